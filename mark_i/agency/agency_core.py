@@ -7,6 +7,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 
 from mark_i.perception.perception_engine import PerceptionEngine
+from mark_i.perception.frame_ring_buffer import FrameSubscriber
 from mark_i.agent.agent_core import AgentCore
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer, MODEL_PREFERENCE_REASONING
 from mark_i.foresight.simulation_engine import SimulationEngine
@@ -219,6 +220,7 @@ class AgencyCore(ObservableComponent, IAgencyCore):
         # State management
         self._agency_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        self._frame_subscriber: Optional[FrameSubscriber] = None
         
         # Opportunity tracking
         self._opportunities: Dict[str, Opportunity] = {}
@@ -316,6 +318,11 @@ class AgencyCore(ObservableComponent, IAgencyCore):
         if self._agency_thread and self._agency_thread.is_alive():
             self._agency_thread.join(timeout=5.0)
         
+        # Release the frame reader so the perception buffer stops tracking it
+        if self._frame_subscriber is not None:
+            self._frame_subscriber.close()
+            self._frame_subscriber = None
+        
         self.set_running(False)
         self.logger.info("Agency Core monitoring stopped")
         
@@ -569,6 +576,19 @@ class AgencyCore(ObservableComponent, IAgencyCore):
                     event = self.perception_engine.perception_queue.get()
                     events.append(event)
             
+            # Only the newest screen frame matters; older unread ones are skipped, not queued
+            if hasattr(self.perception_engine, 'subscribe_frames'):
+                if self._frame_subscriber is None:
+                    self._frame_subscriber = self.perception_engine.subscribe_frames(f"agency_core-{id(self):x}")
+                frame = self._frame_subscriber.latest()
+                if frame is not None and not (frame.delta and frame.delta.unchanged):
+                    event = {'type': 'VISUAL_UPDATE', 'timestamp': frame.timestamp, 'data': frame.image}
+                    if frame.delta:
+                        event['dirty_tiles'] = frame.delta.dirty_tiles
+                        event['changed_boxes'] = frame.delta.boxes
+                        event['changed_fraction'] = frame.delta.changed_fraction
+                    events.append(event)
+            
             return events
         except Exception as e:
             self.logger.error(f"Error getting recent events: {e}")
@@ -7,6 +7,7 @@ import numpy as np
 from mark_i.knowledge.knowledge_base import KnowledgeBase
 from mark_i.engines.capture_engine import CaptureEngine
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer, MODEL_PREFERENCE_REASONING
+from mark_i.engines.gemini_upload import UploadImageOptions
 from mark_i.agent.toolbelt import Toolbelt
 from mark_i.agent.world_model import WorldModel
 
@@ -14,6 +15,9 @@ from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.agent.agent_core")
 
+# Full-screen observations are downscaled to ~1080p and sent as JPEG; a 4K PNG-class upload dominates per-step latency.
+DEFAULT_OBSERVATION_UPLOAD_OPTIONS = UploadImageOptions(max_pixels=1920 * 1080, image_format="jpeg", quality=85)
+
 REACT_PROMPT_TEMPLATE = """
 You are Mark-I, an intelligent and autonomous AI agent that can control a computer desktop by seeing the screen and using a set of tools.
 
@@ -69,8 +73,10 @@ class AgentCore:
         gemini_analyzer: GeminiAnalyzer,
         toolbelt: Toolbelt,
         status_update_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        observation_upload_options: Optional[UploadImageOptions] = DEFAULT_OBSERVATION_UPLOAD_OPTIONS,
     ):
         self.knowledge_base = knowledge_base
+        self.observation_upload_options = observation_upload_options
         self.capture_engine = capture_engine
         self.gemini_analyzer = gemini_analyzer
         self.toolbelt = toolbelt
@@ -132,7 +138,12 @@ class AgentCore:
             self._send_status_update("tactic_before_image", {"image_np": observation_image})
 
             # v12.0.5 FIX: Use `model_preference` instead of `model_name_override`
-            llm_response = self.gemini_analyzer.query_vision_model(prompt=prompt, image_data=observation_image, model_preference=MODEL_PREFERENCE_REASONING)
+            llm_response = self.gemini_analyzer.query_vision_model(
+                prompt=prompt, image_data=observation_image, model_preference=MODEL_PREFERENCE_REASONING, upload_options=self.observation_upload_options
+            )
+            upload_report = llm_response.get("upload_image")
+            if upload_report and upload_report.get("bytes_saved") is not None:
+                logger.debug(f"Observation upload: {upload_report['width']}x{upload_report['height']}, {upload_report['upload_bytes']} bytes ({upload_report['bytes_saved']} saved vs raw).")
 
             if llm_response["status"] != "success" or not llm_response.get("json_content"):
                 final_message = f"AI reasoning failed. Status: {llm_response['status']}, Error: {llm_response.get('error_message')}"
@@ -6,6 +6,7 @@ between different cognitive layers and manages system-wide autonomous behavior.
 """
 
 from .engine import AutonomyEngine
+from .assessment_trigger import AssessmentTrigger
 from .self_correction_engine import SelfCorrectionEngine
 
-__all__ = ['AutonomyEngine', 'SelfCorrectionEngine']
\ No newline at end of file
+__all__ = ['AutonomyEngine', 'AssessmentTrigger', 'SelfCorrectionEngine']
\ No newline at end of file
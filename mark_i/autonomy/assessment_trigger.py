@@ -0,0 +1,197 @@
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.perception.frame_delta import DEFAULT_DELTA_TILE_SIZE, FrameDeltaEncoder
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.autonomy.assessment_trigger")
+
+DEFAULT_MIN_ASSESSMENT_INTERVAL_SECONDS = 10.0
+DEFAULT_MAX_ASSESSMENTS_PER_HOUR = 60
+# A visual change must cover at least this fraction of the screen...
+DEFAULT_MIN_CHANGED_FRACTION = 0.05
+# ...and leave the screen at most this structurally similar to the last assessed one.
+DEFAULT_MAX_STRUCTURAL_SIMILARITY = 0.9
+# Seconds without pointer movement after which the user counts as idle.
+DEFAULT_IDLE_SECONDS = 60.0
+
+# Width in pixels of the grayscale thumbnails structural similarity is computed on.
+SIMILARITY_THUMBNAIL_WIDTH = 256
+
+# Trigger reasons reported by `AssessmentTrigger.observe`.
+REASON_INITIAL = "initial"
+REASON_VISUAL_CHANGE = "visual_change"
+REASON_FOCUS_CHANGE = "focus_change"
+REASON_IDLE_TO_ACTIVE = "idle_to_active"
+
+
+def _similarity_thumbnail(image: np.ndarray) -> np.ndarray:
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    height, width = gray.shape[:2]
+    if width > SIMILARITY_THUMBNAIL_WIDTH:
+        gray = cv2.resize(gray, (SIMILARITY_THUMBNAIL_WIDTH, max(1, round(height * SIMILARITY_THUMBNAIL_WIDTH / width))), interpolation=cv2.INTER_AREA)
+    return gray.astype(np.float32)
+
+
+def structural_similarity(image_a: np.ndarray, image_b: np.ndarray) -> float:
+    """Mean SSIM (Gaussian window, sigma 1.5) of two same-sized images, compared as downscaled grayscale. 1.0 means identical."""
+    a, b = _similarity_thumbnail(image_a), _similarity_thumbnail(image_b)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    blur = lambda x: cv2.GaussianBlur(x, (7, 7), 1.5)
+    mu_a, mu_b = blur(a), blur(b)
+    var_a = blur(a * a) - mu_a * mu_a
+    var_b = blur(b * b) - mu_b * mu_b
+    cov = blur(a * b) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a * mu_a + mu_b * mu_b + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+
+class AssessmentTrigger:
+    """
+    Decides when the AutonomyEngine should spend a Gemini call on assessing the screen.
+
+    An assessment is due when, compared with the screen at the last assessment, a large enough
+    area changed and the screen is structurally different; when the focused window changes; or
+    when the user becomes active after being idle. Due assessments are held back until
+    `min_interval_seconds` passed since the last one and while the hourly budget is spent;
+    focus and idle-to-active triggers stay pending until then, visual changes are re-checked.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float = DEFAULT_MIN_ASSESSMENT_INTERVAL_SECONDS,
+        max_assessments_per_hour: Optional[int] = DEFAULT_MAX_ASSESSMENTS_PER_HOUR,
+        min_changed_fraction: float = DEFAULT_MIN_CHANGED_FRACTION,
+        max_structural_similarity: float = DEFAULT_MAX_STRUCTURAL_SIMILARITY,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        tile_size: int = DEFAULT_DELTA_TILE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            min_interval_seconds: Minimum time between two assessments.
+            max_assessments_per_hour: Assessments allowed in any sliding hour. None for no budget.
+            min_changed_fraction: Fraction of the screen (0-1) that must have changed for a visual trigger.
+            max_structural_similarity: Highest SSIM with the last assessed screen that still counts as a visual change.
+            idle_seconds: Pointer inactivity after which the next movement is an idle-to-active trigger.
+            tile_size: Tile size used to measure the changed area.
+            clock: Monotonic time source (seconds).
+        """
+        if not isinstance(min_interval_seconds, (int, float)) or min_interval_seconds < 0:
+            raise ValueError(f"min_interval_seconds must be a non-negative number, got {min_interval_seconds!r}.")
+        if max_assessments_per_hour is not None and (not isinstance(max_assessments_per_hour, int) or max_assessments_per_hour <= 0):
+            raise ValueError(f"max_assessments_per_hour must be a positive integer or None, got {max_assessments_per_hour!r}.")
+        if not 0 <= min_changed_fraction <= 1:
+            raise ValueError(f"min_changed_fraction must be between 0 and 1, got {min_changed_fraction!r}.")
+        self.min_interval_seconds = float(min_interval_seconds)
+        self.max_assessments_per_hour = max_assessments_per_hour
+        self.min_changed_fraction = float(min_changed_fraction)
+        self.max_structural_similarity = float(max_structural_similarity)
+        self.idle_seconds = float(idle_seconds)
+        self._clock = clock
+        self._delta_encoder = FrameDeltaEncoder(tile_size=tile_size)
+
+        self._reference_frame: Optional[np.ndarray] = None
+        self._last_assessment_time: Optional[float] = None
+        self._assessment_times: Deque[float] = deque()
+        self._pending: Set[str] = {REASON_INITIAL}
+        self._focused_window: Optional[str] = None
+        self._pointer_position: Optional[Tuple[int, int]] = None
+        self._last_activity_time = clock()
+        self._budget_exhausted_logged = False
+        self._stats: Counter = Counter()
+
+    def _note_focus(self, focused_window: Optional[str]):
+        if focused_window is None:
+            return
+        if self._focused_window is not None and focused_window != self._focused_window:
+            logger.debug(f"Focus changed from '{self._focused_window}' to '{focused_window}'.")
+            self._pending.add(REASON_FOCUS_CHANGE)
+        self._focused_window = focused_window
+
+    def _note_pointer(self, pointer_position: Optional[Tuple[int, int]], now: float):
+        if pointer_position is None:
+            return
+        if self._pointer_position is not None and pointer_position != self._pointer_position:
+            if now - self._last_activity_time >= self.idle_seconds:
+                logger.debug(f"User active again after {now - self._last_activity_time:.0f}s idle.")
+                self._pending.add(REASON_IDLE_TO_ACTIVE)
+            self._last_activity_time = now
+        self._pointer_position = pointer_position
+
+    def _gate(self, now: float) -> Optional[str]:
+        """Why an assessment may not run now, or None if it may."""
+        if self._last_assessment_time is not None and now - self._last_assessment_time < self.min_interval_seconds:
+            return "interval"
+        if self.max_assessments_per_hour is not None:
+            while self._assessment_times and now - self._assessment_times[0] >= 3600.0:
+                self._assessment_times.popleft()
+            if len(self._assessment_times) >= self.max_assessments_per_hour:
+                if not self._budget_exhausted_logged:
+                    logger.warning(f"Autonomy assessment budget of {self.max_assessments_per_hour}/hour used up. Holding back assessments.")
+                    self._budget_exhausted_logged = True
+                return "budget"
+        self._budget_exhausted_logged = False
+        return None
+
+    def _visual_change(self, frame: np.ndarray) -> bool:
+        delta = self._delta_encoder.compare(self._reference_frame, frame)
+        if delta.keyframe:
+            return True
+        changed_fraction = delta.changed_fraction
+        if changed_fraction < self.min_changed_fraction:
+            return False
+        similarity = structural_similarity(self._reference_frame, frame)
+        logger.debug(f"Screen changed: {changed_fraction:.1%} of area, SSIM {similarity:.3f}.")
+        return similarity <= self.max_structural_similarity
+
+    def observe(self, frame: np.ndarray, focused_window: Optional[str] = None, pointer_position: Optional[Tuple[int, int]] = None) -> Optional[str]:
+        """
+        Feeds one observation of the screen and user state.
+
+        Args:
+            frame: Current full-screen capture.
+            focused_window: Title of the focused window, if known.
+            pointer_position: Current pointer position, if known (used for idle detection).
+
+        Returns:
+            The reason an assessment should run now, or None. Call `record_assessment` when acting on it.
+        """
+        now = self._clock()
+        self._stats["observations"] += 1
+        self._note_focus(focused_window)
+        self._note_pointer(pointer_position, now)
+
+        blocked_by = self._gate(now)
+        if blocked_by is not None:
+            self._stats[f"held_back_by_{blocked_by}"] += 1
+            return None
+
+        for reason in (REASON_INITIAL, REASON_FOCUS_CHANGE, REASON_IDLE_TO_ACTIVE):
+            if reason in self._pending:
+                return reason
+        if self._visual_change(frame):
+            return REASON_VISUAL_CHANGE
+        self._stats["skipped_unchanged"] += 1
+        return None
+
+    def record_assessment(self, frame: np.ndarray, reason: str):
+        """Marks an assessment of `frame` as done; it becomes the reference for later visual changes."""
+        now = self._clock()
+        self._reference_frame = frame
+        self._last_assessment_time = now
+        self._assessment_times.append(now)
+        self._pending.clear()
+        self._stats["assessments"] += 1
+        self._stats[f"reason_{reason}"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Observation, assessment and hold-back counters, plus assessments in the current hour."""
+        stats = dict(self._stats)
+        stats["assessments_last_hour"] = sum(1 for t in self._assessment_times if self._clock() - t < 3600.0)
+        return stats
@@ -1,7 +1,8 @@
 import logging
+import sys
 import threading
 import time
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
 
 import numpy as np
 from google.api_core import exceptions as google_api_exceptions
@@ -10,6 +11,7 @@ from mark_i.engines.capture_engine import CaptureEngine
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer
 from mark_i.execution.strategic_executor import StrategicExecutor # UPDATED
 from mark_i.engines.gemini_decision_module import GeminiDecisionModule
+from mark_i.autonomy.assessment_trigger import AssessmentTrigger
 
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 
@@ -18,6 +20,35 @@ logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.autonomy.engine")
 ASSESS_PRIMARY_MODEL = "gemini-2.0-flash"
 ASSESS_FALLBACK_MODEL = "gemini-1.5-flash-latest"
 
+# How often the screen, focus and pointer are sampled to decide whether an assessment is due.
+DEFAULT_OBSERVATION_INTERVAL_SECONDS = 1.0
+
+
+def _foreground_window_title() -> Optional[str]:
+    """Title of the focused window (Windows only; None elsewhere or on failure)."""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+
+        user32 = ctypes.windll.user32
+        hwnd = user32.GetForegroundWindow()
+        buffer = ctypes.create_unicode_buffer(user32.GetWindowTextLengthW(hwnd) + 1)
+        user32.GetWindowTextW(hwnd, buffer, len(buffer))
+        return buffer.value
+    except Exception:
+        return None
+
+
+def _pointer_position() -> Optional[Tuple[int, int]]:
+    try:
+        import pyautogui
+
+        position = pyautogui.position()
+        return int(position[0]), int(position[1])
+    except Exception:
+        return None
+
 
 ASSESS_PROMPT = """
 You are an expert AI assistant integrated into a visual desktop automation tool named Mark-I.
@@ -53,6 +84,10 @@ class AutonomyEngine:
     """
     High-level meta-controller for proactive, autonomous operation (v6.0.0).
     v10.0.8 Update: Now uses StrategicExecutor for planning and execution.
+
+    The screen is observed every `observation_interval_seconds`, but only sent to Gemini when the
+    AssessmentTrigger reports a significant visual change, a focus change or an idle-to-active
+    transition, subject to its minimum interval and hourly budget.
     """
 
     def __init__(
@@ -61,19 +96,37 @@ class AutonomyEngine:
         gemini_analyzer: GeminiAnalyzer,
         strategic_executor: StrategicExecutor, # UPDATED
         confirmation_gui_callback: Callable[[str], bool], # UPDATED to take simple string
+        assessment_trigger: Optional[AssessmentTrigger] = None,
+        observation_interval_seconds: float = DEFAULT_OBSERVATION_INTERVAL_SECONDS,
+        focused_window_provider: Callable[[], Optional[str]] = _foreground_window_title,
+        pointer_position_provider: Callable[[], Optional[Tuple[int, int]]] = _pointer_position,
     ):
         self.capture_engine = capture_engine
         self.gemini_analyzer = gemini_analyzer
         self.strategic_executor = strategic_executor # UPDATED
         self.confirmation_gui_callback = confirmation_gui_callback
 
-        self.assessment_interval_seconds: float = 10.0
+        self.assessment_trigger = assessment_trigger or AssessmentTrigger()
+        self.observation_interval_seconds = observation_interval_seconds
+        self.focused_window_provider = focused_window_provider
+        self.pointer_position_provider = pointer_position_provider
         self.is_running: bool = False
 
         self._stop_event = threading.Event()
         self._autonomy_thread: Optional[threading.Thread] = None
         logger.info("AutonomyEngine initialized.")
 
+    @property
+    def assessment_interval_seconds(self) -> float:
+        """Minimum time between two assessments; stored on, and enforced by, the assessment trigger."""
+        return self.assessment_trigger.min_interval_seconds
+
+    @assessment_interval_seconds.setter
+    def assessment_interval_seconds(self, seconds: float):
+        if not isinstance(seconds, (int, float)) or seconds < 0:
+            raise ValueError(f"assessment_interval_seconds must be a non-negative number, got {seconds!r}.")
+        self.assessment_trigger.min_interval_seconds = float(seconds)
+
     def start(self):
         """Starts the autonomous operation loop in a separate thread."""
         if self._autonomy_thread and self._autonomy_thread.is_alive():
@@ -84,7 +137,7 @@ class AutonomyEngine:
         self.is_running = True
         self._autonomy_thread = threading.Thread(target=self.run_autonomy_loop, daemon=True)
         self._autonomy_thread.name = "AutonomyEngineThread"
-        logger.info(f"Starting AutonomyEngine thread. Assessment interval: {self.assessment_interval_seconds}s.")
+        logger.info(f"Starting AutonomyEngine thread. Observation interval: {self.observation_interval_seconds}s, minimum assessment interval: {self.assessment_trigger.min_interval_seconds}s.")
         self._autonomy_thread.start()
 
     def stop(self):
@@ -111,17 +164,27 @@ class AutonomyEngine:
         logger.info("Autonomous loop started.")
         while not self._stop_event.is_set():
             try:
-                full_screen_capture = self._observe()
-                if full_screen_capture is not None:
-                    assessed_task_goal = self._assess(full_screen_capture)
-                    if assessed_task_goal:
-                        self._execute(assessed_task_goal)
+                self._run_cycle()
             except Exception as e:
                 logger.critical("Critical unhandled error in autonomy loop.", exc_info=True)
                 time.sleep(self.assessment_interval_seconds * 2)
             
-            self._stop_event.wait(timeout=self.assessment_interval_seconds)
-        logger.info("Autonomous loop has been stopped.")
+            self._stop_event.wait(timeout=self.observation_interval_seconds)
+        logger.info(f"Autonomous loop has been stopped. Trigger stats: {self.assessment_trigger.get_stats()}")
+
+    def _run_cycle(self):
+        """One observation; assesses (and possibly executes) only when the trigger fires."""
+        full_screen_capture = self._observe()
+        if full_screen_capture is None:
+            return
+        reason = self.assessment_trigger.observe(full_screen_capture, focused_window=self.focused_window_provider(), pointer_position=self.pointer_position_provider())
+        if reason is None:
+            return
+        logger.info(f"AutonomyEngine: assessment triggered ({reason}).")
+        self.assessment_trigger.record_assessment(full_screen_capture, reason)
+        assessed_task_goal = self._assess(full_screen_capture)
+        if assessed_task_goal:
+            self._execute(assessed_task_goal)
 
     def _observe(self) -> Optional[np.ndarray]:
         """Captures the current state of the entire screen."""
@@ -12,7 +12,7 @@ import time
 import os
 import psutil
 import platform
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -23,9 +23,16 @@ import hashlib
 from mark_i.core.base_component import ProcessingComponent
 from mark_i.core.architecture_config import ComponentConfig
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.context.process_sampler import ProcessSampler
 
 logger = logging.getLogger(APP_ROOT_LOGGER_NAME + ".context.environment_monitor")
 
+# Two applications use "similar resources" when their CPU and memory percentages differ by at most
+# these tolerances and both use RESOURCE_SIMILARITY_MIN_CPU percent CPU or more.
+RESOURCE_SIMILARITY_CPU_TOLERANCE = 20.0
+RESOURCE_SIMILARITY_MEMORY_TOLERANCE = 15.0
+RESOURCE_SIMILARITY_MIN_CPU = 1.0
+
 
 class MonitoringScope(Enum):
     """Scope of environment monitoring."""
@@ -148,6 +155,7 @@ class EnvironmentMonitor(ProcessingComponent):
         self.tracked_applications: Dict[str, ApplicationInfo] = {}
         self.application_relationships: Dict[str, ApplicationRelationship] = {}
         self.application_patterns: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.process_sampler = ProcessSampler(watch_list=getattr(config, "watched_processes", []))
 
         # System baseline
         self.baseline_metrics: Optional[SystemMetrics] = None
@@ -343,6 +351,7 @@ class EnvironmentMonitor(ProcessingComponent):
                 },
                 "recommendations": self._generate_health_recommendations(health_status, metrics),
                 "trends": self._analyze_health_trends(),
+                "monitor_overhead": self._assess_monitor_overhead(),
             }
 
             return assessment
@@ -390,12 +399,12 @@ class EnvironmentMonitor(ProcessingComponent):
         try:
             timestamp = datetime.now()
 
-            # Capture system metrics
-            system_metrics = self._capture_system_metrics()
-
-            # Capture application information
+            # Capture application information (also counts processes and threads for the system metrics)
             applications = self._capture_application_info()
 
+            # Capture system metrics
+            system_metrics = self._capture_system_metrics(process_counts=(self.process_sampler.last_process_count, self.process_sampler.last_thread_count) if applications else None)
+
             # Get current relationships
             relationships = list(self.application_relationships.values())
 
@@ -424,8 +433,13 @@ class EnvironmentMonitor(ProcessingComponent):
             logger.error(f"Error capturing environment snapshot: {e}")
             return None
 
-    def _capture_system_metrics(self) -> SystemMetrics:
-        """Capture comprehensive system metrics."""
+    def _capture_system_metrics(self, process_counts: Optional[Tuple[int, int]] = None) -> SystemMetrics:
+        """
+        Capture comprehensive system metrics.
+
+        Args:
+            process_counts: Optional. (process count, thread count) from a process sweep done this cycle.
+        """
         try:
             # CPU metrics
             cpu_percent = psutil.cpu_percent(interval=1)
@@ -466,8 +480,11 @@ class EnvironmentMonitor(ProcessingComponent):
                 pass
 
             # Process counts
-            process_count = len(psutil.pids())
-            thread_count = sum(proc.num_threads() for proc in psutil.process_iter() if proc.is_running())
+            if process_counts is not None:
+                process_count, thread_count = process_counts
+            else:
+                process_count = len(psutil.pids())
+                thread_count = sum(proc.info["num_threads"] or 0 for proc in psutil.process_iter(["num_threads"], ad_value=None))
 
             return SystemMetrics(
                 timestamp=datetime.now(),
@@ -521,71 +538,35 @@ class EnvironmentMonitor(ProcessingComponent):
         applications = {}
 
         try:
-            for proc in psutil.process_iter():
-                try:
-                    if not proc.is_running():
-                        continue
+            for sample in self.process_sampler.sample():
+                app_id = f"{sample.name}_{sample.pid}"
+                app_info = ApplicationInfo(
+                    app_id=app_id,
+                    name=sample.name,
+                    pid=sample.pid,
+                    ppid=sample.ppid,
+                    status=sample.status,
+                    create_time=datetime.fromtimestamp(sample.create_time),
+                    cpu_percent=sample.cpu_percent,
+                    memory_percent=sample.memory_percent,
+                    memory_rss=sample.memory_rss,
+                    memory_vms=sample.memory_vms,
+                    num_threads=sample.num_threads,
+                    num_fds=sample.num_fds,
+                    connections=sample.connections,
+                    open_files=sample.open_files,
+                    cmdline=sample.cmdline,
+                    exe=sample.exe,
+                    cwd=sample.cwd,
+                    username=sample.username,
+                    is_running=True,
+                    children=sample.children,
+                )
 
-                    # Get process info
-                    proc_info = proc.as_dict(
-                        [
-                            "pid",
-                            "ppid",
-                            "name",
-                            "status",
-                            "create_time",
-                            "cpu_percent",
-                            "memory_percent",
-                            "memory_info",
-                            "num_threads",
-                            "num_fds",
-                            "connections",
-                            "open_files",
-                            "cmdline",
-                            "exe",
-                            "cwd",
-                            "username",
-                        ]
-                    )
-
-                    app_id = f"{proc_info['name']}_{proc_info['pid']}"
-
-                    # Get children
-                    children = [child.pid for child in proc.children()]
-
-                    app_info = ApplicationInfo(
-                        app_id=app_id,
-                        name=proc_info["name"],
-                        pid=proc_info["pid"],
-                        ppid=proc_info["ppid"],
-                        status=proc_info["status"],
-                        create_time=datetime.fromtimestamp(proc_info["create_time"]),
-                        cpu_percent=proc_info["cpu_percent"] or 0.0,
-                        memory_percent=proc_info["memory_percent"] or 0.0,
-                        memory_rss=proc_info["memory_info"].rss if proc_info["memory_info"] else 0,
-                        memory_vms=proc_info["memory_info"].vms if proc_info["memory_info"] else 0,
-                        num_threads=proc_info["num_threads"] or 0,
-                        num_fds=proc_info["num_fds"] or 0,
-                        connections=[conn._asdict() for conn in (proc_info["connections"] or [])],
-                        open_files=[f.path for f in (proc_info["open_files"] or [])],
-                        cmdline=proc_info["cmdline"] or [],
-                        exe=proc_info["exe"] or "",
-                        cwd=proc_info["cwd"] or "",
-                        username=proc_info["username"] or "",
-                        is_running=True,
-                        children=children,
-                    )
-
-                    applications[app_id] = app_info
-
-                    # Update tracked applications
-                    self.tracked_applications[app_id] = app_info
-
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-                except Exception as e:
-                    logger.debug(f"Error capturing info for process {proc.pid}: {e}")
-                    continue
+                applications[app_id] = app_info
+
+                # Update tracked applications
+                self.tracked_applications[app_id] = app_info
 
             return applications
 
@@ -971,31 +952,115 @@ class EnvironmentMonitor(ProcessingComponent):
             logger.error(f"Error updating application patterns: {e}")
 
     def _discover_application_relationships(self, applications: Dict[str, ApplicationInfo]):
-        """Discover relationships between applications."""
+        """
+        Discover relationships between applications.
+
+        Candidate pairs come from indexes (pid, file path, socket endpoint, resource-usage grid cell,
+        recent activity) instead of comparing every pair, so the work grows with the number of
+        processes plus the number of relationships found rather than with the number of pairs.
+        """
         try:
             app_list = list(applications.values())
 
-            for i, app1 in enumerate(app_list):
-                for app2 in app_list[i + 1 :]:
-                    # Check for parent-child relationship
-                    if app1.ppid == app2.pid or app2.ppid == app1.pid:
-                        self._add_relationship(app1.app_id, app2.app_id, "parent_child", 0.9, ["process_hierarchy"])
-
-                    # Check for resource sharing patterns
-                    if self._check_resource_similarity(app1, app2):
-                        self._add_relationship(app1.app_id, app2.app_id, "resource_sharing", 0.6, ["similar_resource_usage"])
-
-                    # Check for communication (shared files, network connections)
-                    if self._check_communication_patterns(app1, app2):
-                        self._add_relationship(app1.app_id, app2.app_id, "communication", 0.7, ["shared_resources"])
+            pairs_by_type = {
+                "parent_child": (self._find_parent_child_pairs(app_list), 0.9, ["process_hierarchy"]),
+                "resource_sharing": (self._find_resource_similarity_pairs(app_list), 0.6, ["similar_resource_usage"]),
+                "communication": (self._find_communication_pairs(app_list), 0.7, ["shared_resources"]),
+                "co_occurrence": (self._find_co_occurrence_pairs(app_list), 0.5, ["frequently_active_together"]),
+            }
 
-                    # Check for co-occurrence patterns
-                    if self._check_co_occurrence(app1.app_id, app2.app_id):
-                        self._add_relationship(app1.app_id, app2.app_id, "co_occurrence", 0.5, ["frequently_active_together"])
+            for rel_type, (pairs, strength, evidence) in pairs_by_type.items():
+                # Pairs are (i, j) with i < j in app_list order, which fixes the relationship key order
+                for i, j in sorted(pairs):
+                    self._add_relationship(app_list[i].app_id, app_list[j].app_id, rel_type, strength, list(evidence))
 
         except Exception as e:
             logger.error(f"Error discovering application relationships: {e}")
 
+    @staticmethod
+    def _pairs_within(indices: List[int]) -> List[Tuple[int, int]]:
+        """All (i, j) pairs with i < j from a group of app indices."""
+        indices = sorted(set(indices))
+        return [(a, b) for pos, a in enumerate(indices) for b in indices[pos + 1 :]]
+
+    def _find_parent_child_pairs(self, app_list: List[ApplicationInfo]) -> Set[Tuple[int, int]]:
+        """Pairs where one process is the parent of the other, via a pid -> app index map."""
+        indices_by_pid: Dict[int, List[int]] = defaultdict(list)
+        for index, app in enumerate(app_list):
+            indices_by_pid[app.pid].append(index)
+
+        pairs = set()
+        for child_index, app in enumerate(app_list):
+            for parent_index in indices_by_pid.get(app.ppid, ()):
+                if parent_index != child_index:
+                    pairs.add((min(parent_index, child_index), max(parent_index, child_index)))
+        return pairs
+
+    @staticmethod
+    def _connection_endpoint(address: Any) -> Optional[Tuple[str, int]]:
+        """(ip, port) of a connection address given as dict or (named) tuple; None if empty."""
+        if not address:
+            return None
+        if isinstance(address, dict):
+            ip, port = address.get("ip", ""), address.get("port", 0)
+        else:
+            ip, port = address[0], address[1]
+        return (ip, port) if ip or port else None
+
+    def _find_communication_pairs(self, app_list: List[ApplicationInfo]) -> Set[Tuple[int, int]]:
+        """
+        Pairs sharing an open file, or where one process's remote endpoint is the other's local
+        endpoint. Uses inverted indexes from file path and local endpoint to app indices.
+        """
+        indices_by_file: Dict[str, List[int]] = defaultdict(list)
+        indices_by_local_endpoint: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for index, app in enumerate(app_list):
+            for path in set(app.open_files):
+                indices_by_file[path].append(index)
+            for endpoint in {self._connection_endpoint(conn.get("laddr")) for conn in app.connections}:
+                if endpoint is not None:
+                    indices_by_local_endpoint[endpoint].append(index)
+
+        pairs = set()
+        for indices in indices_by_file.values():
+            if len(indices) > 1:
+                pairs.update(self._pairs_within(indices))
+
+        for index, app in enumerate(app_list):
+            for endpoint in {self._connection_endpoint(conn.get("raddr")) for conn in app.connections}:
+                for peer_index in indices_by_local_endpoint.get(endpoint, ()) if endpoint is not None else ():
+                    if peer_index != index:
+                        pairs.add((min(index, peer_index), max(index, peer_index)))
+        return pairs
+
+    def _find_resource_similarity_pairs(self, app_list: List[ApplicationInfo]) -> Set[Tuple[int, int]]:
+        """
+        Pairs passing `_check_resource_similarity`. Active apps are bucketed into a grid with cells
+        as wide as the CPU/memory tolerances, so each app is only checked against the 3x3
+        neighbouring cells (the only ones that can be within tolerance).
+        """
+        cpu_cell, memory_cell = RESOURCE_SIMILARITY_CPU_TOLERANCE, RESOURCE_SIMILARITY_MEMORY_TOLERANCE
+        active_indices = [index for index, app in enumerate(app_list) if app.cpu_percent >= RESOURCE_SIMILARITY_MIN_CPU]
+        grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index in active_indices:
+            app = app_list[index]
+            grid[(int(app.cpu_percent // cpu_cell), int(app.memory_percent // memory_cell))].append(index)
+
+        pairs = set()
+        for index in active_indices:
+            app = app_list[index]
+            cpu_key, memory_key = int(app.cpu_percent // cpu_cell), int(app.memory_percent // memory_cell)
+            for d_cpu in (-1, 0, 1):
+                for d_memory in (-1, 0, 1):
+                    for other_index in grid.get((cpu_key + d_cpu, memory_key + d_memory), ()):
+                        if other_index != index and self._check_resource_similarity(app, app_list[other_index]):
+                            pairs.add((min(index, other_index), max(index, other_index)))
+        return pairs
+
+    def _find_co_occurrence_pairs(self, app_list: List[ApplicationInfo]) -> Set[Tuple[int, int]]:
+        """Pairs of apps that have both been active recently (the co-occurrence test is per app)."""
+        return set(self._pairs_within([index for index, app in enumerate(app_list) if self._is_recently_active(app.app_id)]))
+
     def _add_relationship(self, app1_id: str, app2_id: str, rel_type: str, strength: float, evidence: List[str]):
         """Add or update an application relationship."""
         rel_key = f"{app1_id}_{app2_id}_{rel_type}"
@@ -1020,16 +1085,16 @@ class EnvironmentMonitor(ProcessingComponent):
         try:
             # Compare CPU usage
             cpu_diff = abs(app1.cpu_percent - app2.cpu_percent)
-            if cpu_diff > 20.0:  # Too different
+            if cpu_diff > RESOURCE_SIMILARITY_CPU_TOLERANCE:  # Too different
                 return False
 
             # Compare memory usage
             memory_diff = abs(app1.memory_percent - app2.memory_percent)
-            if memory_diff > 15.0:  # Too different
+            if memory_diff > RESOURCE_SIMILARITY_MEMORY_TOLERANCE:  # Too different
                 return False
 
             # Both should be reasonably active
-            if app1.cpu_percent < 1.0 and app2.cpu_percent < 1.0:
+            if app1.cpu_percent < RESOURCE_SIMILARITY_MIN_CPU or app2.cpu_percent < RESOURCE_SIMILARITY_MIN_CPU:
                 return False
 
             return True
@@ -1046,11 +1111,11 @@ class EnvironmentMonitor(ProcessingComponent):
             if shared_files:
                 return True
 
-            # Check for network connections between them
-            app1_connections = {(conn.get("laddr", {}).get("ip", ""), conn.get("laddr", {}).get("port", 0)) for conn in app1.connections}
-            app2_connections = {(conn.get("raddr", {}).get("ip", ""), conn.get("raddr", {}).get("port", 0)) for conn in app2.connections}
+            # Check for network connections between them, in either direction
+            local_endpoints = lambda app: {self._connection_endpoint(conn.get("laddr")) for conn in app.connections} - {None}
+            remote_endpoints = lambda app: {self._connection_endpoint(conn.get("raddr")) for conn in app.connections} - {None}
 
-            if app1_connections & app2_connections:
+            if local_endpoints(app1) & remote_endpoints(app2) or local_endpoints(app2) & remote_endpoints(app1):
                 return True
 
             return False
@@ -1059,25 +1124,21 @@ class EnvironmentMonitor(ProcessingComponent):
             logger.debug(f"Error checking communication patterns: {e}")
             return False
 
+    def _is_recently_active(self, app_id: str) -> bool:
+        """Whether an application has enough history and was repeatedly active in its recent samples."""
+        pattern = self.application_patterns.get(app_id, [])
+        if len(pattern) < 10:
+            return False
+        return len([p for p in pattern[-20:] if p.get("cpu_percent", 0) > 1.0]) > 5
+
     def _check_co_occurrence(self, app1_id: str, app2_id: str) -> bool:
         """Check if two applications frequently occur together."""
         try:
             # This is a simplified check - in a real implementation,
             # this would analyze historical data for co-occurrence patterns
 
-            # For now, check if both applications are currently active
-            app1_pattern = self.application_patterns.get(app1_id, [])
-            app2_pattern = self.application_patterns.get(app2_id, [])
-
-            if len(app1_pattern) < 10 or len(app2_pattern) < 10:
-                return False
-
-            # Check recent co-occurrence
-            recent_app1 = [p for p in app1_pattern[-20:] if p.get("cpu_percent", 0) > 1.0]
-            recent_app2 = [p for p in app2_pattern[-20:] if p.get("cpu_percent", 0) > 1.0]
-
             # If both have been active recently, consider co-occurrence
-            return len(recent_app1) > 5 and len(recent_app2) > 5
+            return self._is_recently_active(app1_id) and self._is_recently_active(app2_id)
 
         except Exception as e:
             logger.debug(f"Error checking co-occurrence: {e}")
@@ -1230,6 +1291,12 @@ class EnvironmentMonitor(ProcessingComponent):
 
         return {"status": status, "message": message, "process_count": metrics.process_count, "thread_count": metrics.thread_count, "load_average": metrics.load_average}
 
+    def _assess_monitor_overhead(self) -> Dict[str, Any]:
+        """CPU cost of the process sampler, absolute and as a share of one core over the monitoring interval."""
+        stats = self.process_sampler.get_stats()
+        stats["cpu_percent_of_interval"] = stats["cpu_seconds_mean"] / self.monitoring_interval * 100 if self.monitoring_interval > 0 else 0.0
+        return stats
+
     def _generate_health_recommendations(self, health_status: SystemHealthStatus, metrics: SystemMetrics) -> List[str]:
         """Generate health improvement recommendations."""
         recommendations = []
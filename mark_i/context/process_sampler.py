@@ -0,0 +1,267 @@
+"""
+Process Sampler for MARK-I Environment Monitor
+
+Tiered, incremental process sampling: cheap per-process fields for every process on
+every tick, static fields cached per process instance, and expensive fields (open
+files, connections, fd count) refreshed only for processes that need it.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import psutil
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(APP_ROOT_LOGGER_NAME + ".context.process_sampler")
+
+# psutil 6 renamed Process.connections() to net_connections() and psutil 7 removed the old name.
+CONNECTIONS_ATTR = "net_connections" if hasattr(psutil.Process, "net_connections") else "connections"
+
+# Read for every process on every tick (one pass over the process table).
+CHEAP_ATTRS = ["pid", "ppid", "name", "status", "create_time", "cpu_percent", "memory_percent", "memory_info", "num_threads"]
+# Read once per process instance, identified by (pid, create_time).
+STATIC_ATTRS = ["cmdline", "exe", "cwd", "username"]
+# Read only for new, changed or watched processes, or when the cached values got too old.
+EXPENSIVE_ATTRS = ["num_fds", "open_files", CONNECTIONS_ATTR]
+
+# Relative RSS change since the last expensive sample that marks a process as changed.
+DEFAULT_RSS_CHANGE_FRACTION = 0.10
+# Relative thread-count change since the last expensive sample that marks a process as changed,
+# never less than MIN_THREAD_CHANGE so thread pools growing and shrinking by a worker or two do not count.
+DEFAULT_THREAD_CHANGE_FRACTION = 0.5
+MIN_THREAD_CHANGE = 4
+# Expensive fields of unchanged processes are refreshed at least this often.
+DEFAULT_EXPENSIVE_MAX_AGE_SECONDS = 300.0
+# Statuses a live process flips between from tick to tick; moving among them is not a meaningful change,
+# moving to or from any other status (zombie, stopped, tracing stop, dead, ...) is.
+ACTIVE_STATUSES = frozenset(
+    {psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING, psutil.STATUS_DISK_SLEEP, psutil.STATUS_IDLE, psutil.STATUS_WAKING, psutil.STATUS_WAITING, psutil.STATUS_PARKED, psutil.STATUS_LOCKED}
+)
+
+ProcessKey = Tuple[int, float]
+
+
+@dataclass
+class ProcessSample:
+    """Everything known about one process instance after a tick."""
+
+    pid: int
+    ppid: int
+    name: str
+    status: str
+    create_time: float
+    cpu_percent: float
+    memory_percent: float
+    memory_rss: int
+    memory_vms: int
+    num_threads: int
+    cmdline: List[str] = field(default_factory=list)
+    exe: str = ""
+    cwd: str = ""
+    username: str = ""
+    num_fds: int = 0
+    open_files: List[str] = field(default_factory=list)
+    connections: List[Dict[str, Any]] = field(default_factory=list)
+    children: List[int] = field(default_factory=list)
+
+
+@dataclass
+class _CachedProcess:
+    static: Dict[str, Any]
+    expensive: Optional[Dict[str, Any]] = None
+    expensive_at: float = 0.0
+    expensive_rss: int = 0
+    expensive_threads: int = 0
+    status: str = ""
+
+
+class ProcessSampler:
+    """
+    Samples all processes with cost proportional to what changed.
+
+    Every tick walks the process table once for cheap fields (cpu, memory, threads, status).
+    Static fields (command line, executable, cwd, user) are read once per process instance,
+    keyed by (pid, create_time) so a reused pid is treated as a new process. Expensive fields
+    (open files, connections, fd count) are read only for processes that are new, in the watch
+    list, that left or entered the active statuses (e.g. became a zombie or were stopped), whose
+    thread count (by more than `thread_change_fraction`) or RSS (by more than `rss_change_fraction`)
+    changed since their last expensive read, or whose cached values are older than
+    `expensive_max_age_seconds`. Flipping between running and sleeping does not count.
+    Children lists are derived from the ppid of every process instead of per-process queries.
+
+    The sampler measures its own CPU time per tick; see `get_stats`.
+    """
+
+    def __init__(
+        self,
+        watch_list: Iterable[Union[str, int]] = (),
+        rss_change_fraction: float = DEFAULT_RSS_CHANGE_FRACTION,
+        thread_change_fraction: float = DEFAULT_THREAD_CHANGE_FRACTION,
+        expensive_max_age_seconds: float = DEFAULT_EXPENSIVE_MAX_AGE_SECONDS,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            watch_list: Process names or pids whose expensive fields are read on every tick.
+            rss_change_fraction: Relative RSS change that triggers an expensive re-read.
+            thread_change_fraction: Relative thread-count change (at least MIN_THREAD_CHANGE threads) that triggers an expensive re-read.
+            expensive_max_age_seconds: Maximum age of cached expensive fields.
+            clock: Monotonic time source (seconds).
+        """
+        if rss_change_fraction < 0:
+            raise ValueError(f"rss_change_fraction must be non-negative, got {rss_change_fraction!r}.")
+        if thread_change_fraction < 0:
+            raise ValueError(f"thread_change_fraction must be non-negative, got {thread_change_fraction!r}.")
+        if expensive_max_age_seconds <= 0:
+            raise ValueError(f"expensive_max_age_seconds must be positive, got {expensive_max_age_seconds!r}.")
+        self.watched_names: Set[str] = set()
+        self.watched_pids: Set[int] = set()
+        for entry in watch_list:
+            self.watch(entry)
+        self.rss_change_fraction = rss_change_fraction
+        self.thread_change_fraction = thread_change_fraction
+        self.expensive_max_age_seconds = expensive_max_age_seconds
+        self._clock = clock
+        self._cache: Dict[ProcessKey, _CachedProcess] = {}
+
+        self.ticks = 0
+        self.last_process_count = 0
+        self.last_thread_count = 0
+        self.last_expensive_reads = 0
+        self.total_expensive_reads = 0
+        self.last_cpu_seconds = 0.0
+        self.total_cpu_seconds = 0.0
+        self.last_wall_seconds = 0.0
+
+    def watch(self, name_or_pid: Union[str, int]):
+        """Always read expensive fields for processes with this name or pid."""
+        if isinstance(name_or_pid, int):
+            self.watched_pids.add(name_or_pid)
+        else:
+            self.watched_names.add(name_or_pid)
+
+    def unwatch(self, name_or_pid: Union[str, int]):
+        if isinstance(name_or_pid, int):
+            self.watched_pids.discard(name_or_pid)
+        else:
+            self.watched_names.discard(name_or_pid)
+
+    def _needs_expensive_read(self, cached: _CachedProcess, info: Dict[str, Any], rss: int, now: float) -> bool:
+        if cached.expensive is None:
+            return True
+        if info["pid"] in self.watched_pids or info["name"] in self.watched_names:
+            return True
+        if now - cached.expensive_at >= self.expensive_max_age_seconds:
+            return True
+        if info["status"] != cached.status and not (info["status"] in ACTIVE_STATUSES and cached.status in ACTIVE_STATUSES):
+            return True
+        thread_change = abs((info["num_threads"] or 0) - cached.expensive_threads)
+        if thread_change >= max(MIN_THREAD_CHANGE, self.thread_change_fraction * cached.expensive_threads):
+            return True
+        return abs(rss - cached.expensive_rss) > self.rss_change_fraction * max(cached.expensive_rss, 1)
+
+    @staticmethod
+    def _read_expensive(proc: psutil.Process) -> Dict[str, Any]:
+        values = proc.as_dict(EXPENSIVE_ATTRS, ad_value=None)
+        return {
+            "num_fds": values.get("num_fds") or 0,
+            "open_files": [f.path for f in (values.get("open_files") or [])],
+            "connections": [conn._asdict() for conn in (values.get(CONNECTIONS_ATTR) or [])],
+        }
+
+    def sample(self) -> List[ProcessSample]:
+        """Runs one tick and returns a sample for every live process."""
+        cpu_start, wall_start = time.thread_time(), time.perf_counter()
+        now = self._clock()
+        samples: List[ProcessSample] = []
+        seen: Set[ProcessKey] = set()
+        expensive_reads = 0
+
+        for proc in psutil.process_iter(CHEAP_ATTRS, ad_value=None):
+            info = proc.info
+            if info.get("pid") is None or info.get("create_time") is None:
+                continue
+            key = (info["pid"], info["create_time"])
+            seen.add(key)
+            memory_info = info.get("memory_info")
+            rss = memory_info.rss if memory_info else 0
+            try:
+                cached = self._cache.get(key)
+                if cached is None:
+                    cached = self._cache[key] = _CachedProcess(static=proc.as_dict(STATIC_ATTRS, ad_value=None))
+                if self._needs_expensive_read(cached, info, rss, now):
+                    cached.expensive = self._read_expensive(proc)
+                    cached.expensive_at, cached.expensive_rss = now, rss
+                    cached.expensive_threads, cached.status = info["num_threads"] or 0, info["status"]
+                    expensive_reads += 1
+
+                static, expensive = cached.static, cached.expensive or {}
+                samples.append(
+                    ProcessSample(
+                        pid=info["pid"],
+                        ppid=info["ppid"] or 0,
+                        name=info["name"] or "",
+                        status=info["status"] or "",
+                        create_time=info["create_time"],
+                        cpu_percent=info["cpu_percent"] or 0.0,
+                        memory_percent=info["memory_percent"] or 0.0,
+                        memory_rss=rss,
+                        memory_vms=memory_info.vms if memory_info else 0,
+                        num_threads=info["num_threads"] or 0,
+                        cmdline=static.get("cmdline") or [],
+                        exe=static.get("exe") or "",
+                        cwd=static.get("cwd") or "",
+                        username=static.get("username") or "",
+                        num_fds=expensive.get("num_fds", 0),
+                        open_files=expensive.get("open_files", []),
+                        connections=expensive.get("connections", []),
+                    )
+                )
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self._cache.pop(key, None)
+                seen.discard(key)
+            except Exception as e:
+                # One unreadable process must not cost the whole tick; it is read afresh next tick.
+                logger.debug(f"Error sampling process {info['pid']}: {e}")
+                self._cache.pop(key, None)
+                seen.discard(key)
+
+        # Forget processes that exited
+        for key in [key for key in self._cache if key not in seen]:
+            del self._cache[key]
+
+        children_by_pid: Dict[int, List[int]] = {}
+        for process in samples:
+            children_by_pid.setdefault(process.ppid, []).append(process.pid)
+        for process in samples:
+            process.children = [pid for pid in children_by_pid.get(process.pid, []) if pid != process.pid]
+
+        self.ticks += 1
+        self.last_process_count = len(samples)
+        self.last_thread_count = sum(process.num_threads for process in samples)
+        self.last_expensive_reads = expensive_reads
+        self.total_expensive_reads += expensive_reads
+        self.last_cpu_seconds = time.thread_time() - cpu_start
+        self.total_cpu_seconds += self.last_cpu_seconds
+        self.last_wall_seconds = time.perf_counter() - wall_start
+        logger.debug(
+            f"Sampled {len(samples)} processes ({expensive_reads} expensive reads) in {self.last_wall_seconds * 1000:.1f} ms, {self.last_cpu_seconds * 1000:.1f} ms CPU."
+        )
+        return samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sampling cost and work counters."""
+        return {
+            "ticks": self.ticks,
+            "processes": self.last_process_count,
+            "threads": self.last_thread_count,
+            "cached_processes": len(self._cache),
+            "expensive_reads_last_tick": self.last_expensive_reads,
+            "expensive_reads_total": self.total_expensive_reads,
+            "cpu_seconds_last_tick": self.last_cpu_seconds,
+            "cpu_seconds_mean": self.total_cpu_seconds / self.ticks if self.ticks else 0.0,
+            "wall_seconds_last_tick": self.last_wall_seconds,
+        }
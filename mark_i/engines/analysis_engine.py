@@ -1,17 +1,33 @@
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 import os  # Used for os.linesep in log formatting
 
 import cv2  # OpenCV for image processing tasks
 import numpy as np
 import pytesseract  # For OCR
-from pytesseract import Output  # For structured OCR data
 
 # Standardized logger for this module
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.ocr_backends import OcrBackend, PytesseractOcrBackend, create_ocr_backend
+from mark_i.engines.ocr_cache import DEFAULT_OCR_CACHE_MAX_ENTRIES, OcrResultCache, ocr_cache_key
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.analysis_engine")
 
+DOMINANT_COLOR_MODES = ("kmeans", "fast")
+DEFAULT_DOMINANT_COLORS_MAX_SAMPLES = 4096
+# 'fast' dominant colors: bits kept per channel when bucketing pixels, and Lloyd iteration limits.
+FAST_DOMINANT_COLOR_QUANT_BITS = 5
+FAST_DOMINANT_COLOR_MAX_ITER = 20
+FAST_DOMINANT_COLOR_EPS = 0.5
+# Coarse-to-fine template matching: the template must keep at least this many pixels per side at the
+# coarsest level, at most this many coarse peaks are refined, and coarse peaks are considered down to
+# (threshold - margin) since downsampling lowers correlation scores.
+TEMPLATE_PYRAMID_MIN_SIDE = 8
+TEMPLATE_PYRAMID_MAX_CANDIDATES = 3
+TEMPLATE_PYRAMID_COARSE_MARGIN = 0.15
+
 
 class AnalysisEngine:
     """
@@ -19,7 +35,19 @@ class AnalysisEngine:
     All image_data inputs are expected to be NumPy arrays in BGR format.
     """
 
-    def __init__(self, ocr_command: Optional[str] = None, ocr_config: str = ""):
+    def __init__(
+        self,
+        ocr_command: Optional[str] = None,
+        ocr_config: str = "",
+        ocr_cache_entries: int = DEFAULT_OCR_CACHE_MAX_ENTRIES,
+        ocr_cache_path: Optional[str] = None,
+        ocr_backend: str = "pytesseract",
+        ocr_workers: int = 1,
+        dominant_colors_mode: str = "kmeans",
+        dominant_colors_max_samples: int = DEFAULT_DOMINANT_COLORS_MAX_SAMPLES,
+        template_pyramid_levels: int = 0,
+        template_match_scales: Optional[Sequence[float]] = None,
+    ):
         """
         Initializes the AnalysisEngine.
 
@@ -27,6 +55,17 @@ class AnalysisEngine:
             ocr_command: Optional. The command or path to the Tesseract executable.
                          If None, pytesseract will attempt to find it in the system PATH.
             ocr_config: Optional. Additional Tesseract configuration string (e.g., '--psm 6').
+            ocr_cache_entries: Optional. Maximum number of OCR results kept in the content-addressed
+                               cache (identical pixels + settings skip Tesseract). 0 disables the cache.
+            ocr_cache_path: Optional. JSON file the OCR cache is loaded from and saved to by `save_ocr_cache()`.
+            ocr_backend: Optional. 'pytesseract' (one tesseract process per call) or 'tesserocr'
+                         (pool of long-lived in-process Tesseract handles). Falls back to 'pytesseract'.
+            ocr_workers: Optional. Number of regions `ocr_extract_text_batch` OCRs in parallel.
+            dominant_colors_mode: Optional. 'kmeans' (full-resolution cv2.kmeans, 10 attempts) or 'fast'
+                                  (subsampled, histogram-quantized clustering warm-started per region).
+            dominant_colors_max_samples: Optional. Pixel budget of the 'fast' mode. Higher is more accurate and slower.
+            template_pyramid_levels: Optional. Number of pyrDown levels for coarse-to-fine template matching (0 = full-resolution search).
+            template_match_scales: Optional. Template scale factors tried in order (e.g. [1.0, 1.25, 1.5] for DPI changes). Default [1.0].
         """
         self.ocr_command = ocr_command
         if self.ocr_command:
@@ -39,6 +78,41 @@ class AnalysisEngine:
             logger.info("Tesseract executable path not specified; pytesseract will search in PATH.")
 
         self.ocr_config = ocr_config
+        self.ocr_workers = ocr_workers if isinstance(ocr_workers, int) and ocr_workers > 0 else 1
+        if self.ocr_workers != ocr_workers:
+            logger.warning(f"Invalid ocr_workers '{ocr_workers}'. Using 1.")
+        self._ocr_executor: Optional[ThreadPoolExecutor] = None
+        self._ocr_executor_lock = threading.Lock()
+        self.ocr_backend: OcrBackend = PytesseractOcrBackend()
+        if ocr_backend != PytesseractOcrBackend.name:
+            try:
+                self.ocr_backend = create_ocr_backend(ocr_backend, max_workers=self.ocr_workers, lang="eng", config=self.ocr_config)
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"OCR backend '{ocr_backend}' unavailable ({e}). Falling back to 'pytesseract'.")
+        if dominant_colors_mode not in DOMINANT_COLOR_MODES:
+            logger.warning(f"Invalid dominant_colors_mode '{dominant_colors_mode}'. Using 'kmeans'.")
+            dominant_colors_mode = "kmeans"
+        if not isinstance(dominant_colors_max_samples, int) or dominant_colors_max_samples <= 0:
+            logger.warning(f"Invalid dominant_colors_max_samples '{dominant_colors_max_samples}'. Using {DEFAULT_DOMINANT_COLORS_MAX_SAMPLES}.")
+            dominant_colors_max_samples = DEFAULT_DOMINANT_COLORS_MAX_SAMPLES
+        self.dominant_colors_mode = dominant_colors_mode
+        self.dominant_colors_max_samples = dominant_colors_max_samples
+        # Cluster centers from the previous 'fast' run per (region, k), used to warm-start the next one.
+        self._dominant_color_centers: Dict[Any, np.ndarray] = {}
+        if not isinstance(template_pyramid_levels, int) or template_pyramid_levels < 0:
+            logger.warning(f"Invalid template_pyramid_levels '{template_pyramid_levels}'. Using 0.")
+            template_pyramid_levels = 0
+        self.template_pyramid_levels = template_pyramid_levels
+        scales = list(template_match_scales) if template_match_scales else [1.0]
+        if not all(isinstance(sc, (int, float)) and sc > 0 for sc in scales):
+            logger.warning(f"Invalid template_match_scales '{template_match_scales}'. Using [1.0].")
+            scales = [1.0]
+        self.template_match_scales: List[float] = list(dict.fromkeys(float(sc) for sc in scales))
+        self.ocr_cache: Optional[OcrResultCache] = None
+        if isinstance(ocr_cache_entries, int) and ocr_cache_entries > 0:
+            self.ocr_cache = OcrResultCache(max_entries=ocr_cache_entries, persist_path=ocr_cache_path)
+        elif ocr_cache_entries != 0:
+            logger.warning(f"Invalid ocr_cache_entries '{ocr_cache_entries}'. OCR result cache disabled.")
         logger.info(f"AnalysisEngine initialized. Tesseract OCR custom config: '{self.ocr_config if self.ocr_config else 'None (using pytesseract defaults)'}'.")
 
     def analyze_pixel_color(self, image_data: np.ndarray, x: int, y: int, expected_bgr: List[int], tolerance: int = 0, region_name_context: str = "UnnamedRegion") -> bool:
@@ -120,21 +194,32 @@ class AnalysisEngine:
             return None
 
     def match_template(
-        self, image_data: np.ndarray, template_image: np.ndarray, threshold: float = 0.8, region_name_context: str = "UnnamedRegion", template_name_context: str = "UnnamedTemplate"
+        self,
+        image_data: np.ndarray,
+        template_image: np.ndarray,
+        threshold: float = 0.8,
+        region_name_context: str = "UnnamedRegion",
+        template_name_context: str = "UnnamedTemplate",
+        search_hint: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Finds a template within an image using OpenCV's template matching.
 
+        Each configured scale in `template_match_scales` is tried in order (the hint's scale first) until
+        one matches; with `template_pyramid_levels` > 0 the search runs coarse-to-fine on an image pyramid.
+
         Args:
             image_data: The image to search within (NumPy array, BGR format).
             template_image: The template image to find (NumPy array, BGR format).
             threshold: The minimum confidence score (0.0 to 1.0) for a match.
             region_name_context: Name of the region being searched, for logging.
             template_name_context: Name of the template being used, for logging.
+            search_hint: Optional. A previous match dict for this template/region (location_x, location_y,
+                         width, height, optional scale). A window around it is searched first.
 
         Returns:
             A dictionary with match details if found above threshold, otherwise None.
-            Match details: {"location_x": int, "location_y": int, "confidence": float, "width": int, "height": int}
+            Match details: {"location_x": int, "location_y": int, "confidence": float, "width": int, "height": int, "scale": float}
         """
         log_prefix = f"Rgn '{region_name_context}', TemplateMatch '{template_name_context}'"
 
@@ -151,27 +236,29 @@ class AnalysisEngine:
         img_h, img_w = image_data.shape[:2]
         tpl_h, tpl_w = template_image.shape[:2]
 
-        if img_h < tpl_h or img_w < tpl_w:
+        if len(self.template_match_scales) == 1 and self.template_match_scales[0] == 1.0 and (img_h < tpl_h or img_w < tpl_w):
             logger.warning(f"{log_prefix}: Template (h={tpl_h}, w={tpl_w}) is larger than image (h={img_h}, w={img_w}). Cannot perform matching.")
             return None
 
         try:
-            match_method = cv2.TM_CCOEFF_NORMED
-            result_matrix = cv2.matchTemplate(image_data, template_image, match_method)
-            _min_val, max_val, _min_loc, max_loc_top_left = cv2.minMaxLoc(result_matrix)
-            confidence_score = float(max_val)
-
-            # logger.debug(f"{log_prefix}: Max confidence {confidence_score:.4f} at {max_loc_top_left}. Threshold: {threshold:.4f}")
+            best = self._search_template(image_data, template_image, threshold, search_hint, [image_data], log_prefix)
+            if best is None:
+                logger.warning(f"{log_prefix}: Template (h={tpl_h}, w={tpl_w}) is larger than image (h={img_h}, w={img_w}) at every scale {self.template_match_scales}. Cannot perform matching.")
+                return None
 
+            confidence_score, max_loc_top_left, matched_w, matched_h, matched_scale = best
             if confidence_score >= threshold:
                 match_details = {
                     "location_x": int(max_loc_top_left[0]),
                     "location_y": int(max_loc_top_left[1]),
                     "confidence": confidence_score,
-                    "width": int(tpl_w),
-                    "height": int(tpl_h),
+                    "width": int(matched_w),
+                    "height": int(matched_h),
+                    "scale": float(matched_scale),
                 }
-                logger.info(f"{log_prefix}: TEMPLATE MATCHED. Confidence: {confidence_score:.4f} at ({match_details['location_x']},{match_details['location_y']}). Size: {tpl_w}x{tpl_h}.")
+                logger.info(
+                    f"{log_prefix}: TEMPLATE MATCHED. Confidence: {confidence_score:.4f} at ({match_details['location_x']},{match_details['location_y']}). Size: {matched_w}x{matched_h} (scale {matched_scale})."
+                )
                 return match_details
             else:
                 logger.info(f"{log_prefix}: Template NOT matched (Max confidence {confidence_score:.4f} < Threshold {threshold:.4f}).")
@@ -183,6 +270,157 @@ class AnalysisEngine:
             logger.exception(f"{log_prefix}: Unexpected error during template matching: {e}")
             return None
 
+    def match_templates(
+        self,
+        image_data: np.ndarray,
+        templates: Dict[str, Tuple[np.ndarray, float]],
+        region_name_context: str = "UnnamedRegion",
+        search_hints: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Searches one region for several distinct templates, one `match_template`-style search each.
+
+        Callers pass each template once however many conditions use it, and `search_hints` let a
+        template that has not moved be confirmed in a small window around its previous location.
+        Only the pyramid levels of a coarse-to-fine search (`template_pyramid_levels` > 0) are shared
+        between templates; with the default full-resolution search each template is matched on its own.
+
+        Args:
+            image_data: The image to search within (NumPy array, BGR format).
+            templates: {template name: (template image BGR, threshold)}. The threshold only steers
+                       early exits of the hint/pyramid/scale search.
+            region_name_context: Name of the region being searched, for logging.
+            search_hints: Optional. {template name: previous match dict}, see `match_template`.
+
+        Returns:
+            {template name: best candidate} with the same keys as `match_template` results, whether or
+            not its confidence reaches the threshold (callers compare it with their own threshold).
+            A value is None when the template could not be matched at all (invalid or larger than the image).
+        """
+        log_prefix = f"Rgn '{region_name_context}', TemplateBatch"
+        results: Dict[str, Optional[Dict[str, Any]]] = {name: None for name in templates}
+        if not isinstance(image_data, np.ndarray) or image_data.size == 0 or image_data.ndim != 3 or image_data.shape[2] != 3:
+            logger.warning(f"{log_prefix}: Invalid image_data (None, empty, or not a BGR NumPy array).")
+            return results
+
+        image_pyramid = [image_data]  # Extended lazily by _locate_template when pyramid levels are enabled
+        found_count = 0
+        for name, (template_image, threshold) in templates.items():
+            if not isinstance(template_image, np.ndarray) or template_image.size == 0 or template_image.ndim != 3 or template_image.shape[2] != 3:
+                logger.warning(f"{log_prefix}: Template '{name}' is not a valid BGR image. Skipping.")
+                continue
+            try:
+                best = self._search_template(image_data, template_image, threshold, (search_hints or {}).get(name), image_pyramid, f"{log_prefix} '{name}'")
+            except cv2.error as e_cv2:  # pragma: no cover
+                logger.error(f"{log_prefix}: OpenCV error matching template '{name}': {e_cv2}")
+                continue
+            if best is None:
+                continue
+            confidence, (loc_x, loc_y), matched_w, matched_h, matched_scale = best
+            results[name] = {"location_x": loc_x, "location_y": loc_y, "confidence": confidence, "width": matched_w, "height": matched_h, "scale": matched_scale}
+            found_count += confidence >= threshold
+        logger.info(f"{log_prefix}: Searched {len(templates)} distinct templates; {found_count} at or above their threshold.")
+        return results
+
+    def _search_template(
+        self, image_data: np.ndarray, template_image: np.ndarray, threshold: float, search_hint: Optional[Dict[str, Any]], image_pyramid: List[np.ndarray], log_prefix: str
+    ) -> Optional[Tuple[float, Tuple[int, int], int, int, float]]:
+        """Tries every configured scale (the hint's first) and returns the best (confidence, top-left, width, height, scale), or None if no scale fits."""
+        img_h, img_w = image_data.shape[:2]
+        tpl_h, tpl_w = template_image.shape[:2]
+        scales = list(self.template_match_scales)
+        hint_scale = search_hint.get("scale", 1.0) if search_hint else None
+        if hint_scale in scales:
+            scales.remove(hint_scale)
+            scales.insert(0, hint_scale)
+
+        best: Optional[Tuple[float, Tuple[int, int], int, int, float]] = None
+        for scale in scales:
+            scaled_template = template_image
+            if scale != 1.0:
+                scaled_size = (max(1, int(round(tpl_w * scale))), max(1, int(round(tpl_h * scale))))
+                scaled_template = cv2.resize(template_image, scaled_size, interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR)
+            s_tpl_h, s_tpl_w = scaled_template.shape[:2]
+            if img_h < s_tpl_h or img_w < s_tpl_w:
+                logger.debug(f"{log_prefix}: Template at scale {scale} ({s_tpl_w}x{s_tpl_h}) is larger than image. Skipping scale.")
+                continue
+            hint_for_scale = search_hint if scale == hint_scale else None
+            confidence_at_scale, location_at_scale = self._locate_template(image_data, scaled_template, threshold, hint_for_scale, image_pyramid)
+            if best is None or confidence_at_scale > best[0]:
+                best = (confidence_at_scale, location_at_scale, s_tpl_w, s_tpl_h, scale)
+            if confidence_at_scale >= threshold:
+                break
+        return best
+
+    @staticmethod
+    def _match_template_best(image_data: np.ndarray, template_image: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        result_matrix = cv2.matchTemplate(image_data, template_image, cv2.TM_CCOEFF_NORMED)
+        _min_val, max_val, _min_loc, max_loc_top_left = cv2.minMaxLoc(result_matrix)
+        return float(max_val), (int(max_loc_top_left[0]), int(max_loc_top_left[1]))
+
+    def _match_template_in_window(self, image_data: np.ndarray, template_image: np.ndarray, x0: int, y0: int, x1: int, y1: int) -> Optional[Tuple[float, Tuple[int, int]]]:
+        """Full-resolution match restricted to image_data[y0:y1, x0:x1] (clipped). Location is in image_data coordinates."""
+        img_h, img_w = image_data.shape[:2]
+        tpl_h, tpl_w = template_image.shape[:2]
+        x0, y0, x1, y1 = max(0, x0), max(0, y0), min(img_w, x1), min(img_h, y1)
+        if x1 - x0 < tpl_w or y1 - y0 < tpl_h:
+            return None
+        confidence, (loc_x, loc_y) = self._match_template_best(image_data[y0:y1, x0:x1], template_image)
+        return confidence, (loc_x + x0, loc_y + y0)
+
+    def _locate_template(
+        self, image_data: np.ndarray, template_image: np.ndarray, threshold: float, search_hint: Optional[Dict[str, Any]], image_pyramid: Optional[List[np.ndarray]] = None
+    ) -> Tuple[float, Tuple[int, int]]:
+        """
+        Best (confidence, top-left) of template_image in image_data. Tries a window around `search_hint` first,
+        then a coarse-to-fine pyramid search if enabled and the template is large enough, else a full search.
+        `image_pyramid` ([image_data, pyrDown(image_data), ...]) is extended in place so callers can share it.
+        """
+        tpl_h, tpl_w = template_image.shape[:2]
+
+        if search_hint and "location_x" in search_hint and "location_y" in search_hint:
+            hint_x, hint_y = int(search_hint["location_x"]), int(search_hint["location_y"])
+            windowed = self._match_template_in_window(image_data, template_image, hint_x - tpl_w, hint_y - tpl_h, hint_x + 2 * tpl_w, hint_y + 2 * tpl_h)
+            if windowed is not None and windowed[0] >= threshold:
+                return windowed
+
+        levels = self.template_pyramid_levels
+        while levels > 0 and (min(tpl_h, tpl_w) >> levels) < TEMPLATE_PYRAMID_MIN_SIDE:
+            levels -= 1
+        if levels == 0:
+            return self._match_template_best(image_data, template_image)
+
+        if image_pyramid is None:
+            image_pyramid = [image_data]  # Extended lazily by _locate_template when pyramid levels are enabled
+        while len(image_pyramid) <= levels:
+            image_pyramid.append(cv2.pyrDown(image_pyramid[-1]))
+        coarse_image, coarse_template = image_pyramid[levels], template_image
+        for _ in range(levels):
+            coarse_template = cv2.pyrDown(coarse_template)
+        if coarse_image.shape[0] < coarse_template.shape[0] or coarse_image.shape[1] < coarse_template.shape[1]:
+            return self._match_template_best(image_data, template_image)
+        coarse_scores = cv2.matchTemplate(coarse_image, coarse_template, cv2.TM_CCOEFF_NORMED)
+
+        factor = 1 << levels
+        pad = 2 * factor
+        c_tpl_h, c_tpl_w = coarse_template.shape[:2]
+        best: Optional[Tuple[float, Tuple[int, int]]] = None
+        for _ in range(TEMPLATE_PYRAMID_MAX_CANDIDATES):
+            _min_val, coarse_val, _min_loc, (cx, cy) = cv2.minMaxLoc(coarse_scores)
+            if coarse_val < threshold - TEMPLATE_PYRAMID_COARSE_MARGIN and best is not None:
+                break
+            refined = self._match_template_in_window(image_data, template_image, cx * factor - pad, cy * factor - pad, cx * factor + tpl_w + pad, cy * factor + tpl_h + pad)
+            if refined is not None and (best is None or refined[0] > best[0]):
+                best = refined
+            if best is not None and best[0] >= threshold:
+                break
+            # Suppress this peak so the next candidate is a different location.
+            coarse_scores[max(0, cy - c_tpl_h // 2) : cy + c_tpl_h // 2 + 1, max(0, cx - c_tpl_w // 2) : cx + c_tpl_w // 2 + 1] = -1.0
+        if best is not None and best[0] >= threshold:
+            return best
+        # No coarse peak refined to a match: the pyramid can miss small or low-contrast templates, so confirm at full resolution.
+        return self._match_template_best(image_data, template_image)
+
     def ocr_extract_text(self, image_data: np.ndarray, region_name_context: str = "UnnamedRegion") -> Optional[Dict[str, Any]]:
         """
         Extracts text from an image using Tesseract OCR and calculates average word confidence.
@@ -196,8 +434,16 @@ class AnalysisEngine:
             logger.warning(f"{log_prefix}: image_data not BGR. Shape: {image_data.shape}.")
             return None
 
+        cache_key = None
+        if self.ocr_cache is not None:
+            cache_key = ocr_cache_key(image_data, f"{self.ocr_backend.name}|eng|{self.ocr_config}|{self.ocr_command or ''}")
+            cached_result = self.ocr_cache.get(cache_key)
+            if cached_result is not None:
+                logger.debug(f"{log_prefix}: OCR cache hit. Skipping Tesseract.")
+                return cached_result
+
         try:
-            ocr_data_dict = pytesseract.image_to_data(image_data, lang="eng", config=self.ocr_config, output_type=Output.DICT)
+            ocr_data_dict = self.ocr_backend.image_to_data(image_data, lang="eng", config=self.ocr_config)
 
             if logger.isEnabledFor(logging.DEBUG):  # pragma: no cover
                 summary_raw_data = {k: (v_list[:5] + ["..."] if isinstance(v_list, list) and len(v_list) > 5 else v_list) for k, v_list in ocr_data_dict.items()}
@@ -222,7 +468,10 @@ class AnalysisEngine:
             average_confidence = (sum(confidences) / len(confidences)) if confidences else 0.0
             text_snippet = full_text[:70].replace(os.linesep, " ") + ("..." if len(full_text) > 70 else "")
             logger.info(f"{log_prefix}: Extracted (len {len(full_text)}): '{text_snippet}'. Avg Word Conf: {average_confidence:.1f}% ({len(confidences)} words).")
-            return {"text": full_text, "average_confidence": average_confidence, "raw_data": ocr_data_dict}
+            ocr_result = {"text": full_text, "average_confidence": average_confidence, "raw_data": ocr_data_dict}
+            if cache_key is not None:
+                self.ocr_cache.put(cache_key, ocr_result)
+            return ocr_result
         except pytesseract.TesseractNotFoundError:  # pragma: no cover
             logger.error("Tesseract OCR engine not installed or not in PATH. OCR unavailable.")
             return None
@@ -233,6 +482,36 @@ class AnalysisEngine:
             logger.exception(f"{log_prefix}: Unexpected error during OCR: {e}")
             return None
 
+    def ocr_extract_text_batch(self, images_by_region: Dict[str, np.ndarray]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        OCRs several regions, up to `ocr_workers` at a time. Results are keyed by region name and are
+        identical to calling `ocr_extract_text` for each region.
+        """
+        if self.ocr_workers <= 1 or len(images_by_region) <= 1:
+            return {region_name: self.ocr_extract_text(image, region_name) for region_name, image in images_by_region.items()}
+        with self._ocr_executor_lock:
+            if self._ocr_executor is None:
+                self._ocr_executor = ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix="OcrWorker")
+            executor = self._ocr_executor
+        futures = {region_name: executor.submit(self.ocr_extract_text, image, region_name) for region_name, image in images_by_region.items()}
+        return {region_name: future.result() for region_name, future in futures.items()}
+
+    def close(self):
+        """Shuts down the OCR worker threads and releases OCR backend resources. Both are re-created on demand."""
+        with self._ocr_executor_lock:
+            executor, self._ocr_executor = self._ocr_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.ocr_backend.close()
+
+    def get_ocr_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss/eviction counters of the OCR result cache, or None if caching is disabled."""
+        return self.ocr_cache.get_stats() if self.ocr_cache is not None else None
+
+    def save_ocr_cache(self) -> bool:
+        """Persists the OCR result cache if it was configured with a path."""
+        return self.ocr_cache.save() if self.ocr_cache is not None else False
+
     def analyze_dominant_colors(self, image_data: np.ndarray, num_colors: int = 3, region_name_context: str = "UnnamedRegion") -> Optional[List[Dict[str, Any]]]:
         """
         Finds N dominant colors in an image using K-Means clustering.
@@ -264,6 +543,9 @@ class AnalysisEngine:
             logger.warning(f"{log_prefix}: Effective k is 0 after adjustments (original k: {original_k_requested}). Cannot perform K-Means. Returning empty list.")
             return []
 
+        if self.dominant_colors_mode == "fast":
+            return self._analyze_dominant_colors_fast(image_data, num_colors, region_name_context, log_prefix)
+
         try:
             pixels_reshaped = image_data.reshape((-1, 3))
             pixels_float32 = np.float32(pixels_reshaped)
@@ -303,3 +585,72 @@ class AnalysisEngine:
         except Exception as e:  # pragma: no cover
             logger.exception(f"{log_prefix}: Unexpected error during K-Means: {e}")
             return None
+
+    def _analyze_dominant_colors_fast(self, image_data: np.ndarray, num_colors: int, region_name_context: str, log_prefix: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Approximate dominant colors for the 'fast' mode.
+
+        Pixels are strided down to at most `dominant_colors_max_samples`, bucketed into a
+        5-bit-per-channel color histogram, and the occupied buckets (at their mean color,
+        weighted by pixel count) are clustered with a few Lloyd iterations. Clustering starts
+        from the previous cycle's centers for this region when available, else from a
+        deterministic weighted k-means++ seeding. Same return format as the 'kmeans' mode.
+        """
+        try:
+            height, width = image_data.shape[:2]
+            stride = max(1, int(np.ceil(np.sqrt((height * width) / float(self.dominant_colors_max_samples)))))
+            samples = image_data[::stride, ::stride].reshape((-1, 3))
+
+            shift = 8 - FAST_DOMINANT_COLOR_QUANT_BITS
+            quantized = (samples >> shift).astype(np.int32)
+            bucket_ids = (quantized[:, 0] << (2 * FAST_DOMINANT_COLOR_QUANT_BITS)) | (quantized[:, 1] << FAST_DOMINANT_COLOR_QUANT_BITS) | quantized[:, 2]
+            _unique_buckets, bucket_index, bucket_counts = np.unique(bucket_ids, return_inverse=True, return_counts=True)
+            bucket_index = bucket_index.ravel()
+            weights = bucket_counts.astype(np.float64)
+            points = np.stack([np.bincount(bucket_index, weights=samples[:, c], minlength=len(weights)) for c in range(3)], axis=1) / weights[:, None]
+
+            k = min(num_colors, len(points))
+            warm_key = (region_name_context, k)
+            centers = self._dominant_color_centers.get(warm_key)
+            centers = centers.copy() if centers is not None else self._seed_color_centers(points, weights, k)
+
+            for _ in range(FAST_DOMINANT_COLOR_MAX_ITER):
+                distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+                labels = distances.argmin(axis=1)
+                cluster_weights = np.bincount(labels, weights=weights, minlength=k)
+                new_centers = centers.copy()
+                occupied = cluster_weights > 0
+                for c in range(3):
+                    new_centers[occupied, c] = np.bincount(labels, weights=points[:, c] * weights, minlength=k)[occupied] / cluster_weights[occupied]
+                shift_amount = float(np.abs(new_centers - centers).max())
+                centers = new_centers
+                if shift_amount < FAST_DOMINANT_COLOR_EPS:
+                    break
+
+            distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            cluster_weights = np.bincount(distances.argmin(axis=1), weights=weights, minlength=k)
+            self._dominant_color_centers[warm_key] = centers
+
+            total_weight = float(weights.sum())
+            dominant_colors_list = [
+                {"bgr_color": [int(round(v)) for v in centers[i]], "percentage": float(cluster_weights[i] / total_weight * 100.0)} for i in range(k) if cluster_weights[i] > 0
+            ]
+            dominant_colors_list.sort(key=lambda x: x["percentage"], reverse=True)
+
+            log_summary = [f"BGR:{d['bgr_color']}({d['percentage']:.1f}%)" for d in dominant_colors_list]
+            logger.info(f"{log_prefix}, fast: Found {len(dominant_colors_list)} colors from {len(samples)} samples: [{'; '.join(log_summary)}]")
+            return dominant_colors_list
+        except Exception as e:  # pragma: no cover
+            logger.exception(f"{log_prefix}: Unexpected error during fast dominant color analysis: {e}")
+            return None
+
+    @staticmethod
+    def _seed_color_centers(points: np.ndarray, weights: np.ndarray, k: int) -> np.ndarray:
+        """Deterministic weighted k-means++ seeding: heaviest bucket first, then the bucket maximizing weight * squared distance."""
+        centers = [points[int(weights.argmax())]]
+        closest_sq = ((points - centers[0]) ** 2).sum(axis=1)
+        for _ in range(1, k):
+            next_index = int((closest_sq * weights).argmax())
+            centers.append(points[next_index])
+            closest_sq = np.minimum(closest_sq, ((points - points[next_index]) ** 2).sum(axis=1))
+        return np.array(centers, dtype=np.float64)
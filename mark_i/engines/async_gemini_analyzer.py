@@ -0,0 +1,127 @@
+import asyncio
+import copy
+import functools
+import hashlib
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_response_cache import gemini_request_key
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.async_gemini_analyzer")
+
+DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES = 4
+
+
+class AsyncGeminiAnalyzer:
+    """
+    asyncio front end for a GeminiAnalyzer.
+
+    Each query runs the analyzer's synchronous pipeline (response cache, upload preparation,
+    model fallback, per-model rate limiting) on a worker thread, so it shares all of the
+    wrapped analyzer's configuration. At most `max_in_flight` queries run at once, and
+    identical queries issued while one is in flight wait for that round trip instead of
+    starting their own; they receive a copy of its result marked with "coalesced": True.
+    """
+
+    def __init__(self, gemini_analyzer: GeminiAnalyzer, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES):
+        if not isinstance(max_in_flight, int) or max_in_flight <= 0:
+            raise ValueError(f"max_in_flight must be a positive integer, got {max_in_flight!r}.")
+        self.gemini_analyzer = gemini_analyzer
+        self.max_in_flight = max_in_flight
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # asyncio primitives are bound to one event loop; keep one set per loop.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self._stats_lock = threading.Lock()
+        self.queries = 0
+        self.coalesced = 0
+
+    def _request_key(self, kwargs: Dict[str, Any]) -> str:
+        analyzer = self.gemini_analyzer
+        if kwargs.get("model_name_override"):
+            model_preference = [kwargs["model_name_override"]]
+        else:
+            model_preference = kwargs.get("model_preference") or [analyzer.default_model_name]
+        safety_settings = kwargs.get("custom_safety_settings")
+        upload_options = kwargs.get("upload_options")
+        image_data: Optional[np.ndarray] = kwargs.get("image_data")
+        request_key = gemini_request_key(
+            model_preference,
+            kwargs.get("prompt", ""),
+            kwargs.get("custom_generation_config") or analyzer.generation_config,
+            safety_settings if safety_settings is not None else analyzer.safety_settings,
+            image_data.shape if isinstance(image_data, np.ndarray) else None,
+            upload_options if upload_options is not None else analyzer.upload_options,
+        )
+        hasher = hashlib.blake2b(request_key.encode("utf-8"), digest_size=20)
+        hasher.update(repr(kwargs.get("use_cache", True)).encode("utf-8"))
+        if isinstance(image_data, np.ndarray):
+            hasher.update(np.ascontiguousarray(image_data).data)
+        return hasher.hexdigest()
+
+    async def query_vision_model(self, prompt: str, image_data: Optional[np.ndarray] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Async counterpart of GeminiAnalyzer.query_vision_model; accepts the same keyword arguments."""
+        kwargs = {"prompt": prompt, "image_data": image_data, **kwargs}
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.setdefault(loop, {})
+        key = self._request_key(kwargs)
+
+        shared = in_flight.get(key)
+        if shared is not None:
+            with self._stats_lock:
+                self.coalesced += 1
+            logger.debug("GeminiQuery (Async): Identical request already in flight. Sharing its result.")
+            result = await asyncio.shield(shared)
+            return {**copy.deepcopy(result), "coalesced": True}
+
+        future: asyncio.Future = loop.create_future()
+        in_flight[key] = future
+        with self._stats_lock:
+            self.queries += 1
+        try:
+            async with self._semaphores.setdefault(loop, asyncio.Semaphore(self.max_in_flight)):
+                result = await loop.run_in_executor(self._get_executor(), functools.partial(self.gemini_analyzer.query_vision_model, **kwargs))
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved; waiters (if any) still receive it.
+            raise
+        finally:
+            in_flight.pop(key, None)
+
+    async def query_many(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs query_vision_model for each kwargs dict concurrently; results are in request order."""
+        return list(await asyncio.gather(*(self.query_vision_model(**request) for request in requests)))
+
+    def run_queries(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Blocking helper for synchronous callers: fans `requests` out on a private event loop and joins the results."""
+        return asyncio.run(self.query_many(requests))
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"queries": self.queries, "coalesced": self.coalesced}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="GeminiQuery")
+            return self._executor
+
+    def close(self):
+        """Shuts down the query worker threads. They are re-created on the next query."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,433 @@
+"""
+MARK-I Capture Backend Registry
+One place where every screen-grab method lives, is probed and is measured.
+
+Each backend wraps a single capture method (XShm, MSS, Pillow ImageGrab, PyAutoGUI,
+scrot, gnome-screenshot, grim, ImageMagick import) behind the same `grab(bbox)`
+call returning a BGR NumPy array. `select_fastest_capture_backend` times a few real
+grabs on every backend that initializes on this host and keeps the quickest, and
+`benchmark_capture_backends` reports latency percentiles and throughput per backend
+and region size (see `python -m mark_i.tools capture-benchmark`).
+"""
+
+import abc
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Type, Any, Iterable
+
+import numpy as np
+import cv2
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.xshm_capture import XShmCaptureBackend
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.capture_backends")
+
+BBox = Tuple[int, int, int, int]  # (left, top, right, bottom)
+
+DEFAULT_PROBE_BBOX: BBox = (0, 0, 320, 240)
+DEFAULT_PROBE_GRABS = 3
+
+
+class CaptureBackendStats:
+    """Rolling latency/throughput statistics for one capture method."""
+
+    def __init__(self, backend_name: str, max_samples: int = 1000):
+        self.backend_name = backend_name
+        self._latencies_s: deque = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.grabs = 0
+        self.failures = 0
+        self.total_bytes = 0
+        self.total_time_s = 0.0
+
+    def record(self, latency_s: float, image: Optional[np.ndarray]):
+        """Records one grab. A None image counts as a failure (its latency is not sampled)."""
+        with self._lock:
+            self.grabs += 1
+            if image is None:
+                self.failures += 1
+                return
+            self._latencies_s.append(latency_s)
+            self.total_bytes += int(image.nbytes)
+            self.total_time_s += latency_s
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns counts, mean/min/p50/p95/p99/max latency in milliseconds, FPS and MB/s."""
+        with self._lock:
+            samples_ms = np.array(self._latencies_s, dtype=np.float64) * 1000.0
+            grabs, failures, total_bytes, total_time_s = self.grabs, self.failures, self.total_bytes, self.total_time_s
+        result: Dict[str, Any] = {"backend": self.backend_name, "grabs": grabs, "failures": failures}
+        if samples_ms.size == 0:
+            result.update({"mean_ms": None, "min_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None, "fps": 0.0, "mb_per_s": 0.0})
+            return result
+        p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+        result.update(
+            {
+                "mean_ms": float(samples_ms.mean()),
+                "min_ms": float(samples_ms.min()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(samples_ms.max()),
+                "fps": 1000.0 / float(samples_ms.mean()) if samples_ms.mean() > 0 else 0.0,
+                "mb_per_s": (total_bytes / (1024 * 1024)) / total_time_s if total_time_s > 0 else 0.0,
+            }
+        )
+        return result
+
+
+def legacy_benchmark_results(summary: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    """
+    Maps a CaptureBackendStats summary onto the result keys the older per-engine
+    benchmark methods return (avg_time_ms, fps, success_rate, ...), plus percentiles.
+    """
+    successful = summary["grabs"] - summary["failures"]
+    if successful == 0:
+        return {"success_rate": 0.0, "avg_time_ms": 0.0, "fps": 0.0, "method": summary["backend"], "successful_captures": 0}
+    return {
+        "success_rate": successful / iterations if iterations else 0.0,
+        "avg_time_ms": summary["mean_ms"],
+        "min_time_ms": summary["min_ms"],
+        "max_time_ms": summary["max_ms"],
+        "p50_time_ms": summary["p50_ms"],
+        "p95_time_ms": summary["p95_ms"],
+        "p99_time_ms": summary["p99_ms"],
+        "fps": summary["fps"],
+        "mb_per_s": summary["mb_per_s"],
+        "method": summary["backend"],
+        "total_iterations": iterations,
+        "successful_captures": successful,
+    }
+
+
+class CaptureBackend(abc.ABC):
+    """
+    A single screen-grab method. Subclasses raise RuntimeError from __init__ when the
+    method cannot work on this host, and from `grab` when an individual grab fails.
+    """
+
+    name: str = ""
+    supports_out: bool = False  # Whether grab() can write into a caller's preallocated buffer
+
+    @abc.abstractmethod
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Captures bbox (left, top, right, bottom) and returns it as a BGR uint8 array.
+        Backends with `supports_out` write into `out` (shaped like a previous grab of the
+        same bbox) and return it; the others ignore it and return a new array.
+        """
+
+    def close(self):
+        """Releases any long-lived resources (display connections, shared memory)."""
+
+
+_CAPTURE_BACKEND_REGISTRY: Dict[str, Type[CaptureBackend]] = {}
+
+
+def register_capture_backend(backend_cls: Type[CaptureBackend]) -> Type[CaptureBackend]:
+    """Class decorator adding a backend to the registry. Registration order is the tie-break preference."""
+    if not backend_cls.name:
+        raise ValueError(f"Capture backend {backend_cls.__name__} must define a 'name'.")
+    _CAPTURE_BACKEND_REGISTRY[backend_cls.name] = backend_cls
+    return backend_cls
+
+
+def get_registered_capture_backends() -> List[str]:
+    """Names of all registered backends, in preference order."""
+    return list(_CAPTURE_BACKEND_REGISTRY)
+
+
+def create_capture_backend(name: str) -> CaptureBackend:
+    """Instantiates a registered backend. Raises ValueError if unknown, RuntimeError if unavailable here."""
+    backend_cls = _CAPTURE_BACKEND_REGISTRY.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown capture backend '{name}'. Registered: {get_registered_capture_backends()}")
+    return backend_cls()
+
+
+def _crop_to_bbox(full_image: np.ndarray, bbox: BBox) -> np.ndarray:
+    left, top, right, bottom = bbox
+    h, w = full_image.shape[:2]
+    x1, y1 = max(0, min(left, w)), max(0, min(top, h))
+    x2, y2 = max(0, min(right, w)), max(0, min(bottom, h))
+    if x2 <= x1 or y2 <= y1:
+        raise RuntimeError(f"Bounding box {bbox} lies outside the captured {w}x{h} screen.")
+    return full_image[y1:y2, x1:x2]
+
+
+# --- Backends, registered fastest-first ---
+
+
+@register_capture_backend
+class XShmBackend(CaptureBackend):
+    """Persistent in-process X11 MIT-SHM capture (see xshm_capture.py)."""
+
+    name = "xshm"
+    supports_out = True
+
+    def __init__(self):
+        self._xshm = XShmCaptureBackend()
+
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        try:
+            return self._xshm.grab(bbox, out=out)
+        except ValueError as e:
+            raise RuntimeError(str(e)) from e
+
+    def close(self):
+        self._xshm.close()
+
+
+@register_capture_backend
+class MssBackend(CaptureBackend):
+    """python-mss (optional dependency). MSS handles are not thread-safe, so one is kept per thread."""
+
+    name = "mss"
+
+    def __init__(self):
+        try:
+            import mss  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("python-mss is not installed.") from e
+        self._mss_module = mss
+        self._local = threading.local()
+        self.grab((0, 0, 1, 1))  # Fails fast on Wayland / headless hosts.
+
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss_module.mss()
+        left, top, right, bottom = bbox
+        try:
+            shot = sct.grab({"left": left, "top": top, "width": right - left, "height": bottom - top})
+        except Exception as e:
+            raise RuntimeError(f"MSS grab failed: {e}") from e
+        return cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2BGR)
+
+
+@register_capture_backend
+class PillowBackend(CaptureBackend):
+    """Pillow ImageGrab (native on Windows/macOS, X11 via xcb on Linux)."""
+
+    name = "pil"
+
+    def __init__(self):
+        try:
+            from PIL import ImageGrab
+        except ImportError as e:  # pragma: no cover
+            raise RuntimeError("Pillow ImageGrab is not available.") from e
+        self._image_grab = ImageGrab
+        if platform.system() == "Linux" and not os.environ.get("DISPLAY"):
+            raise RuntimeError("Pillow ImageGrab needs an X display on Linux.")
+
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        try:
+            pil_image = self._image_grab.grab(bbox=bbox, all_screens=True)
+        except Exception as e:
+            raise RuntimeError(f"ImageGrab failed: {e}") from e
+        if pil_image is None:
+            raise RuntimeError("ImageGrab returned no image.")
+        return cv2.cvtColor(np.asarray(pil_image.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+@register_capture_backend
+class PyAutoGuiBackend(CaptureBackend):
+    """pyautogui.screenshot (delegates to Pillow or scrot depending on platform)."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        try:
+            import pyautogui
+        except Exception as e:  # ImportError, or Xlib errors on headless Linux
+            raise RuntimeError(f"PyAutoGUI is not usable: {e}") from e
+        self._pyautogui = pyautogui
+
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        left, top, right, bottom = bbox
+        try:
+            pil_image = self._pyautogui.screenshot(region=(left, top, right - left, bottom - top))
+        except Exception as e:
+            raise RuntimeError(f"PyAutoGUI screenshot failed: {e}") from e
+        if pil_image is None:
+            raise RuntimeError("PyAutoGUI screenshot returned no image.")
+        return cv2.cvtColor(np.asarray(pil_image.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+class _SubprocessToolBackend(CaptureBackend):
+    """Base for command-line tools that write a PNG to a temp file which is then decoded."""
+
+    tool: str = ""
+    timeout_s: float = 5.0
+    captures_region_natively = False
+
+    def __init__(self):
+        if platform.system() != "Linux":
+            raise RuntimeError(f"'{self.tool}' capture is only used on Linux.")
+        if shutil.which(self.tool) is None:
+            raise RuntimeError(f"'{self.tool}' is not installed.")
+
+    @abc.abstractmethod
+    def _command(self, bbox: BBox, output_path: str) -> List[str]:
+        """Returns the argv that writes a capture of bbox (or the full screen) to output_path."""
+
+    def grab(self, bbox: BBox, out: Optional[np.ndarray] = None) -> np.ndarray:
+        tmp_fd, tmp_path = tempfile.mkstemp(suffix=".png")
+        os.close(tmp_fd)
+        os.unlink(tmp_path)  # Some tools (scrot) refuse to overwrite and would write to a suffixed name instead.
+        try:
+            try:
+                result = subprocess.run(self._command(bbox, tmp_path), capture_output=True, timeout=self.timeout_s)
+            except subprocess.TimeoutExpired as e:
+                raise RuntimeError(f"{self.tool} timed out after {self.timeout_s}s.") from e
+            if result.returncode != 0:
+                stderr_msg = result.stderr.decode(errors="replace") if result.stderr else "No error message"
+                raise RuntimeError(f"{self.tool} failed with return code {result.returncode}: {stderr_msg}")
+            image = cv2.imread(tmp_path, cv2.IMREAD_COLOR)
+            if image is None:
+                raise RuntimeError(f"Could not decode {self.tool} output '{tmp_path}'.")
+            return image if self.captures_region_natively else _crop_to_bbox(image, bbox)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+@register_capture_backend
+class ImageMagickImportBackend(_SubprocessToolBackend):
+    name = "import"
+    tool = "import"
+    captures_region_natively = True
+
+    def _command(self, bbox: BBox, output_path: str) -> List[str]:
+        left, top, right, bottom = bbox
+        return ["import", "-window", "root", "-crop", f"{right - left}x{bottom - top}+{left}+{top}", "+repage", output_path]
+
+
+@register_capture_backend
+class GrimBackend(_SubprocessToolBackend):
+    name = "grim"
+    tool = "grim"
+    captures_region_natively = True
+
+    def _command(self, bbox: BBox, output_path: str) -> List[str]:
+        left, top, right, bottom = bbox
+        return ["grim", "-g", f"{left},{top} {right - left}x{bottom - top}", output_path]
+
+
+@register_capture_backend
+class ScrotBackend(_SubprocessToolBackend):
+    name = "scrot"
+    tool = "scrot"
+
+    def _command(self, bbox: BBox, output_path: str) -> List[str]:
+        return ["scrot", output_path]
+
+
+@register_capture_backend
+class GnomeScreenshotBackend(_SubprocessToolBackend):
+    name = "gnome-screenshot"
+    tool = "gnome-screenshot"
+
+    def _command(self, bbox: BBox, output_path: str) -> List[str]:
+        return ["gnome-screenshot", "-f", output_path]
+
+
+# --- Probing, selection and benchmarking ---
+
+
+def probe_capture_backends(names: Optional[Iterable[str]] = None) -> Dict[str, CaptureBackend]:
+    """Instantiates every requested (default: all registered) backend that works on this host."""
+    available: Dict[str, CaptureBackend] = {}
+    for name in names or get_registered_capture_backends():
+        try:
+            available[name] = create_capture_backend(name)
+        except (RuntimeError, ValueError) as e:
+            logger.debug(f"Capture backend '{name}' unavailable: {e}")
+    return available
+
+
+def create_first_available_capture_backend(names: Iterable[str]) -> Optional[CaptureBackend]:
+    """Instantiates the first backend in `names` that works on this host, without timing any of them."""
+    for name in names:
+        try:
+            return create_capture_backend(name)
+        except (RuntimeError, ValueError) as e:
+            logger.debug(f"Capture backend '{name}' unavailable: {e}")
+    return None
+
+
+def benchmark_capture_backend(backend: CaptureBackend, bbox: BBox, iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Times `iterations` grabs of bbox (after `warmup` untimed grabs) and returns a stats summary."""
+    for _ in range(warmup):
+        try:
+            backend.grab(bbox)
+        except RuntimeError:
+            pass
+    stats = CaptureBackendStats(backend.name)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            image: Optional[np.ndarray] = backend.grab(bbox)
+        except RuntimeError as e:
+            logger.debug(f"Capture backend '{backend.name}' grab failed during benchmark: {e}")
+            image = None
+        stats.record(time.perf_counter() - start, image)
+    summary = stats.summary()
+    summary["region"] = f"{bbox[2] - bbox[0]}x{bbox[3] - bbox[1]}"
+    return summary
+
+
+def select_fastest_capture_backend(
+    names: Optional[Iterable[str]] = None, probe_bbox: BBox = DEFAULT_PROBE_BBOX, probe_grabs: int = DEFAULT_PROBE_GRABS
+) -> Tuple[Optional[CaptureBackend], List[Dict[str, Any]]]:
+    """
+    Times a few real grabs on every available backend and keeps the one with the lowest
+    median latency (ties go to the earlier-registered backend). Backends whose grabs all
+    fail are discarded. The others are closed.
+
+    Returns:
+        (selected backend or None, list of probe summaries for every available backend)
+    """
+    candidates = probe_capture_backends(names)
+    probe_results: List[Dict[str, Any]] = []
+    best: Optional[CaptureBackend] = None
+    best_p50 = float("inf")
+    for name, backend in candidates.items():
+        summary = benchmark_capture_backend(backend, probe_bbox, probe_grabs)
+        probe_results.append(summary)
+        if summary["p50_ms"] is not None and summary["failures"] == 0 and summary["p50_ms"] < best_p50:
+            best, best_p50 = backend, summary["p50_ms"]
+    for backend in candidates.values():
+        if backend is not best:
+            backend.close()
+
+    if best is not None:
+        logger.info(f"Auto-selected capture backend '{best.name}' (p50 {best_p50:.1f} ms on a {probe_bbox[2] - probe_bbox[0]}x{probe_bbox[3] - probe_bbox[1]} probe).")
+    else:
+        logger.warning(f"No working capture backend found among {list(candidates) or get_registered_capture_backends()}.")
+    return best, probe_results
+
+
+def benchmark_capture_backends(names: Optional[Iterable[str]], bboxes: List[BBox], iterations: int, warmup: int = 1) -> List[Dict[str, Any]]:
+    """Benchmarks every available requested backend on every bbox. Returns one summary per (backend, bbox)."""
+    results: List[Dict[str, Any]] = []
+    backends = probe_capture_backends(names)
+    try:
+        for backend in backends.values():
+            for bbox in bboxes:
+                logger.info(f"Benchmarking capture backend '{backend.name}' on {bbox} ({iterations} iterations)...")
+                results.append(benchmark_capture_backend(backend, bbox, iterations, warmup))
+    finally:
+        for backend in backends.values():
+            backend.close()
+    return results
@@ -1,8 +1,9 @@
 import logging
 import platform  # To identify the operating system for platform-specific notes/warnings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import subprocess
 import tempfile
+import time
 import os
 
 import numpy as np
@@ -12,9 +13,18 @@ import pyautogui  # For reliably getting screen dimensions
 
 # Standardized logger for this module
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.capture_backends import CaptureBackend, CaptureBackendStats, create_capture_backend, select_fastest_capture_backend
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.capture_engine")
 
+# Capture backend selection:
+#   default - Pillow ImageGrab, or gnome-screenshot/grim/scrot on Linux (original behaviour)
+#   auto    - time a few grabs on every registered backend that works on this host and keep the fastest
+#   <name>  - any backend registered in capture_backends (e.g. 'xshm', 'mss', 'scrot'); falls back to 'default'
+
+# Frame buffers kept for backends that grab into a preallocated array, one per distinct bbox
+MAX_FRAME_BUFFERS = 8
+
 
 class CaptureEngine:
     """
@@ -25,13 +35,38 @@ class CaptureEngine:
     consistent use by other engine components.
     """
 
-    def __init__(self):
-        """Initializes the CaptureEngine, logs the OS, and determines screen dimensions."""
+    def __init__(self, backend: str = "default"):
+        """
+        Initializes the CaptureEngine, logs the OS, and determines screen dimensions.
+
+        Args:
+            backend: 'default', 'auto', or the name of a registered capture backend
+                     (e.g. 'xshm' for persistent X11 shared-memory capture). If the
+                     requested backend cannot be initialized the engine logs a warning
+                     and uses the 'default' method instead.
+        """
         self.system = platform.system()
         self.use_scrot = False
+        self._backend: Optional[CaptureBackend] = None
+        self.backend_probe_results: List[Dict[str, Any]] = []
+        self._frame_buffers: Dict[Tuple[int, int, int, int], np.ndarray] = {}
         logger.info(f"CaptureEngine initialized. Operating System: {self.system}.")
 
-        if self.system == "Windows":
+        if backend == "auto":
+            self._backend, self.backend_probe_results = select_fastest_capture_backend()
+        elif backend != "default":
+            try:
+                self._backend = create_capture_backend(backend)
+            except ValueError as e:
+                logger.warning(f"{e}. Using the default capture method.")
+            except RuntimeError as e:
+                logger.warning(f"Capture backend '{backend}' unavailable ({e}). Falling back to the default capture method.")
+        self.backend = self._backend.name if self._backend is not None else "default"
+        self.capture_stats = CaptureBackendStats(self.backend)
+
+        if self._backend is not None:
+            logger.info(f"Capture method: registered backend '{self.backend}'.")
+        elif self.system == "Windows":
             logger.info("Capture method: Pillow ImageGrab.grab() (Optimized for Windows).")
         elif self.system == "Darwin":  # macOS
             logger.info("Capture method: Pillow ImageGrab.grab() for macOS. Ensure screen recording permissions are granted if issues occur.")
@@ -148,26 +183,13 @@ class CaptureEngine:
             except Exception as e:
                 logger.warning(f"Failed to delete temporary capture file {tmp_path}: {e}")
 
-    def capture_region(self, region_spec: Dict[str, Any]) -> Optional[np.ndarray]:
+    def _region_spec_to_bbox(self, region_spec: Dict[str, Any], log_prefix: str) -> Optional[Tuple[int, int, int, int]]:
         """
-        Captures the specified screen region defined by its coordinates and dimensions.
-
-        The region_spec dictionary must contain 'x', 'y', 'width', and 'height' keys
-        with integer values representing the top-left corner coordinates and the
-        dimensions of the rectangle to capture.
-
-        Args:
-            region_spec: A dictionary defining the region. Example:
-                         {"name": "my_region", "x": 100, "y": 100, "width": 200, "height": 150}
+        Validates a region_spec and converts it to a (left, top, right, bottom) bounding box.
 
         Returns:
-            A NumPy array representing the captured image in BGR format (OpenCV standard),
-            or None if the capture fails, region_spec is invalid, or dimensions are non-positive.
+            The bounding box tuple, or None if the spec is invalid (the reason is logged).
         """
-        region_name = region_spec.get("name", "UnnamedRegion")
-        log_prefix = f"Rgn '{region_name}', Capture"
-
-        # Validate region_spec parameters
         x_coord = region_spec.get("x")
         y_coord = region_spec.get("y")
         width_val = region_spec.get("width")
@@ -189,14 +211,144 @@ class CaptureEngine:
             return None
 
         # Pillow's ImageGrab.grab() uses a bounding box: (left, top, right, bottom)
-        # All coordinates should be integers.
         left, top = int(x_coord), int(y_coord)
         right, bottom = int(x_coord + width_val), int(y_coord + height_val)
-        # Construct the bounding box tuple
-        bbox_to_capture = (left, top, right, bottom)
+        return (left, top, right, bottom)
+
+    def capture_region(self, region_spec: Dict[str, Any], reuse_buffer: bool = False) -> Optional[np.ndarray]:
+        """
+        Captures the specified screen region defined by its coordinates and dimensions.
+
+        The region_spec dictionary must contain 'x', 'y', 'width', and 'height' keys
+        with integer values representing the top-left corner coordinates and the
+        dimensions of the rectangle to capture.
 
+        Args:
+            region_spec: A dictionary defining the region. Example:
+                         {"name": "my_region", "x": 100, "y": 100, "width": 200, "height": 150}
+            reuse_buffer: If True and the backend can grab into a preallocated array, the
+                          image is written into a buffer kept for this bbox and is overwritten
+                          by the next reusing capture of the same area. Only for callers that
+                          are done with the frame before capturing again.
+
+        Returns:
+            A NumPy array representing the captured image in BGR format (OpenCV standard),
+            or None if the capture fails, region_spec is invalid, or dimensions are non-positive.
+        """
+        region_name = region_spec.get("name", "UnnamedRegion")
+        log_prefix = f"Rgn '{region_name}', Capture"
+
+        bbox_to_capture = self._region_spec_to_bbox(region_spec, log_prefix)
+        if bbox_to_capture is None:
+            return None
+        return self._grab_bbox_bgr(bbox_to_capture, log_prefix, reuse_buffer=reuse_buffer)
+
+    def capture_regions(self, region_specs: List[Dict[str, Any]], full_screen: bool = False) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Captures several regions with a single screen grab (frame-snapshot mode).
+
+        The union bounding box of all valid regions (or the full primary screen if
+        `full_screen` is True) is grabbed exactly once, and every region receives a
+        NumPy view into that one BGR buffer. No per-region copies are made, so callers
+        must treat the returned arrays as read-only; copy them before drawing on them.
+        When the backend grabs into a preallocated array the frame buffer is reused, so
+        the views are only valid until the next `capture_regions` call over the same
+        area; copy any region that has to outlive the cycle.
+
+        Args:
+            region_specs: List of region dictionaries (same format as `capture_region`).
+                          Each must have a 'name' to be addressable in the result.
+            full_screen: If True, grab the whole primary screen instead of the union box.
+
+        Returns:
+            A dict mapping region name to its BGR view, or None for regions whose spec
+            is invalid or which fall outside the captured frame.
+        """
+        log_prefix = "FrameSnapshot, Capture"
+        region_images: Dict[str, Optional[np.ndarray]] = {}
+        region_bboxes: Dict[str, Tuple[int, int, int, int]] = {}
+
+        for region_spec in region_specs:
+            region_name = region_spec.get("name")
+            if not region_name:
+                logger.warning(f"{log_prefix}: Skipping region without a name: {region_spec}")
+                continue
+            bbox = self._region_spec_to_bbox(region_spec, f"Rgn '{region_name}', Capture")
+            region_images[region_name] = None
+            if bbox is not None:
+                region_bboxes[region_name] = bbox
+
+        if not region_bboxes:
+            return region_images
+
+        if full_screen:
+            frame_bbox = (0, 0, self.get_primary_screen_width(), self.get_primary_screen_height())
+        else:
+            frame_bbox = (
+                min(b[0] for b in region_bboxes.values()),
+                min(b[1] for b in region_bboxes.values()),
+                max(b[2] for b in region_bboxes.values()),
+                max(b[3] for b in region_bboxes.values()),
+            )
+
+        logger.debug(f"{log_prefix}: Grabbing one frame {frame_bbox} for {len(region_bboxes)} region(s).")
+        frame_bgr = self._grab_bbox_bgr(frame_bbox, log_prefix, reuse_buffer=True)
+        if frame_bgr is None:
+            return region_images
+
+        frame_left, frame_top = frame_bbox[0], frame_bbox[1]
+        frame_h, frame_w = frame_bgr.shape[:2]
+        for region_name, (left, top, right, bottom) in region_bboxes.items():
+            rel_left, rel_top = left - frame_left, top - frame_top
+            rel_right, rel_bottom = right - frame_left, bottom - frame_top
+            if rel_left < 0 or rel_top < 0 or rel_right > frame_w or rel_bottom > frame_h:
+                logger.error(f"Rgn '{region_name}', Capture: Region {(left, top, right, bottom)} lies outside the captured frame {frame_bbox} (frame size {frame_w}x{frame_h}).")
+                continue
+            region_images[region_name] = frame_bgr[rel_top:rel_bottom, rel_left:rel_right]
+
+        return region_images
+
+    def get_capture_stats(self) -> Dict[str, Any]:
+        """Returns latency percentiles, FPS and MB/s for all grabs made by this engine so far."""
+        return self.capture_stats.summary()
+
+    def close(self):
+        """Releases the selected capture backend's resources (display connection, shared memory)."""
+        if self._backend is not None:
+            self._backend.close()
+        self._frame_buffers.clear()
+
+    def _grab_bbox_bgr(self, bbox_to_capture: Tuple[int, int, int, int], log_prefix: str, reuse_buffer: bool = False) -> Optional[np.ndarray]:
+        """
+        Grabs the screen area inside bbox_to_capture (left, top, right, bottom) as an
+        OpenCV BGR NumPy array using the selected backend, and records its latency.
+        With reuse_buffer, backends that support it grab into the buffer kept for this bbox.
+        """
         logger.debug(f"{log_prefix}: Attempting capture with BoundingBox (L,T,R,B): {bbox_to_capture}")
+        start_time = time.perf_counter()
+        if self._backend is not None:
+            reuse_buffer = reuse_buffer and self._backend.supports_out
+            frame_buffer = self._frame_buffers.pop(bbox_to_capture, None) if reuse_buffer else None
+            try:
+                if frame_buffer is not None:
+                    image_bgr: Optional[np.ndarray] = self._backend.grab(bbox_to_capture, out=frame_buffer)
+                else:
+                    image_bgr = self._backend.grab(bbox_to_capture)
+            except RuntimeError as e:
+                logger.error(f"{log_prefix}: Capture FAILED via backend '{self.backend}' for BBox {bbox_to_capture}: {e}")
+                image_bgr = None
+            if reuse_buffer and image_bgr is not None:
+                # Most recently used last, so the oldest buffer is evicted first.
+                self._frame_buffers[bbox_to_capture] = image_bgr
+                if len(self._frame_buffers) > MAX_FRAME_BUFFERS:
+                    del self._frame_buffers[next(iter(self._frame_buffers))]
+        else:
+            image_bgr = self._grab_bbox_bgr_default(bbox_to_capture, log_prefix)
+        self.capture_stats.record(time.perf_counter() - start_time, image_bgr)
+        return image_bgr
 
+    def _grab_bbox_bgr_default(self, bbox_to_capture: Tuple[int, int, int, int], log_prefix: str) -> Optional[np.ndarray]:
+        """Default method: Pillow ImageGrab, or the detected Linux screenshot tool, then conversion to BGR."""
         try:
             # Use grim/scrot for Linux if available, otherwise fall back to ImageGrab
             if self.system == "Linux" and self.use_scrot:
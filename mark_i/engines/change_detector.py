@@ -0,0 +1,71 @@
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.change_detector")
+
+# Side length of the downsampled thumbnail compared when a non-zero change threshold is configured.
+THUMBNAIL_SIZE = 16
+
+
+class RegionChangeDetector:
+    """
+    Tracks a cheap signature of each region's last *changed* frame so callers can skip
+    re-analysing regions whose pixels did not change between monitoring cycles.
+
+    A region is considered unchanged when its shape matches the reference and either
+    the full-resolution pixel digest is identical or, with a positive `threshold`,
+    the mean absolute difference of 16x16 area-averaged thumbnails (0-255 scale) is
+    at or below the threshold. The reference is only replaced when a change is
+    reported, so slow drift below the threshold still accumulates into a change.
+    """
+
+    def __init__(self, threshold: float = 0.0):
+        """
+        Args:
+            threshold: Maximum mean absolute thumbnail difference still treated as "unchanged".
+                       0.0 (default) only treats pixel-identical frames as unchanged.
+        """
+        if not isinstance(threshold, (int, float)) or threshold < 0:
+            raise ValueError(f"Change detection threshold must be a non-negative number, got {threshold!r}.")
+        self.threshold = float(threshold)
+        self._signatures: Dict[str, Tuple[Tuple[int, ...], bytes, Optional[np.ndarray]]] = {}
+        logger.debug(f"RegionChangeDetector initialized (threshold={self.threshold}).")
+
+    def _signature(self, image: np.ndarray) -> Tuple[Tuple[int, ...], bytes, Optional[np.ndarray]]:
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16).digest()
+        thumbnail = None
+        if self.threshold > 0 and image.shape[0] > 0 and image.shape[1] > 0:
+            thumbnail = cv2.resize(image, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA).astype(np.int16)
+        return image.shape, digest, thumbnail
+
+    def has_changed(self, region_name: str, image: np.ndarray) -> bool:
+        """
+        Compares `image` with the last changed frame of `region_name`.
+        Returns True (and stores `image` as the new reference) for the first frame of a region or on change.
+        """
+        signature = self._signature(image)
+        previous = self._signatures.get(region_name)
+        if previous is not None and previous[0] == signature[0]:
+            if previous[1] == signature[1]:
+                return False
+            if signature[2] is not None and previous[2] is not None:
+                delta = float(np.mean(np.abs(signature[2] - previous[2])))
+                if delta <= self.threshold:
+                    logger.debug(f"Rgn '{region_name}', ChangeDetect: delta {delta:.2f} <= threshold {self.threshold}. Treated as unchanged.")
+                    return False
+        self._signatures[region_name] = signature
+        return True
+
+    def forget(self, region_name: str):
+        """Drops the reference for a region so its next frame is reported as changed."""
+        self._signatures.pop(region_name, None)
+
+    def reset(self):
+        """Drops all references."""
+        self._signatures.clear()
@@ -109,6 +109,12 @@ class AverageColorEvaluator(ConditionEvaluator):
 
 
 class TemplateMatchEvaluator(ConditionEvaluator):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Last match info (as handed to RulesEngine._last_template_match_info) per (region, template),
+        # used as a search hint next cycle. Dropped when the template is not found.
+        self._last_known_locations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
     def evaluate(self, spec: Dict, region_name: str, region_data_packet: Dict, rule_name_for_context: str) -> ConditionEvaluationResult:
         log_prefix = f"R '{rule_name_for_context}', Rgn '{region_name}', Cond 'template_match_found' (Eval)"
         image_np_bgr = region_data_packet.get("image")
@@ -119,17 +125,41 @@ class TemplateMatchEvaluator(ConditionEvaluator):
         tpl_filename = spec.get("template_filename")
         min_conf = float(spec.get("min_confidence", 0.8))
 
-        if image_np_bgr is not None and tpl_filename:
+        prematched = region_data_packet.get("template_match_results")
+        if image_np_bgr is not None and tpl_filename and isinstance(prematched, dict) and tpl_filename in prematched:
+            # Batched by RulesEngine for this region and cycle; apply this condition's own threshold.
+            candidate = prematched[tpl_filename]
+            match_result = candidate if candidate is not None and candidate["confidence"] >= min_conf else None
+            logger.log(
+                logging.INFO if match_result else logging.DEBUG,
+                f"{log_prefix}: '{tpl_filename}' {'MATCHED' if match_result else 'not matched'} (batched, conf {candidate['confidence'] if candidate else 'n/a'}, min {min_conf}).",
+            )
+            if match_result:
+                condition_met = True
+                match_info_for_rule_engine = {"found": True, **match_result, "matched_region_name": region_name}
+                self._last_known_locations[(region_name, tpl_filename)] = match_info_for_rule_engine
+                if spec.get("capture_as"):
+                    captured_value = {"value": match_result, "_source_region_for_capture_": region_name}
+        elif image_np_bgr is not None and tpl_filename:
             template_image_np = self._load_template_image_for_rule(tpl_filename, rule_name_for_context)
             if template_image_np is not None:
+                location_key = (region_name, tpl_filename)
                 match_result = self.analysis_engine.match_template(
-                    image_np_bgr, template_image_np, min_conf, region_name_context=f"{rule_name_for_context}/{region_name}", template_name_context=tpl_filename
+                    image_np_bgr,
+                    template_image_np,
+                    min_conf,
+                    region_name_context=f"{rule_name_for_context}/{region_name}",
+                    template_name_context=tpl_filename,
+                    search_hint=self._last_known_locations.get(location_key),
                 )
                 if match_result:
                     condition_met = True
                     match_info_for_rule_engine = {"found": True, **match_result, "matched_region_name": region_name}
+                    self._last_known_locations[location_key] = match_info_for_rule_engine
                     if spec.get("capture_as"):
                         captured_value = {"value": match_result, "_source_region_for_capture_": region_name}
+                else:
+                    self._last_known_locations.pop(location_key, None)
             # else: logger already warns about template load failure
         else:
             if image_np_bgr is None: # pragma: no cover
@@ -139,6 +169,26 @@ class TemplateMatchEvaluator(ConditionEvaluator):
 
         return ConditionEvaluationResult(met=condition_met, captured_value=captured_value, template_match_info=match_info_for_rule_engine)
 
+    def prematch_region(self, region_name: str, image_np_bgr: np.ndarray, templates_with_threshold: Dict[str, float]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Matches each distinct template used on a region once, with its last known location as a search hint.
+        Returns {template filename: best candidate} for `evaluate` to threshold per condition; templates that
+        fail to load are left out so `evaluate` falls back to its own path (and logging) for them.
+        """
+        templates: Dict[str, Tuple[np.ndarray, float]] = {}
+        for tpl_filename, threshold in templates_with_threshold.items():
+            template_image_np = self._load_template_image_for_rule(tpl_filename, f"TemplateBatch/{region_name}")
+            if template_image_np is not None:
+                templates[tpl_filename] = (template_image_np, threshold)
+        if not templates:
+            return {}
+        hints = {tpl_filename: self._last_known_locations.get((region_name, tpl_filename)) for tpl_filename in templates}
+        results = self.analysis_engine.match_templates(image_np_bgr, templates, region_name_context=region_name, search_hints=hints)
+        for tpl_filename, candidate in results.items():
+            if candidate is None or candidate["confidence"] < templates[tpl_filename][1]:
+                self._last_known_locations.pop((region_name, tpl_filename), None)
+        return results
+
 
 class OcrContainsTextEvaluator(ConditionEvaluator):
     def evaluate(self, spec: Dict, region_name: str, region_data_packet: Dict, rule_name_for_context: str) -> ConditionEvaluationResult:
@@ -244,7 +294,9 @@ class GeminiVisionQueryEvaluator(ConditionEvaluator):
             prompt_str = spec.get("prompt")
             model_override = spec.get("model_name")
             if prompt_str:
-                gemini_response = self.gemini_analyzer_for_query.query_vision_model(prompt=prompt_str, image_data=image_np_bgr, model_name_override=model_override)
+                gemini_response = region_data_packet.get("gemini_query_results", {}).get((prompt_str, model_override))
+                if gemini_response is None:
+                    gemini_response = self.gemini_analyzer_for_query.query_vision_model(prompt=prompt_str, image_data=image_np_bgr, model_name_override=model_override)
                 if gemini_response["status"] == "success":
                     resp_text_content = gemini_response.get("text_content", "") or ""
                     resp_json_content = gemini_response.get("json_content")
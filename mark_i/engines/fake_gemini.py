@@ -0,0 +1,449 @@
+"""
+Offline stand-in for the Gemini API, for benchmarks and tests without a key or network.
+
+`FakeGeminiBackend` plugs into `GeminiAnalyzer(model_factory=...)` and answers with scripted
+responses after a sampled latency, optionally failing with API or rate-limit errors.
+`GeminiSessionRecorder` wraps the real SDK the same way to record sessions that
+`benchmark_gemini_session` (and `python -m mark_i.tools gemini-benchmark`) replay.
+`benchmark_rules_engine` and `benchmark_nlu_task` drive the RulesEngine and GeminiDecisionModule
+pipelines end to end against such an analyzer, with a dry-run ActionExecutor.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from google.api_core import exceptions as google_api_exceptions
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.fake_gemini")
+
+GEMINI_SESSION_FILE_VERSION = 1
+LATENCY_KINDS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Response latency distribution. fixed: `a_ms`; uniform: between `a_ms` and `b_ms`;
+    lognormal: median `a_ms` with shape `b_ms` (sigma), which gives realistic long tails.
+    """
+
+    kind: str = "fixed"
+    a_ms: float = 0.0
+    b_ms: float = 0.0
+
+    def __post_init__(self):
+        if self.kind not in LATENCY_KINDS:
+            raise ValueError(f"Unknown latency model '{self.kind}'. Available: {LATENCY_KINDS}")
+        if self.a_ms < 0 or self.b_ms < 0:
+            raise ValueError("Latency parameters must be non-negative.")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Parses 'fixed:50', 'uniform:100,400' or 'lognormal:800,0.5'."""
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(v) for v in params.split(",") if v.strip()] if params else []
+        except ValueError:
+            raise ValueError(f"Invalid latency spec '{spec}'. Use e.g. 'fixed:50', 'uniform:100,400' or 'lognormal:800,0.5'.")
+        return cls(kind.strip().lower(), *values[:2])
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a_ms, max(self.a_ms, self.b_ms))
+        if self.kind == "lognormal":
+            return self.a_ms * float(np.exp(rng.gauss(0.0, self.b_ms)))
+        return self.a_ms
+
+
+@dataclass
+class ScriptedResponse:
+    """Response text returned for prompts containing `prompt_contains` (any prompt if None), optionally only for `model`."""
+
+    text: str
+    prompt_contains: Optional[str] = None
+    model: Optional[str] = None
+    finish_reason: str = "STOP"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScriptedResponse":
+        """Accepts {"text": "..."} or {"response": <JSON value>}, plus optional "prompt_contains", "model" and "finish_reason"."""
+        text = data["text"] if "text" in data else json.dumps(data.get("response"))
+        return cls(text=text, prompt_contains=data.get("prompt_contains"), model=data.get("model"), finish_reason=data.get("finish_reason", "STOP"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"text": self.text, "prompt_contains": self.prompt_contains, "model": self.model, "finish_reason": self.finish_reason}
+
+    def matches(self, prompt: str, model_name: str) -> bool:
+        return (self.prompt_contains is None or self.prompt_contains in prompt) and (self.model is None or self.model == model_name)
+
+
+def _sdk_response(text: str, finish_reason: str = "STOP") -> SimpleNamespace:
+    """Minimal object with the attributes GeminiAnalyzer._process_sdk_response reads."""
+    return SimpleNamespace(
+        prompt_feedback=None,
+        candidates=[SimpleNamespace(finish_reason=SimpleNamespace(name=finish_reason), safety_ratings=[], content=SimpleNamespace(parts=[SimpleNamespace(text=text)]))],
+    )
+
+
+def _prompt_of(contents: Any) -> str:
+    if isinstance(contents, str):
+        return contents
+    return next((item for item in contents if isinstance(item, str)), "") if isinstance(contents, (list, tuple)) else ""
+
+
+class _FakeGenerativeModel:
+    def __init__(self, backend: "FakeGeminiBackend", model_name: str):
+        self._backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, contents: Any, stream: bool = False) -> SimpleNamespace:
+        return self._backend.respond(self.model_name, contents)
+
+
+class FakeGeminiBackend:
+    """
+    `model_factory` for GeminiAnalyzer that never touches the network. Each call sleeps for a latency
+    drawn from `latency`, then raises ResourceExhausted with probability `rate_limit_rate` (which makes
+    GeminiAnalyzer fall back to the next model), raises ServiceUnavailable with probability `error_rate`,
+    or returns the first matching scripted response (`default_text` if none matches). Thread-safe.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        responses: Optional[List[ScriptedResponse]] = None,
+        default_text: str = "{}",
+        latency: LatencyModel = LatencyModel(),
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        for label, rate in (("error_rate", error_rate), ("rate_limit_rate", rate_limit_rate)):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{label} must be between 0 and 1, got {rate!r}.")
+        self.responses = list(responses or [])
+        self.default_text = default_text
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.calls_per_model: Dict[str, int] = {}
+
+    @classmethod
+    def from_session(cls, session: Dict[str, Any], **kwargs: Any) -> "FakeGeminiBackend":
+        return cls(responses=[ScriptedResponse.from_dict(r) for r in session.get("responses", [])], **kwargs)
+
+    def __call__(self, model_name: str, generation_config: Any = None, safety_settings: Any = None) -> _FakeGenerativeModel:
+        return _FakeGenerativeModel(self, model_name)
+
+    def respond(self, model_name: str, contents: Any) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+            self.calls_per_model[model_name] = self.calls_per_model.get(model_name, 0) + 1
+            delay_ms = self.latency.sample_ms(self._rng)
+            roll = self._rng.random()
+        if delay_ms > 0:
+            self._sleep(delay_ms / 1000.0)
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.rate_limited += 1
+            raise google_api_exceptions.ResourceExhausted(f"Fake quota exhausted for '{model_name}'.")
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.errors += 1
+            raise google_api_exceptions.ServiceUnavailable(f"Fake outage for '{model_name}'.")
+        prompt = _prompt_of(contents)
+        scripted = next((r for r in self.responses if r.matches(prompt, model_name)), None)
+        if scripted is None:
+            return _sdk_response(self.default_text)
+        return _sdk_response(scripted.text, scripted.finish_reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors, "rate_limited": self.rate_limited, "calls_per_model": dict(self.calls_per_model)}
+
+
+class GeminiSessionRecorder:
+    """
+    `model_factory` that forwards to the real SDK (or `inner_factory`) and records each request and its
+    response text, so the session can later be replayed offline. Images are recorded by size only.
+    """
+
+    name = "recorder"
+
+    def __init__(self, inner_factory: Optional[Callable[..., Any]] = None):
+        if inner_factory is None:
+            import google.generativeai as genai
+
+            inner_factory = genai.GenerativeModel
+        self._inner_factory = inner_factory
+        self._lock = threading.Lock()
+        self.requests: List[Dict[str, Any]] = []
+        self.responses: List[ScriptedResponse] = []
+
+    def __call__(self, model_name: str, generation_config: Any = None, safety_settings: Any = None) -> Any:
+        inner_model = self._inner_factory(model_name=model_name, generation_config=generation_config, safety_settings=safety_settings)
+        recorder = self
+
+        class _RecordingModel:
+            def generate_content(self, contents: Any, stream: bool = False) -> Any:
+                start = time.perf_counter()
+                response = inner_model.generate_content(contents, stream=stream)
+                recorder._record(model_name, contents, response, (time.perf_counter() - start) * 1000.0)
+                return response
+
+        return _RecordingModel()
+
+    def _record(self, model_name: str, contents: Any, response: Any, latency_ms: float):
+        prompt = _prompt_of(contents)
+        image_size = None
+        for item in contents if isinstance(contents, (list, tuple)) else []:
+            if hasattr(item, "size") and isinstance(getattr(item, "size"), tuple):
+                image_size = list(item.size)
+            elif isinstance(item, dict) and "data" in item:
+                image_size = [0, 0]  # Pre-encoded upload; only its presence is recorded.
+        try:
+            text = "".join(part.text for part in response.candidates[0].content.parts if hasattr(part, "text"))
+        except (AttributeError, IndexError, TypeError):
+            text = ""
+        with self._lock:
+            self.requests.append({"prompt": prompt, "model_preference": [model_name], "image_size": image_size, "recorded_latency_ms": round(latency_ms, 1)})
+            self.responses.append(ScriptedResponse(text=text, prompt_contains=prompt, model=model_name))
+
+    def to_session(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"version": GEMINI_SESSION_FILE_VERSION, "requests": list(self.requests), "responses": [r.to_dict() for r in self.responses]}
+
+    def save(self, path: str):
+        session_dir = os.path.dirname(path)
+        if session_dir:
+            os.makedirs(session_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_session(), f, indent=2)
+        logger.info(f"Saved Gemini session with {len(self.requests)} requests to '{path}'.")
+
+
+def load_gemini_session(path: str) -> Dict[str, Any]:
+    """Raises ValueError for files that are not version-1 sessions."""
+    with open(path, "r", encoding="utf-8") as f:
+        session = json.load(f)
+    if not isinstance(session, dict) or session.get("version") != GEMINI_SESSION_FILE_VERSION:
+        raise ValueError(f"'{path}' is not a version {GEMINI_SESSION_FILE_VERSION} Gemini session file.")
+    if not isinstance(session.get("requests"), list) or not session["requests"]:
+        raise ValueError(f"Gemini session '{path}' has no requests to replay.")
+    return session
+
+
+def _session_image(image_size: Optional[List[int]], seed: int) -> Optional[np.ndarray]:
+    if not image_size:
+        return None
+    width, height = image_size
+    if width <= 0 or height <= 0:  # Recorded as a pre-encoded upload of unknown size.
+        width, height = 64, 64
+    return np.random.default_rng(seed).integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def benchmark_gemini_session(gemini_analyzer: Any, session: Dict[str, Any], repeat: int = 1, concurrency: int = 1) -> Dict[str, Any]:
+    """
+    Replays the session's requests `repeat` times through `gemini_analyzer` (serially, or via
+    AsyncGeminiAnalyzer with `concurrency` > 1) and reports throughput, latency percentiles and
+    result status counts. Images are synthesized from the recorded sizes.
+    """
+    from mark_i.engines.async_gemini_analyzer import AsyncGeminiAnalyzer
+
+    requests: List[Dict[str, Any]] = []
+    for round_idx in range(repeat):
+        for request_idx, recorded in enumerate(session["requests"]):
+            request = {"prompt": recorded["prompt"], "image_data": _session_image(recorded.get("image_size"), request_idx)}
+            if recorded.get("model_preference"):
+                request["model_preference"] = list(recorded["model_preference"])
+            requests.append(request)
+
+    latencies_ms: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    def _record(result: Dict[str, Any], elapsed_s: float):
+        latencies_ms.append(elapsed_s * 1000.0)
+        statuses[result.get("status", "unknown")] = statuses.get(result.get("status", "unknown"), 0) + 1
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        for request in requests:
+            request_start = time.perf_counter()
+            _record(gemini_analyzer.query_vision_model(**request), time.perf_counter() - request_start)
+    else:
+        async_analyzer = AsyncGeminiAnalyzer(gemini_analyzer, max_in_flight=concurrency)
+
+        async def _timed(request: Dict[str, Any]):
+            request_start = time.perf_counter()
+            _record(await async_analyzer.query_vision_model(**request), time.perf_counter() - request_start)
+
+        async def _run_all():
+            await asyncio.gather(*(_timed(request) for request in requests))
+
+        try:
+            asyncio.run(_run_all())
+        finally:
+            async_analyzer.close()
+    wall_s = time.perf_counter() - start
+
+    return {
+        "requests": len(requests),
+        "concurrency": concurrency,
+        "wall_s": wall_s,
+        "throughput_rps": len(requests) / wall_s if wall_s > 0 else 0.0,
+        **_latency_percentiles(latencies_ms),
+        "statuses": statuses,
+    }
+
+
+def _latency_percentiles(latencies_ms: List[float]) -> Dict[str, Optional[float]]:
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if latencies_ms else (None, None, None)
+    return {
+        "p50_ms": float(p50) if p50 is not None else None,
+        "p95_ms": float(p95) if p95 is not None else None,
+        "p99_ms": float(p99) if p99 is not None else None,
+        "max_ms": max(latencies_ms) if latencies_ms else None,
+    }
+
+
+# --- End-to-end pipeline scenarios ---
+# Prompts below are the ones RulesEngine / GeminiDecisionModule send for the benchmark profile and command;
+# PIPELINE_BENCHMARK_RESPONSES scripts a FakeGeminiBackend to answer them.
+
+RULES_BENCHMARK_PROMPT = "Is the 'Submit' button enabled? Answer yes or no."
+NLU_BENCHMARK_COMMAND = "If the search page is open, click the search box"
+PIPELINE_BENCHMARK_RESPONSES = [
+    ScriptedResponse(text="yes", prompt_contains=RULES_BENCHMARK_PROMPT),
+    ScriptedResponse(
+        text=json.dumps(
+            {
+                "parsed_task": {
+                    "command_type": "CONDITIONAL_INSTRUCTION",
+                    "condition_description": "the search page is open",
+                    "then_branch": {"command_type": "SINGLE_INSTRUCTION", "instruction_details": {"intent_verb": "CLICK_DESCRIBED_ELEMENT", "target_description": "search box", "parameters": {}}},
+                }
+            }
+        ),
+        prompt_contains=f'User Command to Parse: "{NLU_BENCHMARK_COMMAND}"',
+    ),
+    ScriptedResponse(text="true", prompt_contains='Condition: "the search page is open"'),
+    ScriptedResponse(text=json.dumps({"found": True, "box": [420, 36, 300, 28]}), prompt_contains='best described as: "search box"'),
+]
+
+
+def _dry_run_action_executor() -> Any:
+    """An ActionExecutor that records action specs instead of driving the mouse and keyboard."""
+    from mark_i.engines.action_executor import ActionExecutor
+
+    class DryRunActionExecutor(ActionExecutor):
+        def __init__(self):
+            self.executed: List[Dict[str, Any]] = []
+
+        def execute_action(self, full_action_spec_with_context: Dict[str, Any]):
+            self.executed.append(full_action_spec_with_context)
+
+    return DryRunActionExecutor()
+
+
+def benchmark_rules_engine(gemini_analyzer: Any, cycles: int = 10, regions: int = 4, concurrency: int = 1, image_size: Tuple[int, int] = (640, 360)) -> Dict[str, Any]:
+    """
+    Runs `cycles` RulesEngine.evaluate_rules cycles over a profile with one 'gemini_vision_query' rule per
+    region, with `gemini_analyzer` answering the queries (`concurrency` > 1 fans them out per cycle).
+    Every cycle gets fresh synthetic region images, so a response cache never short-circuits the backend.
+    """
+    from mark_i.core.config_manager import ConfigManager
+    from mark_i.engines.analysis_engine import AnalysisEngine
+    from mark_i.engines.rules_engine import RulesEngine
+
+    width, height = image_size
+    region_names = [f"panel_{i}" for i in range(regions)]
+    config_manager = ConfigManager()
+    config_manager.update_profile_data(
+        {
+            "settings": {"gemini_max_concurrent_queries": concurrency},
+            "regions": [{"name": name, "x": 0, "y": 0, "width": width, "height": height} for name in region_names],
+            "rules": [
+                {
+                    "name": f"{name}_ready",
+                    "region": name,
+                    "condition": {"type": "gemini_vision_query", "prompt": RULES_BENCHMARK_PROMPT, "expected_response_contains": "yes"},
+                    "action": {"type": "log_message", "message": f"{name} ready", "level": "DEBUG"},
+                }
+                for name in region_names
+            ],
+        }
+    )
+    analysis_engine = AnalysisEngine()
+    rules_engine = RulesEngine(config_manager, analysis_engine, _dry_run_action_executor(), gemini_analyzer=gemini_analyzer)
+
+    latencies_ms: List[float] = []
+    rules_fired = 0
+    start = time.perf_counter()
+    try:
+        for cycle in range(cycles):
+            all_region_data = {name: {"image": _session_image([width, height], cycle * regions + i)} for i, name in enumerate(region_names)}
+            cycle_start = time.perf_counter()
+            rules_fired += len(rules_engine.evaluate_rules(all_region_data))
+            latencies_ms.append((time.perf_counter() - cycle_start) * 1000.0)
+    finally:
+        rules_engine.close()
+        analysis_engine.close()
+    wall_s = time.perf_counter() - start
+
+    return {
+        "cycles": cycles,
+        "regions": regions,
+        "concurrency": concurrency,
+        "wall_s": wall_s,
+        "throughput_per_s": cycles / wall_s if wall_s > 0 else 0.0,
+        **_latency_percentiles(latencies_ms),
+        "rules_fired": rules_fired,
+    }
+
+
+def benchmark_nlu_task(gemini_analyzer: Any, runs: int = 10, image_size: Tuple[int, int] = (1280, 720)) -> Dict[str, Any]:
+    """
+    Runs GeminiDecisionModule.execute_nlu_task `runs` times for NLU_BENCHMARK_COMMAND (NLU parse, visual
+    check, target refinement and a dry-run click) and reports per-task latency and task status counts.
+    """
+    from mark_i.core.config_manager import ConfigManager
+    from mark_i.engines.gemini_decision_module import GeminiDecisionModule
+
+    decision_module = GeminiDecisionModule(gemini_analyzer, _dry_run_action_executor(), ConfigManager())
+    latencies_ms: List[float] = []
+    statuses: Dict[str, int] = {}
+    start = time.perf_counter()
+    for run in range(runs):
+        context_images = {"main_window": _session_image(list(image_size), run)}
+        task_start = time.perf_counter()
+        result = decision_module.execute_nlu_task("nlu_benchmark", NLU_BENCHMARK_COMMAND, context_images, {"require_confirmation_per_step": False})
+        latencies_ms.append((time.perf_counter() - task_start) * 1000.0)
+        statuses[result.get("status", "unknown")] = statuses.get(result.get("status", "unknown"), 0) + 1
+    wall_s = time.perf_counter() - start
+
+    return {
+        "tasks": runs,
+        "wall_s": wall_s,
+        "throughput_per_s": runs / wall_s if wall_s > 0 else 0.0,
+        **_latency_percentiles(latencies_ms),
+        "statuses": statuses,
+    }
@@ -1,7 +1,7 @@
 import logging
 import time
 import json
-from typing import Optional, Dict, Any, Union, List, Tuple
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable
 import os
 
 import google.generativeai as genai
@@ -10,11 +10,13 @@ from google.generativeai.types import BlockedPromptException, StopCandidateExcep
 from google.api_core import exceptions as google_api_exceptions
 
 from PIL import Image
-import cv2
 import numpy as np
 
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 from mark_i.core.app_config import MODEL_PREFERENCE_REASONING, MODEL_PREFERENCE_FAST
+from mark_i.engines.gemini_rate_limiter import ModelRateLimiter
+from mark_i.engines.gemini_response_cache import GeminiResponseCache, gemini_request_key, perceptual_hash
+from mark_i.engines.gemini_upload import PreparedUploadImage, UploadImageOptions, prepare_upload_image, remap_boxes_to_source
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.gemini_analyzer")
 
@@ -47,6 +49,9 @@ FOCUSED_CONTEXT_CONFIDENCE_THRESHOLD = 0.7
 # Minimum window dimensions for focused context (width, height in pixels)
 FOCUSED_CONTEXT_MIN_WINDOW_SIZE = (100, 100)
 
+# Window detection only needs coarse bounds; returned boxes are remapped to full-screen coordinates.
+APPLICATION_DETECTION_UPLOAD_OPTIONS = UploadImageOptions(max_pixels=1280 * 720, image_format="jpeg", quality=80)
+
 # Application detection prompt template for identifying target application windows
 APPLICATION_DETECTION_PROMPT = """
 Analyze the screenshot and identify the primary application window that would be most relevant for this command: "{command}"
@@ -74,8 +79,33 @@ If no clear target application can be identified, set found_target_application t
 
 
 class GeminiAnalyzer:
-    def __init__(self, api_key: str, default_model_name: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        default_model_name: Optional[str] = None,
+        response_cache: Optional[GeminiResponseCache] = None,
+        upload_options: Optional[UploadImageOptions] = None,
+        rate_limiter: Optional[ModelRateLimiter] = None,
+        model_factory: Optional[Callable[..., Any]] = None,
+    ):
+        """
+        Args:
+            api_key: Gemini API key.
+            default_model_name: Model used when a query names neither a preference list nor an override.
+            response_cache: Optional. Reuses successful responses for repeated prompts on visually
+                            identical images instead of calling the API again.
+            upload_options: Optional. Default downscale/crop/encoding applied to images before upload.
+                            None sends full-resolution images as before.
+            rate_limiter: Optional. Per-model request budget; calls block until the model may be used.
+            model_factory: Optional. Replaces `genai.GenerativeModel` (same keyword arguments, returns an object
+                           with `generate_content(contents, stream=False)`), e.g. the offline FakeGeminiBackend.
+                           No API key or client configuration is needed then.
+        """
         self.api_key = api_key
+        self.response_cache = response_cache
+        self.upload_options = upload_options
+        self.rate_limiter = rate_limiter
+        self.model_factory = model_factory
         self.client_initialized = False
         self.safety_settings: Optional[List[Any]] = None
         self.generation_config = DEFAULT_GENERATION_CONFIG
@@ -83,6 +113,10 @@ class GeminiAnalyzer:
         self.default_model_name = default_model_name or MODEL_PREFERENCE_FAST[0]
         # --- END REFACTOR ---
 
+        if self.model_factory is not None:
+            self.client_initialized = True
+            logger.info(f"GeminiAnalyzer initialized with custom model backend '{getattr(self.model_factory, 'name', type(self.model_factory).__name__)}'.")
+            return
         if not self.api_key or not isinstance(self.api_key, str):
             logger.critical("GeminiAnalyzer CRITICAL ERROR: API key is missing or invalid.")
             return
@@ -99,15 +133,20 @@ class GeminiAnalyzer:
             logger.critical(f"GeminiAnalyzer CRITICAL FAILURE: Could not configure API client: {e}.", exc_info=True)
 
     def _attempt_sdk_call_with_fallback(
-        self, api_contents: List[Union[str, Image.Image]], model_preference: List[str], gen_config: GenerationConfig, safety_settings: Optional[List[Any]]
+        self, api_contents: List[Union[str, Image.Image, Dict[str, Any]]], model_preference: List[str], gen_config: GenerationConfig, safety_settings: Optional[List[Any]]
     ) -> Dict[str, Any]:
         last_error_response: Dict[str, Any] = {"status": "error_api", "error_message": "All preferred models failed.", "text_content": None, "json_content": None, "raw_gemini_response": None}
 
         for model_name in model_preference:
             log_prefix = f"GeminiQuery (Attempting Model: '{model_name}')"
+            if self.rate_limiter is not None:
+                waited_s = self.rate_limiter.acquire(model_name)
+                if waited_s > 0:
+                    logger.debug(f"{log_prefix}: Rate limited. Waited {waited_s:.2f}s.")
             logger.info(f"{log_prefix}: Sending query...")
             try:
-                model_instance = genai.GenerativeModel(model_name=model_name, generation_config=gen_config, safety_settings=safety_settings)
+                model_factory = self.model_factory or genai.GenerativeModel
+                model_instance = model_factory(model_name=model_name, generation_config=gen_config, safety_settings=safety_settings)
                 sdk_response = model_instance.generate_content(api_contents, stream=False)
                 processed_response = self._process_sdk_response(sdk_response, log_prefix)
                 processed_response["model_used"] = model_name
@@ -130,18 +169,18 @@ class GeminiAnalyzer:
             last_error_response["error_message"] = "Gemini API quota exceeded for all fallback models. Please check your usage limits."
         return last_error_response
 
-    def _validate_and_prepare_api_input(self, prompt: str, image_data: Optional[np.ndarray], log_prefix: str) -> Tuple[Optional[List[Union[str, Image.Image]]], Optional[Dict[str, Any]]]:
+    def _validate_api_input(self, prompt: str, image_data: Optional[np.ndarray], log_prefix: str) -> Optional[Dict[str, Any]]:
+        """Cheap checks of the prompt and image; returns an error result update, or None if the input is usable."""
         if not prompt or not isinstance(prompt, str) or not prompt.strip():
             error_msg = "Input error: Prompt cannot be empty or just whitespace."
             logger.error(f"{log_prefix}: {error_msg}")
-            return None, {"status": "error_input", "error_message": error_msg}
+            return {"status": "error_input", "error_message": error_msg}
 
-        pil_image_for_sdk: Optional[Image.Image] = None
         if image_data is not None:
             if not isinstance(image_data, np.ndarray) or image_data.size == 0:
                 error_msg = "Input error: Provided image_data is invalid (empty or not NumPy array)."
                 logger.error(f"{log_prefix}: {error_msg}")
-                return None, {"status": "error_input", "error_message": error_msg}
+                return {"status": "error_input", "error_message": error_msg}
             # --- BUG FIX ---
             # The original check was `image_data.shape != 3` which is always true for an image.
             # The correct check is for the number of dimensions and the channel count.
@@ -149,20 +188,33 @@ class GeminiAnalyzer:
             # --- END BUG FIX ---
                 error_msg = f"Input error: Provided image_data is not a 3-channel (BGR) image. Shape: {image_data.shape}"
                 logger.error(f"{log_prefix}: {error_msg}")
-                return None, {"status": "error_input", "error_message": error_msg}
+                return {"status": "error_input", "error_message": error_msg}
+        return None
+
+    def _prepare_api_input(
+        self, prompt: str, image_data: Optional[np.ndarray], log_prefix: str, upload_options: Optional[UploadImageOptions] = None
+    ) -> Tuple[Optional[List[Union[str, Image.Image, Dict[str, Any]]]], Optional[PreparedUploadImage], Optional[Dict[str, Any]]]:
+        """Resizes/encodes an already validated image for upload and builds the API contents."""
+        prepared_image: Optional[PreparedUploadImage] = None
+        if image_data is not None:
             try:
-                img_rgb = cv2.cvtColor(image_data, cv2.COLOR_BGR2RGB)
-                pil_image_for_sdk = Image.fromarray(img_rgb)
-                logger.debug(f"{log_prefix}: Prepared image (Size: {pil_image_for_sdk.width}x{pil_image_for_sdk.height}) for API call.")
+                prepared_image = prepare_upload_image(image_data, upload_options)
+                if prepared_image.upload_bytes is not None:
+                    logger.debug(
+                        f"{log_prefix}: Prepared image (Size: {prepared_image.width}x{prepared_image.height} from {image_data.shape[1]}x{image_data.shape[0]}, "
+                        f"{prepared_image.upload_bytes} bytes, {prepared_image.source_bytes - prepared_image.upload_bytes} saved vs raw) for API call."
+                    )
+                else:
+                    logger.debug(f"{log_prefix}: Prepared image (Size: {prepared_image.width}x{prepared_image.height}) for API call.")
             except Exception as e_img_prep:
                 error_msg = f"Error preparing image for Gemini: {e_img_prep}"
                 logger.error(f"{log_prefix}: {error_msg}", exc_info=True)
-                return None, {"status": "error_input", "error_message": error_msg}
+                return None, None, {"status": "error_input", "error_message": error_msg}
 
-        api_contents: List[Union[str, Image.Image]] = [prompt]
-        if pil_image_for_sdk:
-            api_contents.append(pil_image_for_sdk)
-        return api_contents, None
+        api_contents: List[Union[str, Image.Image, Dict[str, Any]]] = [prompt]
+        if prepared_image is not None:
+            api_contents.append(prepared_image.content)
+        return api_contents, prepared_image, None
 
     def _process_sdk_response(self, api_sdk_response: Optional[Any], log_prefix: str) -> Dict[str, Any]:
         processed_result: Dict[str, Any] = {
@@ -235,7 +287,17 @@ class GeminiAnalyzer:
         model_name_override: Optional[str] = None,
         custom_generation_config: Optional[GenerationConfig] = None,
         custom_safety_settings: Optional[List[Any]] = None,
+        use_cache: bool = True,
+        upload_options: Optional[UploadImageOptions] = None,
     ) -> Dict[str, Any]:
+        """
+        Sends a prompt (and optional BGR image) to Gemini, falling back through the model preference list on quota errors.
+        With a response cache configured and `use_cache` set, a successful response for the same request on a
+        perceptually identical image is returned without an API call (marked with "cache_hit": True).
+        `upload_options` (default: the analyzer's) shrinks the image before upload; "box"/"bounding_box"
+        coordinates in the JSON response are mapped back to `image_data` pixel space and the transform is
+        reported under "upload_image".
+        """
         start_time = time.perf_counter()
 
         if model_name_override:
@@ -260,17 +322,54 @@ class GeminiAnalyzer:
             result["latency_ms"] = int((time.perf_counter() - start_time) * 1000)
             return result
 
-        api_contents, input_error = self._validate_and_prepare_api_input(prompt, image_data, "GeminiQuery")
+        input_error = self._validate_api_input(prompt, image_data, "GeminiQuery")
         if input_error:
             result.update(input_error)
             result["latency_ms"] = int((time.perf_counter() - start_time) * 1000)
             return result
 
+        effective_upload_options = upload_options if upload_options is not None else self.upload_options
         effective_gen_config = custom_generation_config or self.generation_config
         effective_safety_settings = custom_safety_settings if custom_safety_settings is not None else self.safety_settings
 
+        cache_key: Optional[Tuple[str, Optional[int]]] = None
+        if self.response_cache is not None and use_cache:
+            cache_key = (
+                gemini_request_key(
+                    effective_model_preference, prompt, effective_gen_config, effective_safety_settings, image_data.shape if image_data is not None else None, effective_upload_options
+                ),
+                perceptual_hash(image_data) if image_data is not None else None,
+            )
+            cached_result = self.response_cache.get(*cache_key)
+            if cached_result is not None:
+                cached_result["cache_hit"] = True
+                cached_result["latency_ms"] = int((time.perf_counter() - start_time) * 1000)
+                logger.info(f"GeminiQuery (Cache Hit): Reused response from model '{cached_result.get('model_used', 'N/A')}'. Latency: {cached_result['latency_ms']}ms.")
+                return cached_result
+
+        # Only a cache miss pays for resizing and encoding the upload.
+        api_contents, prepared_image, input_error = self._prepare_api_input(prompt, image_data, "GeminiQuery", effective_upload_options)
+        if input_error:
+            result.update(input_error)
+            result["latency_ms"] = int((time.perf_counter() - start_time) * 1000)
+            return result
+
         result = self._attempt_sdk_call_with_fallback(api_contents or [], effective_model_preference, effective_gen_config, effective_safety_settings)
+        if prepared_image is not None and effective_upload_options is not None:
+            result["upload_image"] = prepared_image.report()
+            if result.get("json_content") is not None:
+                result["json_content"] = remap_boxes_to_source(result["json_content"], prepared_image)
+        if cache_key is not None and result.get("status") == "success":
+            self.response_cache.put(*cache_key, result)
 
         result["latency_ms"] = int((time.perf_counter() - start_time) * 1000)
         logger.info(f"GeminiQuery (Final Status): '{result['status']}' on model '{result.get('model_used', 'N/A')}'. Latency: {result['latency_ms']}ms.")
-        return result
\ No newline at end of file
+        return result
+
+    def get_response_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss counters of the response cache, or None if caching is disabled."""
+        return self.response_cache.get_stats() if self.response_cache is not None else None
+
+    def save_response_cache(self) -> bool:
+        """Persists the response cache if it was configured with a file path."""
+        return self.response_cache.save() if self.response_cache is not None else False
@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.gemini_rate_limiter")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate_per_second` up to `capacity` tokens.
+    `acquire()` blocks the calling thread until a token is available.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if not isinstance(rate_per_second, (int, float)) or rate_per_second <= 0:
+            raise ValueError(f"Token bucket rate must be a positive number, got {rate_per_second!r}.")
+        self.rate_per_second = float(rate_per_second)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate_per_second)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token (possibly going negative) and returns how long the caller must wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+    def acquire(self) -> float:
+        """Returns the seconds waited."""
+        wait_s = self._reserve()
+        if wait_s > 0:
+            self._sleep(wait_s)
+        return wait_s
+
+
+class ModelRateLimiter:
+    """Per-model request budgets in requests per minute. Models without a limit (and no default) are not throttled."""
+
+    def __init__(
+        self,
+        requests_per_minute: Dict[str, float],
+        default_requests_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        if default_requests_per_minute is not None:
+            self._make_bucket(default_requests_per_minute)  # Validates the default up front.
+        self._default_rpm = default_requests_per_minute
+        self._buckets: Dict[str, TokenBucket] = {model: self._make_bucket(rpm) for model, rpm in requests_per_minute.items()}
+        self._lock = threading.Lock()
+
+    def _make_bucket(self, rpm: float) -> TokenBucket:
+        if not isinstance(rpm, (int, float)) or rpm <= 0:
+            raise ValueError(f"Requests per minute must be a positive number, got {rpm!r}.")
+        # Allow short bursts of up to a tenth of the per-minute budget.
+        return TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 10.0), clock=self._clock, sleep=self._sleep)
+
+    def acquire(self, model_name: str) -> float:
+        """Blocks until `model_name` may be called. Returns the seconds waited."""
+        with self._lock:
+            bucket = self._buckets.get(model_name)
+            if bucket is None and self._default_rpm is not None:
+                bucket = self._buckets[model_name] = self._make_bucket(self._default_rpm)
+        return bucket.acquire() if bucket is not None else 0.0
+
+
+def create_gemini_rate_limiter(settings: Dict[str, Any]) -> Optional[ModelRateLimiter]:
+    """
+    Builds a limiter from the 'gemini_rate_limit_rpm' profile setting: a number (every model) or a
+    {model_name: rpm} dict, optionally with a "*" default. None/absent disables rate limiting.
+    """
+    rpm_setting = settings.get("gemini_rate_limit_rpm")
+    if rpm_setting is None:
+        return None
+    try:
+        if isinstance(rpm_setting, dict):
+            per_model = {model: rpm for model, rpm in rpm_setting.items() if model != "*"}
+            return ModelRateLimiter(per_model, default_requests_per_minute=rpm_setting.get("*"))
+        return ModelRateLimiter({}, default_requests_per_minute=rpm_setting)
+    except ValueError as e:
+        logger.warning(f"Invalid 'gemini_rate_limit_rpm' ({e}). Gemini rate limiting disabled.")
+        return None
@@ -0,0 +1,248 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.gemini_response_cache")
+
+DEFAULT_GEMINI_CACHE_MAX_ENTRIES = 128
+DEFAULT_GEMINI_CACHE_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_GEMINI_CACHE_TTL_SECONDS = 60.0
+DEFAULT_GEMINI_CACHE_MAX_DISTANCE = 0
+# Side of the difference-hash grid; the hash has PERCEPTUAL_HASH_SIZE**2 bits.
+PERCEPTUAL_HASH_SIZE = 16
+GEMINI_CACHE_FILE_VERSION = 1
+
+
+def perceptual_hash(image_bgr: np.ndarray, hash_size: int = PERCEPTUAL_HASH_SIZE) -> int:
+    """
+    Difference hash (dHash) of an image: the sign of horizontal brightness gradients on a
+    hash_size x hash_size grid of the area-downscaled grayscale image, packed into an int.
+    Visually identical frames (compression noise, a blinking cursor) hash within a few bits.
+    """
+    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY) if image_bgr.ndim == 3 else image_bgr
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    return (hash_a ^ hash_b).bit_count()
+
+
+def gemini_request_key(
+    model_preference: List[str], prompt: str, generation_config: Any, safety_settings: Any, image_shape: Optional[Tuple[int, ...]], upload_options: Any = None
+) -> str:
+    """Exact part of a cache key: everything in the request except the image pixels."""
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(
+        json.dumps([list(model_preference), prompt, repr(generation_config), repr(safety_settings), list(image_shape) if image_shape else None, repr(upload_options)]).encode("utf-8")
+    )
+    return hasher.hexdigest()
+
+
+class GeminiResponseCache:
+    """
+    Thread-safe LRU cache of successful Gemini responses.
+
+    Entries are grouped by `gemini_request_key` (model preference, prompt, generation config,
+    safety settings, image shape). Within a group, a stored response is reused when the
+    perceptual hash of the new image is within `max_distance` bits of the stored one and the
+    entry is younger than `ttl_seconds`. Bounded by entry count and approximate serialized
+    size; with `persist_path`, the cache is loaded on construction and written by `save()`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_GEMINI_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_GEMINI_CACHE_TTL_SECONDS,
+        max_distance: int = DEFAULT_GEMINI_CACHE_MAX_DISTANCE,
+        max_bytes: int = DEFAULT_GEMINI_CACHE_MAX_BYTES,
+        persist_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError(f"Gemini cache max_entries must be a positive integer, got {max_entries!r}.")
+        if not isinstance(ttl_seconds, (int, float)) or ttl_seconds <= 0:
+            raise ValueError(f"Gemini cache ttl_seconds must be a positive number, got {ttl_seconds!r}.")
+        if not isinstance(max_distance, int) or not 0 <= max_distance <= PERCEPTUAL_HASH_SIZE * PERCEPTUAL_HASH_SIZE:
+            raise ValueError(f"Gemini cache max_distance must be an integer between 0 and {PERCEPTUAL_HASH_SIZE * PERCEPTUAL_HASH_SIZE}, got {max_distance!r}.")
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError(f"Gemini cache max_bytes must be a positive integer, got {max_bytes!r}.")
+        self.max_entries = max_entries
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_distance = max_distance
+        self.max_bytes = max_bytes
+        self.persist_path = persist_path
+        self._clock = clock
+        # (request key, image hash or None) -> (response, stored_at, size)
+        self._entries: "OrderedDict[Tuple[str, Optional[int]], Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        if self.persist_path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _find(self, request_key: str, image_hash: Optional[int], now: float) -> Optional[Tuple[Tuple[str, Optional[int]], int]]:
+        exact_key = (request_key, image_hash)
+        if exact_key in self._entries:
+            return exact_key, 0
+        if image_hash is None or self.max_distance == 0:
+            return None
+        best: Optional[Tuple[Tuple[str, Optional[int]], int]] = None
+        for key, (_response, stored_at, _size) in self._entries.items():
+            if key[0] != request_key or key[1] is None or now - stored_at > self.ttl_seconds:
+                continue
+            distance = hamming_distance(key[1], image_hash)
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = key, distance
+        return best
+
+    def get(self, request_key: str, image_hash: Optional[int]) -> Optional[Dict[str, Any]]:
+        now = self._clock()
+        with self._lock:
+            found = self._find(request_key, image_hash, now)
+            if found is None:
+                self.misses += 1
+                return None
+            key, distance = found
+            response, stored_at, size = self._entries[key]
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._total_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if distance:
+                self.near_hits += 1
+            return copy.deepcopy(response)
+
+    def put(self, request_key: str, image_hash: Optional[int], response: Dict[str, Any]):
+        try:
+            size = len(json.dumps(response, default=str))
+        except (TypeError, ValueError) as e:  # pragma: no cover
+            logger.warning(f"Gemini response not cacheable ({e}). Skipping.")
+            return
+        if size > self.max_bytes:
+            logger.debug(f"Gemini response of ~{size} bytes exceeds cache budget ({self.max_bytes}). Not cached.")
+            return
+        with self._lock:
+            self._insert((request_key, image_hash), copy.deepcopy(response), self._clock(), size)
+
+    def _insert(self, key: Tuple[str, Optional[int]], response: Dict[str, Any], stored_at: float, size: int):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[2]
+        self._entries[key] = (response, stored_at, size)
+        self._total_bytes += size
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            _evicted_key, (_evicted, _stored_at, evicted_size) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "approx_bytes": self._total_bytes,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def load(self) -> bool:
+        """Loads unexpired entries from `persist_path`. A missing, unreadable or incompatible file leaves the cache empty."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return False
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != GEMINI_CACHE_FILE_VERSION:
+                logger.warning(f"Gemini cache file '{self.persist_path}' has unsupported version {payload.get('version')}. Ignoring it.")
+                return False
+            now = self._clock()
+            with self._lock:
+                for request_key, image_hash_hex, stored_at, response in payload.get("entries", []):
+                    if now - stored_at > self.ttl_seconds:
+                        continue
+                    image_hash = int(image_hash_hex, 16) if image_hash_hex is not None else None
+                    self._insert((request_key, image_hash), response, stored_at, len(json.dumps(response, default=str)))
+            logger.info(f"Loaded {len(self._entries)} Gemini cache entries from '{self.persist_path}'.")
+            return True
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not load Gemini cache from '{self.persist_path}': {e}. Starting with an empty cache.")
+            with self._lock:
+                self._entries.clear()
+                self._total_bytes = 0
+            return False
+
+    def save(self) -> bool:
+        """Writes entries (least recently used first) to `persist_path` atomically."""
+        if not self.persist_path:
+            return False
+        with self._lock:
+            payload = {
+                "version": GEMINI_CACHE_FILE_VERSION,
+                "entries": [[request_key, f"{image_hash:x}" if image_hash is not None else None, stored_at, response] for (request_key, image_hash), (response, stored_at, _size) in self._entries.items()],
+            }
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            cache_dir = os.path.dirname(self.persist_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=str)
+            os.replace(tmp_path, self.persist_path)
+            logger.info(f"Saved {len(payload['entries'])} Gemini cache entries to '{self.persist_path}'.")
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Could not save Gemini cache to '{self.persist_path}': {e}")
+            return False
+
+
+def create_gemini_response_cache(settings: Dict[str, Any]) -> Optional[GeminiResponseCache]:
+    """
+    Builds a response cache from profile settings ('gemini_response_cache_entries', '..._ttl_seconds',
+    '..._max_distance', '..._path'). Returns None when disabled (0 entries, the default) or misconfigured.
+    """
+    max_entries = settings.get("gemini_response_cache_entries", 0)
+    if max_entries == 0:
+        return None
+    try:
+        return GeminiResponseCache(
+            max_entries=max_entries,
+            ttl_seconds=settings.get("gemini_response_cache_ttl_seconds", DEFAULT_GEMINI_CACHE_TTL_SECONDS),
+            max_distance=settings.get("gemini_response_cache_max_distance", DEFAULT_GEMINI_CACHE_MAX_DISTANCE),
+            persist_path=settings.get("gemini_response_cache_path"),
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid Gemini response cache settings ({e}). Gemini response cache disabled.")
+        return None
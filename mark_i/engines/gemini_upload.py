@@ -0,0 +1,150 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.gemini_upload")
+
+UPLOAD_IMAGE_FORMATS = ("jpeg", "webp", "png")
+_FORMAT_ENCODING = {
+    "jpeg": (".jpg", "image/jpeg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", "image/webp", cv2.IMWRITE_WEBP_QUALITY),
+    "png": (".png", "image/png", None),
+}
+
+
+@dataclass(frozen=True)
+class UploadImageOptions:
+    """
+    How an image is shrunk and encoded before it is sent to Gemini.
+
+    max_pixels: Downscale (area interpolation, aspect ratio kept) until width*height fits. None keeps the resolution.
+    image_format: 'jpeg', 'webp' or 'png'. None hands a PIL image to the SDK, which encodes lossless WebP.
+    quality: JPEG/WebP quality (1-100). Ignored for PNG.
+    grayscale: Drop colour, e.g. for prompts that only need to read text.
+    crop_box: (x, y, width, height) in image coordinates, e.g. the focused window. Clipped to the image.
+    """
+
+    max_pixels: Optional[int] = None
+    image_format: Optional[str] = "jpeg"
+    quality: int = 85
+    grayscale: bool = False
+    crop_box: Optional[Tuple[int, int, int, int]] = None
+
+    def __post_init__(self):
+        if self.max_pixels is not None and (not isinstance(self.max_pixels, int) or self.max_pixels <= 0):
+            raise ValueError(f"max_pixels must be a positive integer or None, got {self.max_pixels!r}.")
+        if self.image_format is not None and self.image_format not in UPLOAD_IMAGE_FORMATS:
+            raise ValueError(f"Unknown upload image format '{self.image_format}'. Available: {UPLOAD_IMAGE_FORMATS}")
+        if not isinstance(self.quality, int) or not 1 <= self.quality <= 100:
+            raise ValueError(f"quality must be an integer between 1 and 100, got {self.quality!r}.")
+        if self.crop_box is not None and (len(self.crop_box) != 4 or self.crop_box[2] <= 0 or self.crop_box[3] <= 0):
+            raise ValueError(f"crop_box must be (x, y, width, height) with positive size, got {self.crop_box!r}.")
+
+
+@dataclass
+class PreparedUploadImage:
+    """An image ready for the SDK, plus the transform that maps its pixel coordinates back to the source image."""
+
+    content: Union[Image.Image, Dict[str, Any]]
+    width: int
+    height: int
+    offset_x: int = 0
+    offset_y: int = 0
+    scale: float = 1.0  # Uploaded pixels per source pixel.
+    source_bytes: int = 0  # Size of the raw BGR source buffer.
+    upload_bytes: Optional[int] = None  # Encoded size; None when the SDK encodes a PIL image.
+
+    @property
+    def is_identity(self) -> bool:
+        return self.scale == 1.0 and self.offset_x == 0 and self.offset_y == 0
+
+    def to_source_point(self, x: float, y: float) -> Tuple[int, int]:
+        return int(round(x / self.scale + self.offset_x)), int(round(y / self.scale + self.offset_y))
+
+    def to_source_box(self, box: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+        x, y = self.to_source_point(box[0], box[1])
+        return x, y, int(round(box[2] / self.scale)), int(round(box[3] / self.scale))
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "offset": [self.offset_x, self.offset_y],
+            "scale": self.scale,
+            "source_bytes": self.source_bytes,
+            "upload_bytes": self.upload_bytes,
+            "bytes_saved": self.source_bytes - self.upload_bytes if self.upload_bytes is not None else None,
+        }
+
+
+def prepare_upload_image(image_bgr: np.ndarray, options: Optional[UploadImageOptions]) -> PreparedUploadImage:
+    """Crops, downscales, converts and encodes a BGR image according to `options` (None: PIL image, unchanged)."""
+    source_bytes = int(image_bgr.nbytes)
+    if options is None:
+        pil_image = Image.fromarray(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB))
+        return PreparedUploadImage(content=pil_image, width=pil_image.width, height=pil_image.height, source_bytes=source_bytes)
+
+    image = image_bgr
+    offset_x = offset_y = 0
+    if options.crop_box is not None:
+        x, y, w, h = (int(v) for v in options.crop_box)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(image.shape[1], x + w), min(image.shape[0], y + h)
+        if x1 > x0 and y1 > y0:
+            image = image[y0:y1, x0:x1]
+            offset_x, offset_y = x0, y0
+        else:
+            logger.warning(f"Upload crop box {options.crop_box} lies outside the {image.shape[1]}x{image.shape[0]} image. Sending the full image.")
+
+    scale = 1.0
+    height, width = image.shape[:2]
+    if options.max_pixels is not None and width * height > options.max_pixels:
+        scale = (options.max_pixels / float(width * height)) ** 0.5
+        new_width, new_height = max(1, int(width * scale)), max(1, int(height * scale))
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+        scale = new_width / float(width)  # Exact ratio after integer rounding of the target size.
+        height, width = new_height, new_width
+
+    if options.grayscale:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    transform = {"width": width, "height": height, "offset_x": offset_x, "offset_y": offset_y, "scale": scale, "source_bytes": source_bytes}
+    if options.image_format is None:
+        return PreparedUploadImage(content=Image.fromarray(image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2RGB)), **transform)
+
+    extension, mime_type, quality_flag = _FORMAT_ENCODING[options.image_format]
+    encode_params = [quality_flag, options.quality] if quality_flag is not None else []
+    ok, encoded = cv2.imencode(extension, image, encode_params)
+    if not ok:
+        raise RuntimeError(f"Could not encode the upload image as {options.image_format}.")
+    return PreparedUploadImage(content={"mime_type": mime_type, "data": encoded.tobytes()}, upload_bytes=int(encoded.nbytes), **transform)
+
+
+def remap_boxes_to_source(json_content: Any, prepared: PreparedUploadImage) -> Any:
+    """
+    Maps coordinates in a parsed model response from uploaded-image space back to source-image space.
+    Recognized shapes, at any nesting depth: "box": [x, y, w, h] and "bounding_box": {"x", "y", "width", "height"}.
+    Returns a new structure; other values are left untouched.
+    """
+    if prepared.is_identity:
+        return json_content
+    if isinstance(json_content, list):
+        return [remap_boxes_to_source(item, prepared) for item in json_content]
+    if not isinstance(json_content, dict):
+        return json_content
+    remapped = {}
+    for key, value in json_content.items():
+        if key == "box" and isinstance(value, list) and len(value) == 4 and all(isinstance(v, (int, float)) for v in value):
+            remapped[key] = list(prepared.to_source_box(value))
+        elif key == "bounding_box" and isinstance(value, dict) and all(isinstance(value.get(k), (int, float)) for k in ("x", "y", "width", "height")):
+            x, y, w, h = prepared.to_source_box((value["x"], value["y"], value["width"], value["height"]))
+            remapped[key] = {**value, "x": x, "y": y, "width": w, "height": h}
+        else:
+            remapped[key] = remap_boxes_to_source(value, prepared)
+    return remapped
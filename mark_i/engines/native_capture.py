@@ -7,14 +7,12 @@ import logging
 import time
 import platform
 import subprocess
-import tempfile
-import os
 from typing import Optional, Dict, Any
 import numpy as np
 import cv2
-from PIL import Image
 
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.capture_backends import CaptureBackendStats, create_first_available_capture_backend, legacy_benchmark_results
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.native_capture")
 
@@ -25,6 +23,7 @@ class NativeCaptureEngine:
     def __init__(self):
         self.system = platform.system()
         self.capture_method = None
+        self.backend = None
         self.screen_width = 1920
         self.screen_height = 1080
 
@@ -43,13 +42,11 @@ class NativeCaptureEngine:
         if self.system == "Linux":
             # Check for available tools in order of speed
             # On Wayland, scrot works better than ImageMagick import
-            tools = [("scrot", "scrot (fast and compatible)"), ("import", "ImageMagick import (fastest but X11 only)"), ("gnome-screenshot", "gnome-screenshot (slow but compatible)")]
-
-            for tool, description in tools:
-                if self._check_tool_available(tool):
-                    self.capture_method = tool
-                    logger.info(f"Using {description}")
-                    return
+            self.backend = create_first_available_capture_backend(["scrot", "import", "gnome-screenshot"])
+            if self.backend is not None:
+                self.capture_method = self.backend.name
+                logger.info(f"Using {self.capture_method}")
+                return
 
             # Fallback
             self.capture_method = "fallback"
@@ -59,14 +56,6 @@ class NativeCaptureEngine:
             self.capture_method = "fallback"
             logger.info("Non-Linux system, using fallback method")
 
-    def _check_tool_available(self, tool: str) -> bool:
-        """Check if a command-line tool is available."""
-        try:
-            result = subprocess.run(["which", tool], capture_output=True, timeout=1.0)
-            return result.returncode == 0
-        except:
-            return False
-
     def _get_screen_dimensions(self):
         """Get screen dimensions using the fastest method."""
         try:
@@ -140,135 +129,13 @@ class NativeCaptureEngine:
         if height is None:
             height = self.screen_height
 
-        try:
-            if self.capture_method == "import":
-                return self._capture_with_import(x, y, width, height)
-            elif self.capture_method == "scrot":
-                return self._capture_with_scrot(x, y, width, height)
-            elif self.capture_method == "gnome-screenshot":
-                return self._capture_with_gnome_screenshot(x, y, width, height)
-            else:
-                return self._capture_fallback(x, y, width, height)
-
-        except Exception as e:
-            logger.error(f"Native capture error: {e}")
-            return None
+        if self.backend is None:
+            return self._capture_fallback(x, y, width, height)
 
-    def _capture_with_import(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
-        """Capture using ImageMagick import (fastest on Linux)."""
         try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-
-            # ImageMagick import command for region capture
-            cmd = ["import", "-window", "root", "-crop", f"{width}x{height}+{x}+{y}", "+repage", tmp_path]
-
-            # Execute with timeout
-            result = subprocess.run(cmd, capture_output=True, timeout=0.5)  # 500ms timeout
-
-            if result.returncode == 0 and os.path.exists(tmp_path):
-                # Load image
-                img = cv2.imread(tmp_path)
-                os.unlink(tmp_path)  # Clean up
-                return img
-            else:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                return None
-
-        except Exception as e:
-            logger.error(f"Import capture error: {e}")
-            return None
-
-    def _capture_with_scrot(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
-        """Capture using scrot (full screen then crop for reliability)."""
-        tmp_path = None
-        try:
-            # Create temporary file
-            tmp_fd, tmp_path = tempfile.mkstemp(suffix=".png")
-            os.close(tmp_fd)  # Close file descriptor
-
-            # Use full screen capture (more reliable than region)
-            cmd = ["scrot", tmp_path]
-
-            # Pass environment variables for display access
-            env = os.environ.copy()
-
-            result = subprocess.run(cmd, capture_output=True, timeout=2.0, env=env)
-
-            if result.returncode == 0:
-                if os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
-                    # Load full screen image
-                    img = cv2.imread(tmp_path)
-                    if img is not None:
-                        # Crop to desired region
-                        h, w = img.shape[:2]
-                        x1 = max(0, min(x, w))
-                        y1 = max(0, min(y, h))
-                        x2 = max(0, min(x + width, w))
-                        y2 = max(0, min(y + height, h))
-
-                        if x2 > x1 and y2 > y1:
-                            cropped = img[y1:y2, x1:x2]
-                            return cropped
-                        else:
-                            return img  # Return full image if crop fails
-                    else:
-                        logger.error("OpenCV couldn't read the scrot image")
-                else:
-                    logger.error(f"Scrot output file missing or empty: {tmp_path}")
-            else:
-                stderr_msg = result.stderr.decode() if result.stderr else "No error message"
-                logger.error(f"Scrot command failed: return code {result.returncode}, stderr: {stderr_msg}")
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Scrot capture error: {e}")
-            return None
-        finally:
-            # Clean up temporary file
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-
-    def _capture_with_gnome_screenshot(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
-        """Capture using gnome-screenshot (slowest but most compatible)."""
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-
-            # gnome-screenshot for full screen, then crop
-            cmd = ["gnome-screenshot", "-f", tmp_path]
-
-            result = subprocess.run(cmd, capture_output=True, timeout=2.0)
-
-            if result.returncode == 0 and os.path.exists(tmp_path):
-                # Load and crop
-                img = cv2.imread(tmp_path)
-                os.unlink(tmp_path)
-
-                if img is not None:
-                    # Crop to desired region
-                    h, w = img.shape[:2]
-                    x1 = max(0, min(x, w))
-                    y1 = max(0, min(y, h))
-                    x2 = max(0, min(x + width, w))
-                    y2 = max(0, min(y + height, h))
-
-                    if x2 > x1 and y2 > y1:
-                        return img[y1:y2, x1:x2]
-
-                return img
-            else:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                return None
-
-        except Exception as e:
-            logger.error(f"Gnome-screenshot capture error: {e}")
+            return self.backend.grab((x, y, x + width, y + height))
+        except RuntimeError as e:
+            logger.error(f"Native capture error: {e}")
             return None
 
     def _capture_fallback(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
@@ -292,43 +159,19 @@ class NativeCaptureEngine:
         test_width = 640
         test_height = 480
 
-        times = []
-        successful_captures = 0
-
+        stats = CaptureBackendStats(self.capture_method)
         for i in range(iterations):
-            start_time = time.time()
-
+            start_time = time.perf_counter()
             result = self.capture_screen_native(0, 0, test_width, test_height)
+            capture_time = time.perf_counter() - start_time
+            stats.record(capture_time, result)
+
+            # Show progress every 10 iterations
+            if result is not None and (i + 1) % 10 == 0:
+                print(f"   Progress: {i+1}/{iterations} ({capture_time*1000:.1f}ms)")
+
+        results = legacy_benchmark_results(stats.summary(), iterations)
+        results["test_resolution"] = f"{test_width}x{test_height}"
 
-            end_time = time.time()
-            capture_time = end_time - start_time
-
-            if result is not None:
-                times.append(capture_time)
-                successful_captures += 1
-
-                # Show progress every 10 iterations
-                if (i + 1) % 10 == 0:
-                    print(f"   Progress: {i+1}/{iterations} ({capture_time*1000:.1f}ms)")
-
-        if not times:
-            return {"success_rate": 0.0, "avg_time_ms": 0.0, "fps": 0.0, "method": self.capture_method}
-
-        avg_time = np.mean(times)
-        fps = 1.0 / avg_time if avg_time > 0 else 0.0
-        success_rate = successful_captures / iterations
-
-        results = {
-            "success_rate": success_rate,
-            "avg_time_ms": avg_time * 1000,
-            "min_time_ms": min(times) * 1000,
-            "max_time_ms": max(times) * 1000,
-            "fps": fps,
-            "method": self.capture_method,
-            "test_resolution": f"{test_width}x{test_height}",
-            "total_iterations": iterations,
-            "successful_captures": successful_captures,
-        }
-
-        logger.info(f"Native benchmark: {fps:.1f} FPS, {avg_time*1000:.1f}ms avg")
+        logger.info(f"Native benchmark: {results['fps']:.1f} FPS, {results['avg_time_ms']:.1f}ms avg")
         return results
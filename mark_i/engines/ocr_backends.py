@@ -0,0 +1,194 @@
+import abc
+import logging
+import queue
+import shlex
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+from pytesseract import Output
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.ocr_backends")
+
+try:
+    import tesserocr  # Optional: in-process Tesseract API bindings
+
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
+OCR_BACKENDS = ("pytesseract", "tesserocr")
+
+# Column types of Tesseract's TSV output, matching what pytesseract returns for Output.DICT.
+_TSV_INT_COLUMNS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num", "left", "top", "width", "height")
+
+
+def parse_tesseract_tsv(tsv_text: str) -> Dict[str, List[Any]]:
+    """Parses Tesseract TSV output into the column dict layout of `pytesseract.image_to_data(..., output_type=Output.DICT)`."""
+    columns: Dict[str, List[Any]] = {name: [] for name in (*_TSV_INT_COLUMNS, "conf", "text")}
+    for line in tsv_text.splitlines():
+        fields = line.split("\t")
+        if not fields or fields[0] == "level" or len(fields) < 11:
+            continue
+        try:
+            int_values = [int(value) for value in fields[:10]]
+            conf = float(fields[10])
+        except ValueError:
+            logger.debug(f"Skipping malformed TSV line: {line!r}")
+            continue
+        for name, value in zip(_TSV_INT_COLUMNS, int_values):
+            columns[name].append(value)
+        columns["conf"].append(conf)
+        columns["text"].append(fields[11] if len(fields) > 11 else "")
+    return columns
+
+
+def parse_tesseract_cli_config(config: str) -> Tuple[Optional[int], Optional[int], Dict[str, str]]:
+    """
+    Translates a Tesseract CLI config string (e.g. '--psm 6 --oem 1 -c tessedit_char_whitelist=0123456789')
+    into (psm, oem, variables) for API-based backends. Unsupported flags are ignored with a warning.
+    """
+    psm: Optional[int] = None
+    oem: Optional[int] = None
+    variables: Dict[str, str] = {}
+    tokens = shlex.split(config or "")
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token in ("--psm", "--oem") and value is not None:
+            try:
+                if token == "--psm":
+                    psm = int(value)
+                else:
+                    oem = int(value)
+            except ValueError:
+                logger.warning(f"Ignoring non-integer value '{value}' for Tesseract option '{token}'.")
+            i += 2
+        elif token == "-c" and value is not None and "=" in value:
+            key, _, var_value = value.partition("=")
+            variables[key] = var_value
+            i += 2
+        else:
+            logger.warning(f"Tesseract option '{token}' is not supported by the in-process OCR backend. Ignoring it.")
+            i += 1
+    return psm, oem, variables
+
+
+class OcrBackend(abc.ABC):
+    """Runs Tesseract on a BGR image and returns word-level data in pytesseract's Output.DICT layout."""
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def image_to_data(self, image_bgr: np.ndarray, lang: str, config: str) -> Dict[str, List[Any]]:
+        """May raise pytesseract.TesseractError / TesseractNotFoundError or RuntimeError."""
+
+    def close(self):
+        """Releases long-lived resources. The backend may lazily re-acquire them on next use."""
+
+
+class PytesseractOcrBackend(OcrBackend):
+    """Original behaviour: one `tesseract` process per call via pytesseract. Safe to call from several threads."""
+
+    name = "pytesseract"
+
+    def image_to_data(self, image_bgr: np.ndarray, lang: str, config: str) -> Dict[str, List[Any]]:
+        return pytesseract.image_to_data(image_bgr, lang=lang, config=config, output_type=Output.DICT)
+
+
+class TesserocrOcrBackend(OcrBackend):
+    """
+    Pool of long-lived in-process Tesseract API handles (tesserocr). Each handle serves one
+    call at a time; up to `max_workers` handles are created on demand and reused, so there is
+    no process spawn or temp file per call and concurrent calls run in parallel (tesserocr
+    releases the GIL while recognizing).
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, max_workers: int = 1, lang: str = "eng", config: str = ""):
+        if not TESSEROCR_AVAILABLE:
+            raise RuntimeError("tesserocr is not installed. Install it to use the 'tesserocr' OCR backend.")
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers!r}.")
+        self.max_workers = max_workers
+        self.lang = lang
+        self.config = config
+        self._psm, self._oem, self._variables = parse_tesseract_cli_config(config)
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Fail early (instead of on the first OCR call) if tessdata or the language is missing.
+        self._idle.put(self._acquire())
+
+    def _create_api(self):
+        kwargs: Dict[str, Any] = {"lang": self.lang}
+        if self._psm is not None:
+            kwargs["psm"] = self._psm
+        if self._oem is not None:
+            kwargs["oem"] = self._oem
+        try:
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+        except Exception as e:
+            raise RuntimeError(f"Could not initialize tesserocr (lang='{self.lang}'): {e}") from e
+        for key, value in self._variables.items():
+            if not api.SetVariable(key, value):
+                logger.warning(f"tesserocr rejected variable '{key}={value}'.")
+        return api
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.max_workers
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get()
+        try:
+            return self._create_api()
+        except RuntimeError:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def image_to_data(self, image_bgr: np.ndarray, lang: str, config: str) -> Dict[str, List[Any]]:
+        if lang != self.lang or config != self.config:
+            raise RuntimeError(f"tesserocr pool was initialized for lang='{self.lang}', config='{self.config}' but called with lang='{lang}', config='{config}'.")
+        pil_image = Image.fromarray(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB))
+        api = self._acquire()
+        try:
+            api.SetImage(pil_image)
+            api.Recognize()
+            return parse_tesseract_tsv(api.GetTSVText(0))
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def close(self):
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            api.End()
+            with self._lock:
+                self._created -= 1
+
+
+def create_ocr_backend(name: str, max_workers: int = 1, lang: str = "eng", config: str = "") -> OcrBackend:
+    """Raises ValueError for unknown names and RuntimeError if the backend cannot run on this host."""
+    if name == "pytesseract":
+        return PytesseractOcrBackend()
+    if name == "tesserocr":
+        return TesserocrOcrBackend(max_workers=max_workers, lang=lang, config=config)
+    raise ValueError(f"Unknown OCR backend '{name}'. Available: {OCR_BACKENDS}")
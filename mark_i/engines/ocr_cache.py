@@ -0,0 +1,148 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.ocr_cache")
+
+DEFAULT_OCR_CACHE_MAX_ENTRIES = 256
+DEFAULT_OCR_CACHE_MAX_BYTES = 16 * 1024 * 1024
+OCR_CACHE_FILE_VERSION = 1
+
+
+def ocr_cache_key(image_data: np.ndarray, ocr_settings: str) -> str:
+    """Content address of an OCR request: digest of the pixel buffer, its shape/dtype and the OCR settings."""
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(f"{image_data.shape}|{image_data.dtype.str}|{ocr_settings}".encode("utf-8"))
+    hasher.update(np.ascontiguousarray(image_data).data)
+    return hasher.hexdigest()
+
+
+class OcrResultCache:
+    """
+    Thread-safe LRU cache of OCR results keyed by `ocr_cache_key`.
+
+    Bounded both by entry count and by the approximate serialized size of the stored
+    results. Results are deep-copied on the way in and out so callers may mutate them.
+    With `persist_path`, the cache is loaded on construction and written by `save()`.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_OCR_CACHE_MAX_ENTRIES, max_bytes: int = DEFAULT_OCR_CACHE_MAX_BYTES, persist_path: Optional[str] = None):
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError(f"OCR cache max_entries must be a positive integer, got {max_entries!r}.")
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError(f"OCR cache max_bytes must be a positive integer, got {max_bytes!r}.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_path = persist_path
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.persist_path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: str, result: Dict[str, Any]):
+        try:
+            size = len(json.dumps(result, default=str))
+        except (TypeError, ValueError) as e:  # pragma: no cover
+            logger.warning(f"OCR result not cacheable ({e}). Skipping.")
+            return
+        if size > self.max_bytes:
+            logger.debug(f"OCR result of ~{size} bytes exceeds cache budget ({self.max_bytes}). Not cached.")
+            return
+        with self._lock:
+            self._insert(key, copy.deepcopy(result), size)
+
+    def _insert(self, key: str, result: Dict[str, Any], size: int):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[1]
+        self._entries[key] = (result, size)
+        self._total_bytes += size
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            _evicted_key, (_evicted, evicted_size) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "approx_bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def load(self) -> bool:
+        """Loads entries from `persist_path`. A missing, unreadable or incompatible file leaves the cache empty."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return False
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != OCR_CACHE_FILE_VERSION:
+                logger.warning(f"OCR cache file '{self.persist_path}' has unsupported version {payload.get('version')}. Ignoring it.")
+                return False
+            with self._lock:
+                for key, result in payload.get("entries", []):
+                    self._insert(key, result, len(json.dumps(result, default=str)))
+            logger.info(f"Loaded {len(self._entries)} OCR cache entries from '{self.persist_path}'.")
+            return True
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not load OCR cache from '{self.persist_path}': {e}. Starting with an empty cache.")
+            with self._lock:
+                self._entries.clear()
+                self._total_bytes = 0
+            return False
+
+    def save(self) -> bool:
+        """Writes entries (least recently used first) to `persist_path` atomically."""
+        if not self.persist_path:
+            return False
+        with self._lock:
+            payload = {"version": OCR_CACHE_FILE_VERSION, "entries": [[key, result] for key, (result, _size) in self._entries.items()]}
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            cache_dir = os.path.dirname(self.persist_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=str)
+            os.replace(tmp_path, self.persist_path)
+            logger.info(f"Saved {len(payload['entries'])} OCR cache entries to '{self.persist_path}'.")
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Could not save OCR cache to '{self.persist_path}': {e}")
+            return False
@@ -6,15 +6,13 @@ Optimized screen capture for real-time performance on Linux.
 import logging
 import time
 import subprocess
-import tempfile
-import os
 from typing import Optional, Dict, Any
 import numpy as np
-import cv2
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.capture_backends import CaptureBackendStats, create_capture_backend, legacy_benchmark_results
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.optimized_capture")
 
@@ -32,6 +30,13 @@ class OptimizedCaptureEngine:
         # Thread pool for async captures
         self.executor = ThreadPoolExecutor(max_workers=2)
         
+        # gnome-screenshot is the most compatible capture tool
+        try:
+            self.backend = create_capture_backend("gnome-screenshot")
+        except RuntimeError as e:
+            self.backend = None
+            logger.warning(f"gnome-screenshot capture unavailable: {e}")
+        
         # Get screen dimensions
         self._get_screen_dimensions()
         
@@ -119,49 +124,13 @@ class OptimizedCaptureEngine:
     
     def _fast_capture_gnome(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
         """Fast capture using gnome-screenshot with optimizations."""
-        tmp_path = None
-        try:
-            # Create temporary file
-            tmp_fd, tmp_path = tempfile.mkstemp(suffix=".png")
-            os.close(tmp_fd)
-            
-            # Use gnome-screenshot (most compatible)
-            cmd = ["gnome-screenshot", "-f", tmp_path]
-            
-            # Run with timeout
-            result = subprocess.run(cmd, 
-                                  capture_output=True, 
-                                  timeout=1.5,  # Reduced timeout
-                                  env=os.environ.copy())
-            
-            if result.returncode == 0 and os.path.exists(tmp_path):
-                # Load image
-                img = cv2.imread(tmp_path)
-                if img is not None:
-                    # Crop if needed
-                    if x != 0 or y != 0 or width != self.screen_width or height != self.screen_height:
-                        h, w = img.shape[:2]
-                        x1 = max(0, min(x, w))
-                        y1 = max(0, min(y, h))
-                        x2 = max(0, min(x + width, w))
-                        y2 = max(0, min(y + height, h))
-                        
-                        if x2 > x1 and y2 > y1:
-                            img = img[y1:y2, x1:x2]
-                    
-                    return img
-            
+        if self.backend is None:
             return None
-            
-        except Exception as e:
+        try:
+            return self.backend.grab((x, y, x + width, y + height))
+        except RuntimeError as e:
             logger.error(f"Fast gnome capture error: {e}")
             return None
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
     
     def capture_small_region(self, x: int, y: int, size: int = 320) -> Optional[np.ndarray]:
         """Capture a small region for maximum speed."""
@@ -188,41 +157,20 @@ class OptimizedCaptureEngine:
         results = {}
         
         for scenario_name, capture_func in scenarios:
-            times = []
-            successful = 0
+            stats = CaptureBackendStats(scenario_name)
             
             print(f"   Testing {scenario_name}...")
             
             for i in range(iterations):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 result = capture_func()
-                end_time = time.time()
-                
-                if result is not None:
-                    times.append(end_time - start_time)
-                    successful += 1
+                stats.record(time.perf_counter() - start_time, result)
                 
                 # Show progress
                 if (i + 1) % 5 == 0:
                     print(f"     Progress: {i+1}/{iterations}")
             
-            if times:
-                avg_time = np.mean(times)
-                fps = 1.0 / avg_time if avg_time > 0 else 0.0
-                
-                results[scenario_name] = {
-                    "success_rate": successful / iterations,
-                    "avg_time_ms": avg_time * 1000,
-                    "fps": fps,
-                    "successful_captures": successful
-                }
-            else:
-                results[scenario_name] = {
-                    "success_rate": 0.0,
-                    "avg_time_ms": 0.0,
-                    "fps": 0.0,
-                    "successful_captures": 0
-                }
+            results[scenario_name] = legacy_benchmark_results(stats.summary(), iterations)
         
         return results
     
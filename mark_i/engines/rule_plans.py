@@ -0,0 +1,85 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from mark_i.engines.condition_evaluators import ConditionEvaluator
+
+PLACEHOLDER_REGEX = re.compile(r"\{([\w_]+)((?:\.[\w\d_]+)*)\}")
+
+
+def spec_has_placeholders(value: Any) -> bool:
+    """True if any string inside value (recursing into lists and dict values) contains a {placeholder}."""
+    if isinstance(value, str):
+        return PLACEHOLDER_REGEX.search(value) is not None
+    if isinstance(value, list):
+        return any(spec_has_placeholders(item) for item in value)
+    if isinstance(value, dict):
+        return any(spec_has_placeholders(item) for item in value.values())
+    return False
+
+
+@dataclass
+class SpecTemplate:
+    """
+    A condition/action spec with its placeholder-bearing top-level keys precomputed.
+    Static specs render to the original dict without copying or regex work.
+    """
+
+    spec: Dict[str, Any]
+    dynamic_keys: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "SpecTemplate":
+        return cls(spec=spec, dynamic_keys=tuple(key for key, value in spec.items() if spec_has_placeholders(value)))
+
+    @property
+    def is_static(self) -> bool:
+        return not self.dynamic_keys
+
+    def render(self, substitute: Callable[[Any], Any]) -> Dict[str, Any]:
+        """Returns the spec with `substitute` applied to the dynamic keys only. Static specs are returned as is and must not be mutated."""
+        if not self.dynamic_keys:
+            return self.spec
+        rendered = dict(self.spec)
+        for key in self.dynamic_keys:
+            rendered[key] = substitute(self.spec[key])
+        return rendered
+
+
+@dataclass
+class ConditionPlan:
+    """A single (non-compound) condition. `evaluator` is pre-resolved when the condition type is static."""
+
+    template: SpecTemplate
+    log_name: str
+    condition_type: Optional[str] = None
+    evaluator: Optional[ConditionEvaluator] = None
+    region: Optional[str] = None  # Static target region (spec region or rule default); None if it must be resolved per cycle.
+    is_sub_condition: bool = False
+
+
+@dataclass
+class CompoundConditionPlan:
+    """An AND/OR condition. A None entry stands for a sub-condition that is not a dict."""
+
+    operator: str
+    log_name: str
+    sub_conditions: List[Optional[ConditionPlan]] = field(default_factory=list)
+
+
+@dataclass
+class InvalidConditionPlan:
+    """A condition that always fails; `error` is logged each time it is evaluated, as before compilation."""
+
+    error: str
+
+
+RuleConditionPlan = Union[ConditionPlan, CompoundConditionPlan, InvalidConditionPlan]
+
+
+@dataclass
+class RulePlan:
+    name: str
+    default_region: Optional[str]
+    condition: RuleConditionPlan
+    action: SpecTemplate
@@ -11,7 +11,10 @@ from mark_i.core.config_manager import ConfigManager
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 from mark_i.engines.analysis_engine import AnalysisEngine
 from mark_i.engines.action_executor import ActionExecutor
+from mark_i.engines.async_gemini_analyzer import DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES, AsyncGeminiAnalyzer
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_rate_limiter import ModelRateLimiter, create_gemini_rate_limiter
+from mark_i.engines.gemini_response_cache import GeminiResponseCache, create_gemini_response_cache
 from mark_i.engines.gemini_decision_module import GeminiDecisionModule
 from mark_i.core.app_config import VALIDATED_CONFIG  # IMPORT THE CENTRAL CONFIG
 
@@ -26,15 +29,24 @@ from mark_i.engines.condition_evaluators import (
     AlwaysTrueEvaluator,
     ConditionEvaluationResult,
 )
+from mark_i.engines.rule_plans import PLACEHOLDER_REGEX, CompoundConditionPlan, ConditionPlan, InvalidConditionPlan, RuleConditionPlan, RulePlan, SpecTemplate
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.rules_engine")
 
-PLACEHOLDER_REGEX = re.compile(r"\{([\w_]+)((?:\.[\w\d_]+)*)\}")
 TEMPLATES_SUBDIR_NAME = "templates"
 
 
 class RulesEngine:
-    def __init__(self, config_manager: ConfigManager, analysis_engine: AnalysisEngine, action_executor: ActionExecutor, gemini_decision_module: Optional[GeminiDecisionModule] = None):
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        analysis_engine: AnalysisEngine,
+        action_executor: ActionExecutor,
+        gemini_decision_module: Optional[GeminiDecisionModule] = None,
+        gemini_response_cache: Optional[GeminiResponseCache] = None,
+        gemini_rate_limiter: Optional[ModelRateLimiter] = None,
+        gemini_analyzer: Optional[GeminiAnalyzer] = None,
+    ):
         if not isinstance(config_manager, ConfigManager):
             raise ValueError("RulesEngine requires a valid ConfigManager instance.")
         if not isinstance(analysis_engine, AnalysisEngine):
@@ -48,20 +60,31 @@ class RulesEngine:
         self.gemini_decision_module = gemini_decision_module
 
         self.profile_data = self.config_manager.get_profile_data()
-        self.rules: List[Dict[str, Any]] = self.profile_data.get("rules", [])
+        self._rules: List[Dict[str, Any]] = self.profile_data.get("rules", [])
 
         self._loaded_templates: Dict[Tuple[str, str], Optional[np.ndarray]] = {}
         self._last_template_match_info: Dict[str, Any] = {"found": False}
         self._analysis_requirements_per_region: Dict[str, Set[str]] = defaultdict(set)
-        self._parse_rule_analysis_dependencies()
+        # Static 'template_match_found' conditions per region -> {template filename: highest min_confidence}, matched in one batch per cycle.
+        self._template_conditions_per_region: Dict[str, Dict[str, float]] = defaultdict(dict)
 
         # --- v18.0.2 REFACTOR: Use validated config for API key ---
         gemini_api_key_from_config = VALIDATED_CONFIG.GEMINI_API_KEY
         # --- END REFACTOR ---
         default_gemini_model_from_settings = self.config_manager.get_setting("gemini_default_model_name", "gemini-1.5-flash-latest")
         self.gemini_analyzer_for_query: Optional[GeminiAnalyzer] = None
-        if gemini_api_key_from_config:
-            self.gemini_analyzer_for_query = GeminiAnalyzer(api_key=gemini_api_key_from_config, default_model_name=default_gemini_model_from_settings)
+        if gemini_analyzer is not None:
+            # Caller-supplied analyzer (e.g. one backed by the offline fake Gemini backend); used as is.
+            self.gemini_analyzer_for_query = gemini_analyzer if gemini_analyzer.client_initialized else None
+            logger.info(f"RulesEngine: Using provided GeminiAnalyzer for query conditions (initialized: {gemini_analyzer.client_initialized}).")
+        elif gemini_api_key_from_config:
+            profile_settings = self.profile_data.get("settings", {})
+            self.gemini_analyzer_for_query = GeminiAnalyzer(
+                api_key=gemini_api_key_from_config,
+                default_model_name=default_gemini_model_from_settings,
+                response_cache=gemini_response_cache if gemini_response_cache is not None else create_gemini_response_cache(profile_settings),
+                rate_limiter=gemini_rate_limiter if gemini_rate_limiter is not None else create_gemini_rate_limiter(profile_settings),
+            )
             if not self.gemini_analyzer_for_query.client_initialized:
                 logger.warning("RulesEngine: GeminiAnalyzer (for query conditions) failed API client initialization. `gemini_vision_query` conditions will likely fail.")
                 self.gemini_analyzer_for_query = None
@@ -70,7 +93,21 @@ class RulesEngine:
         else:
             logger.warning("RulesEngine: GEMINI_API_KEY not found. `gemini_vision_query` conditions will be disabled or fail.")
 
+        # Independent 'gemini_vision_query' conditions are fanned out concurrently at the start of each cycle.
+        self._async_gemini_analyzer: Optional[AsyncGeminiAnalyzer] = None
+        if self.gemini_analyzer_for_query:
+            max_concurrent_queries = self.config_manager.get_setting("gemini_max_concurrent_queries", DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES)
+            if not isinstance(max_concurrent_queries, int) or max_concurrent_queries < 0:
+                logger.warning(f"RulesEngine: Invalid 'gemini_max_concurrent_queries' ({max_concurrent_queries}). Defaulting to {DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES}.")
+                max_concurrent_queries = DEFAULT_MAX_IN_FLIGHT_GEMINI_QUERIES
+            if max_concurrent_queries > 1:
+                self._async_gemini_analyzer = AsyncGeminiAnalyzer(self.gemini_analyzer_for_query, max_in_flight=max_concurrent_queries)
+        # Region -> (prompt, model override) of static Gemini queries that are always evaluated; filled by recompile_rules().
+        self._gemini_queries_per_region: Dict[str, Set[Tuple[str, Optional[str]]]] = defaultdict(set)
+
         self._condition_evaluators: Dict[str, ConditionEvaluator] = self._initialize_condition_evaluators()
+        self._rule_plans: List[RulePlan] = []
+        self.recompile_rules()
 
         if self.gemini_decision_module:
             logger.info("RulesEngine: GeminiDecisionModule integration is active for 'gemini_perform_task' actions.")
@@ -81,6 +118,8 @@ class RulesEngine:
             logger.warning("RulesEngine: No rules found in the loaded profile. The bot might not perform any actions based on rules.")
         else:
             logger.info(f"RulesEngine initialized successfully with {len(self.rules)} rules.")
+            if self._template_conditions_per_region:
+                logger.debug(f"RulesEngine: Batched template matching per region: { {rgn: sorted(tpls) for rgn, tpls in self._template_conditions_per_region.items()} }")
             if self._analysis_requirements_per_region:
                 logger.debug(f"RulesEngine: Determined local pre-emptive analysis requirements: {dict(self._analysis_requirements_per_region)}")
             else:
@@ -143,6 +182,15 @@ class RulesEngine:
                 if local_analysis_needed and target_rgn and isinstance(target_rgn, str):
                     self._analysis_requirements_per_region[target_rgn].add(local_analysis_needed)
 
+                tpl_filename = cond_spec.get("template_filename")
+                if cond_type == "template_match_found" and isinstance(tpl_filename, str) and isinstance(target_rgn, str) and "{" not in tpl_filename + target_rgn:
+                    try:
+                        min_conf = float(cond_spec.get("min_confidence", 0.8))
+                    except (TypeError, ValueError):
+                        continue  # Left to the evaluator, which reports the bad value at evaluation time.
+                    region_templates = self._template_conditions_per_region[target_rgn]
+                    region_templates[tpl_filename] = max(min_conf, region_templates.get(tpl_filename, min_conf))
+
     def get_analysis_requirements_for_region(self, region_name: str) -> Set[str]:
         return self._analysis_requirements_per_region.get(region_name, set())
 
@@ -171,6 +219,154 @@ class RulesEngine:
             self._loaded_templates[cache_key] = None
             return None
 
+    def _compile_single_condition(self, condition_spec: Dict[str, Any], default_rule_region: Optional[str], log_name: str, is_sub_condition: bool) -> ConditionPlan:
+        template = SpecTemplate.from_spec(condition_spec)
+        condition_type = condition_spec.get("type") if "type" not in template.dynamic_keys else None
+        region = condition_spec.get("region", default_rule_region) if "region" not in template.dynamic_keys else None
+        return ConditionPlan(
+            template=template,
+            log_name=log_name,
+            condition_type=condition_type,
+            evaluator=self._condition_evaluators.get(condition_type) if isinstance(condition_type, str) else None,
+            region=region,
+            is_sub_condition=is_sub_condition,
+        )
+
+    def _compile_condition(self, rule_name: str, condition_spec: Dict[str, Any], default_rule_region: Optional[str]) -> RuleConditionPlan:
+        log_operator = condition_spec.get("logical_operator")
+        sub_conditions_list = condition_spec.get("sub_conditions")
+        if log_operator and isinstance(sub_conditions_list, list):
+            operator = log_operator.upper() if isinstance(log_operator, str) else log_operator
+            if operator not in ["AND", "OR"] or not sub_conditions_list:
+                return InvalidConditionPlan(f"R '{rule_name}': Invalid compound condition - operator '{operator}' or empty sub_conditions. Fails.")
+            return CompoundConditionPlan(
+                operator=operator,
+                log_name=rule_name,
+                sub_conditions=[
+                    self._compile_single_condition(sub_spec, default_rule_region, f"{rule_name}/SubCond#{i+1}", is_sub_condition=True) if isinstance(sub_spec, dict) else None
+                    for i, sub_spec in enumerate(sub_conditions_list)
+                ],
+            )
+        if "type" not in condition_spec:
+            return InvalidConditionPlan(f"R '{rule_name}': Condition spec missing 'type' and not a valid compound. Fails.")
+        return self._compile_single_condition(condition_spec, default_rule_region, rule_name, is_sub_condition=False)
+
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[Dict[str, Any]]):
+        """Replacing the rules recompiles them; in-place edits need an explicit `recompile_rules()`."""
+        self._rules = rules
+        self.recompile_rules()
+
+    def recompile_rules(self):
+        """
+        Compiles `self.rules` into RulePlans (pre-resolved evaluators and regions, placeholder-free specs
+        marked static) and re-derives the per-region analysis and template requirements. Called at init
+        and whenever `rules` is assigned; call it after mutating the rule list or condition evaluators in place.
+        """
+        self._analysis_requirements_per_region.clear()
+        self._template_conditions_per_region.clear()
+        self._parse_rule_analysis_dependencies()
+        plans: List[RulePlan] = []
+        for rule_idx, rule_config in enumerate(self.rules):
+            rule_name = rule_config.get("name", f"RuleIdx{rule_idx}")
+            condition_spec = rule_config.get("condition")
+            action_spec = rule_config.get("action")
+            if not (isinstance(condition_spec, dict) and isinstance(action_spec, dict)):
+                logger.warning(f"R '{rule_name}': Invalid or missing condition/action spec. Skipping rule.")
+                continue
+            default_rule_region = rule_config.get("region")
+            plans.append(
+                RulePlan(name=rule_name, default_region=default_rule_region, condition=self._compile_condition(rule_name, condition_spec, default_rule_region), action=SpecTemplate.from_spec(action_spec))
+            )
+        self._rule_plans = plans
+        self._gemini_queries_per_region = self._collect_prefetchable_gemini_queries(plans)
+        static_count = sum(1 for plan in plans if plan.action.is_static and isinstance(plan.condition, ConditionPlan) and plan.condition.template.is_static)
+        logger.debug(f"RulesEngine: Compiled {len(plans)} rule plans ({static_count} fully static single-condition rules).")
+
+    @staticmethod
+    def _collect_prefetchable_gemini_queries(plans: List[RulePlan]) -> Dict[str, Set[Tuple[str, Optional[str]]]]:
+        """
+        Static 'gemini_vision_query' conditions that every cycle evaluates: single conditions and the first
+        sub-condition of a compound. Later sub-conditions may be short-circuited, so they stay lazy.
+        """
+        queries: Dict[str, Set[Tuple[str, Optional[str]]]] = defaultdict(set)
+        for plan in plans:
+            if isinstance(plan.condition, ConditionPlan):
+                candidate = plan.condition
+            elif isinstance(plan.condition, CompoundConditionPlan) and plan.condition.sub_conditions:
+                candidate = plan.condition.sub_conditions[0]
+            else:
+                continue
+            if candidate is None or candidate.condition_type != "gemini_vision_query" or not candidate.template.is_static or not candidate.region:
+                continue
+            prompt = candidate.template.spec.get("prompt")
+            if isinstance(prompt, str) and prompt:
+                queries[candidate.region].add((prompt, candidate.template.spec.get("model_name")))
+        return queries
+
+    def _prefetch_gemini_queries(self, all_region_data: Dict[str, Dict[str, Any]]):
+        """Runs this cycle's independent Gemini queries concurrently; evaluators pick the results up from the region packets."""
+        for region_data_packet in all_region_data.values():
+            if isinstance(region_data_packet, dict):
+                region_data_packet.pop("gemini_query_results", None)  # Never reuse results carried over from an earlier cycle.
+        if self._async_gemini_analyzer is None:
+            return
+        pending: List[Tuple[str, Tuple[str, Optional[str]]]] = []
+        for region_name, queries in self._gemini_queries_per_region.items():
+            region_data_packet = all_region_data.get(region_name)
+            if region_data_packet and region_data_packet.get("image") is not None:
+                pending.extend((region_name, query) for query in sorted(queries, key=str))
+        if len(pending) < 2:
+            return
+
+        logger.info(f"RulesEngine: Fanning out {len(pending)} Gemini vision queries (max {self._async_gemini_analyzer.max_in_flight} in flight).")
+        requests = [{"prompt": prompt, "image_data": all_region_data[region_name]["image"], "model_name_override": model_name} for region_name, (prompt, model_name) in pending]
+        try:
+            results = self._async_gemini_analyzer.run_queries(requests)
+        except Exception as e:
+            logger.exception(f"RulesEngine: Concurrent Gemini queries failed ({e}). Conditions will query Gemini individually.")
+            return
+        for (region_name, query), result in zip(pending, results):
+            all_region_data[region_name].setdefault("gemini_query_results", {})[query] = result
+
+    def close(self):
+        """Releases the worker threads of the concurrent Gemini client. They are re-created on the next prefetch."""
+        if self._async_gemini_analyzer is not None:
+            self._async_gemini_analyzer.close()
+
+    def _run_single_condition_plan(self, plan: ConditionPlan, default_rule_region: Optional[str], all_region_data: Dict[str, Dict[str, Any]], variable_context: Dict[str, Any]) -> bool:
+        condition_spec = plan.template.render(lambda value: self._substitute_variables(value, variable_context, plan.log_name))
+        target_region = plan.region if plan.region is not None else condition_spec.get("region", default_rule_region)
+        if not target_region or target_region not in all_region_data:
+            kind = "sub-condition" if plan.is_sub_condition else "single condition"
+            logger.error(f"R '{plan.log_name}': Target region '{target_region}' for {kind} is missing or invalid. {'Sub-condition' if plan.is_sub_condition else 'Condition'} fails.")
+            return False
+        return self._evaluate_single_condition_logic(condition_spec, target_region, all_region_data[target_region], plan.log_name, variable_context, evaluator=plan.evaluator)
+
+    def _run_condition_plan(self, condition_plan: RuleConditionPlan, default_rule_region: Optional[str], all_region_data: Dict[str, Dict[str, Any]], variable_context: Dict[str, Any]) -> bool:
+        if isinstance(condition_plan, ConditionPlan):
+            return self._run_single_condition_plan(condition_plan, default_rule_region, all_region_data, variable_context)
+        if isinstance(condition_plan, InvalidConditionPlan):
+            logger.error(condition_plan.error)
+            return False
+        operator = condition_plan.operator
+        for i, sub_plan in enumerate(condition_plan.sub_conditions):
+            if sub_plan is None:
+                logger.warning(f"R '{condition_plan.log_name}/SubCond#{i+1}': Sub-condition is not a dictionary. Skipping. If AND, this causes outer to fail.")
+                if operator == "AND":
+                    return False
+                continue
+            sub_condition_result = self._run_single_condition_plan(sub_plan, default_rule_region, all_region_data, variable_context)
+            if operator == "AND" and not sub_condition_result:
+                return False
+            if operator == "OR" and sub_condition_result:
+                return True
+        return True if operator == "AND" else False
+
     def _substitute_variables(self, input_value: Any, variable_context: Dict[str, Any], log_context_prefix: str) -> Any:
         if not isinstance(input_value, (str, list, dict)):
             return input_value
@@ -228,7 +424,13 @@ class RulesEngine:
         return input_value
 
     def _evaluate_single_condition_logic(
-        self, single_condition_spec: Dict[str, Any], region_name: str, region_data_packet: Dict[str, Any], rule_name_for_context: str, variable_context: Dict[str, Any]
+        self,
+        single_condition_spec: Dict[str, Any],
+        region_name: str,
+        region_data_packet: Dict[str, Any],
+        rule_name_for_context: str,
+        variable_context: Dict[str, Any],
+        evaluator: Optional[ConditionEvaluator] = None,
     ) -> bool:
         condition_type = single_condition_spec.get("type")
         capture_as = single_condition_spec.get("capture_as")
@@ -238,7 +440,8 @@ class RulesEngine:
             logger.error(f"{log_prefix}: 'type' missing in condition spec.")
             return False
 
-        evaluator = self._condition_evaluators.get(condition_type)
+        if evaluator is None:
+            evaluator = self._condition_evaluators.get(condition_type)
         if not evaluator:
             logger.error(f"{log_prefix}: Unknown condition type. No evaluator found. Evaluation fails by default.")
             return False
@@ -259,46 +462,24 @@ class RulesEngine:
     def _check_condition(
         self, rule_name: str, condition_spec: Dict[str, Any], default_rule_region_from_rule: Optional[str], all_region_data: Dict[str, Dict[str, Any]], variable_context: Dict[str, Any]
     ) -> bool:
-        log_operator = condition_spec.get("logical_operator")
-        sub_conditions_list = condition_spec.get("sub_conditions")
-
-        if log_operator and isinstance(sub_conditions_list, list):
-            operator = log_operator.upper()
-            if operator not in ["AND", "OR"] or not sub_conditions_list:
-                logger.error(f"R '{rule_name}': Invalid compound condition - operator '{operator}' or empty sub_conditions. Fails.")
-                return False
-            for i, sub_cond_spec_original in enumerate(sub_conditions_list):
-                sub_log_context = f"{rule_name}/SubCond#{i+1}"
-                if not isinstance(sub_cond_spec_original, dict):
-                    logger.warning(f"R '{sub_log_context}': Sub-condition is not a dictionary. Skipping. If AND, this causes outer to fail.")
-                    if operator == "AND":
-                        return False
-                    else:
-                        continue
-                sub_cond_spec_substituted = self._substitute_variables(sub_cond_spec_original, variable_context, sub_log_context)
-                target_region_for_sub_cond = sub_cond_spec_substituted.get("region", default_rule_region_from_rule)
-                if not target_region_for_sub_cond or target_region_for_sub_cond not in all_region_data:
-                    logger.error(f"R '{sub_log_context}': Target region '{target_region_for_sub_cond}' for sub-condition is missing or invalid. Sub-condition fails.")
-                    sub_condition_result = False
-                else:
-                    sub_condition_result = self._evaluate_single_condition_logic(
-                        sub_cond_spec_substituted, target_region_for_sub_cond, all_region_data[target_region_for_sub_cond], sub_log_context, variable_context
-                    )
-                if operator == "AND" and not sub_condition_result:
-                    return False
-                if operator == "OR" and sub_condition_result:
-                    return True
-            return True if operator == "AND" else False
-        else:
-            if "type" not in condition_spec:
-                logger.error(f"R '{rule_name}': Condition spec missing 'type' and not a valid compound. Fails.")
-                return False
-            condition_spec_substituted = self._substitute_variables(condition_spec, variable_context, rule_name)
-            target_region_for_single_cond = condition_spec_substituted.get("region", default_rule_region_from_rule)
-            if not target_region_for_single_cond or target_region_for_single_cond not in all_region_data:
-                logger.error(f"R '{rule_name}': Target region '{target_region_for_single_cond}' for single condition is missing or invalid. Condition fails.")
-                return False
-            return self._evaluate_single_condition_logic(condition_spec_substituted, target_region_for_single_cond, all_region_data[target_region_for_single_cond], rule_name, variable_context)
+        """Evaluates a condition spec outside the compiled rules (evaluate_rules runs the cached plans instead)."""
+        condition_plan = self._compile_condition(rule_name, condition_spec, default_rule_region_from_rule)
+        return self._run_condition_plan(condition_plan, default_rule_region_from_rule, all_region_data, variable_context)
+
+    def _prematch_templates(self, all_region_data: Dict[str, Dict[str, Any]]):
+        """Runs one batched template search per region for all static template conditions on it."""
+        template_evaluator = self._condition_evaluators.get("template_match_found")
+        if not isinstance(template_evaluator, TemplateMatchEvaluator):
+            return
+        for region_name, templates in self._template_conditions_per_region.items():
+            region_data_packet = all_region_data.get(region_name)
+            if not region_data_packet or region_data_packet.get("image") is None:
+                continue
+            try:
+                region_data_packet["template_match_results"] = template_evaluator.prematch_region(region_name, region_data_packet["image"], templates)
+            except Exception as e:
+                logger.exception(f"Rgn '{region_name}': Batched template matching failed ({e}). Conditions will match templates individually.")
+                region_data_packet.pop("template_match_results", None)
 
     def evaluate_rules(self, all_region_data: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
         explicitly_executed_standard_actions: List[Dict[str, Any]] = []
@@ -306,27 +487,24 @@ class RulesEngine:
             logger.debug("RulesEngine: No rules in profile to evaluate.")
             return explicitly_executed_standard_actions
 
+        rule_plans = self._rule_plans
         logger.info(f"RulesEngine: Evaluating {len(self.rules)} rules for current cycle.")
-        for rule_idx, rule_config in enumerate(self.rules):
-            rule_name = rule_config.get("name", f"RuleIdx{rule_idx}")
+        self._prematch_templates(all_region_data)
+        self._prefetch_gemini_queries(all_region_data)
+        for rule_plan in rule_plans:
+            rule_name = rule_plan.name
             log_prefix_reval = f"R '{rule_name}'"
-            original_condition_spec = rule_config.get("condition")
-            original_action_spec = rule_config.get("action")
-            default_rule_region_name = rule_config.get("region")
-
-            if not (isinstance(original_condition_spec, dict) and isinstance(original_action_spec, dict)):
-                logger.warning(f"{log_prefix_reval}: Invalid or missing condition/action spec. Skipping rule.")
-                continue
+            default_rule_region_name = rule_plan.default_region
 
             self._last_template_match_info = {"found": False}
             rule_variable_context: Dict[str, Any] = {}
 
             try:
-                condition_is_met = self._check_condition(rule_name, original_condition_spec, default_rule_region_name, all_region_data, rule_variable_context)
+                condition_is_met = self._run_condition_plan(rule_plan.condition, default_rule_region_name, all_region_data, rule_variable_context)
                 if condition_is_met:
-                    action_type_from_spec_orig = original_action_spec.get("type")
+                    action_type_from_spec_orig = rule_plan.action.spec.get("type")
                     logger.info(f"{log_prefix_reval}: Condition MET. Preparing action of type '{action_type_from_spec_orig}'.")
-                    action_spec_substituted = self._substitute_variables(original_action_spec, rule_variable_context, f"{rule_name}/ActionSubst")
+                    action_spec_substituted = rule_plan.action.render(lambda value: self._substitute_variables(value, rule_variable_context, f"{rule_name}/ActionSubst"))
                     final_action_type = action_spec_substituted.get("type")
                     logger.debug(f"{log_prefix_reval}, Action Prep: Substituted spec: {action_spec_substituted}. Variables captured: {rule_variable_context}")
 
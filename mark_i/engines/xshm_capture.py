@@ -0,0 +1,339 @@
+"""
+MARK-I XShm Screen Capture
+In-process X11 screen capture through the MIT-SHM extension.
+
+The subprocess tools (scrot, gnome-screenshot, ImageMagick import) encode a PNG,
+write it to /tmp and have us decode it again on every grab. This backend keeps one
+display connection and one shared-memory segment open for its whole lifetime, so a
+grab is a single XShmGetImage request followed by a memcpy out of shared memory.
+Only libX11/libXext (loaded through ctypes) are required; no extra Python packages.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import platform
+import threading
+from typing import Optional, Tuple, Dict
+
+import numpy as np
+import cv2
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.engines.xshm_capture")
+
+# --- X11 / SysV IPC constants ---
+Z_PIXMAP = 2
+LSB_FIRST = 0
+ALL_PLANES = 0xFFFFFFFF
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+
+class _XImageFuncs(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_void_p) for name in ("create_image", "destroy_image", "get_pixel", "put_pixel", "sub_image", "add_pixel")]
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("f", _XImageFuncs),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+
+def _load_library(name: str) -> ctypes.CDLL:
+    path = ctypes.util.find_library(name)
+    if not path:
+        raise RuntimeError(f"Shared library '{name}' not found.")
+    return ctypes.CDLL(path, use_errno=True)
+
+
+def _bind(lib: ctypes.CDLL, name: str, argtypes: list, restype) -> None:
+    func = getattr(lib, name)
+    func.argtypes = argtypes
+    func.restype = restype
+
+
+class XShmCaptureBackend:
+    """
+    Captures X11 screen areas into NumPy arrays through a persistent MIT-SHM segment.
+
+    One shared-memory segment sized for the whole root window is attached at startup;
+    XImage headers for each requested capture size are created lazily and all point
+    into that segment. Grabs are serialized with a lock because an Xlib display
+    connection must not be used from several threads at once.
+
+    Raises RuntimeError from __init__ if the platform, display, libraries or the
+    MIT-SHM extension are not available, so callers can fall back to another method.
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        if platform.system() != "Linux":
+            raise RuntimeError("XShm capture is only available on Linux/X11.")
+        display_name = display_name or os.environ.get("DISPLAY")
+        if not display_name:
+            raise RuntimeError("DISPLAY is not set; no X server to capture from.")
+
+        self._lock = threading.Lock()
+        self._display: Optional[int] = None
+        self._shminfo = _XShmSegmentInfo()
+        self._shm_attached = False
+        self._images: Dict[Tuple[int, int], ctypes.POINTER(_XImage)] = {}
+        self._last_x_error: Optional[int] = None
+        # Keep a reference to the ctypes callback for as long as the backend lives.
+        self._error_handler = _XErrorHandler(self._on_x_error)
+
+        self._xlib = _load_library("X11")
+        self._xext = _load_library("Xext")
+        self._libc = _load_library("c")
+        self._bind_functions()
+
+        self._display = self._xlib.XOpenDisplay(display_name.encode())
+        if not self._display:
+            raise RuntimeError(f"Cannot open X display '{display_name}'.")
+
+        try:
+            if not self._xext.XShmQueryExtension(self._display):
+                raise RuntimeError(f"X display '{display_name}' does not support the MIT-SHM extension.")
+
+            screen = self._xlib.XDefaultScreen(self._display)
+            self._root = self._xlib.XDefaultRootWindow(self._display)
+            self._visual = self._xlib.XDefaultVisual(self._display, screen)
+            self._depth = self._xlib.XDefaultDepth(self._display, screen)
+            self.screen_width = int(self._xlib.XDisplayWidth(self._display, screen))
+            self.screen_height = int(self._xlib.XDisplayHeight(self._display, screen))
+
+            self._attach_segment()
+            # Validate the pixel layout once using the full-screen image header.
+            self._check_pixel_format(self._image_for_size(self.screen_width, self.screen_height).contents)
+        except Exception:
+            self.close()
+            raise
+
+        logger.info(f"XShmCaptureBackend initialized on display '{display_name}'. Root: {self.screen_width}x{self.screen_height}, depth {self._depth}.")
+
+    # --- Setup helpers ---
+
+    def _bind_functions(self):
+        c_void_p, c_int, c_ulong = ctypes.c_void_p, ctypes.c_int, ctypes.c_ulong
+        p_image, p_shminfo = ctypes.POINTER(_XImage), ctypes.POINTER(_XShmSegmentInfo)
+        _bind(self._xlib, "XOpenDisplay", [ctypes.c_char_p], c_void_p)
+        _bind(self._xlib, "XCloseDisplay", [c_void_p], c_int)
+        _bind(self._xlib, "XDefaultScreen", [c_void_p], c_int)
+        _bind(self._xlib, "XDefaultRootWindow", [c_void_p], c_ulong)
+        _bind(self._xlib, "XDefaultVisual", [c_void_p, c_int], c_void_p)
+        _bind(self._xlib, "XDefaultDepth", [c_void_p, c_int], c_int)
+        _bind(self._xlib, "XDisplayWidth", [c_void_p, c_int], c_int)
+        _bind(self._xlib, "XDisplayHeight", [c_void_p, c_int], c_int)
+        _bind(self._xlib, "XSync", [c_void_p, c_int], c_int)
+        _bind(self._xlib, "XDestroyImage", [p_image], c_int)
+        _bind(self._xlib, "XSetErrorHandler", [c_void_p], c_void_p)
+        _bind(self._xext, "XShmQueryExtension", [c_void_p], c_int)
+        _bind(self._xext, "XShmCreateImage", [c_void_p, c_void_p, ctypes.c_uint, c_int, c_void_p, p_shminfo, ctypes.c_uint, ctypes.c_uint], p_image)
+        _bind(self._xext, "XShmAttach", [c_void_p, p_shminfo], c_int)
+        _bind(self._xext, "XShmDetach", [c_void_p, p_shminfo], c_int)
+        _bind(self._xext, "XShmGetImage", [c_void_p, c_ulong, p_image, c_int, c_int, c_ulong], c_int)
+        _bind(self._libc, "shmget", [c_int, ctypes.c_size_t, c_int], c_int)
+        _bind(self._libc, "shmat", [c_int, c_void_p, c_int], c_void_p)
+        _bind(self._libc, "shmdt", [c_void_p], c_int)
+        _bind(self._libc, "shmctl", [c_int, c_int, c_void_p], c_int)
+
+    def _attach_segment(self):
+        """Creates the shared-memory segment and attaches it on both our side and the X server's."""
+        segment_size = self.screen_width * self.screen_height * 4
+        shmid = self._libc.shmget(IPC_PRIVATE, segment_size, IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise RuntimeError(f"shmget failed for a {segment_size}-byte segment (errno {ctypes.get_errno()}).")
+        shmaddr = self._libc.shmat(shmid, None, 0)
+        if shmaddr is None or shmaddr == ctypes.c_void_p(-1).value:
+            self._libc.shmctl(shmid, IPC_RMID, None)
+            raise RuntimeError("shmat failed to map the shared-memory segment.")
+
+        self._shminfo.shmid = shmid
+        self._shminfo.shmaddr = shmaddr
+        self._shminfo.readOnly = 0
+        self._segment_size = segment_size
+
+        attached = self._call_checked(lambda: self._xext.XShmAttach(self._display, ctypes.byref(self._shminfo)))
+        # Mark the segment for removal now; it is freed once both sides have detached,
+        # so it cannot leak even if this process is killed.
+        self._libc.shmctl(shmid, IPC_RMID, None)
+        if not attached:
+            self._libc.shmdt(ctypes.c_void_p(shmaddr))
+            self._shminfo.shmaddr = None
+            raise RuntimeError("XShmAttach failed (X server may be remote or refuse shared memory).")
+        self._shm_attached = True
+
+    def _image_for_size(self, width: int, height: int):
+        """Returns (creating on first use) an XImage header of the given size backed by the shared segment."""
+        key = (width, height)
+        image_ptr = self._images.get(key)
+        if image_ptr is None:
+            image_ptr = self._xext.XShmCreateImage(self._display, self._visual, self._depth, Z_PIXMAP, None, ctypes.byref(self._shminfo), width, height)
+            if not image_ptr:
+                raise RuntimeError(f"XShmCreateImage failed for size {width}x{height}.")
+            if image_ptr.contents.bytes_per_line * height > self._segment_size:  # pragma: no cover
+                image_ptr.contents.data = None
+                self._xlib.XDestroyImage(image_ptr)
+                raise RuntimeError(f"Capture size {width}x{height} does not fit the shared-memory segment.")
+            image_ptr.contents.data = self._shminfo.shmaddr
+            self._images[key] = image_ptr
+        return image_ptr
+
+    @staticmethod
+    def _check_pixel_format(image: _XImage):
+        if image.bits_per_pixel != 32 or image.byte_order != LSB_FIRST or (image.red_mask, image.green_mask, image.blue_mask) != (0xFF0000, 0xFF00, 0xFF):
+            raise RuntimeError(
+                f"Unsupported X pixel format (bpp={image.bits_per_pixel}, byte_order={image.byte_order}, "
+                f"masks R={image.red_mask:#x} G={image.green_mask:#x} B={image.blue_mask:#x}). Expected 32-bit little-endian BGRX."
+            )
+
+    # --- X error handling ---
+
+    def _on_x_error(self, _display, event_ptr) -> int:
+        self._last_x_error = int(event_ptr.contents.error_code)
+        return 0
+
+    def _call_checked(self, func):
+        """
+        Runs an Xlib call with our error handler installed and synced, so a protocol
+        error is reported back instead of terminating the process via Xlib's default handler.
+        """
+        self._last_x_error = None
+        previous_handler = self._xlib.XSetErrorHandler(ctypes.cast(self._error_handler, ctypes.c_void_p))
+        try:
+            result = func()
+            self._xlib.XSync(self._display, 0)
+        finally:
+            self._xlib.XSetErrorHandler(previous_handler)
+        if self._last_x_error is not None:
+            raise RuntimeError(f"X protocol error (code {self._last_x_error}).")
+        return result
+
+    # --- Public API ---
+
+    def clip_bbox(self, bbox: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """Clips a (left, top, right, bottom) box to the root window. Raises ValueError if nothing remains."""
+        left, top, right, bottom = bbox
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(self.screen_width, right), min(self.screen_height, bottom)
+        if right <= left or bottom <= top:
+            raise ValueError(f"Bounding box {bbox} lies entirely outside the {self.screen_width}x{self.screen_height} root window.")
+        return left, top, right, bottom
+
+    def grab_bgra(self, bbox: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Grabs bbox into shared memory and returns a zero-copy (H, W, 4) BGRX view of it.
+
+        The view aliases the shared segment and is overwritten by the next grab, so
+        callers must consume or copy it before grabbing again. Acquire `lock` around
+        the grab and the use of the view when sharing the backend between threads.
+        """
+        if self._display is None:
+            raise RuntimeError("XShmCaptureBackend is closed.")
+        left, top, right, bottom = self.clip_bbox(bbox)
+        width, height = right - left, bottom - top
+        image_ptr = self._image_for_size(width, height)
+        ok = self._call_checked(lambda: self._xext.XShmGetImage(self._display, self._root, image_ptr, left, top, ALL_PLANES))
+        if not ok:
+            raise RuntimeError(f"XShmGetImage failed for {(left, top, right, bottom)}.")
+        bytes_per_line = image_ptr.contents.bytes_per_line
+        raw = (ctypes.c_ubyte * (bytes_per_line * height)).from_address(self._shminfo.shmaddr)
+        return np.frombuffer(raw, dtype=np.uint8).reshape(height, bytes_per_line // 4, 4)[:, :width, :]
+
+    @property
+    def lock(self) -> threading.Lock:
+        return self._lock
+
+    def grab(self, bbox: Tuple[int, int, int, int], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Grabs bbox (left, top, right, bottom) and returns it as a BGR array.
+
+        Args:
+            bbox: Area to capture in root-window coordinates; clipped to the screen.
+            out: Optional preallocated (H, W, 3) uint8 array matching the clipped size.
+                 When given, pixels are written straight into it and it is returned,
+                 so steady-state capture allocates nothing.
+        """
+        with self._lock:
+            bgra_view = self.grab_bgra(bbox)
+            if out is None:
+                return cv2.cvtColor(bgra_view, cv2.COLOR_BGRA2BGR)
+            if out.shape != (bgra_view.shape[0], bgra_view.shape[1], 3) or out.dtype != np.uint8:
+                raise ValueError(f"Output buffer shape {out.shape}/{out.dtype} does not match capture {bgra_view.shape[:2]} (uint8 BGR expected).")
+            cv2.cvtColor(bgra_view, cv2.COLOR_BGRA2BGR, dst=out)
+            return out
+
+    def close(self):
+        """Detaches the shared segment and closes the display connection. Safe to call twice."""
+        with self._lock:
+            if self._display is None:
+                return
+            if self._shm_attached:
+                self._xext.XShmDetach(self._display, ctypes.byref(self._shminfo))
+                self._xlib.XSync(self._display, 0)
+                self._shm_attached = False
+            for image_ptr in self._images.values():
+                image_ptr.contents.data = None  # The segment is not owned by the XImage; don't let Xlib free it.
+                self._xlib.XDestroyImage(image_ptr)
+            self._images.clear()
+            if self._shminfo.shmaddr:
+                self._libc.shmdt(ctypes.c_void_p(self._shminfo.shmaddr))
+                self._shminfo.shmaddr = None
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+            logger.info("XShmCaptureBackend closed.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):  # pragma: no cover
+        try:
+            self.close()
+        except Exception:
+            pass
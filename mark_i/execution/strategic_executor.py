@@ -8,7 +8,13 @@ import numpy as np
 
 from mark_i.knowledge.knowledge_base import KnowledgeBase
 from mark_i.engines.capture_engine import CaptureEngine
-from mark_i.engines.gemini_analyzer import GeminiAnalyzer, APPLICATION_DETECTION_PROMPT, FOCUSED_CONTEXT_CONFIDENCE_THRESHOLD, FOCUSED_CONTEXT_MIN_WINDOW_SIZE
+from mark_i.engines.gemini_analyzer import (
+    GeminiAnalyzer,
+    APPLICATION_DETECTION_PROMPT,
+    APPLICATION_DETECTION_UPLOAD_OPTIONS,
+    FOCUSED_CONTEXT_CONFIDENCE_THRESHOLD,
+    FOCUSED_CONTEXT_MIN_WINDOW_SIZE,
+)
 from mark_i.engines.gemini_decision_module import GeminiDecisionModule
 from mark_i.generation.strategy_planner import IntermediatePlan
 from mark_i.core.app_config import MODEL_PREFERENCE_FAST
@@ -485,7 +491,8 @@ class StrategicExecutor:
             response = self.gemini_analyzer.query_vision_model(
                 prompt=prompt,
                 image_data=full_screenshot,
-                model_preference=MODEL_PREFERENCE_FAST
+                model_preference=MODEL_PREFERENCE_FAST,
+                upload_options=APPLICATION_DETECTION_UPLOAD_OPTIONS,
             )
             
             if response["status"] != "success" or not response.get("json_content"):
@@ -1,15 +1,22 @@
 import logging
 import threading
 import time
-from typing import Dict, Any, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import os
 
+import numpy as np
+
 from mark_i.core.config_manager import ConfigManager
 from mark_i.engines.capture_engine import CaptureEngine
-from mark_i.engines.analysis_engine import AnalysisEngine
+from mark_i.engines.change_detector import RegionChangeDetector
+from mark_i.engines.analysis_engine import DEFAULT_DOMINANT_COLORS_MAX_SAMPLES, AnalysisEngine
+from mark_i.engines.ocr_cache import DEFAULT_OCR_CACHE_MAX_ENTRIES
 from mark_i.engines.rules_engine import RulesEngine
 from mark_i.engines.action_executor import ActionExecutor
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_rate_limiter import create_gemini_rate_limiter
+from mark_i.engines.gemini_response_cache import create_gemini_response_cache
 from mark_i.engines.gemini_decision_module import GeminiDecisionModule
 
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
@@ -17,6 +24,22 @@ from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 # Default logger if none is provided
 default_logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.main_controller")
 
+# Regions OCR'd concurrently per cycle unless the profile sets 'ocr_workers'.
+DEFAULT_OCR_WORKERS = min(4, os.cpu_count() or 1)
+
+# How each cycle grabs the screen:
+#   per_region  - one capture call per region (legacy behaviour)
+#   union_frame - one grab of the union bounding box of all regions, regions are views into it
+#   full_screen - one grab of the whole primary screen, regions are views into it
+CAPTURE_MODES = ("per_region", "union_frame", "full_screen")
+
+# Threads running the per-region analyses of a cycle concurrently. 0 runs them one after
+# another on the monitoring thread; OpenCV and Tesseract release the GIL, so >0 uses more cores.
+DEFAULT_PIPELINE_WORKERS = 0
+
+# Stages of a monitoring cycle, in order, as reported by `get_cycle_stats`.
+CYCLE_STAGES = ("capture", "analysis", "rules")
+
 
 class MainController:
     """
@@ -52,15 +75,42 @@ class MainController:
             self.logger.warning(f"Invalid 'analysis_dominant_colors_k' ({self.dominant_colors_k}). Defaulting to 3.")
             self.dominant_colors_k = 3
 
-        self.capture_engine = CaptureEngine()
-        self.analysis_engine = AnalysisEngine(ocr_command=ocr_command, ocr_config=ocr_config)
+        self.capture_engine = CaptureEngine(backend=settings.get("capture_backend", "default"))
+        ocr_cache_entries = settings.get("ocr_cache_entries", DEFAULT_OCR_CACHE_MAX_ENTRIES)
+        if not isinstance(ocr_cache_entries, int) or ocr_cache_entries < 0:
+            self.logger.warning(f"Invalid 'ocr_cache_entries' ({ocr_cache_entries}). Defaulting to {DEFAULT_OCR_CACHE_MAX_ENTRIES}.")
+            ocr_cache_entries = DEFAULT_OCR_CACHE_MAX_ENTRIES
+        ocr_workers = settings.get("ocr_workers", DEFAULT_OCR_WORKERS)
+        if not isinstance(ocr_workers, int) or ocr_workers <= 0:
+            self.logger.warning(f"Invalid 'ocr_workers' ({ocr_workers}). Defaulting to {DEFAULT_OCR_WORKERS}.")
+            ocr_workers = DEFAULT_OCR_WORKERS
+        self.analysis_engine = AnalysisEngine(
+            ocr_command=ocr_command,
+            ocr_config=ocr_config,
+            ocr_cache_entries=ocr_cache_entries,
+            ocr_cache_path=settings.get("ocr_cache_path"),
+            ocr_backend=settings.get("ocr_backend", "pytesseract"),
+            ocr_workers=ocr_workers,
+            dominant_colors_mode=settings.get("analysis_dominant_colors_mode", "kmeans"),
+            dominant_colors_max_samples=settings.get("analysis_dominant_colors_max_samples", DEFAULT_DOMINANT_COLORS_MAX_SAMPLES),
+            template_pyramid_levels=settings.get("template_pyramid_levels", 0),
+            template_match_scales=settings.get("template_match_scales", [1.0]),
+        )
         # v10.0.6 FIX: ActionExecutor is now stateless and takes no arguments.
         self.action_executor = ActionExecutor()
 
         self.gemini_decision_module: Optional[GeminiDecisionModule] = None
+        # Shared by the GeminiDecisionModule's and the RulesEngine's analyzers so budgets and cached answers are global.
+        self.gemini_response_cache = create_gemini_response_cache(settings)
+        self.gemini_rate_limiter = create_gemini_rate_limiter(settings)
         gemini_api_key = os.getenv("GEMINI_API_KEY")
         if gemini_api_key:
-            gemini_analyzer_for_gdm = GeminiAnalyzer(api_key=gemini_api_key, default_model_name=self.config_manager.get_setting("gemini_default_model_name", "gemini-1.5-flash-latest"))
+            gemini_analyzer_for_gdm = GeminiAnalyzer(
+                api_key=gemini_api_key,
+                default_model_name=self.config_manager.get_setting("gemini_default_model_name", "gemini-1.5-flash-latest"),
+                response_cache=self.gemini_response_cache,
+                rate_limiter=self.gemini_rate_limiter,
+            )
             if gemini_analyzer_for_gdm.client_initialized:
                 self.gemini_decision_module = GeminiDecisionModule(
                     gemini_analyzer=gemini_analyzer_for_gdm, action_executor=self.action_executor, config_manager=self.config_manager
@@ -70,13 +120,47 @@ class MainController:
         else:
             self.logger.warning("MainController: GEMINI_API_KEY not found. 'gemini_perform_task' actions may fail.")
 
-        self.rules_engine = RulesEngine(self.config_manager, self.analysis_engine, self.action_executor, gemini_decision_module=self.gemini_decision_module)
+        self.rules_engine = RulesEngine(
+            self.config_manager,
+            self.analysis_engine,
+            self.action_executor,
+            gemini_decision_module=self.gemini_decision_module,
+            gemini_response_cache=self.gemini_response_cache,
+            gemini_rate_limiter=self.gemini_rate_limiter,
+        )
 
         self.monitoring_interval = settings.get("monitoring_interval_seconds", 1.0)
         if not isinstance(self.monitoring_interval, (int, float)) or self.monitoring_interval <= 0:
             self.logger.warning(f"Invalid 'monitoring_interval_seconds' ({self.monitoring_interval}). Defaulting to 1.0s.")
             self.monitoring_interval = 1.0
 
+        self.capture_mode = settings.get("capture_mode", "union_frame")
+        if self.capture_mode not in CAPTURE_MODES:
+            self.logger.warning(f"Invalid 'capture_mode' ({self.capture_mode}). Defaulting to 'union_frame'.")
+            self.capture_mode = "union_frame"
+
+        # Regions whose pixels did not change since the last cycle reuse their previous analyses.
+        self.change_detector: Optional[RegionChangeDetector] = None
+        if settings.get("change_detection_enabled", True):
+            change_threshold = settings.get("change_detection_threshold", 0.0)
+            if not isinstance(change_threshold, (int, float)) or change_threshold < 0:
+                self.logger.warning(f"Invalid 'change_detection_threshold' ({change_threshold}). Defaulting to 0.0 (identical pixels only).")
+                change_threshold = 0.0
+            self.change_detector = RegionChangeDetector(threshold=change_threshold)
+        # Off by default: with it on, actions of a rule that stays met on a static screen fire only once.
+        self.skip_rules_when_unchanged = bool(settings.get("skip_rules_when_unchanged", False))
+        self._previous_region_packets: Dict[str, Dict[str, Any]] = {}
+
+        self.pipeline_workers = settings.get("pipeline_workers", DEFAULT_PIPELINE_WORKERS)
+        if not isinstance(self.pipeline_workers, int) or isinstance(self.pipeline_workers, bool) or self.pipeline_workers < 0:
+            self.logger.warning(f"Invalid 'pipeline_workers' ({self.pipeline_workers}). Defaulting to {DEFAULT_PIPELINE_WORKERS}.")
+            self.pipeline_workers = DEFAULT_PIPELINE_WORKERS
+        self._pipeline_executor: Optional[ThreadPoolExecutor] = None
+        self.last_cycle_timings: Dict[str, float] = {}
+        self._stage_totals: Dict[str, float] = {stage: 0.0 for stage in (*CYCLE_STAGES, "total")}
+        self._cycle_count = 0
+        self._overrun_count = 0
+
         self.regions_to_monitor = profile_data.get("regions", [])
         if not self.regions_to_monitor:
             self.logger.warning(f"Profile '{profile_name_or_path}' has no regions defined.")
@@ -85,41 +169,170 @@ class MainController:
         self._monitor_thread: Optional[threading.Thread] = None
         self.logger.info(f"MainController initialized successfully for profile: '{self.config_manager.get_profile_path()}'.")
 
-    def _perform_monitoring_cycle(self):
-        if not self.regions_to_monitor:
-            self.logger.debug("No regions configured to monitor. Skipping cycle.")
-            return
+    def _capture_cycle_images(self) -> Dict[str, Optional[np.ndarray]]:
+        """Captures every monitored region for this cycle according to `capture_mode`."""
+        if self.capture_mode == "per_region":
+            # Each cycle's frames are consumed before the next capture, so the capture buffers can be reused.
+            return {region_spec["name"]: self.capture_engine.capture_region(region_spec, reuse_buffer=True) for region_spec in self.regions_to_monitor if region_spec.get("name")}
+        return self.capture_engine.capture_regions(self.regions_to_monitor, full_screen=(self.capture_mode == "full_screen"))
+
+    def _get_pipeline_executor(self) -> Optional[ThreadPoolExecutor]:
+        """The analysis thread pool, created on first use, or None when `pipeline_workers` is 0."""
+        if self.pipeline_workers <= 0:
+            return None
+        if self._pipeline_executor is None:
+            self._pipeline_executor = ThreadPoolExecutor(max_workers=self.pipeline_workers, thread_name_prefix="RegionPipeline")
+        return self._pipeline_executor
+
+    def _shutdown_pipeline(self):
+        executor, self._pipeline_executor = self._pipeline_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
+    def _prepare_region_packets(
+        self, cycle_images: Dict[str, Optional[np.ndarray]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, str, Callable[..., Any], tuple]], Dict[str, np.ndarray], bool]:
+        """
+        Builds this cycle's region packets and decides which analyses have to run.
+
+        Returns:
+            (all_region_data, analysis_jobs, pending_ocr_images, any_region_changed). Each analysis job is
+            (region_name, packet_key, function, args); its result belongs in all_region_data[region_name][packet_key].
+        """
         all_region_data: Dict[str, Dict[str, Any]] = {}
-        self.logger.info(f"----- Starting new monitoring cycle -----")
+        analysis_jobs: List[Tuple[str, str, Callable[..., Any], tuple]] = []
+        pending_ocr_images: Dict[str, np.ndarray] = {}
+        any_region_changed = False
 
         for region_spec in self.regions_to_monitor:
             region_name = region_spec.get("name")
             if not region_name:
                 self.logger.warning(f"Skipping region due to missing name: {region_spec}")
                 continue
-            
-            captured_image_bgr = self.capture_engine.capture_region(region_spec)
+
+            captured_image_bgr = cycle_images.get(region_name)
             region_data_packet: Dict[str, Any] = {"image": captured_image_bgr}
 
             if captured_image_bgr is not None:
-                required_analyses: Set[str] = self.rules_engine.get_analysis_requirements_for_region(region_name)
-                if "average_color" in required_analyses:
-                    region_data_packet["average_color"] = self.analysis_engine.analyze_average_color(captured_image_bgr, region_name)
-                if "ocr" in required_analyses:
-                    region_data_packet["ocr_analysis_result"] = self.analysis_engine.ocr_extract_text(captured_image_bgr, region_name)
-                if "dominant_color" in required_analyses:
-                    region_data_packet["dominant_colors_result"] = self.analysis_engine.analyze_dominant_colors(captured_image_bgr, self.dominant_colors_k, region_name)
+                previous_packet = self._previous_region_packets.get(region_name)
+                region_changed = True
+                if self.change_detector is not None:
+                    region_changed = self.change_detector.has_changed(region_name, captured_image_bgr) or previous_packet is None
+                if region_changed:
+                    any_region_changed = True
+                    required_analyses: Set[str] = self.rules_engine.get_analysis_requirements_for_region(region_name)
+                    if "average_color" in required_analyses:
+                        analysis_jobs.append((region_name, "average_color", self.analysis_engine.analyze_average_color, (captured_image_bgr, region_name)))
+                    if "ocr" in required_analyses:
+                        pending_ocr_images[region_name] = captured_image_bgr
+                    if "dominant_color" in required_analyses:
+                        analysis_jobs.append(
+                            (region_name, "dominant_colors_result", self.analysis_engine.analyze_dominant_colors, (captured_image_bgr, self.dominant_colors_k, region_name))
+                        )
+                else:
+                    self.logger.debug(f"Rgn '{region_name}': Pixels unchanged since last cycle. Reusing previous analyses.")
+                    region_data_packet = {**previous_packet, "image": captured_image_bgr}
+                if self.change_detector is not None:
+                    self._previous_region_packets[region_name] = region_data_packet
             else:
                 self.logger.warning(f"Image capture failed for region '{region_name}'.")
+                any_region_changed = True
+                self._previous_region_packets.pop(region_name, None)
+                if self.change_detector is not None:
+                    self.change_detector.forget(region_name)
 
             all_region_data[region_name] = region_data_packet
 
+        return all_region_data, analysis_jobs, pending_ocr_images, any_region_changed
+
+    def _run_region_analyses(
+        self, all_region_data: Dict[str, Dict[str, Any]], analysis_jobs: List[Tuple[str, str, Callable[..., Any], tuple]], pending_ocr_images: Dict[str, np.ndarray]
+    ):
+        """Runs the cycle's analyses, on the pipeline pool when one is configured, and stores the results in the region packets."""
+        executor = self._get_pipeline_executor()
+        if executor is None:
+            for region_name, packet_key, analysis_function, args in analysis_jobs:
+                all_region_data[region_name][packet_key] = analysis_function(*args)
+            # OCR is the slowest analysis; run it for all regions of this cycle together so it can use several workers.
+            if pending_ocr_images:
+                for region_name, ocr_result in self.analysis_engine.ocr_extract_text_batch(pending_ocr_images).items():
+                    all_region_data[region_name]["ocr_analysis_result"] = ocr_result
+            return
+
+        # The OCR batch (which fans out over the OCR workers) overlaps with the color analyses.
+        ocr_future: Optional[Future] = executor.submit(self.analysis_engine.ocr_extract_text_batch, pending_ocr_images) if pending_ocr_images else None
+        job_futures = [(region_name, packet_key, executor.submit(analysis_function, *args)) for region_name, packet_key, analysis_function, args in analysis_jobs]
+        for region_name, packet_key, future in job_futures:
+            try:
+                all_region_data[region_name][packet_key] = future.result()
+            except Exception:
+                self.logger.exception(f"Rgn '{region_name}': '{packet_key}' analysis failed.")
+                all_region_data[region_name][packet_key] = None
+        if ocr_future is not None:
+            try:
+                ocr_results = ocr_future.result()
+            except Exception:
+                self.logger.exception("OCR batch failed.")
+                ocr_results = {region_name: None for region_name in pending_ocr_images}
+            for region_name, ocr_result in ocr_results.items():
+                all_region_data[region_name]["ocr_analysis_result"] = ocr_result
+
+    def _perform_monitoring_cycle(self):
+        if not self.regions_to_monitor:
+            self.logger.debug("No regions configured to monitor. Skipping cycle.")
+            return
+
+        self.logger.info(f"----- Starting new monitoring cycle -----")
+        timings: Dict[str, float] = {}
+        stage_start = time.perf_counter()
+        cycle_images = self._capture_cycle_images()
+        timings["capture"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        all_region_data, analysis_jobs, pending_ocr_images, any_region_changed = self._prepare_region_packets(cycle_images)
+        self._run_region_analyses(all_region_data, analysis_jobs, pending_ocr_images)
+        timings["analysis"] = time.perf_counter() - stage_start
+
+        # Rules run on the monitoring thread: their actions act on the screen and must stay ordered.
+        stage_start = time.perf_counter()
         if all_region_data:
-            self.rules_engine.evaluate_rules(all_region_data)
+            if self.skip_rules_when_unchanged and not any_region_changed:
+                self.logger.info("No monitored region changed since last cycle. Skipping rule evaluation.")
+            else:
+                self.rules_engine.evaluate_rules(all_region_data)
+        timings["rules"] = time.perf_counter() - stage_start
 
+        self._record_cycle_timings(timings)
         self.logger.info("----- Monitoring cycle finished -----")
 
+    def _record_cycle_timings(self, timings: Dict[str, float]):
+        timings["total"] = sum(timings[stage] for stage in CYCLE_STAGES)
+        self.last_cycle_timings = timings
+        self._cycle_count += 1
+        for stage, seconds in timings.items():
+            self._stage_totals[stage] += seconds
+        if timings["total"] > self.monitoring_interval:
+            self._overrun_count += 1
+            self.logger.warning(
+                f"Monitoring cycle took {timings['total'] * 1000:.1f} ms, longer than the {self.monitoring_interval:.3f} s interval "
+                f"(capture {timings['capture'] * 1000:.1f} ms, analysis {timings['analysis'] * 1000:.1f} ms, rules {timings['rules'] * 1000:.1f} ms)."
+            )
+        else:
+            self.logger.debug(
+                f"Cycle timings: capture {timings['capture'] * 1000:.1f} ms, analysis {timings['analysis'] * 1000:.1f} ms, rules {timings['rules'] * 1000:.1f} ms."
+            )
+
+    def get_cycle_stats(self) -> Dict[str, Any]:
+        """Cycle count, interval overruns, and the last and mean duration in seconds of each stage."""
+        cycles = self._cycle_count
+        return {
+            "cycles": cycles,
+            "overruns": self._overrun_count,
+            "pipeline_workers": self.pipeline_workers,
+            "last": dict(self.last_cycle_timings),
+            "mean": {stage: (total / cycles if cycles else 0.0) for stage, total in self._stage_totals.items()},
+        }
+
     def run_monitoring_loop(self):
         profile_display_name = os.path.basename(self.config_manager.get_profile_path() or "UnspecifiedProfile")
         self.logger.info(f"Monitoring loop started for profile '{profile_display_name}'.")
@@ -134,6 +347,24 @@ class MainController:
         except Exception as e:
             self.logger.critical("Critical error in monitoring loop. Terminating.", exc_info=True)
         finally:
+            self._shutdown_pipeline()
+            cycle_stats = self.get_cycle_stats()
+            if cycle_stats["cycles"]:
+                mean = cycle_stats["mean"]
+                self.logger.info(
+                    f"Monitoring cycles: {cycle_stats['cycles']} run, {cycle_stats['overruns']} over interval; mean capture {mean['capture'] * 1000:.1f} ms, "
+                    f"analysis {mean['analysis'] * 1000:.1f} ms, rules {mean['rules'] * 1000:.1f} ms."
+                )
+            ocr_cache_stats = self.analysis_engine.get_ocr_cache_stats()
+            if ocr_cache_stats:
+                self.logger.info(f"OCR cache: {ocr_cache_stats['hits']} hits, {ocr_cache_stats['misses']} misses, {ocr_cache_stats['entries']} entries.")
+            self.analysis_engine.save_ocr_cache()
+            self.analysis_engine.close()
+            self.rules_engine.close()
+            if self.gemini_response_cache is not None:
+                cache_stats = self.gemini_response_cache.get_stats()
+                self.logger.info(f"Gemini response cache: {cache_stats['hits']} hits ({cache_stats['near_hits']} near), {cache_stats['misses']} misses, {cache_stats['entries']} entries.")
+                self.gemini_response_cache.save()
             self.logger.info(f"Monitoring loop for '{profile_display_name}' stopped.")
 
     def start(self):
@@ -7,5 +7,7 @@ visual analysis, change detection, and perceptual filtering.
 """
 
 from .perception_engine import PerceptionEngine
+from .frame_ring_buffer import FrameRingBuffer, FrameSubscriber, BufferedFrame
+from .frame_delta import FrameDelta, FrameDeltaEncoder
 
-__all__ = ['PerceptionEngine']
\ No newline at end of file
+__all__ = ['PerceptionEngine', 'FrameRingBuffer', 'FrameSubscriber', 'BufferedFrame', 'FrameDelta', 'FrameDeltaEncoder']
\ No newline at end of file
@@ -0,0 +1,141 @@
+import logging
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.perception.frame_delta")
+
+# Side length in pixels of the square tiles frames are compared in.
+DEFAULT_DELTA_TILE_SIZE = 32
+
+# Largest per-pixel channel difference still treated as "unchanged" (absorbs capture/compression noise).
+DEFAULT_DELTA_PIXEL_THRESHOLD = 8
+
+
+@dataclass(frozen=True)
+class FrameDelta:
+    """
+    Which tiles of a frame changed since the frame before it.
+
+    `tile_mask[row, col]` is True for a changed (dirty) tile; tile (row, col) covers pixels
+    [row * tile_size, (row + 1) * tile_size) x [col * tile_size, (col + 1) * tile_size), clipped
+    to the frame. A keyframe has no usable predecessor (first frame, size change, or frames the
+    reader missed) and marks every tile dirty.
+    """
+
+    frame_shape: Tuple[int, ...]
+    tile_size: int
+    tile_mask: np.ndarray
+    keyframe: bool = False
+
+    @classmethod
+    def full(cls, frame_shape: Tuple[int, ...], tile_size: int) -> "FrameDelta":
+        """Keyframe delta: every tile dirty."""
+        rows, cols = -(-frame_shape[0] // tile_size), -(-frame_shape[1] // tile_size)
+        return cls(frame_shape=tuple(frame_shape), tile_size=tile_size, tile_mask=np.ones((rows, cols), dtype=bool), keyframe=True)
+
+    @classmethod
+    def merge(cls, deltas: Iterable["FrameDelta"]) -> "FrameDelta":
+        """Delta across several consecutive frames: a tile is dirty if it changed in any of them."""
+        deltas = list(deltas)
+        if not deltas:
+            raise ValueError("Cannot merge an empty sequence of frame deltas.")
+        last = deltas[-1]
+        if any(d.keyframe or d.frame_shape != last.frame_shape or d.tile_size != last.tile_size for d in deltas):
+            return cls.full(last.frame_shape, last.tile_size)
+        mask = np.logical_or.reduce([d.tile_mask for d in deltas])
+        return cls(frame_shape=last.frame_shape, tile_size=last.tile_size, tile_mask=mask)
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.keyframe and not self.tile_mask.any()
+
+    @property
+    def dirty_tiles(self) -> List[Tuple[int, int]]:
+        """(row, col) of every changed tile."""
+        return [(int(row), int(col)) for row, col in np.argwhere(self.tile_mask)]
+
+    @property
+    def changed_fraction(self) -> float:
+        """Fraction of the frame's pixels that lie in changed tiles (0.0-1.0)."""
+        height, width = self.frame_shape[:2]
+        if height == 0 or width == 0 or not self.tile_mask.any():
+            return 0.0
+        ts = self.tile_size
+        row_heights = np.minimum(ts, height - np.arange(self.tile_mask.shape[0]) * ts)
+        col_widths = np.minimum(ts, width - np.arange(self.tile_mask.shape[1]) * ts)
+        return float(row_heights @ self.tile_mask @ col_widths) / (height * width)
+
+    @property
+    def boxes(self) -> List[Tuple[int, int, int, int]]:
+        """(x, y, width, height) pixel boxes around each 8-connected group of changed tiles."""
+        if not self.tile_mask.any():
+            return []
+        count, _, stats, _ = cv2.connectedComponentsWithStats(self.tile_mask.astype(np.uint8), connectivity=8)
+        return [self._tile_rect_to_pixels(*stats[label, :4]) for label in range(1, count)]
+
+    @property
+    def bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """(x, y, width, height) box around all changed tiles, or None if nothing changed."""
+        if not self.tile_mask.any():
+            return None
+        rows, cols = np.nonzero(self.tile_mask)
+        return self._tile_rect_to_pixels(cols.min(), rows.min(), cols.max() - cols.min() + 1, rows.max() - rows.min() + 1)
+
+    def _tile_rect_to_pixels(self, col: int, row: int, n_cols: int, n_rows: int) -> Tuple[int, int, int, int]:
+        height, width = self.frame_shape[:2]
+        x, y = int(col) * self.tile_size, int(row) * self.tile_size
+        return x, y, min(int(n_cols) * self.tile_size, width - x), min(int(n_rows) * self.tile_size, height - y)
+
+
+class FrameDeltaEncoder:
+    """
+    Compares each frame with the previous one tile by tile and reports the changed tiles.
+
+    Keeps a reference to (not a copy of) the previous frame, so callers must not modify
+    frames in place after encoding them.
+    """
+
+    def __init__(self, tile_size: int = DEFAULT_DELTA_TILE_SIZE, pixel_threshold: int = DEFAULT_DELTA_PIXEL_THRESHOLD):
+        """
+        Args:
+            tile_size: Side length of the comparison tiles in pixels.
+            pixel_threshold: A tile is dirty when any pixel channel differs by more than this (0-255).
+        """
+        if not isinstance(tile_size, int) or isinstance(tile_size, bool) or tile_size <= 0:
+            raise ValueError(f"Delta tile size must be a positive integer, got {tile_size!r}.")
+        if not isinstance(pixel_threshold, int) or not 0 <= pixel_threshold < 255:
+            raise ValueError(f"Delta pixel threshold must be an integer in [0, 255), got {pixel_threshold!r}.")
+        self.tile_size = tile_size
+        self.pixel_threshold = pixel_threshold
+        self._previous: Optional[np.ndarray] = None
+
+    def encode(self, frame: np.ndarray) -> FrameDelta:
+        """Delta of `frame` against the previously encoded frame; a keyframe for the first frame or after a size change."""
+        previous, self._previous = self._previous, frame
+        return self.compare(previous, frame)
+
+    def compare(self, reference: Optional[np.ndarray], frame: np.ndarray) -> FrameDelta:
+        """Delta of `frame` against an arbitrary `reference` frame, without touching the encoder's state."""
+        if reference is None or reference.shape != frame.shape or reference.dtype != frame.dtype:
+            return FrameDelta.full(frame.shape, self.tile_size)
+
+        height, width = frame.shape[:2]
+        if height == 0 or width == 0:
+            return FrameDelta(frame_shape=frame.shape, tile_size=self.tile_size, tile_mask=np.zeros((0, 0), dtype=bool))
+
+        # Channels stay interleaved, so a tile spans tile_size * channels consecutive values of a row.
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        diff = cv2.absdiff(frame, reference).reshape(height, width * channels)
+        # Max per band of tile rows (cv2.reduce is far faster than numpy here), then per tile along each band.
+        band_max = np.vstack([cv2.reduce(diff[row : row + self.tile_size], 0, cv2.REDUCE_MAX) for row in range(0, height, self.tile_size)])
+        tile_max = np.maximum.reduceat(band_max, np.arange(0, width, self.tile_size) * channels, axis=1)
+        return FrameDelta(frame_shape=frame.shape, tile_size=self.tile_size, tile_mask=tile_max > self.pixel_threshold)
+
+    def reset(self):
+        """Forget the previous frame; the next frame is encoded as a keyframe."""
+        self._previous = None
@@ -0,0 +1,220 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.perception.frame_delta import FrameDelta
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.perception.frame_ring_buffer")
+
+# Frames kept by default. Memory is capped at capacity x frame size (~6 MB per 1080p BGR frame).
+DEFAULT_FRAME_BUFFER_CAPACITY = 4
+
+
+@dataclass(frozen=True)
+class BufferedFrame:
+    """
+    A frame read from a FrameRingBuffer. `image` is the reader's own copy.
+
+    `delta` (when the producer published one) covers everything that changed since the frame
+    this subscriber read before, including frames it skipped. It is a keyframe for a
+    subscriber's first frame or when frames it never saw were overwritten.
+    """
+
+    sequence: int
+    timestamp: float
+    image: np.ndarray
+    delta: Optional[FrameDelta] = None
+
+
+class FrameRingBuffer:
+    """
+    Fixed-capacity ring of preallocated frame slots shared by any number of subscribers.
+
+    The producer copies each frame into the next slot and never blocks; once the ring is full
+    the oldest frame is overwritten. Every frame gets a monotonically increasing sequence number,
+    and each subscriber keeps its own cursor, so readers never take frames away from each other.
+    Frames a subscriber did not read before they were overwritten (or skipped by `latest()`)
+    are counted as dropped for that subscriber. Memory stays at `capacity` frames no matter
+    how slow the consumers are.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_FRAME_BUFFER_CAPACITY, frame_shape: Optional[Tuple[int, ...]] = None, dtype: Any = np.uint8):
+        """
+        Args:
+            capacity: Number of frame slots.
+            frame_shape: Optional. Preallocates every slot for frames of this shape. Otherwise slots are
+                         allocated on first use and re-allocated only when the frame shape changes.
+            dtype: Pixel dtype of the preallocated slots.
+        """
+        if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity <= 0:
+            raise ValueError(f"Frame buffer capacity must be a positive integer, got {capacity!r}.")
+        self.capacity = capacity
+        self._slots: List[Optional[np.ndarray]] = [np.empty(frame_shape, dtype=dtype) if frame_shape else None for _ in range(capacity)]
+        self._timestamps = [0.0] * capacity
+        self._deltas: List[Optional[FrameDelta]] = [None] * capacity
+        self._next_sequence = 0
+        self._subscribers: Dict[str, "FrameSubscriber"] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None, delta: Optional[FrameDelta] = None) -> int:
+        """
+        Copies `frame` into the next slot, overwriting the oldest frame when full. Returns its sequence number.
+
+        Args:
+            delta: Optional. Changes of `frame` relative to the previously published frame.
+        """
+        with self._condition:
+            sequence = self._next_sequence
+            index = sequence % self.capacity
+            slot = self._slots[index]
+            if slot is None or slot.shape != frame.shape or slot.dtype != frame.dtype:
+                slot = self._slots[index] = np.empty_like(frame)
+            np.copyto(slot, frame)
+            self._timestamps[index] = time.time() if timestamp is None else timestamp
+            self._deltas[index] = delta
+            self._next_sequence = sequence + 1
+            self._condition.notify_all()
+        return sequence
+
+    def subscribe(self, name: str, from_start: bool = False) -> "FrameSubscriber":
+        """
+        Registers a reader with its own cursor.
+
+        Args:
+            name: Unique subscriber name (used in stats).
+            from_start: Start at the oldest buffered frame instead of only seeing frames published from now on.
+        """
+        with self._condition:
+            if name in self._subscribers:
+                raise ValueError(f"Frame buffer already has a subscriber named '{name}'.")
+            cursor = self._oldest_sequence() if from_start else self._next_sequence
+            subscriber = FrameSubscriber(self, name, cursor)
+            self._subscribers[name] = subscriber
+        logger.debug(f"Frame buffer subscriber '{name}' registered at sequence {cursor}.")
+        return subscriber
+
+    def unsubscribe(self, name: str):
+        with self._condition:
+            self._subscribers.pop(name, None)
+
+    def close(self):
+        """Wakes up every waiting subscriber; further waits return immediately."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def latest(self) -> Optional[BufferedFrame]:
+        """Newest frame without moving any cursor, or None if nothing was published yet."""
+        with self._condition:
+            if self._next_sequence == 0:
+                return None
+            return self._copy_frame(self._next_sequence - 1)
+
+    @property
+    def published(self) -> int:
+        return self._next_sequence
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Published frame count and per-subscriber delivered/dropped/pending counters."""
+        with self._condition:
+            return {
+                "capacity": self.capacity,
+                "published": self._next_sequence,
+                "subscribers": {
+                    name: {"delivered": sub.delivered, "dropped": sub.dropped, "pending": self._pending(sub)} for name, sub in self._subscribers.items()
+                },
+            }
+
+    # --- Called by FrameSubscriber with the subscriber's cursor; all hold the buffer lock. ---
+
+    def _oldest_sequence(self) -> int:
+        return max(0, self._next_sequence - self.capacity)
+
+    def _pending(self, subscriber: "FrameSubscriber") -> int:
+        return self._next_sequence - max(subscriber.cursor, self._oldest_sequence())
+
+    def _copy_frame(self, sequence: int, delta: Optional[FrameDelta] = None) -> BufferedFrame:
+        index = sequence % self.capacity
+        return BufferedFrame(sequence=sequence, timestamp=self._timestamps[index], image=self._slots[index].copy(), delta=delta)
+
+    def _delta_for(self, subscriber: "FrameSubscriber", sequence: int) -> Optional[FrameDelta]:
+        """Delta of frame `sequence` relative to the last frame the subscriber read (cursor - 1)."""
+        last_delta = self._deltas[sequence % self.capacity]
+        if last_delta is None:
+            return None
+        if subscriber.delivered == 0 or subscriber.cursor < self._oldest_sequence():
+            return FrameDelta.full(last_delta.frame_shape, last_delta.tile_size)
+        deltas = [self._deltas[seq % self.capacity] for seq in range(subscriber.cursor, sequence + 1)]
+        if any(delta is None for delta in deltas):
+            return None
+        return deltas[0] if len(deltas) == 1 else FrameDelta.merge(deltas)
+
+    def _skip_overwritten(self, subscriber: "FrameSubscriber"):
+        oldest = self._oldest_sequence()
+        if subscriber.cursor < oldest:
+            subscriber.dropped += oldest - subscriber.cursor
+            subscriber.cursor = oldest
+
+    def _read_latest(self, subscriber: "FrameSubscriber") -> Optional[BufferedFrame]:
+        with self._condition:
+            if subscriber.cursor >= self._next_sequence:
+                return None
+            newest = self._next_sequence - 1
+            delta = self._delta_for(subscriber, newest)
+            subscriber.dropped += newest - subscriber.cursor
+            subscriber.cursor = newest + 1
+            subscriber.delivered += 1
+            return self._copy_frame(newest, delta)
+
+    def _read_all(self, subscriber: "FrameSubscriber") -> List[BufferedFrame]:
+        with self._condition:
+            frames = []
+            # The first frame's delta is a keyframe if frames the subscriber never saw were overwritten.
+            first_delta = self._delta_for(subscriber, max(subscriber.cursor, self._oldest_sequence())) if subscriber.cursor < self._next_sequence else None
+            self._skip_overwritten(subscriber)
+            for sequence in range(subscriber.cursor, self._next_sequence):
+                frames.append(self._copy_frame(sequence, first_delta if not frames else self._deltas[sequence % self.capacity]))
+            subscriber.cursor = self._next_sequence
+            subscriber.delivered += len(frames)
+            return frames
+
+    def _wait(self, subscriber: "FrameSubscriber", timeout: Optional[float]) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: self._closed or subscriber.cursor < self._next_sequence, timeout=timeout) and not self._closed
+
+
+class FrameSubscriber:
+    """A reader's cursor into a FrameRingBuffer. Create through `FrameRingBuffer.subscribe`."""
+
+    def __init__(self, buffer: FrameRingBuffer, name: str, cursor: int):
+        self.buffer = buffer
+        self.name = name
+        self.cursor = cursor  # Sequence number of the next unread frame.
+        self.delivered = 0
+        self.dropped = 0
+
+    def latest(self) -> Optional[BufferedFrame]:
+        """Newest unread frame (latest-frame-wins); older unread frames count as dropped. None if nothing new."""
+        return self.buffer._read_latest(self)
+
+    def read_all(self) -> List[BufferedFrame]:
+        """Every unread frame still in the buffer, oldest first; already overwritten frames count as dropped."""
+        return self.buffer._read_all(self)
+
+    def wait_for_frame(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until an unread frame is available. Returns False on timeout or when the buffer is closed."""
+        return self.buffer._wait(self, timeout)
+
+    @property
+    def pending(self) -> int:
+        with self.buffer._condition:
+            return self.buffer._pending(self)
+
+    def close(self):
+        self.buffer.unsubscribe(self.name)
@@ -19,6 +19,8 @@ except ImportError:
     logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.perception.perception_engine").warning("pywinauto.win32hooks could not be imported. OS event perception will be disabled (Windows-only feature).")
 
 from mark_i.engines.capture_engine import CaptureEngine
+from mark_i.perception.frame_delta import DEFAULT_DELTA_TILE_SIZE, FrameDeltaEncoder
+from mark_i.perception.frame_ring_buffer import DEFAULT_FRAME_BUFFER_CAPACITY, FrameRingBuffer, FrameSubscriber
 
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.perception.perception_engine")
@@ -60,14 +62,19 @@ class PerceptionEngine:
 
     _instance = None
 
-    def __init__(self, capture_engine: CaptureEngine):
+    def __init__(self, capture_engine: CaptureEngine, frame_buffer_capacity: int = DEFAULT_FRAME_BUFFER_CAPACITY, frame_delta_tile_size: Optional[int] = DEFAULT_DELTA_TILE_SIZE):
         if PerceptionEngine._instance is not None:
             raise Exception("PerceptionEngine is a singleton and has already been instantiated.")
 
         self.capture_engine = capture_engine
         self.is_running = False
 
+        # Small OS/audio events. Screen frames go to `frame_buffer` instead, which caps their memory
+        # and lets several consumers read the same frames.
         self.perception_queue = Queue()
+        self.frame_buffer = FrameRingBuffer(capacity=frame_buffer_capacity)
+        # Published frames carry the tiles that changed since the previous frame; None disables delta encoding.
+        self.frame_delta_encoder: Optional[FrameDeltaEncoder] = FrameDeltaEncoder(tile_size=frame_delta_tile_size) if frame_delta_tile_size else None
 
         self._stop_event = threading.Event()
         self._threads: list[threading.Thread] = []
@@ -82,6 +89,10 @@ class PerceptionEngine:
             raise RuntimeError("PerceptionEngine has not been initialized.")
         return cls._instance
 
+    def subscribe_frames(self, name: str) -> FrameSubscriber:
+        """Registers a reader of the screen frames captured by the video loop."""
+        return self.frame_buffer.subscribe(name)
+
     def start(self):
         if self.is_running:
             logger.warning("PerceptionEngine is already running.")
@@ -138,8 +149,8 @@ class PerceptionEngine:
             )
 
             if screenshot is not None:
-                perception_event = {"type": "VISUAL_UPDATE", "timestamp": time.time(), "data": screenshot}
-                self.perception_queue.put(perception_event)
+                delta = self.frame_delta_encoder.encode(screenshot) if self.frame_delta_encoder else None
+                self.frame_buffer.publish(screenshot, delta=delta)
 
             elapsed = time.time() - start_time
             sleep_time = (1.0 / self.video_fps) - elapsed
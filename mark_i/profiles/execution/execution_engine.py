@@ -1,7 +1,89 @@
-uration
+"""
+Execution Engine
+
+High-level execution orchestration for automation profiles: a priority
+scheduler with a bounded worker pool, timed retries, deadlines and
+cooperative cancellation, plus feasibility analysis and optimization hints.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+from datetime import datetime, timedelta
+from enum import Enum
+
+from ..models.profile import AutomationProfile
+from .profile_executor import ProfileExecutor, ExecutionResult
+from .integration_bridge import IntegrationBridge
+from .context_manager import ProfileContextManager
+
+
+class ExecutionMode(Enum):
+    """Execution modes"""
+    NORMAL = "normal"
+    DEBUG = "debug"
+    SIMULATION = "simulation"
+    PERFORMANCE = "performance"
+    SAFE_MODE = "safe_mode"
+
+
+class ExecutionPriority(Enum):
+    """Execution priorities (higher values run first)"""
+    LOW = 1
+    NORMAL = 2
+    HIGH = 3
+    CRITICAL = 4
+
+
+class ExecutionEngine:
+    """
+    Intelligent execution engine for automation profiles
+
+    Queued executions are kept in a heap ordered by priority, then queue order, and run
+    on a pool of at most `max_concurrent_executions` worker threads, each with its own
+    ProfileExecutor. A dispatcher thread starts queued executions as workers free up,
+    re-queues failed attempts after an exponential backoff without holding a worker,
+    and cancels executions that run past their deadline.
+    """
+    
+    def __init__(self, executor_factory: Callable[[], ProfileExecutor] = ProfileExecutor):
+        """
+        Initialize execution engine
+        
+        Args:
+            executor_factory: Creates ProfileExecutor instances; one for immediate
+                execution and one per concurrently running queued execution
+        """
+        self.logger = logging.getLogger("mark_i.profiles.execution.engine")
+        
+        # Core components
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        self.integration_bridge = IntegrationBridge()
+        self.context_manager = ProfileContextManager()
+        
+        # Scheduler state, guarded by _condition
+        self.execution_queue: List[tuple] = []  # Heap of (-priority, sequence, request)
+        self.retry_queue: List[tuple] = []  # Heap of (ready_at monotonic, sequence, request)
+        self.active_executions: Dict[str, Dict[str, Any]] = {}
+        self.execution_history: List[Dict[str, Any]] = []
+        self._requests: Dict[str, Dict[str, Any]] = {}  # Queued or waiting for a retry
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._idle_executors: List[ProfileExecutor] = []
+        self._worker_pool: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._shutdown = False
+        
+        # Configuration
         self.max_concurrent_executions = 3
         self.default_timeout = 300  # 5 minutes
         self.retry_attempts = 3
+        self.retry_backoff_seconds = 1.0  # Retry n waits retry_backoff_seconds * 2 ** n
         self.adaptive_timing = True
         
         # Callbacks
@@ -16,7 +98,8 @@ uration
                        mode: ExecutionMode = ExecutionMode.NORMAL,
                        priority: ExecutionPriority = ExecutionPriority.NORMAL,
                        user_variables: Dict[str, Any] = None,
-                       timeout: Optional[int] = None) -> str:
+                       timeout: Optional[int] = None,
+                       deadline: Optional[datetime] = None) -> str:
         """
         Queue profile for execution
         
@@ -25,7 +108,10 @@ uration
             mode: Execution mode
             priority: Execution priority
             user_variables: User-provided variables
-            timeout: Execution timeout in seconds
+            timeout: Execution timeout in seconds, counted from the first attempt's
+                start and covering all retries
+            deadline: Optional time by which the execution must have finished; it
+                times out if still queued or running then
             
         Returns:
             Execution ID for tracking
@@ -39,22 +125,29 @@ uration
             'priority': priority,
             'user_variables': user_variables or {},
             'timeout': timeout or self.default_timeout,
+            'deadline': deadline,
             'queued_at': datetime.now(),
             'retry_count': 0,
             'status': 'queued'
         }
         
-        # Add to queue based on priority
-        self._add_to_queue(execution_request)
-        
         # Callback
         if self.on_execution_queued:
             self.on_execution_queued(execution_id, profile)
         
-        self.logger.info(f"Profile queued for execution: {profile.name} (ID: {execution_id})")
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("ExecutionEngine has been shut down")
+            
+            # Monotonic deadline while queued; narrowed by the timeout once started
+            if deadline is not None:
+                execution_request['_deadline'] = time.monotonic() + (deadline - datetime.now()).total_seconds()
+            
+            self._add_to_queue(execution_request)
+            self._ensure_dispatcher()
+            self._condition.notify_all()
         
-        # Start processing if not already running
-        self._process_queue()
+        self.logger.info(f"Profile queued for execution: {profile.name} (ID: {execution_id})")
         
         return execution_id
     
@@ -108,72 +201,118 @@ uration
             self.context_manager.cleanup_context()
     
     def cancel_execution(self, execution_id: str) -> bool:
-        """Cancel queued or active execution"""
-        # Check if in queue
-        for i, request in enumerate(self.execution_queue):
-            if request['execution_id'] == execution_id:
-                self.execution_queue.pop(i)
+        """
+        Cancel queued or active execution
+        
+        Queued executions and executions waiting for a retry are dropped at once.
+        Running executions are asked to stop and finish as CANCELLED once their
+        executor returns.
+        """
+        with self._condition:
+            # Check if queued or waiting for a retry
+            request = self._requests.pop(execution_id, None)
+            if request is not None:
+                request['status'] = 'cancelled'  # Its heap entry is skipped when popped
+                request['result'] = ExecutionResult.CANCELLED
+                request['completed_at'] = datetime.now()
+                self._append_history(request)
+                self._condition.notify_all()
                 self.logger.info(f"Cancelled queued execution: {execution_id}")
                 return True
-        
-        # Check if active
-        if execution_id in self.active_executions:
-            # Cancel active execution
-            self.executor.cancel_execution()
-            self.active_executions[execution_id]['status'] = 'cancelled'
-            self.logger.info(f"Cancelled active execution: {execution_id}")
-            return True
-        
-        return False
+            
+            # Check if active
+            request = self.active_executions.get(execution_id)
+            if request is None:
+                return False
+            if not request.get('_cancel_reason'):
+                request['_cancel_reason'] = 'cancelled'
+                request['status'] = 'cancelling'
+                # Cancel while holding the lock: once released, the attempt can finish and its
+                # executor can be handed to another execution. cancel_execution only sets a flag.
+                if request.get('_executor') is not None:
+                    request['_executor'].cancel_execution()
+        
+        self.logger.info(f"Cancelled active execution: {execution_id}")
+        return True
     
     def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
         """Get status of execution"""
-        # Check active executions
-        if execution_id in self.active_executions:
-            return self.active_executions[execution_id].copy()
-        
-        # Check queue
-        for request in self.execution_queue:
-            if request['execution_id'] == execution_id:
+        with self._condition:
+            # Check active executions
+            if execution_id in self.active_executions:
+                return self._public_view(self.active_executions[execution_id])
+            
+            # Check queue
+            request = self._requests.get(execution_id)
+            if request is not None:
+                if request['status'] == 'retry_scheduled':
+                    return self._public_view(request)
                 return {
                     'execution_id': execution_id,
                     'status': 'queued',
-                    'position_in_queue': self.execution_queue.index(request) + 1,
+                    'position_in_queue': self._queued_requests().index(request) + 1,
                     'queued_at': request['queued_at']
                 }
-        
-        # Check history
-        for record in self.execution_history:
-            if record['execution_id'] == execution_id:
-                return record.copy()
+            
+            # Check history
+            for record in reversed(self.execution_history):
+                if record['execution_id'] == execution_id:
+                    return self._public_view(record)
         
         return None
     
     def get_queue_status(self) -> Dict[str, Any]:
         """Get execution queue status"""
-        return {
-            'queue_length': len(self.execution_queue),
-            'active_executions': len(self.active_executions),
-            'max_concurrent': self.max_concurrent_executions,
-            'queued_profiles': [
-                {
-                    'execution_id': req['execution_id'],
-                    'profile_name': req['profile'].name,
-                    'priority': req['priority'].name,
-                    'queued_at': req['queued_at'].isoformat()
-                }
-                for req in self.execution_queue
-            ],
-            'active_profiles': [
-                {
-                    'execution_id': exec_id,
-                    'profile_name': exec_data['profile'].name,
-                    'started_at': exec_data['started_at'].isoformat(),
-                    'status': exec_data['status']
-                }
-                for exec_id, exec_data in self.active_executions.items()
-            ]
-        }
+        with self._condition:
+            queued = self._queued_requests()
+            return {
+                'queue_length': len(queued),
+                'active_executions': len(self.active_executions),
+                'max_concurrent': self.max_concurrent_executions,
+                'queued_profiles': [
+                    {
+                        'execution_id': req['execution_id'],
+                        'profile_name': req['profile'].name,
+                        'priority': req['priority'].name,
+                        'queued_at': req['queued_at'].isoformat()
+                    }
+                    for req in queued
+                ],
+                'retry_pending': len(self._requests) - len(queued),
+                'active_profiles': [
+                    {
+                        'execution_id': exec_id,
+                        'profile_name': exec_data['profile'].name,
+                        'started_at': exec_data['started_at'].isoformat(),
+                        'status': exec_data['status']
+                    }
+                    for exec_id, exec_data in self.active_executions.items()
+                ]
+            }
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the scheduler
+        
+        Queued executions are cancelled and running ones are asked to stop.
+        
+        Args:
+            wait: Block until the dispatcher and running executions have finished
+        """
+        with self._condition:
+            self._shutdown = True
+            pending_ids = list(self._requests)
+            active_ids = list(self.active_executions)
+            dispatcher, worker_pool = self._dispatcher, self._worker_pool
+            self._condition.notify_all()
+        
+        for execution_id in pending_ids + active_ids:
+            self.cancel_execution(execution_id)
+        
+        if dispatcher is not None and wait:
+            dispatcher.join()
+        if worker_pool is not None:
+            worker_pool.shutdown(wait=wait)
     
     def get_execution_recommendations(self, profile: AutomationProfile) -> List[Dict[str, Any]]:
         """Get intelligent execution recommendations"""
@@ -248,135 +387,207 @@ uration
         return f"{profile.name}_{timestamp}"
     
     def _add_to_queue(self, execution_request: Dict[str, Any]):
-        """Add execution request to queue based on priority"""
-        priority = execution_request['priority']
-        
-        # Find insertion point based on priority
-        insertion_index = len(self.execution_queue)
-        for i, existing_request in enumerate(self.execution_queue):
-            if existing_request['priority'].value < priority.value:
-                insertion_index = i
-                break
-        
-        self.execution_queue.insert(insertion_index, execution_request)
+        """Add execution request to the priority heap (caller holds _condition)"""
+        execution_request.setdefault('_deadline', float('inf'))
+        execution_request['status'] = 'queued'
+        self._requests[execution_request['execution_id']] = execution_request
+        heapq.heappush(self.execution_queue, (-execution_request['priority'].value, next(self._sequence), execution_request))
     
-    def _process_queue(self):
-        """Process execution queue"""
-        if len(self.active_executions) >= self.max_concurrent_executions:
-            return
-        
-        if not self.execution_queue:
+    def _queued_requests(self) -> List[Dict[str, Any]]:
+        """Queued requests in the order they will start (caller holds _condition)"""
+        return [request for _, _, request in sorted(self.execution_queue)
+                if request['status'] == 'queued' and self._requests.get(request['execution_id']) is request]
+    
+    def _ensure_dispatcher(self):
+        """Start the worker pool and dispatcher thread on first use (caller holds _condition)"""
+        if self._dispatcher is not None:
             return
         
-        # Get next execution request
-        request = self.execution_queue.pop(0)
-        execution_id = request['execution_id']
-        
-        # Move to active executions
-        request['status'] = 'starting'
-        request['started_at'] = datetime.now()
-        self.active_executions[execution_id] = request
-        
-        # Start execution asynchronously
-        asyncio.create_task(self._execute_async(request))
+        self._worker_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_executions, thread_name_prefix="ProfileExecution")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="ExecutionScheduler", daemon=True)
+        self._dispatcher.start()
     
-    async def _execute_async(self, request: Dict[str, Any]):
-        """Execute profile asynchronously"""
-        execution_id = request['execution_id']
-        profile = request['profile']
-        
-        try:
-            # Callback
-            if self.on_execution_started:
-                self.on_execution_started(execution_id, profile)
-            
-            # Update status
-            self.active_executions[execution_id]['status'] = 'running'
-            
-            # Execute profile
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                self._execute_with_retry,
-                request
-            )
-            
-            # Update status
-            self.active_executions[execution_id]['status'] = 'completed'
-            self.active_executions[execution_id]['result'] = result
-            self.active_executions[execution_id]['completed_at'] = datetime.now()
-            
-            # Callback
-            if self.on_execution_completed:
-                self.on_execution_completed(execution_id, result, request)
-            
-            # Move to history
-            self._move_to_history(execution_id)
-            
-        except Exception as e:
-            self.logger.error(f"Async execution failed: {e}")
-            
-            # Update status
-            self.active_executions[execution_id]['status'] = 'failed'
-            self.active_executions[execution_id]['error'] = str(e)
-            self.active_executions[execution_id]['completed_at'] = datetime.now()
-            
-            # Callback
-            if self.on_execution_failed:
-                self.on_execution_failed(execution_id, e)
+    def _dispatch_loop(self):
+        """Start queued executions as workers free up and enforce retry times and deadlines"""
+        while True:
+            with self._condition:
+                if self._shutdown:
+                    return
+                
+                now = time.monotonic()
+                self._promote_due_retries(now)
+                expired = self._expire_overdue(now)
+                self._start_ready_executions(now)
+                
+                if not expired:
+                    self._condition.wait(self._next_wakeup(now))
             
-            # Move to history
-            self._move_to_history(execution_id)
-        
-        finally:
-            # Continue processing queue
-            self._process_queue()
+            for request in expired:
+                self._notify_finished(request, None)
+    
+    def _promote_due_retries(self, now: float):
+        """Move retries whose backoff has elapsed back into the priority heap"""
+        while self.retry_queue and self.retry_queue[0][0] <= now:
+            _, _, request = heapq.heappop(self.retry_queue)
+            if request['status'] == 'retry_scheduled' and self._requests.get(request['execution_id']) is request:
+                self._add_to_queue(request)
+    
+    def _expire_overdue(self, now: float) -> List[Dict[str, Any]]:
+        """Time out waiting executions past their deadline and ask running ones to stop"""
+        expired = []
+        for execution_id, request in list(self._requests.items()):
+            if request['_deadline'] <= now:
+                del self._requests[execution_id]
+                self._finalize(request, ExecutionResult.TIMEOUT, 'timeout')
+                self.logger.warning(f"Execution timed out before it could run: {execution_id}")
+                expired.append(request)
+        
+        for execution_id, request in self.active_executions.items():
+            if request['_deadline'] <= now and not request.get('_cancel_reason'):
+                request['_cancel_reason'] = 'timeout'
+                request['status'] = 'cancelling'
+                # ProfileExecutor.cancel_execution only sets a flag, so it is safe under the lock
+                request['_executor'].cancel_execution()
+                self.logger.warning(f"Execution exceeded its timeout, cancelling: {execution_id}")
+        
+        return expired
+    
+    def _start_ready_executions(self, now: float):
+        """Hand queued executions to idle workers, highest priority first"""
+        while len(self.active_executions) < self.max_concurrent_executions and self.execution_queue:
+            _, _, request = heapq.heappop(self.execution_queue)
+            execution_id = request['execution_id']
+            if request['status'] != 'queued' or self._requests.get(execution_id) is not request:
+                continue  # Cancelled or expired while queued
+            
+            del self._requests[execution_id]
+            if 'started_at' not in request:
+                request['started_at'] = datetime.now()
+                request['_deadline'] = min(request['_deadline'], now + request['timeout'])
+            request['status'] = 'starting'
+            request['_executor'] = self._idle_executors.pop() if self._idle_executors else self.executor_factory()
+            self.active_executions[execution_id] = request
+            self._worker_pool.submit(self._run_attempt, request)
     
-    def _execute_with_retry(self, request: Dict[str, Any]) -> ExecutionResult:
-        """Execute profile with retry logic"""
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        """Seconds until the next retry or deadline is due, None if nothing is timed"""
+        due_times = [request['_deadline'] for request in self._requests.values()]
+        due_times.extend(request['_deadline'] for request in self.active_executions.values() if not request.get('_cancel_reason'))
+        if self.retry_queue:
+            due_times.append(self.retry_queue[0][0])
+        next_due = min(due_times, default=float('inf'))
+        return None if next_due == float('inf') else max(0.0, next_due - now)
+    
+    def _run_attempt(self, request: Dict[str, Any]):
+        """Run one execution attempt on a worker thread"""
+        execution_id = request['execution_id']
         profile = request['profile']
-        mode = request['mode']
-        user_variables = request['user_variables']
-        max_retries = self.retry_attempts
+        attempt = request['retry_count']
+        
+        with self._condition:
+            if request.get('_cancel_reason'):
+                cancelled_before_start = True
+            else:
+                cancelled_before_start = False
+                request['status'] = 'running'
         
-        for attempt in range(max_retries + 1):
+        result, error = None, None
+        if not cancelled_before_start:
             try:
-                if attempt > 0:
+                if attempt == 0:
+                    # Callback
+                    if self.on_execution_started:
+                        self.on_execution_started(execution_id, profile)
+                else:
                     self.logger.info(f"Retry attempt {attempt} for profile: {profile.name}")
-                    # Add delay between retries
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                
-                # Execute profile
-                result = self.executor.execute_profile(profile, user_variables, mode.value)
                 
-                if result == ExecutionResult.SUCCESS:
-                    return result
-                elif result in [ExecutionResult.PARTIAL, ExecutionResult.FAILURE]:
-                    if attempt < max_retries:
-                        continue  # Retry
-                    else:
-                        return result
-                else:
-                    return result  # Don't retry for CANCELLED or TIMEOUT
-                    
+                result = request['_executor'].execute_profile(profile, request['user_variables'], request['mode'].value)
             except Exception as e:
-                if attempt < max_retries:
-                    self.logger.warning(f"Execution attempt {attempt + 1} failed, retrying: {e}")
-                    continue
-                else:
-                    raise
+                error = e
         
-        return ExecutionResult.FAILURE
+        self._finish_attempt(request, result, error)
     
-    def _move_to_history(self, execution_id: str):
-        """Move execution from active to history"""
-        if execution_id in self.active_executions:
-            execution_data = self.active_executions.pop(execution_id)
-            self.execution_history.append(execution_data)
-            
-            # Keep only recent history (last 100 executions)
-            if len(self.execution_history) > 100:
-                self.execution_history = self.execution_history[-100:]
+    def _finish_attempt(self, request: Dict[str, Any], result: Optional[ExecutionResult], error: Optional[Exception]):
+        """Record an attempt's outcome: finish the execution or schedule a timed retry"""
+        execution_id = request['execution_id']
+        
+        with self._condition:
+            self._idle_executors.append(request.pop('_executor'))
+            self.active_executions.pop(execution_id, None)
+            cancel_reason = request.pop('_cancel_reason', None)
+            
+            if cancel_reason:
+                # Cancelled or timed out while running; whatever the executor returned is superseded
+                result = ExecutionResult.CANCELLED if cancel_reason == 'cancelled' else ExecutionResult.TIMEOUT
+                error = None
+                self._finalize(request, result, cancel_reason)
+            elif self._should_retry(request, result, error):
+                retry_number = request['retry_count'] + 1
+                delay = self.retry_backoff_seconds * 2 ** retry_number
+                request['retry_count'] = retry_number
+                request['status'] = 'retry_scheduled'
+                request['next_attempt_at'] = datetime.now() + timedelta(seconds=delay)
+                if error is not None:
+                    request['last_error'] = str(error)
+                self._requests[execution_id] = request
+                heapq.heappush(self.retry_queue, (time.monotonic() + delay, next(self._sequence), request))
+                self._condition.notify_all()
+                
+                reason = f"error: {error}" if error is not None else f"result: {result.value}"
+                self.logger.warning(f"Execution attempt {retry_number} failed ({reason}), retrying in {delay:.1f}s: {execution_id}")
+                return
+            elif error is not None:
+                self.logger.error(f"Execution failed: {error}")
+                request['error'] = str(error)
+                self._finalize(request, None, 'failed')
+            else:
+                self._finalize(request, result, 'completed')
+            
+            self._condition.notify_all()
+        
+        self._notify_finished(request, error)
+    
+    def _should_retry(self, request: Dict[str, Any], result: Optional[ExecutionResult], error: Optional[Exception]) -> bool:
+        """Retry failed or partial attempts while attempts and time remain (caller holds _condition)"""
+        if self._shutdown or request['retry_count'] >= self.retry_attempts:
+            return False
+        if error is None and result not in (ExecutionResult.PARTIAL, ExecutionResult.FAILURE):
+            return False  # Don't retry for SUCCESS, CANCELLED or TIMEOUT
+        
+        delay = self.retry_backoff_seconds * 2 ** (request['retry_count'] + 1)
+        return time.monotonic() + delay < request['_deadline']
+    
+    def _finalize(self, request: Dict[str, Any], result: Optional[ExecutionResult], status: str):
+        """Mark an execution finished and move it to history (caller holds _condition)"""
+        request['status'] = status
+        if result is not None:
+            request['result'] = result
+        request['completed_at'] = datetime.now()
+        self._append_history(request)
+    
+    def _notify_finished(self, request: Dict[str, Any], error: Optional[Exception]):
+        """Invoke the completion callbacks outside the scheduler lock"""
+        try:
+            if error is not None:
+                if self.on_execution_failed:
+                    self.on_execution_failed(request['execution_id'], error)
+            elif self.on_execution_completed:
+                self.on_execution_completed(request['execution_id'], request['result'], self._public_view(request))
+        except Exception as e:
+            self.logger.error(f"Execution callback failed: {e}")
+    
+    def _append_history(self, request: Dict[str, Any]):
+        """Add a finished execution to history (caller holds _condition)"""
+        self.execution_history.append(request)
+        
+        # Keep only recent history (last 100 executions)
+        if len(self.execution_history) > 100:
+            self.execution_history = self.execution_history[-100:]
+    
+    @staticmethod
+    def _public_view(request: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a request without scheduler-internal fields"""
+        return {key: value for key, value in request.items() if not key.startswith('_')}
     
     def _analyze_execution_feasibility(self, profile: AutomationProfile) -> Dict[str, Any]:
         """Analyze if execution is feasible"""
@@ -0,0 +1,39 @@
+"""
+Model Base Helpers
+
+Shared helpers for the profile data models: slotted dataclass options and a
+JSON codec that uses orjson when it is installed.
+"""
+
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; the standard library codec is used instead
+    orjson = None
+
+
+# Slotted dataclasses (Python 3.10+) use less memory and have faster attribute access
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize to indented JSON (profiles stay human-readable on disk)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json_file(file_path: str) -> Any:
+    """Read and parse a JSON file"""
+    with open(file_path, 'rb') as f:
+        return json_loads(f.read())
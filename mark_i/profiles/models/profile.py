@@ -5,16 +5,16 @@ Main automation profile definition with settings and metadata.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
-import json
 import uuid
 
+from .base import DATACLASS_SLOTS, json_dumps, json_loads, load_json_file
 from .region import Region
 from .rule import Rule
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProfileSettings:
     """Profile execution settings and configuration"""
     monitoring_interval_seconds: float = 1.0
@@ -74,7 +74,13 @@ class ProfileSettings:
 
 @dataclass
 class AutomationProfile:
-    """Complete automation profile definition"""
+    """
+    Complete automation profile definition
+    
+    Profiles loaded with from_dict keep their regions and rules as raw dictionaries
+    until `regions`/`rules` is first accessed, so loading for listings, search or
+    re-saving does not build every Region, Rule, Condition and Action.
+    """
     id: str
     name: str
     description: str
@@ -213,6 +219,9 @@ class AutomationProfile:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert profile to dictionary for serialization"""
+        # Unmaterialized regions/rules are written back as loaded
+        raw_regions = self.__dict__.get('_raw_regions')
+        raw_rules = self.__dict__.get('_raw_rules')
         return {
             'id': self.id,
             'name': self.name,
@@ -222,8 +231,8 @@ class AutomationProfile:
             'created_at': self.created_at.isoformat(),
             'modified_at': self.modified_at.isoformat(),
             'version': self.version,
-            'regions': [r.to_dict() for r in self.regions],
-            'rules': [r.to_dict() for r in self.rules],
+            'regions': raw_regions if raw_regions is not None else [r.to_dict() for r in self.regions],
+            'rules': raw_rules if raw_rules is not None else [r.to_dict() for r in self.rules],
             'settings': self.settings.to_dict(),
             'tags': self.tags,
             'author': self.author,
@@ -233,7 +242,7 @@ class AutomationProfile:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AutomationProfile':
-        """Create profile from dictionary"""
+        """Create profile from dictionary; regions and rules are materialized on first access"""
         profile = cls(
             id=data['id'],
             name=data['name'],
@@ -250,24 +259,35 @@ class AutomationProfile:
             parent_template=data.get('parent_template')
         )
         
-        # Add regions
-        for region_data in data.get('regions', []):
-            profile.add_region(Region.from_dict(region_data))
-        
-        # Add rules
-        for rule_data in data.get('rules', []):
-            profile.add_rule(Rule.from_dict(rule_data))
+        # Reject invalid entries and duplicate names now, as eager construction would,
+        # without building the objects
+        raw_regions = data.get('regions', [])
+        raw_rules = data.get('rules', [])
+        for kind, items, check in (('Region', raw_regions, Region.check_dict), ('Rule', raw_rules, Rule.check_dict)):
+            seen_names = set()
+            for item in items:
+                check(item)
+                if item['name'] in seen_names:
+                    raise ValueError(f"{kind} with name '{item['name']}' already exists")
+                seen_names.add(item['name'])
         
+        profile.__dict__['_raw_regions'] = raw_regions
+        profile.__dict__['_raw_rules'] = raw_rules
         return profile
     
+    @property
+    def is_materialized(self) -> bool:
+        """Whether regions and rules have been built from their raw dictionaries"""
+        return '_raw_regions' not in self.__dict__ and '_raw_rules' not in self.__dict__
+    
     def to_json(self) -> str:
         """Convert profile to JSON string"""
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        return json_dumps(self.to_dict())
     
     @classmethod
     def from_json(cls, json_str: str) -> 'AutomationProfile':
         """Create profile from JSON string"""
-        data = json.loads(json_str)
+        data = json_loads(json_str)
         return cls.from_dict(data)
     
     def save_to_file(self, file_path: str):
@@ -278,5 +298,26 @@ class AutomationProfile:
     @classmethod
     def load_from_file(cls, file_path: str) -> 'AutomationProfile':
         """Load profile from JSON file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return cls.from_json(f.read())
\ No newline at end of file
+        return cls.from_dict(load_json_file(file_path))
+
+
+def _lazy_model_list(name: str, loader: Callable[[Dict[str, Any]], Any]) -> property:
+    """Property for a list field that is built from its raw dictionaries on first access"""
+    raw_key = f'_raw_{name}'
+    
+    def getter(self):
+        raw_items = self.__dict__.pop(raw_key, None)
+        if raw_items is not None:
+            self.__dict__[name] = [loader(item) for item in raw_items]
+        return self.__dict__[name]
+    
+    def setter(self, value):
+        self.__dict__.pop(raw_key, None)
+        self.__dict__[name] = value
+    
+    return property(getter, setter, doc=f"Profile {name} (materialized lazily)")
+
+
+# Installed after @dataclass so the generated __init__ assigns through them
+AutomationProfile.regions = _lazy_model_list('regions', Region.from_dict)
+AutomationProfile.rules = _lazy_model_list('rules', Rule.from_dict)
\ No newline at end of file
@@ -8,8 +8,18 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Tuple, Dict, Any
 import json
 
+from .base import DATACLASS_SLOTS
 
-@dataclass
+
+def _check_region_bounds(name: str, x: int, y: int, width: int, height: int):
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Region '{name}' must have positive width and height")
+    
+    if x < 0 or y < 0:
+        raise ValueError(f"Region '{name}' coordinates must be non-negative")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Region:
     """Screen region definition for automation"""
     name: str
@@ -35,11 +45,7 @@ class Region:
     
     def __post_init__(self):
         """Validate region parameters after initialization"""
-        if self.width <= 0 or self.height <= 0:
-            raise ValueError(f"Region '{self.name}' must have positive width and height")
-        
-        if self.x < 0 or self.y < 0:
-            raise ValueError(f"Region '{self.name}' coordinates must be non-negative")
+        _check_region_bounds(self.name, self.x, self.y, self.width, self.height)
     
     @property
     def center_x(self) -> int:
@@ -107,6 +113,13 @@ class Region:
             timeout_seconds=data.get('timeout_seconds', 5)
         )
     
+    @staticmethod
+    def check_dict(data: Dict[str, Any]):
+        """Raise the error from_dict would raise for this dictionary, without building the region"""
+        _check_region_bounds(data['name'], data['x'], data['y'], data['width'], data['height'])
+        if 'description' not in data:
+            raise KeyError('description')
+    
     def to_json(self) -> str:
         """Convert region to JSON string"""
         return json.dumps(self.to_dict(), indent=2)
@@ -9,6 +9,8 @@ from typing import List, Dict, Any, Optional
 import json
 from enum import Enum
 
+from .base import DATACLASS_SLOTS
+
 
 class ConditionType(Enum):
     """Available condition types for rules"""
@@ -36,7 +38,37 @@ class ActionType(Enum):
     LOG_MESSAGE = "log_message"
 
 
-@dataclass
+def _check_condition_type(condition_type: str):
+    try:
+        ConditionType(condition_type)
+    except ValueError:
+        valid_types = [ct.value for ct in ConditionType]
+        raise ValueError(f"Invalid condition type '{condition_type}'. Valid types: {valid_types}")
+
+
+def _check_action_type(action_type: str):
+    try:
+        ActionType(action_type)
+    except ValueError:
+        valid_types = [at.value for at in ActionType]
+        raise ValueError(f"Invalid action type '{action_type}'. Valid types: {valid_types}")
+
+
+def _check_rule_settings(logical_operator: str, priority: int, max_retries: int, retry_delay: float):
+    if logical_operator not in ["AND", "OR"]:
+        raise ValueError(f"Invalid logical operator '{logical_operator}'. Must be 'AND' or 'OR'")
+    
+    if priority < 0:
+        raise ValueError("Rule priority must be non-negative")
+    
+    if max_retries < 0:
+        raise ValueError("Max retries must be non-negative")
+    
+    if retry_delay < 0:
+        raise ValueError("Retry delay must be non-negative")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Condition:
     """Rule condition definition"""
     type: str  # ConditionType value
@@ -46,11 +78,7 @@ class Condition:
     
     def __post_init__(self):
         """Validate condition after initialization"""
-        try:
-            ConditionType(self.type)
-        except ValueError:
-            valid_types = [ct.value for ct in ConditionType]
-            raise ValueError(f"Invalid condition type '{self.type}'. Valid types: {valid_types}")
+        _check_condition_type(self.type)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert condition to dictionary"""
@@ -72,7 +100,7 @@ class Condition:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Action:
     """Action definition"""
     type: str  # ActionType value
@@ -83,11 +111,7 @@ class Action:
     
     def __post_init__(self):
         """Validate action after initialization"""
-        try:
-            ActionType(self.type)
-        except ValueError:
-            valid_types = [at.value for at in ActionType]
-            raise ValueError(f"Invalid action type '{self.type}'. Valid types: {valid_types}")
+        _check_action_type(self.type)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert action to dictionary"""
@@ -111,7 +135,7 @@ class Action:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Rule:
     """Automation rule with conditions and actions"""
     name: str
@@ -133,17 +157,7 @@ class Rule:
     
     def __post_init__(self):
         """Validate rule after initialization"""
-        if self.logical_operator not in ["AND", "OR"]:
-            raise ValueError(f"Invalid logical operator '{self.logical_operator}'. Must be 'AND' or 'OR'")
-        
-        if self.priority < 0:
-            raise ValueError("Rule priority must be non-negative")
-        
-        if self.max_retries < 0:
-            raise ValueError("Max retries must be non-negative")
-        
-        if self.retry_delay < 0:
-            raise ValueError("Retry delay must be non-negative")
+        _check_rule_settings(self.logical_operator, self.priority, self.max_retries, self.retry_delay)
     
     def add_condition(self, condition: Condition):
         """Add a condition to this rule"""
@@ -218,6 +232,20 @@ class Rule:
         
         return rule
     
+    @staticmethod
+    def check_dict(data: Dict[str, Any]):
+        """Raise the error from_dict would raise for this dictionary, without building the rule"""
+        for key in ('name', 'description'):
+            if key not in data:
+                raise KeyError(key)
+        _check_rule_settings(data.get('logical_operator', 'AND'), data.get('priority', 0), data.get('max_retries', 3), data.get('retry_delay', 1.0))
+        for condition_data in data.get('conditions', []):
+            if 'region' not in condition_data:
+                raise KeyError('region')
+            _check_condition_type(condition_data['type'])
+        for action_data in data.get('actions', []):
+            _check_action_type(action_data['type'])
+    
     def to_json(self) -> str:
         """Convert rule to JSON string"""
         return json.dumps(self.to_dict(), indent=2)
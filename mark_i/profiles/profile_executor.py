@@ -7,6 +7,9 @@ Integrates CaptureEngine (Eye), AgentCore (Brain), and ActionExecutor (Hand).
 
 import time
 import logging
+import platform
+import subprocess
+import threading
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from dataclasses import dataclass
@@ -15,6 +18,18 @@ from enum import Enum
 from .models.profile import AutomationProfile
 from .models.region import Region
 from .models.rule import Rule, Condition, Action, ConditionType, ActionType
+from ..engines.change_detector import RegionChangeDetector
+
+
+# wait_for_visual_cue polling: starts fast, backs off while the region is static
+DEFAULT_VISUAL_CUE_TIMEOUT_SECONDS = 10.0
+DEFAULT_VISUAL_CUE_POLL_SECONDS = 0.05
+DEFAULT_VISUAL_CUE_MAX_POLL_SECONDS = 1.0
+VISUAL_CUE_POLL_BACKOFF = 1.5
+# Conditions whose result does not depend on the region's pixels; waits re-check them on every poll
+NON_VISUAL_CONDITION_TYPES = {ConditionType.ALWAYS_TRUE.value, ConditionType.WINDOW_EXISTS.value}
+DEFAULT_COLOR_MATCH_TOLERANCE = 10
+DEFAULT_COLOR_MATCH_NUM_COLORS = 3
 
 
 class ExecutionStatus(Enum):
@@ -98,7 +113,7 @@ class ExecutionContext:
 class ProfileExecutor:
     """Executes automation profiles using Eye-Brain-Hand architecture"""
     
-    def __init__(self, capture_engine=None, agent_core=None, action_executor=None):
+    def __init__(self, capture_engine=None, agent_core=None, action_executor=None, analysis_engine=None):
         """
         Initialize ProfileExecutor with Eye-Brain-Hand components
         
@@ -106,10 +121,13 @@ class ProfileExecutor:
             capture_engine: Eye component for visual perception
             agent_core: Brain component for decision making
             action_executor: Hand component for action execution
+            analysis_engine: Local template/color analysis; created on first use if not given
         """
         self.eye = capture_engine  # CaptureEngine
         self.brain = agent_core    # AgentCore
         self.hand = action_executor # ActionExecutor
+        self._analysis_engine = analysis_engine  # AnalysisEngine
+        self._templates: Dict[str, Any] = {}
         
         self.logger = logging.getLogger("mark_i.profiles.executor")
         
@@ -117,6 +135,7 @@ class ProfileExecutor:
         self._current_execution: Optional[ExecutionResult] = None
         self._execution_cancelled = False
         self._execution_paused = False
+        self._cancel_event = threading.Event()  # Wakes interruptible waits on cancellation
         
         self.logger.info("ProfileExecutor initialized")
     
@@ -151,6 +170,7 @@ class ProfileExecutor:
         self._current_execution = execution_result
         self._execution_cancelled = False
         self._execution_paused = False
+        self._cancel_event.clear()
         
         try:
             self.logger.info(f"Starting execution of profile: {profile.name}")
@@ -327,8 +347,15 @@ class ProfileExecutor:
         else:
             return False
     
-    def _evaluate_condition(self, condition: Condition, context: ExecutionContext) -> bool:
-        """Evaluate a single condition"""
+    def _evaluate_condition(self, condition: Condition, context: ExecutionContext, region_image: Optional[Any] = None) -> bool:
+        """
+        Evaluate a single condition
+        
+        Args:
+            condition: Condition to evaluate
+            context: Execution context
+            region_image: Already captured image of the condition's region, if any
+        """
         region = context.get_region(condition.region)
         if not region:
             self.logger.error(f"Region not found for condition: {condition.region}")
@@ -338,16 +365,16 @@ class ProfileExecutor:
             return True
         
         elif condition.type == ConditionType.VISUAL_MATCH.value:
-            return self._check_visual_match(region, condition.parameters, context)
+            return self._check_visual_match(region, condition.parameters, context, region_image)
         
         elif condition.type == ConditionType.OCR_CONTAINS.value:
-            return self._check_ocr_contains(region, condition.parameters, context)
+            return self._check_ocr_contains(region, condition.parameters, context, region_image)
         
         elif condition.type == ConditionType.TEMPLATE_MATCH.value:
-            return self._check_template_match(region, condition.parameters, context)
+            return self._check_template_match(region, condition.parameters, context, region_image)
         
         elif condition.type == ConditionType.COLOR_MATCH.value:
-            return self._check_color_match(region, condition.parameters, context)
+            return self._check_color_match(region, condition.parameters, context, region_image)
         
         elif condition.type == ConditionType.WINDOW_EXISTS.value:
             return self._check_window_exists(condition.parameters, context)
@@ -356,7 +383,7 @@ class ProfileExecutor:
             self.logger.warning(f"Unknown condition type: {condition.type}")
             return False
     
-    def _check_visual_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext) -> bool:
+    def _check_visual_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext, region_image: Optional[Any] = None) -> bool:
         """Check if region is visually present/visible"""
         if not self.eye:
             self.logger.warning("No Eye (CaptureEngine) available for visual match")
@@ -364,10 +391,16 @@ class ProfileExecutor:
         
         try:
             # Capture region
-            region_image = self.eye.capture_region(region.x, region.y, region.width, region.height)
+            if region_image is None:
+                region_image = self.eye.capture_region(region.x, region.y, region.width, region.height)
             
             # Use Brain (Gemini) for analysis if available
             if self.brain and hasattr(self.brain, 'analyze_image'):
+                cue_description = parameters.get('cue_description')
+                if cue_description:
+                    analysis_prompt = f"Is the following visible in this region? Answer yes or no. Cue: '{cue_description}'"
+                    analysis = self.brain.analyze_image(region_image, analysis_prompt)
+                    return analysis.strip().lower().startswith(('yes', 'true'))
                 analysis_prompt = f"Is this region visible and contains interactive elements? Region: {region.description}"
                 analysis = self.brain.analyze_image(region_image, analysis_prompt)
                 return 'visible' in analysis.lower() or 'yes' in analysis.lower()
@@ -380,7 +413,7 @@ class ProfileExecutor:
             self.logger.error(f"Visual match check failed: {str(e)}")
             return False
     
-    def _check_ocr_contains(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext) -> bool:
+    def _check_ocr_contains(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext, region_image: Optional[Any] = None) -> bool:
         """Check if region contains specific text via OCR"""
         if not self.eye:
             self.logger.warning("No Eye (CaptureEngine) available for OCR")
@@ -392,7 +425,8 @@ class ProfileExecutor:
                 return False
             
             # Capture region
-            region_image = self.eye.capture_region(region.x, region.y, region.width, region.height)
+            if region_image is None:
+                region_image = self.eye.capture_region(region.x, region.y, region.width, region.height)
             
             # Use Brain for OCR analysis if available
             if self.brain and hasattr(self.brain, 'analyze_image'):
@@ -407,26 +441,112 @@ class ProfileExecutor:
             self.logger.error(f"OCR check failed: {str(e)}")
             return False
     
-    def _check_template_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext) -> bool:
-        """Check if region matches a template image"""
-        # This would require template matching implementation
-        # For now, return True as placeholder
-        self.logger.debug("Template matching not yet implemented")
-        return True
+    @property
+    def analysis_engine(self):
+        """AnalysisEngine used for template and color conditions"""
+        if self._analysis_engine is None:
+            from ..engines.analysis_engine import AnalysisEngine
+            self._analysis_engine = AnalysisEngine()
+        return self._analysis_engine
     
-    def _check_color_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext) -> bool:
-        """Check if region contains expected color"""
-        # This would require color analysis implementation
-        # For now, return True as placeholder
-        self.logger.debug("Color matching not yet implemented")
-        return True
+    def _capture_for_analysis(self, region: Region, region_image: Optional[Any]) -> Optional[Any]:
+        """Return the already captured region image, or capture it now"""
+        if region_image is not None:
+            return region_image
+        if not self.eye:
+            self.logger.warning("No Eye (CaptureEngine) available for image analysis")
+            return None
+        return self.eye.capture_region(region.x, region.y, region.width, region.height)
+    
+    def _load_template(self, template_path: str) -> Optional[Any]:
+        """Load a template image once and keep it for later checks"""
+        if template_path not in self._templates:
+            import cv2
+            template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+            if template is None:
+                self.logger.error(f"Could not load template image: {template_path}")
+            self._templates[template_path] = template
+        return self._templates[template_path]
+    
+    def _check_template_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext, region_image: Optional[Any] = None) -> bool:
+        """Check if the 'template_path' image is found in the region"""
+        template_path = parameters.get('template_path')
+        if not template_path:
+            self.logger.error("Template match requires a 'template_path' parameter")
+            return False
+        
+        try:
+            template = self._load_template(template_path)
+            if template is None:
+                return False
+            region_image = self._capture_for_analysis(region, region_image)
+            if region_image is None:
+                return False
+            threshold = float(parameters.get('threshold', context.profile.settings.template_match_threshold))
+            match = self.analysis_engine.match_template(region_image, template, threshold, region.name, template_path)
+            if match:
+                context.set_variable('last_template_match', match)
+            return match is not None
+        except Exception as e:
+            self.logger.error(f"Template match check failed: {str(e)}")
+            return False
+    
+    def _check_color_match(self, region: Region, parameters: Dict[str, Any], context: ExecutionContext, region_image: Optional[Any] = None) -> bool:
+        """Check if one of the region's dominant colors is within 'tolerance' of 'expected_color' [R, G, B]"""
+        expected_color = parameters.get('expected_color')
+        if not (isinstance(expected_color, (list, tuple)) and len(expected_color) == 3):
+            self.logger.error("Color match requires an 'expected_color' parameter in [R, G, B] format")
+            return False
+        expected_bgr = list(reversed(expected_color))
+        
+        try:
+            region_image = self._capture_for_analysis(region, region_image)
+            if region_image is None:
+                return False
+            tolerance = int(parameters.get('tolerance', DEFAULT_COLOR_MATCH_TOLERANCE))
+            top_n = int(parameters.get('check_top_n_dominant', 1))
+            min_percentage = float(parameters.get('min_percentage', 0.0))
+            num_colors = int(parameters.get('num_colors', DEFAULT_COLOR_MATCH_NUM_COLORS))
+            dominant_colors = self.analysis_engine.analyze_dominant_colors(region_image, num_colors, region.name) or []
+            for color_info in dominant_colors[:top_n]:
+                if color_info.get('percentage', 0.0) >= min_percentage and all(
+                    abs(int(actual) - int(expected)) <= tolerance for actual, expected in zip(color_info['bgr_color'], expected_bgr)
+                ):
+                    return True
+            return False
+        except Exception as e:
+            self.logger.error(f"Color match check failed: {str(e)}")
+            return False
+    
+    def _list_window_titles(self) -> Optional[List[str]]:
+        """Titles of the open top-level windows, or None if they cannot be listed here"""
+        try:
+            import pygetwindow
+            return list(pygetwindow.getAllTitles())
+        except Exception:
+            pass
+        if platform.system() == "Linux":
+            try:
+                result = subprocess.run(['wmctrl', '-l'], capture_output=True, text=True, timeout=2.0)
+                if result.returncode == 0:
+                    # Columns: window id, desktop, host, title
+                    return [line.split(None, 3)[3] for line in result.stdout.splitlines() if len(line.split(None, 3)) == 4]
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return None
     
     def _check_window_exists(self, parameters: Dict[str, Any], context: ExecutionContext) -> bool:
-        """Check if a specific window exists"""
-        # This would require window detection implementation
-        # For now, return True as placeholder
-        self.logger.debug("Window detection not yet implemented")
-        return True
+        """Check if a window whose title contains 'window_title' is open"""
+        window_title = parameters.get('window_title')
+        if not window_title:
+            self.logger.error("Window exists check requires a 'window_title' parameter")
+            return False
+        
+        titles = self._list_window_titles()
+        if titles is None:
+            self.logger.warning("Window titles cannot be listed on this system")
+            return False
+        return any(window_title.lower() in title.lower() for title in titles)
     
     def _execute_action(self, action: Action, context: ExecutionContext) -> bool:
         """Execute a single action"""
@@ -530,12 +650,96 @@ class ProfileExecutor:
             return False
     
     def _execute_wait_for_visual_cue_action(self, action: Action, context: ExecutionContext) -> bool:
-        """Execute wait for visual cue action"""
-        # This would implement waiting for specific visual elements
-        # For now, just wait a short time
-        time.sleep(2.0)
-        self.logger.debug("Waited for visual cue (placeholder)")
-        return True
+        """
+        Execute wait for visual cue action
+        
+        Polls the region until the cue condition holds or the timeout expires. Polling
+        starts every `poll_interval` seconds and backs off towards `max_poll_interval`
+        while the region's pixels stay the same; the (possibly expensive) condition is
+        only evaluated when the region changed, and any change resets the interval.
+        Cues that do not depend on pixels (window_exists, always_true) are checked on
+        every poll without capturing.
+        
+        Parameters:
+            condition: Cue condition dict (type, parameters, negate); its region
+                defaults to the action's region
+            cue_description: Free-text cue, used when no 'condition' is given; checked
+                as a visual_match by the Brain
+            timeout_seconds: Maximum time to wait (default 10)
+            poll_interval / max_poll_interval: Polling interval bounds in seconds
+            change_threshold: Mean thumbnail difference (0-255) below which the region
+                counts as unchanged; 0 only skips pixel-identical frames
+        
+        Returns:
+            True as soon as the cue is observed, False on timeout or cancellation
+        """
+        params = action.parameters
+        cue_data = params.get('condition')
+        if cue_data is None and params.get('cue_description'):
+            cue_data = {'type': ConditionType.VISUAL_MATCH.value, 'parameters': {'cue_description': params['cue_description']}}
+        if not isinstance(cue_data, dict) or 'type' not in cue_data:
+            self.logger.error("Wait for visual cue action requires a 'condition' parameter with a 'type' or a 'cue_description'")
+            return False
+        
+        region_name = cue_data.get('region') or action.region
+        region = context.get_region(region_name) if region_name else None
+        if not region:
+            self.logger.error(f"Region not found for visual cue: {region_name}")
+            return False
+        
+        try:
+            cue = Condition.from_dict({**cue_data, 'region': region.name})
+            timeout_seconds = float(params.get('timeout_seconds', DEFAULT_VISUAL_CUE_TIMEOUT_SECONDS))
+            min_interval = max(0.0, float(params.get('poll_interval', DEFAULT_VISUAL_CUE_POLL_SECONDS)))
+            max_interval = max(min_interval, float(params.get('max_poll_interval', DEFAULT_VISUAL_CUE_MAX_POLL_SECONDS)))
+            change_detector = RegionChangeDetector(float(params.get('change_threshold', 0.0)))
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Invalid wait for visual cue parameters: {str(e)}")
+            return False
+        
+        start = time.monotonic()
+        deadline = start + timeout_seconds
+        interval = min_interval
+        polls = evaluations = 0
+        
+        # Conditions that do not look at pixels are re-checked every poll without capturing
+        pixel_gated = cue.type not in NON_VISUAL_CONDITION_TYPES
+        
+        while not self._execution_cancelled:
+            polls += 1
+            region_image = None
+            if pixel_gated and self.eye:
+                try:
+                    region_image = self.eye.capture_region(region.x, region.y, region.width, region.height)
+                except Exception as e:
+                    self.logger.warning(f"Visual cue capture failed: {str(e)}")
+            
+            backed_off_interval = min(max_interval, max(interval, 0.01) * VISUAL_CUE_POLL_BACKOFF)
+            if region_image is not None and not change_detector.has_changed(region.name, region_image):
+                # Region unchanged since the last check, so the cue cannot have appeared
+                interval = backed_off_interval
+            else:
+                evaluations += 1
+                cue_met = self._evaluate_condition(cue, context, region_image)
+                if cue.negate:
+                    cue_met = not cue_met
+                if cue_met:
+                    elapsed = time.monotonic() - start
+                    self.logger.debug(f"Visual cue '{cue.type}' observed in region '{region.name}' after {elapsed:.2f}s ({polls} polls, {evaluations} checks)")
+                    return True
+                # The region is changing, so look again soon; without captures just back off
+                interval = min_interval if region_image is not None else backed_off_interval
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cancel_event.wait(min(interval, remaining))
+        
+        if self._execution_cancelled:
+            self.logger.debug(f"Wait for visual cue in region '{region.name}' cancelled")
+        else:
+            self.logger.warning(f"Timed out after {timeout_seconds}s waiting for visual cue '{cue.type}' in region '{region.name}' ({polls} polls, {evaluations} checks)")
+        return False
     
     def _execute_ask_user_action(self, action: Action, context: ExecutionContext) -> bool:
         """Execute ask user action"""
@@ -607,6 +811,7 @@ class ProfileExecutor:
     def cancel_execution(self):
         """Cancel current execution"""
         self._execution_cancelled = True
+        self._cancel_event.set()
         self.logger.info("Execution cancellation requested")
     
     def pause_execution(self):
@@ -0,0 +1,331 @@
+"""
+Profile Index
+
+Persistent metadata index for stored automation profiles. Maps profile IDs to
+their files and the fields needed for listing and searching, so the profile
+manager does not have to open and deserialize every profile file.
+"""
+
+import os
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Set
+from datetime import datetime
+
+from .models.base import load_json_file
+from .models.profile import AutomationProfile
+from .profile_search import ProfileSearchIndex
+
+
+INDEX_FILE_NAME = ".profile_index.json"
+INDEX_VERSION = 2
+
+
+@dataclass
+class ProfileIndexEntry:
+    """Lightweight summary of a stored profile"""
+    id: str
+    path: str  # Relative to the storage root, POSIX separators
+    category: str
+    name: str
+    description: str = ""
+    target_application: str = ""
+    tags: List[str] = field(default_factory=list)
+    is_template: bool = False
+    region_names: List[str] = field(default_factory=list)
+    rule_names: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    modified_at: datetime = field(default_factory=datetime.now)
+    mtime_ns: int = 0
+    size: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entry to dictionary for serialization"""
+        return {
+            'id': self.id,
+            'path': self.path,
+            'category': self.category,
+            'name': self.name,
+            'description': self.description,
+            'target_application': self.target_application,
+            'tags': self.tags,
+            'is_template': self.is_template,
+            'region_names': self.region_names,
+            'rule_names': self.rule_names,
+            'created_at': self.created_at.isoformat(),
+            'modified_at': self.modified_at.isoformat(),
+            'mtime_ns': self.mtime_ns,
+            'size': self.size
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProfileIndexEntry':
+        """Create entry from dictionary"""
+        return cls(
+            id=data['id'],
+            path=data['path'],
+            category=data['category'],
+            name=data['name'],
+            description=data.get('description', ''),
+            target_application=data.get('target_application', ''),
+            tags=list(data.get('tags', [])),
+            is_template=data.get('is_template', False),
+            region_names=list(data.get('region_names', [])),
+            rule_names=list(data.get('rule_names', [])),
+            created_at=datetime.fromisoformat(data['created_at']),
+            modified_at=datetime.fromisoformat(data['modified_at']),
+            mtime_ns=data.get('mtime_ns', 0),
+            size=data.get('size', 0)
+        )
+
+    @classmethod
+    def from_profile_data(cls, data: Dict[str, Any], path: str, stat: os.stat_result) -> 'ProfileIndexEntry':
+        """Create entry from the raw JSON of a profile file"""
+        return cls(
+            id=data['id'],
+            path=path,
+            category=data['category'],
+            name=data['name'],
+            description=data.get('description', ''),
+            target_application=data.get('target_application', ''),
+            tags=list(data.get('tags', [])),
+            is_template=data.get('is_template', False),
+            region_names=[region.get('name', '') for region in data.get('regions', [])],
+            rule_names=[rule.get('name', '') for rule in data.get('rules', [])],
+            created_at=datetime.fromisoformat(data['created_at']),
+            modified_at=datetime.fromisoformat(data['modified_at']),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size
+        )
+
+    @classmethod
+    def from_profile(cls, profile: AutomationProfile, path: str, stat: os.stat_result) -> 'ProfileIndexEntry':
+        """Create entry from an in-memory profile that was just written to `path`"""
+        return cls(
+            id=profile.id,
+            path=path,
+            category=profile.category,
+            name=profile.name,
+            description=profile.description,
+            target_application=profile.target_application,
+            tags=list(profile.tags),
+            is_template=profile.is_template,
+            region_names=profile.get_region_names(),
+            rule_names=profile.get_rule_names(),
+            created_at=profile.created_at,
+            modified_at=profile.modified_at,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size
+        )
+
+    @property
+    def region_count(self) -> int:
+        return len(self.region_names)
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.rule_names)
+
+    def search_fields(self) -> Dict[str, List[str]]:
+        """Texts indexed for full-text search, by field"""
+        return {
+            'name': [self.name],
+            'tags': self.tags,
+            'target_application': [self.target_application],
+            'rule_names': self.rule_names,
+            'region_names': self.region_names,
+            'description': [self.description]
+        }
+
+
+class ProfileIndex:
+    """
+    On-disk index of profile metadata stored next to the profile categories.
+
+    Entries are validated against each file's modification time and size, so
+    `refresh()` only stats unchanged files and re-reads new or edited ones.
+    A ProfileSearchIndex over the entries is kept up to date as they change.
+    """
+
+    def __init__(self, storage_path: Path, categories: Iterable[str], index_file_name: str = INDEX_FILE_NAME):
+        """
+        Initialize profile index
+
+        Args:
+            storage_path: Base path for profile storage
+            categories: Category subdirectories that hold profile files
+            index_file_name: Name of the index file inside storage_path
+        """
+        self.storage_path = Path(storage_path)
+        self.categories = list(categories)
+        self.index_path = self.storage_path / index_file_name
+        self.logger = logging.getLogger("mark_i.profiles.index")
+
+        self._entries: Dict[str, ProfileIndexEntry] = {}
+        self._dirty = False
+        self.search_index = ProfileSearchIndex()
+
+    def _put(self, entry: ProfileIndexEntry):
+        self._entries[entry.id] = entry
+        self.search_index.add(entry.id, entry.search_fields())
+        self._dirty = True
+
+    def _pop(self, profile_id: str) -> Optional[ProfileIndexEntry]:
+        entry = self._entries.pop(profile_id, None)
+        if entry is not None:
+            self.search_index.remove(profile_id)
+            self._dirty = True
+        return entry
+
+    def load(self):
+        """Load the index file; a missing or unreadable index starts empty"""
+        self._entries = {}
+        self.search_index.clear()
+        if not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                self.logger.info(f"Profile index version {data.get('version')} is outdated. Rebuilding.")
+                self._dirty = True
+                return
+            for entry_data in data.get('entries', []):
+                self._put(ProfileIndexEntry.from_dict(entry_data))
+            self._dirty = False
+        except Exception as e:
+            self.logger.warning(f"Failed to read profile index {self.index_path}: {str(e)}. Rebuilding.")
+            self._entries = {}
+            self.search_index.clear()
+            self._dirty = True
+
+    def save(self):
+        """Write the index if it changed since it was loaded or last saved"""
+        if not self._dirty:
+            return
+
+        data = {
+            'version': INDEX_VERSION,
+            'entries': [entry.to_dict() for entry in self._entries.values()]
+        }
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            self.logger.error(f"Failed to write profile index {self.index_path}: {str(e)}")
+
+    def refresh(self) -> Set[str]:
+        """
+        Reconcile the index with the files on disk
+
+        Returns:
+            IDs of profiles that were added, changed or removed
+        """
+        changed_ids: Set[str] = set()
+        by_path = {entry.path: entry for entry in self._entries.values()}
+        seen_paths: Set[str] = set()
+
+        for category in self.categories:
+            category_path = self.storage_path / category
+            if not category_path.is_dir():
+                continue
+
+            with os.scandir(category_path) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                        continue
+
+                    rel_path = f"{category}/{dir_entry.name}"
+                    seen_paths.add(rel_path)
+                    stat = dir_entry.stat()
+                    existing = by_path.get(rel_path)
+                    if existing and existing.mtime_ns == stat.st_mtime_ns and existing.size == stat.st_size:
+                        continue
+
+                    entry = self._read_entry(dir_entry.path, rel_path, stat)
+                    if existing:
+                        self._pop(existing.id)
+                        changed_ids.add(existing.id)
+                    if entry is None:
+                        continue
+
+                    duplicate = self._entries.get(entry.id)
+                    if duplicate and duplicate.path != rel_path and self.resolve_path(duplicate).exists():
+                        self.logger.warning(f"Profile ID {entry.id} is stored in both {duplicate.path} and {rel_path}. Using {duplicate.path}.")
+                        continue
+
+                    self._put(entry)
+                    changed_ids.add(entry.id)
+
+        for path, entry in by_path.items():
+            if path not in seen_paths and self._entries.get(entry.id) is entry:
+                self._pop(entry.id)
+                changed_ids.add(entry.id)
+
+        if changed_ids:
+            self.logger.debug(f"Profile index refreshed: {len(changed_ids)} profile(s) changed on disk")
+        return changed_ids
+
+    def _read_entry(self, file_path: str, rel_path: str, stat: os.stat_result) -> Optional[ProfileIndexEntry]:
+        """Read the metadata of one profile file"""
+        try:
+            return ProfileIndexEntry.from_profile_data(load_json_file(file_path), rel_path, stat)
+        except Exception as e:
+            self.logger.error(f"Failed to index profile file {file_path}: {str(e)}")
+            return None
+
+    def update(self, profile: AutomationProfile, file_path: Path):
+        """Record a profile that was just written to file_path"""
+        rel_path = Path(file_path).relative_to(self.storage_path).as_posix()
+        # A profile written over another profile's file replaces it
+        for other_id in [entry.id for entry in self._entries.values() if entry.path == rel_path and entry.id != profile.id]:
+            self._pop(other_id)
+        self._put(ProfileIndexEntry.from_profile(profile, rel_path, os.stat(file_path)))
+
+    def remove(self, profile_id: str):
+        """Forget a profile"""
+        self._pop(profile_id)
+
+    def get(self, profile_id: str) -> Optional[ProfileIndexEntry]:
+        """Get the entry for a profile ID"""
+        return self._entries.get(profile_id)
+
+    def search(self, query: str, category: Optional[str] = None, limit: Optional[int] = None) -> List[ProfileIndexEntry]:
+        """
+        Ranked full-text search over the indexed metadata
+
+        Args:
+            query: Free-text query; tokens match as prefixes
+            category: Optional category filter
+            limit: Optional maximum number of results
+
+        Returns:
+            Matching entries, best first
+        """
+        if not category:
+            return [self._entries[profile_id] for profile_id, _ in self.search_index.search(query, limit=limit)]
+
+        prefix = f"{category}/"
+        matches = [self._entries[profile_id] for profile_id, _ in self.search_index.search(query)]
+        matches = [entry for entry in matches if entry.path.startswith(prefix)]
+        return matches[:limit] if limit is not None else matches
+
+    def resolve_path(self, entry: ProfileIndexEntry) -> Path:
+        """Absolute path of an entry's profile file"""
+        return self.storage_path / entry.path
+
+    def entries(self, category: Optional[str] = None) -> List[ProfileIndexEntry]:
+        """All entries, optionally filtered by the category directory they are stored in"""
+        if category is None:
+            return list(self._entries.values())
+        prefix = f"{category}/"
+        return [entry for entry in self._entries.values() if entry.path.startswith(prefix)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -6,16 +6,19 @@ organization, search, and template management.
 """
 
 import os
-import json
 import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from .models.profile import AutomationProfile
+from .profile_index import ProfileIndex, ProfileIndexEntry
 from .validation.profile_validator import ProfileValidator
 
 
+PROFILE_CATEGORIES = ['email', 'web', 'files', 'templates', 'custom']
+
+
 class ProfileManager:
     """Central management of automation profiles"""
     
@@ -38,13 +41,16 @@ class ProfileManager:
         # Cache for loaded profiles
         self._profile_cache: Dict[str, AutomationProfile] = {}
         
+        # Metadata index (id -> file, name, tags, ...), validated against file mtimes
+        self.index = ProfileIndex(self.storage_path, PROFILE_CATEGORIES)
+        self.index.load()
+        self._refresh_index()
+        
         self.logger.info(f"ProfileManager initialized with storage: {self.storage_path}")
     
     def _ensure_storage_structure(self):
         """Ensure all required storage directories exist"""
-        categories = ['email', 'web', 'files', 'templates', 'custom']
-        
-        for category in categories:
+        for category in PROFILE_CATEGORIES:
             category_path = self.storage_path / category
             category_path.mkdir(parents=True, exist_ok=True)
             
@@ -104,12 +110,11 @@ class ProfileManager:
             Created AutomationProfile instance
         """
         # Validate category
-        valid_categories = ['email', 'web', 'files', 'templates', 'custom']
-        if category not in valid_categories:
-            raise ValueError(f"Invalid category '{category}'. Valid categories: {valid_categories}")
+        if category not in PROFILE_CATEGORIES:
+            raise ValueError(f"Invalid category '{category}'. Valid categories: {PROFILE_CATEGORIES}")
         
         # Check for duplicate names in category
-        existing_profiles = self.list_profiles(category)
+        existing_profiles = self.list_profile_summaries(category)
         if any(p.name == name for p in existing_profiles):
             raise ValueError(f"Profile with name '{name}' already exists in category '{category}'")
         
@@ -186,7 +191,16 @@ class ProfileManager:
             # Save to file
             profile.save_to_file(str(file_path))
             
-            # Update cache
+            # Remove the previous file if the profile was renamed or moved
+            previous_entry = self.index.get(profile.id)
+            if previous_entry and previous_entry.path != file_path.relative_to(self.storage_path).as_posix():
+                previous_file = self.index.resolve_path(previous_entry)
+                if previous_file.exists():
+                    os.remove(previous_file)
+            
+            # Update index and cache
+            self.index.update(profile, file_path)
+            self.index.save()
             self._profile_cache[profile.id] = profile
             
             self.logger.info(f"Saved profile: {profile.name} to {file_path}")
@@ -216,6 +230,10 @@ class ProfileManager:
             # Remove file
             os.remove(profile_file)
             
+            # Remove from index
+            self.index.remove(profile_id)
+            self.index.save()
+            
             # Remove from cache
             if profile_id in self._profile_cache:
                 del self._profile_cache[profile_id]
@@ -239,28 +257,16 @@ class ProfileManager:
         """
         profiles = []
         
-        # Determine which categories to search
-        if category:
-            categories = [category]
-        else:
-            categories = ['email', 'web', 'files', 'templates', 'custom']
-        
-        for cat in categories:
-            category_path = self.storage_path / cat
-            if not category_path.exists():
-                continue
-            
-            # Load all JSON files in category
-            for json_file in category_path.glob("*.json"):
+        for entry in self.list_profile_summaries(category):
+            profile = self._profile_cache.get(entry.id)
+            if profile is None:
                 try:
-                    profile = AutomationProfile.load_from_file(str(json_file))
-                    profiles.append(profile)
-                    
-                    # Add to cache
+                    profile = AutomationProfile.load_from_file(str(self.index.resolve_path(entry)))
                     self._profile_cache[profile.id] = profile
-                    
                 except Exception as e:
-                    self.logger.error(f"Failed to load profile from {json_file}: {str(e)}")
+                    self.logger.error(f"Failed to load profile from {entry.path}: {str(e)}")
+                    continue
+            profiles.append(profile)
         
         # Sort by modified time (newest first)
         profiles.sort(key=lambda p: p.modified_at, reverse=True)
@@ -268,40 +274,35 @@ class ProfileManager:
     
     def search_profiles(self, query: str) -> List[AutomationProfile]:
         """
-        Search profiles by name, description, or tags
+        Search profiles by name, tags, target application, rule/region names or description
         
         Args:
-            query: Search query string
+            query: Search query string; each word matches as a prefix
             
         Returns:
-            List of matching AutomationProfile instances
+            List of matching AutomationProfile instances, best match first
+        """
+        # Only deserialize the matches
+        matches = self.search_profile_summaries(query)
+        return [p for p in (self.load_profile(entry.id) for entry in matches) if p]
+    
+    def search_profile_summaries(self, query: str, category: Optional[str] = None, limit: Optional[int] = None, refresh: bool = True) -> List[ProfileIndexEntry]:
         """
-        query_lower = query.lower()
-        all_profiles = self.list_profiles()
+        Ranked search over the profile index without loading the profiles
         
-        matching_profiles = []
-        for profile in all_profiles:
-            # Search in name
-            if query_lower in profile.name.lower():
-                matching_profiles.append(profile)
-                continue
-            
-            # Search in description
-            if query_lower in profile.description.lower():
-                matching_profiles.append(profile)
-                continue
-            
-            # Search in tags
-            if any(query_lower in tag.lower() for tag in profile.tags):
-                matching_profiles.append(profile)
-                continue
-            
-            # Search in target application
-            if query_lower in profile.target_application.lower():
-                matching_profiles.append(profile)
-                continue
-        
-        return matching_profiles
+        Args:
+            query: Search query string; each word matches as a prefix
+            category: Optional category filter
+            limit: Optional maximum number of results
+            refresh: Reconcile the index with the files on disk first. Type-ahead
+                callers that refreshed when they opened can skip this per keystroke.
+            
+        Returns:
+            List of matching ProfileIndexEntry instances, best match first
+        """
+        if refresh:
+            self._refresh_index()
+        return self.index.search(query, category=category, limit=limit)
     
     def duplicate_profile(self, profile_id: str, new_name: str) -> Optional[AutomationProfile]:
         """
@@ -340,7 +341,7 @@ class ProfileManager:
         Returns:
             Dictionary containing profile statistics
         """
-        all_profiles = self.list_profiles()
+        all_profiles = self.list_profile_summaries()
         
         stats = {
             'total_profiles': len(all_profiles),
@@ -367,25 +368,37 @@ class ProfileManager:
         
         return stats
     
-    def _find_profile_file(self, profile_id: str) -> Optional[str]:
-        """Find the file path for a profile by ID"""
-        categories = ['email', 'web', 'files', 'templates', 'custom']
+    def list_profile_summaries(self, category: Optional[str] = None) -> List[ProfileIndexEntry]:
+        """
+        List profile metadata from the index without loading the profiles
         
-        for category in categories:
-            category_path = self.storage_path / category
-            if not category_path.exists():
-                continue
+        Args:
+            category: Optional category filter
             
-            for json_file in category_path.glob("*.json"):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if data.get('id') == profile_id:
-                            return str(json_file)
-                except Exception:
-                    continue
+        Returns:
+            List of ProfileIndexEntry instances, newest first
+        """
+        self._refresh_index()
+        summaries = self.index.entries(category)
+        summaries.sort(key=lambda p: p.modified_at, reverse=True)
+        return summaries
+    
+    def _refresh_index(self):
+        """Bring the index up to date with files changed outside this manager"""
+        changed_ids = self.index.refresh()
+        for profile_id in changed_ids:
+            self._profile_cache.pop(profile_id, None)
+        self.index.save()
+    
+    def _find_profile_file(self, profile_id: str) -> Optional[str]:
+        """Find the file path for a profile by ID"""
+        entry = self.index.get(profile_id)
+        if entry is None or not self.index.resolve_path(entry).exists():
+            # The file may have been added or moved since the last refresh
+            self._refresh_index()
+            entry = self.index.get(profile_id)
         
-        return None
+        return str(self.index.resolve_path(entry)) if entry else None
     
     def _generate_filename(self, profile_name: str) -> str:
         """Generate a safe filename from profile name"""
@@ -467,7 +480,7 @@ class ProfileManager:
                 return None
             
             # Check for name conflicts
-            existing_profiles = self.list_profiles(profile.category)
+            existing_profiles = self.list_profile_summaries(profile.category)
             if any(p.name == profile.name for p in existing_profiles):
                 # Generate unique name
                 base_name = profile.name
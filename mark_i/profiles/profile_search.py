@@ -0,0 +1,141 @@
+"""
+Profile Search
+
+Inverted token index over profile metadata (name, tags, target application,
+rule and region names, description) with prefix matching and ranking.
+"""
+
+import re
+import heapq
+from bisect import bisect_left, insort
+from typing import List, Dict, Iterable, Optional, Set, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Field weights used for ranking; a token occurring in several fields keeps its best weight
+FIELD_WEIGHTS = {
+    'name': 8.0,
+    'tags': 5.0,
+    'target_application': 4.0,
+    'rule_names': 2.0,
+    'region_names': 2.0,
+    'description': 1.0
+}
+
+# Exact token matches rank above prefix matches
+PREFIX_MATCH_FACTOR = 0.6
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class ProfileSearchIndex:
+    """
+    Inverted index from tokens to the profiles containing them.
+
+    Profiles are added, replaced and removed one at a time, so the index can be kept in step
+    with the profile index. A query matches a profile when every query token is a prefix of
+    one of its tokens; matches are ranked by the weights of the fields the tokens came from.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._sorted_tokens: List[str] = []
+        self._doc_tokens: Dict[str, Set[str]] = {}
+
+    def add(self, profile_id: str, fields: Dict[str, Iterable[str]]):
+        """
+        Index a profile, replacing any previous version of it
+
+        Args:
+            profile_id: Profile ID
+            fields: Field name (see FIELD_WEIGHTS) -> texts of that field
+        """
+        self.remove(profile_id)
+
+        token_weights: Dict[str, float] = {}
+        for field_name, texts in fields.items():
+            weight = FIELD_WEIGHTS.get(field_name, 1.0)
+            for text in texts:
+                for token in tokenize(text):
+                    if weight > token_weights.get(token, 0.0):
+                        token_weights[token] = weight
+
+        for token, weight in token_weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._sorted_tokens, token)
+            postings[profile_id] = weight
+        self._doc_tokens[profile_id] = set(token_weights)
+
+    def remove(self, profile_id: str):
+        """Remove a profile from the index"""
+        for token in self._doc_tokens.pop(profile_id, ()):
+            postings = self._postings[token]
+            del postings[profile_id]
+            if not postings:
+                del self._postings[token]
+                del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+
+    def clear(self):
+        """Remove all profiles"""
+        self._postings.clear()
+        self._sorted_tokens.clear()
+        self._doc_tokens.clear()
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """All indexed tokens starting with prefix"""
+        start = bisect_left(self._sorted_tokens, prefix)
+        end = start
+        while end < len(self._sorted_tokens) and self._sorted_tokens[end].startswith(prefix):
+            end += 1
+        return self._sorted_tokens[start:end]
+
+    def _score_token(self, query_token: str) -> Dict[str, float]:
+        """Best score per profile for one query token"""
+        scores: Dict[str, float] = {}
+        for token in self._expand_prefix(query_token):
+            factor = 1.0 if token == query_token else PREFIX_MATCH_FACTOR
+            for profile_id, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(profile_id, 0.0):
+                    scores[profile_id] = score
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Find profiles matching every token of the query
+
+        Args:
+            query: Free-text query; the last token may be partially typed
+            limit: Optional maximum number of results
+
+        Returns:
+            (profile_id, score) pairs, best first
+        """
+        query_tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not query_tokens:
+            return []
+
+        # Longest tokens first: they usually have the fewest matches, which keeps the intersection small
+        totals: Optional[Dict[str, float]] = None
+        for query_token in query_tokens:
+            scores = self._score_token(query_token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {pid: total + scores[pid] for pid, total in totals.items() if pid in scores}
+            if not totals:
+                return []
+
+        rank_key = lambda item: (-item[1], item[0])
+        if limit is not None:
+            return heapq.nsmallest(limit, totals.items(), key=rank_key)
+        return sorted(totals.items(), key=rank_key)
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
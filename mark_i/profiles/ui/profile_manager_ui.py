@@ -15,6 +15,7 @@ from pathlib import Path
 
 from ..models.profile import AutomationProfile
 from ..profile_manager import ProfileManager
+from ..profile_index import ProfileIndexEntry
 from ..validation.profile_validator import ProfileValidator
 from ..templates.template_manager import TemplateManager
 from .profile_editor import ProfileEditorWindow
@@ -32,8 +33,8 @@ class ProfileManagerWindow(ctk.CTkToplevel):
         self.logger = logging.getLogger("mark_i.profiles.ui.manager")
         
         # UI state
-        self.profiles: List[AutomationProfile] = []
-        self.filtered_profiles: List[AutomationProfile] = []
+        self.profiles: List[ProfileIndexEntry] = []
+        self.filtered_profiles: List[ProfileIndexEntry] = []
         self.selected_profiles: List[AutomationProfile] = []
         self.current_category = "all"
         self.search_query = ""
@@ -178,7 +179,7 @@ class ProfileManagerWindow(ctk.CTkToplevel):
                     font=("Arial", 14, "bold")).grid(row=0, column=0, pady=5)
         
         # Search entry
-        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Search by name, description, or tags...")
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Search by name, tags, application, rules...")
         self.search_entry.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
         self.search_entry.bind("<KeyRelease>", self._on_search_changed)
         
@@ -292,7 +293,7 @@ class ProfileManagerWindow(ctk.CTkToplevel):
         
         self.sort_combo = ctk.CTkComboBox(
             sort_frame,
-            values=["Name", "Category", "Created", "Modified", "Priority"],
+            values=["Relevance", "Name", "Category", "Created", "Modified", "Priority"],
             command=self._on_sort_changed,
             width=120
         )
@@ -391,7 +392,8 @@ class ProfileManagerWindow(ctk.CTkToplevel):
     def _load_profiles(self):
         """Load profiles from profile manager"""
         try:
-            self.profiles = self.profile_manager.list_profiles()
+            # Index summaries; full profiles are loaded on selection
+            self.profiles = self.profile_manager.list_profile_summaries()
             self._apply_filters()
             self._update_status(f"Loaded {len(self.profiles)} profiles")
         except Exception as e:
@@ -419,13 +421,11 @@ class ProfileManagerWindow(ctk.CTkToplevel):
         if self.current_category != "all":
             filtered = [p for p in filtered if p.category == self.current_category]
         
-        # Apply search filter
+        # Apply search filter (type-ahead over the inverted index, ranked by relevance)
         if self.search_query:
-            query = self.search_query.lower()
-            filtered = [p for p in filtered if 
-                       query in p.name.lower() or 
-                       query in p.description.lower() or
-                       any(query in tag.lower() for tag in p.tags)]
+            visible_ids = {p.id for p in filtered}
+            matches = self.profile_manager.search_profile_summaries(self.search_query, refresh=False)
+            filtered = [p for p in matches if p.id in visible_ids]
         
         # Apply enabled filter
         if hasattr(self, 'show_enabled_var') and self.show_enabled_var.get():
@@ -454,7 +454,7 @@ class ProfileManagerWindow(ctk.CTkToplevel):
         elif sort_key == "Created":
             self.filtered_profiles.sort(key=lambda p: p.created_at, reverse=True)
         elif sort_key == "Modified":
-            self.filtered_profiles.sort(key=lambda p: p.updated_at, reverse=True)
+            self.filtered_profiles.sort(key=lambda p: p.modified_at, reverse=True)
         
         # Add profiles to tree
         for profile in self.filtered_profiles:
@@ -462,9 +462,9 @@ class ProfileManagerWindow(ctk.CTkToplevel):
             status = "✅ Ready"
             if 'template' in profile.tags:
                 status = "📋 Template"
-            elif not profile.rules:
+            elif not profile.rule_count:
                 status = "⚠️ No Rules"
-            elif not profile.regions:
+            elif not profile.region_count:
                 status = "⚠️ No Regions"
             
             # Insert into tree
@@ -473,8 +473,8 @@ class ProfileManagerWindow(ctk.CTkToplevel):
                                    values=(
                                        profile.category.title(),
                                        profile.target_application or "Any",
-                                       len(profile.regions),
-                                       len(profile.rules),
+                                       profile.region_count,
+                                       profile.rule_count,
                                        profile.created_at.strftime("%Y-%m-%d"),
                                        status
                                    ),
@@ -502,7 +502,8 @@ class ProfileManagerWindow(ctk.CTkToplevel):
     
     def _on_sort_changed(self, value):
         """Handle sort option change"""
-        self._update_profile_list()
+        # Re-filter so "Relevance" restores the search ranking
+        self._apply_filters()
     
     def _on_template_category_changed(self, value):
         """Handle template category change"""
@@ -520,7 +521,7 @@ class ProfileManagerWindow(ctk.CTkToplevel):
         self.selected_profiles = []
         for item in selection:
             profile_id = self.profile_tree.item(item)["tags"][0]
-            profile = next((p for p in self.filtered_profiles if p.id == profile_id), None)
+            profile = self.profile_manager.load_profile(profile_id)
             if profile:
                 self.selected_profiles.append(profile)
         
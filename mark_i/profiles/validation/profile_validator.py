@@ -395,7 +395,7 @@ class ProfileValidator:
         unused_regions = region_names - used_regions
         for unused_region in unused_regions:
             result.add_warning(f"Region '{unused_region}' is defined but not used by any rules") 
-   def _validate_conditions_and_actions(self, profile: AutomationProfile, result: ValidationResult):
+    def _validate_conditions_and_actions(self, profile: AutomationProfile, result: ValidationResult):
         """Validate rule conditions and actions in detail"""
         for rule in profile.rules:
             rule_location = f"Rule '{rule.name}'"
@@ -131,6 +131,10 @@ class RuleValidator:
                     result.add_error(f"Condition {condition_num}: Color must be [R, G, B] format")
                 elif not all(0 <= c <= 255 for c in color):
                     result.add_error(f"Condition {condition_num}: Color values must be 0-255")
+        
+        elif condition.type == ConditionType.WINDOW_EXISTS.value:
+            if not condition.parameters.get('window_title'):
+                result.add_error(f"Condition {condition_num}: Window exists condition missing 'window_title' parameter")
     
     def _validate_actions(self, rule: Rule, available_regions: List[str], result: ValidationResult):
         """Validate rule actions"""
@@ -200,7 +204,24 @@ class RuleValidator:
                     result.add_error(f"Action {action_num}: WAIT seconds must be positive number")
                 elif wait_time > 60:
                     result.add_warning(f"Action {action_num}: Very long wait time ({wait_time}s)")
-        
+
+        elif action.type == ActionType.WAIT_FOR_VISUAL_CUE.value:
+            cue = action.parameters.get('condition')
+            if cue is None and 'cue_description' in action.parameters:
+                if not isinstance(action.parameters['cue_description'], str) or not action.parameters['cue_description'].strip():
+                    result.add_error(f"Action {action_num}: WAIT_FOR_VISUAL_CUE cue_description cannot be empty")
+            elif not isinstance(cue, dict) or 'type' not in cue:
+                result.add_error(f"Action {action_num}: WAIT_FOR_VISUAL_CUE missing 'condition' parameter with a 'type' (or a 'cue_description')")
+            elif cue['type'] not in [ct.value for ct in ConditionType]:
+                result.add_error(f"Action {action_num}: WAIT_FOR_VISUAL_CUE has invalid condition type '{cue['type']}'")
+            else:
+                cue_condition = Condition(cue['type'], cue.get('region') or action.region, parameters=cue.get('parameters') or {})
+                self._validate_condition_parameters(cue_condition, result, action_num)
+
+            timeout = action.parameters.get('timeout_seconds', 10.0)
+            if not isinstance(timeout, (int, float)) or timeout <= 0:
+                result.add_error(f"Action {action_num}: WAIT_FOR_VISUAL_CUE timeout_seconds must be positive number")
+
         elif action.type == ActionType.PRESS_KEY.value:
             if 'key' not in action.parameters:
                 result.add_error(f"Action {action_num}: PRESS_KEY missing 'key' parameter")
@@ -0,0 +1,7 @@
+"""
+MARK-I developer tools.
+
+Run `python -m mark_i.tools --help` for the command-line utilities
+(e.g. `capture-benchmark`). The standalone *_test.py / *_demo.py scripts
+in this package are interactive demos and are run directly.
+"""
@@ -0,0 +1,207 @@
+"""
+MARK-I developer tool commands.
+
+Usage:
+    python -m mark_i.tools capture-benchmark [--backends xshm,mss,pil] [--sizes 320x240,1280x720,full] [--iterations 50]
+    python -m mark_i.tools gemini-benchmark [--scenario session|rules|nlu] [--session recorded.json] [--latency lognormal:800,0.5] [--concurrency 4] [--repeat 5]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
+from mark_i.engines.capture_backends import benchmark_capture_backends, get_registered_capture_backends
+from mark_i.engines.fake_gemini import (
+    GEMINI_SESSION_FILE_VERSION,
+    PIPELINE_BENCHMARK_RESPONSES,
+    FakeGeminiBackend,
+    LatencyModel,
+    benchmark_gemini_session,
+    benchmark_nlu_task,
+    benchmark_rules_engine,
+    load_gemini_session,
+)
+
+logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.tools")
+
+DEFAULT_BENCHMARK_SIZES = "320x240,1280x720,full"
+DEFAULT_GEMINI_BENCHMARK_LATENCY = "lognormal:800,0.5"
+GEMINI_BENCHMARK_SCENARIOS = ("session", "rules", "nlu")
+
+
+def _primary_screen_size() -> Tuple[int, int]:
+    try:
+        import pyautogui
+
+        width, height = pyautogui.size()
+        return int(width), int(height)
+    except Exception as e:
+        logger.warning(f"Could not read the screen size ({e}); assuming 1920x1080 for 'full'.")
+        return 1920, 1080
+
+
+def parse_region_sizes(sizes_arg: str) -> List[Tuple[int, int, int, int]]:
+    """Parses '320x240,full' into bounding boxes anchored at the screen origin."""
+    bboxes = []
+    for token in (t.strip().lower() for t in sizes_arg.split(",")):
+        if not token:
+            continue
+        if token == "full":
+            width, height = _primary_screen_size()
+        else:
+            try:
+                width, height = (int(v) for v in token.split("x", 1))
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Invalid region size '{token}'. Use WIDTHxHEIGHT or 'full'.")
+            if width <= 0 or height <= 0:
+                raise argparse.ArgumentTypeError(f"Region size '{token}' must be positive.")
+        bboxes.append((0, 0, width, height))
+    if not bboxes:
+        raise argparse.ArgumentTypeError("At least one region size is required.")
+    return bboxes
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def format_capture_benchmark_table(results: List[Dict[str, Any]]) -> str:
+    """Renders benchmark summaries as a fixed-width table with the fastest backend per region size."""
+    header = f"{'backend':<18}{'region':>11}{'grabs':>7}{'fail':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'fps':>8}{'MB/s':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['backend']:<18}{r['region']:>11}{r['grabs']:>7}{r['failures']:>6}{_fmt_ms(r['p50_ms']):>9}{_fmt_ms(r['p95_ms']):>9}{_fmt_ms(r['p99_ms']):>9}{r['fps']:>8.1f}{r['mb_per_s']:>9.1f}"
+        )
+
+    fastest_per_region: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        if r["p50_ms"] is None or r["failures"]:
+            continue
+        best = fastest_per_region.get(r["region"])
+        if best is None or r["p50_ms"] < best["p50_ms"]:
+            fastest_per_region[r["region"]] = r
+    if fastest_per_region:
+        lines.append("")
+        for region, r in fastest_per_region.items():
+            lines.append(f"Fastest for {region}: {r['backend']} (p50 {r['p50_ms']:.1f} ms, {r['mb_per_s']:.1f} MB/s)")
+    return "\n".join(lines)
+
+
+def _run_capture_benchmark(args: argparse.Namespace) -> int:
+    backend_names = [b.strip() for b in args.backends.split(",") if b.strip()] if args.backends else None
+    unknown = [b for b in backend_names or [] if b not in get_registered_capture_backends()]
+    if unknown:
+        print(f"Unknown capture backend(s): {unknown}. Registered: {get_registered_capture_backends()}", file=sys.stderr)
+        return 2
+
+    results = benchmark_capture_backends(backend_names, args.sizes, args.iterations, args.warmup)
+    if not results:
+        print("No capture backend could be initialized on this host.", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_capture_benchmark_table(results))
+    return 0
+
+
+def synthetic_gemini_session(requests: int = 20) -> Dict[str, Any]:
+    """A small built-in session (three recurring vision prompts on 1280x720 frames) for runs without a recording."""
+    prompts = [
+        ("Is the 'Submit' button enabled? Answer yes or no.", {"text": "yes"}),
+        ('Find the search box. Respond ONLY with JSON: {"found": true, "box": [x,y,w,h]}.', {"response": {"found": True, "box": [420, 36, 300, 28]}}),
+        ("Read the status bar text.", {"text": "Ready"}),
+    ]
+    return {
+        "version": GEMINI_SESSION_FILE_VERSION,
+        "requests": [{"prompt": prompts[i % len(prompts)][0], "image_size": [1280, 720]} for i in range(requests)],
+        "responses": [{"prompt_contains": prompt, **response} for prompt, response in prompts],
+    }
+
+
+def _run_gemini_benchmark(args: argparse.Namespace) -> int:
+    # The app config validates GEMINI_API_KEY at import time; the fake backend never uses it.
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+    from mark_i.engines.gemini_upload import UploadImageOptions
+
+    try:
+        latency = LatencyModel.parse(args.latency)
+        backend_options = {"latency": latency, "error_rate": args.error_rate, "rate_limit_rate": args.rate_limit_rate, "seed": args.seed}
+        if args.scenario == "session":
+            session = load_gemini_session(args.session) if args.session else synthetic_gemini_session()
+            backend = FakeGeminiBackend.from_session(session, **backend_options)
+        else:
+            backend = FakeGeminiBackend(responses=PIPELINE_BENCHMARK_RESPONSES, **backend_options)
+    except (OSError, ValueError) as e:
+        print(f"Cannot start Gemini benchmark: {e}", file=sys.stderr)
+        return 2
+    upload_options = UploadImageOptions(max_pixels=args.upload_max_pixels) if args.upload_max_pixels else None
+    analyzer = GeminiAnalyzer(api_key="", default_model_name="fake-model", upload_options=upload_options, model_factory=backend)
+
+    if args.scenario == "rules":
+        result = benchmark_rules_engine(analyzer, cycles=args.repeat, regions=args.regions, concurrency=args.concurrency)
+        summary = f"{result['cycles']} rule cycles x {result['regions']} regions, concurrency {result['concurrency']}: {result['throughput_per_s']:.2f} cycles/s"
+        outcome = f"Rules fired: {result['rules_fired']}"
+    elif args.scenario == "nlu":
+        result = benchmark_nlu_task(analyzer, runs=args.repeat)
+        summary = f"{result['tasks']} NLU tasks: {result['throughput_per_s']:.2f} tasks/s"
+        outcome = f"Statuses: {result['statuses']}"
+    else:
+        result = benchmark_gemini_session(analyzer, session, repeat=args.repeat, concurrency=args.concurrency)
+        summary = f"{result['requests']} requests, concurrency {result['concurrency']}: {result['throughput_rps']:.2f} req/s"
+        outcome = f"Statuses: {result['statuses']}"
+    result["scenario"] = args.scenario
+    result["backend"] = backend.get_stats()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{summary}, p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms, p99 {result['p99_ms']:.0f} ms, max {result['max_ms']:.0f} ms")
+        print(f"{outcome}. Backend calls: {result['backend']['calls']} ({result['backend']['rate_limited']} rate-limited, {result['backend']['errors']} errors).")
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m mark_i.tools", description="MARK-I developer tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench = subparsers.add_parser("capture-benchmark", help="Measure p50/p95/p99 latency and MB/s of every capture backend that works on this host.")
+    bench.add_argument("--backends", default="", help=f"Comma-separated backends to test (default: all of {', '.join(get_registered_capture_backends())}).")
+    bench.add_argument("--sizes", type=parse_region_sizes, default=DEFAULT_BENCHMARK_SIZES, help="Comma-separated WIDTHxHEIGHT sizes or 'full'.")
+    bench.add_argument("--iterations", type=int, default=50, help="Timed grabs per backend and size.")
+    bench.add_argument("--warmup", type=int, default=2, help="Untimed grabs before timing starts.")
+    bench.add_argument("--json", action="store_true", help="Print raw results as JSON instead of a table.")
+    bench.set_defaults(handler=_run_capture_benchmark)
+
+    gemini_bench = subparsers.add_parser("gemini-benchmark", help="Replay a Gemini session, or run the rules engine or an NLU task, against the offline fake backend.")
+    gemini_bench.add_argument(
+        "--scenario", choices=GEMINI_BENCHMARK_SCENARIOS, default="session", help="session: replay raw queries; rules: RulesEngine.evaluate_rules cycles; nlu: execute_nlu_task runs."
+    )
+    gemini_bench.add_argument("--session", default="", help="Session JSON recorded with GeminiSessionRecorder (default: built-in synthetic session).")
+    gemini_bench.add_argument("--latency", default=DEFAULT_GEMINI_BENCHMARK_LATENCY, help="Injected latency: fixed:MS, uniform:LO,HI or lognormal:MEDIAN,SIGMA.")
+    gemini_bench.add_argument("--error-rate", type=float, default=0.0, help="Probability of a simulated API error per call.")
+    gemini_bench.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of a simulated quota (429) error per call.")
+    gemini_bench.add_argument("--concurrency", type=int, default=1, help="Queries in flight at once (1 replays serially; for 'rules', per cycle).")
+    gemini_bench.add_argument("--repeat", type=int, default=1, help="How many times the session is replayed (rule cycles or NLU tasks for the other scenarios).")
+    gemini_bench.add_argument("--regions", type=int, default=4, help="Regions, each with one Gemini query rule, in the 'rules' scenario.")
+    gemini_bench.add_argument("--upload-max-pixels", type=int, default=0, help="Downscale images to this many pixels before 'upload' (0: send as is).")
+    gemini_bench.add_argument("--seed", type=int, default=0, help="Seed for latency and error sampling.")
+    gemini_bench.add_argument("--json", action="store_true", help="Print raw results as JSON.")
+    gemini_bench.set_defaults(handler=_run_gemini_benchmark)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    sys.exit(main())
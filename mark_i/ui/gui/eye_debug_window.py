@@ -18,6 +18,7 @@ import json
 from mark_i.engines.capture_engine import CaptureEngine
 from mark_i.engines.gemini_analyzer import GeminiAnalyzer
 from mark_i.engines.cv_analyzer import CVAnalyzer
+from mark_i.perception.frame_delta import FrameDeltaEncoder
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.ui.gui.eye_debug_window")
@@ -35,6 +36,9 @@ class EyeDebugWindow:
         self.capture_engine = CaptureEngine()
         self.gemini_analyzer = None  # Initialize when needed
         self.cv_analyzer = CVAnalyzer()
+        self.frame_delta_encoder = FrameDeltaEncoder()
+        self._capture_lock = threading.Lock()  # force_update runs captures on its own thread
+        self._last_analysis_settings = None
         
         # UI elements
         self.canvas = None
@@ -186,8 +190,12 @@ class EyeDebugWindow:
                 self._update_status(f"Error: {str(e)}")
                 time.sleep(1.0)
     
-    def _capture_and_analyze(self):
-        """Capture screen and analyze what the Eye sees."""
+    def _capture_and_analyze(self, force: bool = False):
+        """Capture screen and analyze what the Eye sees. `force` re-analyzes even if the screen did not change."""
+        with self._capture_lock:
+            self._capture_and_analyze_locked(force)
+    
+    def _capture_and_analyze_locked(self, force: bool):
         try:
             # Update status
             self._update_status("Capturing screen...")
@@ -206,6 +214,14 @@ class EyeDebugWindow:
                 self._update_status("❌ Screen capture failed")
                 return
             
+            # Nothing changed on screen and the same analyses are enabled: keep the previous image and detections
+            frame_unchanged = self.frame_delta_encoder.encode(captured_image).unchanged
+            analysis_settings = (self.analysis_enabled, self.cv_analysis_enabled)
+            if frame_unchanged and not force and analysis_settings == self._last_analysis_settings and self.current_image is not None:
+                self._update_status("✅ No change")
+                return
+            self._last_analysis_settings = analysis_settings
+            
             # Convert to PIL Image
             pil_image = Image.fromarray(cv2.cvtColor(captured_image, cv2.COLOR_BGR2RGB))
             self.current_image = pil_image.copy()
@@ -597,7 +613,7 @@ class EyeDebugWindow:
     def force_update(self):
         """Force an immediate update."""
         if self.is_running:
-            threading.Thread(target=self._capture_and_analyze, daemon=True).start()
+            threading.Thread(target=self._capture_and_analyze, kwargs={"force": True}, daemon=True).start()
     
     def on_closing(self):
         """Handle window closing."""
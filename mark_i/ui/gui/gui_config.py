@@ -7,9 +7,29 @@ DEFAULT_PROFILE_STRUCTURE: Dict[str, Any] = {
     "settings": {
         "monitoring_interval_seconds": 1.0,
         "analysis_dominant_colors_k": 3,
+        "analysis_dominant_colors_mode": "kmeans",
+        "analysis_dominant_colors_max_samples": 4096,
+        "template_pyramid_levels": 0,
+        "template_match_scales": [1.0],
         "tesseract_cmd_path": None,
         "tesseract_config_custom": "",
         "gemini_default_model_name": "gemini-1.5-flash-latest",
+        "capture_mode": "union_frame",
+        "capture_backend": "default",
+        "change_detection_enabled": True,
+        "change_detection_threshold": 0.0,
+        "skip_rules_when_unchanged": False,
+        "ocr_cache_entries": 256,
+        "ocr_cache_path": None,
+        "gemini_response_cache_entries": 0,
+        "gemini_response_cache_ttl_seconds": 60.0,
+        "gemini_response_cache_max_distance": 0,
+        "gemini_response_cache_path": None,
+        "gemini_max_concurrent_queries": 4,
+        "gemini_rate_limit_rpm": None,
+        "ocr_backend": "pytesseract",
+        "ocr_workers": 4,
+        "pipeline_workers": 0,
     },
     "regions": [],
     "templates": [],
@@ -16,6 +16,7 @@ import numpy as np
 
 from mark_i.engines.capture_engine import CaptureEngine
 from mark_i.engines.cv_analyzer import CVAnalyzer
+from mark_i.perception.frame_delta import FrameDeltaEncoder
 from mark_i.core.logging_setup import APP_ROOT_LOGGER_NAME
 
 logger = logging.getLogger(f"{APP_ROOT_LOGGER_NAME}.ui.gui.simple_eye_debug")
@@ -32,6 +33,8 @@ class SimpleEyeDebugWindow:
         # Initialize engines
         self.capture_engine = CaptureEngine()
         self.cv_analyzer = CVAnalyzer()
+        self.frame_delta_encoder = FrameDeltaEncoder()
+        self._capture_lock = threading.Lock()  # force_update runs captures on its own thread
         
         # UI elements
         self.canvas = None
@@ -139,8 +142,12 @@ class SimpleEyeDebugWindow:
                 self._safe_update_status(f"Error: {str(e)}")
                 time.sleep(1.0)
     
-    def _capture_and_analyze(self):
-        """Capture screen and analyze."""
+    def _capture_and_analyze(self, force: bool = False):
+        """Capture screen and analyze. `force` re-analyzes even if the screen did not change."""
+        with self._capture_lock:
+            self._capture_and_analyze_locked(force)
+    
+    def _capture_and_analyze_locked(self, force: bool):
         try:
             self._safe_update_status("📸 Capturing screen...")
             
@@ -161,6 +168,13 @@ class SimpleEyeDebugWindow:
                 self._safe_update_status("❌ Screen capture failed")
                 return
             
+            # Nothing changed on screen: keep the previous analysis
+            frame_delta = self.frame_delta_encoder.encode(captured_image)
+            if frame_delta.unchanged and not force and self.current_stats:
+                self.current_stats["capture_time"] = capture_time
+                self._safe_update_status("✅ No change since last capture")
+                return
+            
             self._safe_update_status("👁️ Analyzing with CV...")
             
             # Analyze with CV
@@ -173,7 +187,8 @@ class SimpleEyeDebugWindow:
                 "capture_time": capture_time,
                 "cv_time": cv_time,
                 "cv_results": cv_results,
-                "image_shape": captured_image.shape
+                "image_shape": captured_image.shape,
+                "changed_fraction": frame_delta.changed_fraction
             }
             
             # Update display in main thread
@@ -283,7 +298,7 @@ Total Objects: {summary.get('total_detections', 0):,}
     def force_update(self):
         """Force an immediate update."""
         if self.is_running:
-            threading.Thread(target=self._capture_and_analyze, daemon=True).start()
+            threading.Thread(target=self._capture_and_analyze, kwargs={"force": True}, daemon=True).start()
     
     def on_closing(self):
         """Handle window closing."""
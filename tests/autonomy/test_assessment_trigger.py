@@ -0,0 +1,147 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from mark_i.autonomy.assessment_trigger import AssessmentTrigger, structural_similarity
+from mark_i.autonomy.engine import AutonomyEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _screen(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, (120, 160, 3), dtype=np.uint8)
+
+
+def _trigger(clock, **kwargs):
+    settings = {"min_interval_seconds": 10.0, "max_assessments_per_hour": 100, "idle_seconds": 60.0, "clock": clock}
+    settings.update(kwargs)
+    return AssessmentTrigger(**settings)
+
+
+def _step(trigger, frame, **kwargs):
+    reason = trigger.observe(frame, **kwargs)
+    if reason:
+        trigger.record_assessment(frame, reason)
+    return reason
+
+
+def test_static_screen_is_assessed_once():
+    clock = FakeClock()
+    trigger = _trigger(clock)
+    screen = _screen()
+    reasons = []
+    for _ in range(100):
+        reasons.append(_step(trigger, screen.copy()))
+        clock.now += 1.0
+    assert reasons[0] == "initial" and not any(reasons[1:])
+    assert trigger.get_stats()["skipped_unchanged"] > 80
+
+
+def test_small_or_similar_changes_do_not_trigger_but_large_ones_do():
+    clock = FakeClock()
+    trigger = _trigger(clock)
+    screen = _screen()
+    _step(trigger, screen)
+    clock.now += 30.0
+
+    cursor_blink = screen.copy()
+    cursor_blink[10:20, 10:12] = 0
+    assert _step(trigger, cursor_blink) is None
+
+    new_window = screen.copy()
+    new_window[20:100, 30:140] = _screen(1)[20:100, 30:140]
+    assert _step(trigger, new_window) == "visual_change"
+
+
+def test_min_interval_and_budget_hold_back_assessments():
+    clock = FakeClock()
+    trigger = _trigger(clock, max_assessments_per_hour=3)
+    reasons = []
+    for seed in range(40):
+        reasons.append(_step(trigger, _screen(seed)))  # Every frame differs.
+        clock.now += 5.0
+    fired = [r for r in reasons if r]
+    assert len(fired) == 3 and reasons[:3] == ["initial", None, "visual_change"]
+    stats = trigger.get_stats()
+    assert stats["held_back_by_interval"] > 0 and stats["held_back_by_budget"] > 0
+
+    clock.now += 3600.0
+    assert _step(trigger, _screen(99)) == "visual_change"
+
+
+def test_focus_change_stays_pending_until_interval_passes():
+    clock = FakeClock()
+    trigger = _trigger(clock)
+    screen = _screen()
+    _step(trigger, screen, focused_window="Editor")
+    clock.now += 2.0
+    assert _step(trigger, screen, focused_window="Browser") is None
+    clock.now += 2.0
+    assert _step(trigger, screen, focused_window="Browser") is None
+    clock.now += 10.0
+    assert _step(trigger, screen, focused_window="Browser") == "focus_change"
+
+
+def test_idle_to_active_transition():
+    clock = FakeClock()
+    trigger = _trigger(clock)
+    screen = _screen()
+    _step(trigger, screen, pointer_position=(0, 0))
+    clock.now += 30.0
+    assert _step(trigger, screen, pointer_position=(5, 5)) is None  # Active, never idle.
+    clock.now += 120.0
+    assert _step(trigger, screen, pointer_position=(5, 5)) is None
+    assert _step(trigger, screen, pointer_position=(50, 60)) == "idle_to_active"
+
+
+def test_structural_similarity_and_validation():
+    screen = _screen()
+    assert structural_similarity(screen, screen) == pytest.approx(1.0)
+    assert structural_similarity(screen, _screen(1)) < 0.5
+    with pytest.raises(ValueError):
+        AssessmentTrigger(max_assessments_per_hour=0)
+    with pytest.raises(ValueError):
+        AssessmentTrigger(min_changed_fraction=2)
+
+
+def test_engine_only_queries_gemini_when_triggered():
+    clock = FakeClock()
+    capture_engine = MagicMock()
+    capture_engine.capture_region.return_value = _screen()
+    gemini_analyzer = MagicMock()
+    gemini_analyzer.query_vision_model.return_value = {"status": "success", "json_content": {"assistance_opportunity": {"task_identified": False}}}
+    engine = AutonomyEngine(
+        capture_engine,
+        gemini_analyzer,
+        strategic_executor=MagicMock(),
+        confirmation_gui_callback=lambda goal: False,
+        assessment_trigger=_trigger(clock),
+        focused_window_provider=lambda: "Editor",
+        pointer_position_provider=lambda: (0, 0),
+    )
+    for _ in range(30):
+        engine._run_cycle()
+        clock.now += 1.0
+    assert gemini_analyzer.query_vision_model.call_count == 1
+
+
+def test_engine_assessment_interval_is_the_trigger_minimum_interval():
+    trigger = _trigger(FakeClock(), min_interval_seconds=30.0)
+    engine = AutonomyEngine(MagicMock(), MagicMock(), strategic_executor=MagicMock(), confirmation_gui_callback=lambda goal: False, assessment_trigger=trigger)
+    assert engine.assessment_interval_seconds == 30.0
+
+    engine.assessment_interval_seconds = 5
+    assert trigger.min_interval_seconds == 5.0
+    with pytest.raises(ValueError):
+        engine.assessment_interval_seconds = -1
+
+    default_engine = AutonomyEngine(MagicMock(), MagicMock(), strategic_executor=MagicMock(), confirmation_gui_callback=lambda goal: False)
+    assert default_engine.assessment_interval_seconds == 10.0
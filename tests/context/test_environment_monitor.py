@@ -0,0 +1,110 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from mark_i.context.environment_monitor import ApplicationInfo, EnvironmentMonitor
+from mark_i.core.architecture_config import ComponentConfig
+
+
+def _app(pid, ppid=1, cpu=0.0, memory=0.5, open_files=(), connections=()):
+    return ApplicationInfo(
+        app_id=f"proc_{pid}",
+        name="proc",
+        pid=pid,
+        ppid=ppid,
+        status="running",
+        create_time=datetime.now(),
+        cpu_percent=cpu,
+        memory_percent=memory,
+        memory_rss=0,
+        memory_vms=0,
+        num_threads=1,
+        num_fds=0,
+        connections=list(connections),
+        open_files=list(open_files),
+        cmdline=[],
+        exe="",
+        cwd="",
+        username="user",
+        is_running=True,
+        children=[],
+    )
+
+
+def _random_apps(count, seed=0, active_fraction=0.25):
+    rng = random.Random(seed)
+    apps = {}
+    for pid in range(2, count + 2):
+        connections = []
+        if rng.random() < 0.2:
+            port = rng.randint(5000, 5010)
+            connections.append({"laddr": {"ip": "127.0.0.1", "port": port}, "raddr": {"ip": "127.0.0.1", "port": rng.randint(5000, 5010)}})
+        if rng.random() < 0.1:
+            connections.append({"laddr": ("10.0.0.1", 40000 + pid), "raddr": ()})
+        app = _app(
+            pid,
+            ppid=rng.choice([1, rng.randint(2, count + 1)]),
+            cpu=rng.uniform(0, 60) if rng.random() < active_fraction else 0.0,
+            memory=rng.uniform(0, 40),
+            open_files=[f"/tmp/file{rng.randint(0, 50)}" for _ in range(rng.randint(0, 2))],
+            connections=connections,
+        )
+        apps[app.app_id] = app
+    return apps
+
+
+@pytest.fixture
+def monitor():
+    return EnvironmentMonitor(ComponentConfig())
+
+
+def _brute_force_keys(monitor, apps):
+    keys = set()
+    app_list = list(apps.values())
+    for i, app1 in enumerate(app_list):
+        for app2 in app_list[i + 1 :]:
+            if app1.ppid == app2.pid or app2.ppid == app1.pid:
+                keys.add(f"{app1.app_id}_{app2.app_id}_parent_child")
+            if monitor._check_resource_similarity(app1, app2):
+                keys.add(f"{app1.app_id}_{app2.app_id}_resource_sharing")
+            if monitor._check_communication_patterns(app1, app2):
+                keys.add(f"{app1.app_id}_{app2.app_id}_communication")
+            if monitor._check_co_occurrence(app1.app_id, app2.app_id):
+                keys.add(f"{app1.app_id}_{app2.app_id}_co_occurrence")
+    return keys
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_indexed_discovery_matches_pairwise_checks(monitor, seed):
+    apps = _random_apps(150, seed)
+    for app_id in list(apps)[:20]:
+        monitor.application_patterns[app_id] = [{"cpu_percent": 5.0}] * 12
+    monitor._discover_application_relationships(apps)
+    assert set(monitor.application_relationships) == _brute_force_keys(monitor, apps)
+    assert monitor.relationships_discovered == len(monitor.application_relationships)
+
+
+def test_communication_over_sockets_in_either_direction(monitor):
+    server = _app(10, connections=[{"laddr": ("127.0.0.1", 8080), "raddr": ()}])
+    client = _app(5, connections=[{"laddr": ("127.0.0.1", 50000), "raddr": ("127.0.0.1", 8080)}])
+    bystander = _app(20, connections=[{"laddr": ("127.0.0.1", 9090), "raddr": ()}])
+    apps = {app.app_id: app for app in (server, client, bystander)}
+    monitor._discover_application_relationships(apps)
+    assert [key for key in monitor.application_relationships if key.endswith("_communication")] == ["proc_10_proc_5_communication"]
+
+
+def test_rediscovery_updates_frequency(monitor):
+    apps = {app.app_id: app for app in (_app(2, ppid=1), _app(3, ppid=2))}
+    monitor._discover_application_relationships(apps)
+    monitor._discover_application_relationships(apps)
+    relationship = monitor.application_relationships["proc_2_proc_3_parent_child"]
+    assert relationship.frequency == 2 and relationship.evidence == ["process_hierarchy"]
+
+
+def test_discovery_scales_linearly(monitor):
+    apps = _random_apps(4000, seed=3, active_fraction=0.05)
+    start = time.perf_counter()
+    monitor._discover_application_relationships(apps)
+    assert time.perf_counter() - start < 5.0
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mark_i.context.environment_monitor import EnvironmentMonitor
+from mark_i.context.process_sampler import ProcessSampler, _CachedProcess
+from mark_i.core.architecture_config import ComponentConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _own_sample(samples):
+    return next(sample for sample in samples if sample.pid == os.getpid())
+
+
+def _info(status="running", num_threads=4, pid=123, name="proc"):
+    return {"pid": pid, "name": name, "status": status, "num_threads": num_threads}
+
+
+def _sampled(rss=1000, num_threads=4, status="running", at=1000.0):
+    return _CachedProcess(static={}, expensive={}, expensive_at=at, expensive_rss=rss, expensive_threads=num_threads, status=status)
+
+
+def test_first_tick_reads_everything_then_only_changes():
+    sampler = ProcessSampler()
+    first = sampler.sample()
+    own = _own_sample(first)
+    assert own.cmdline and own.exe
+    assert own.num_fds > 0
+    assert sampler.last_expensive_reads == len(first)
+
+    sampler.sample()
+    # Unchanged processes keep their cached expensive fields, so far fewer are re-read.
+    assert sampler.last_expensive_reads < len(first)
+    assert sampler.get_stats()["ticks"] == 2
+
+
+def test_children_derived_from_ppid():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        samples = ProcessSampler().sample()
+        assert child.pid in _own_sample(samples).children
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_exited_processes_are_forgotten():
+    sampler = ProcessSampler()
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    sampler.sample()
+    assert any(pid == child.pid for pid, _ in sampler._cache)
+    child.kill()
+    child.wait()
+    samples = sampler.sample()
+    assert all(sample.pid != child.pid for sample in samples)
+    assert all(pid != child.pid for pid, _ in sampler._cache)
+
+
+def test_unexpected_error_skips_only_that_process(monkeypatch):
+    sampler = ProcessSampler()
+    read_expensive = ProcessSampler._read_expensive
+
+    def failing_for_own_process(proc):
+        if proc.pid == os.getpid():
+            raise RuntimeError("unreadable")
+        return read_expensive(proc)
+
+    monkeypatch.setattr(sampler, "_read_expensive", failing_for_own_process)
+    samples = sampler.sample()
+    assert samples
+    assert all(sample.pid != os.getpid() for sample in samples)
+    assert all(pid != os.getpid() for pid, _ in sampler._cache)
+
+    monkeypatch.setattr(sampler, "_read_expensive", read_expensive)
+    assert _own_sample(sampler.sample()).num_fds > 0
+
+
+def test_expensive_read_triggers():
+    clock = FakeClock()
+    sampler = ProcessSampler(rss_change_fraction=0.1, expensive_max_age_seconds=60, clock=clock)
+    assert sampler._needs_expensive_read(_CachedProcess(static={}), _info(), 1000, clock.now)
+    assert not sampler._needs_expensive_read(_sampled(), _info(), 1050, clock.now)
+    assert sampler._needs_expensive_read(_sampled(), _info(), 1200, clock.now)
+    assert sampler._needs_expensive_read(_sampled(), _info(num_threads=8), 1000, clock.now)
+    assert sampler._needs_expensive_read(_sampled(), _info(status="zombie"), 1000, clock.now)
+    assert sampler._needs_expensive_read(_sampled(status="stopped"), _info(), 1000, clock.now)
+    assert sampler._needs_expensive_read(_sampled(), _info(), 1000, clock.now + 60)
+
+
+def test_routine_status_and_thread_churn_does_not_trigger_expensive_reads():
+    clock = FakeClock()
+    sampler = ProcessSampler(clock=clock)
+    cached = _sampled(num_threads=20)
+    for tick, status in enumerate(["sleeping", "running", "disk-sleep", "sleeping", "running"]):
+        assert not sampler._needs_expensive_read(cached, _info(status=status, num_threads=20 + tick % 3), 1000, clock.now)
+    assert sampler._needs_expensive_read(cached, _info(status="sleeping", num_threads=40), 1000, clock.now)
+
+
+def test_watch_list_always_reads_expensive_fields():
+    sampler = ProcessSampler(watch_list=[os.getpid()])
+    sampler.sample()
+    sampler.sample()
+    # Our own process is read on every tick, however little it changed.
+    assert sampler.last_expensive_reads >= 1
+
+    sampler.watch("proc")
+    assert sampler._needs_expensive_read(_sampled(), _info(), 1000, 1000.0)
+    sampler.unwatch("proc")
+    assert not sampler._needs_expensive_read(_sampled(), _info(), 1000, 1000.0)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ProcessSampler(rss_change_fraction=-0.1)
+    with pytest.raises(ValueError):
+        ProcessSampler(thread_change_fraction=-1)
+    with pytest.raises(ValueError):
+        ProcessSampler(expensive_max_age_seconds=0)
+
+
+def test_monitor_reports_sampler_overhead():
+    monitor = EnvironmentMonitor(ComponentConfig())
+    monitor.current_snapshot = monitor._capture_environment_snapshot()
+    assert monitor.current_snapshot.applications
+    assert monitor.current_snapshot.system_metrics.process_count == monitor.process_sampler.last_process_count
+
+    overhead = monitor.get_system_health_assessment()["monitor_overhead"]
+    assert overhead["ticks"] == 1
+    assert overhead["cpu_seconds_last_tick"] >= 0.0
+    assert overhead["cpu_percent_of_interval"] >= 0.0
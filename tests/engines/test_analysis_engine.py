@@ -121,6 +121,96 @@ def test_match_template_opencv_error(analysis_engine_instance, dummy_bgr_image_5
         assert result is None
 
 
+@pytest.fixture
+def textured_scene() -> np.ndarray:
+    """A 240x320 BGR image of smooth random texture, so every patch is unique and survives resizing."""
+    rng = np.random.default_rng(7)
+    noise = rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+    blurred = cv2.GaussianBlur(noise, (0, 0), 3)
+    return cv2.normalize(blurred, None, 0, 255, cv2.NORM_MINMAX)
+
+
+def test_match_template_pyramid_finds_exact_location(textured_scene):
+    template = textured_scene[90:130, 150:200].copy()
+    engine = AnalysisEngine(template_pyramid_levels=2)
+    result = engine.match_template(textured_scene, template, threshold=0.9)
+    assert (result["location_x"], result["location_y"]) == (150, 90)
+    assert result["confidence"] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_match_template_pyramid_reports_miss(textured_scene):
+    unrelated = cv2.flip(textured_scene[90:130, 150:200], -1)
+    assert AnalysisEngine(template_pyramid_levels=2).match_template(textured_scene, unrelated, threshold=0.9) is None
+
+
+def test_match_template_pyramid_falls_back_to_full_search_when_coarse_misses(textured_scene):
+    template = textured_scene[90:130, 150:200].copy()
+    engine = AnalysisEngine(template_pyramid_levels=2)
+    with patch.object(engine, "_match_template_in_window", return_value=(0.1, (0, 0))):
+        result = engine.match_template(textured_scene, template, threshold=0.9)
+    assert (result["location_x"], result["location_y"]) == (150, 90)
+
+
+def test_match_template_hint_searches_small_window_first(textured_scene):
+    template = textured_scene[60:90, 40:80].copy()
+    engine = AnalysisEngine()
+    hint = {"location_x": 42, "location_y": 58, "width": 40, "height": 30}
+    with patch("cv2.matchTemplate", wraps=cv2.matchTemplate) as spy:
+        result = engine.match_template(textured_scene, template, threshold=0.9, search_hint=hint)
+    assert (result["location_x"], result["location_y"]) == (40, 60)
+    spy.assert_called_once()
+    searched = spy.call_args.args[0]
+    assert searched.shape[0] < textured_scene.shape[0] and searched.shape[1] < textured_scene.shape[1]
+
+
+def test_match_template_stale_hint_falls_back_to_full_search(textured_scene):
+    template = textured_scene[150:180, 200:240].copy()
+    result = AnalysisEngine().match_template(textured_scene, template, threshold=0.9, search_hint={"location_x": 0, "location_y": 0})
+    assert (result["location_x"], result["location_y"]) == (200, 150)
+
+
+def test_match_template_multi_scale_handles_dpi_change(textured_scene):
+    # Template captured at 100%, screen now rendered at 125%.
+    template = cv2.resize(textured_scene[100:140, 100:150], (40, 32), interpolation=cv2.INTER_AREA)
+    assert AnalysisEngine().match_template(textured_scene, template, threshold=0.9) is None
+    result = AnalysisEngine(template_match_scales=[1.0, 1.25]).match_template(textured_scene, template, threshold=0.9)
+    assert result["scale"] == 1.25
+    assert (result["width"], result["height"]) == (50, 40)
+    assert abs(result["location_x"] - 100) <= 1 and abs(result["location_y"] - 100) <= 1
+
+
+def test_match_templates_batch_shares_pyramid_and_reports_candidates(textured_scene):
+    templates = {
+        "a": (textured_scene[20:60, 30:80].copy(), 0.9),
+        "b": (textured_scene[150:190, 200:260].copy(), 0.9),
+        "missing": (cv2.flip(textured_scene[0:40, 0:40], -1), 0.9),
+        "too_big": (np.zeros((300, 10, 3), dtype=np.uint8), 0.9),
+    }
+    engine = AnalysisEngine(template_pyramid_levels=1)
+    with patch("cv2.pyrDown", wraps=cv2.pyrDown) as spy_pyr:
+        results = engine.match_templates(textured_scene, templates, region_name_context="toolbar")
+    image_pyrdowns = [c for c in spy_pyr.call_args_list if c.args[0].shape == textured_scene.shape]
+    assert len(image_pyrdowns) == 1
+    assert (results["a"]["location_x"], results["a"]["location_y"]) == (30, 20)
+    assert (results["b"]["location_x"], results["b"]["location_y"]) == (200, 150)
+    assert results["missing"] is not None and results["missing"]["confidence"] < 0.9
+    assert results["too_big"] is None
+
+
+def test_match_templates_matches_single_template_results(textured_scene):
+    template = textured_scene[100:130, 10:50].copy()
+    engine = AnalysisEngine()
+    single = engine.match_template(textured_scene, template, threshold=0.8)
+    batched = engine.match_templates(textured_scene, {"t": (template, 0.8)})["t"]
+    assert batched == single
+
+
+def test_invalid_template_search_settings_fall_back():
+    engine = AnalysisEngine(template_pyramid_levels=-1, template_match_scales=[1.0, "big"])
+    assert engine.template_pyramid_levels == 0
+    assert engine.template_match_scales == [1.0]
+
+
 # --- Tests for ocr_extract_text ---
 MOCK_OCR_DATA_SUCCESS = {
     "level": [1, 2, 3, 4, 5, 1, 2, 3, 4, 5],
@@ -168,6 +258,58 @@ def test_ocr_extract_text_empty_result(analysis_engine_instance, dummy_bgr_image
         assert result["average_confidence"] == 0.0
 
 
+def test_ocr_extract_text_cache_hit_skips_tesseract(analysis_engine_instance, dummy_bgr_image_100x100_blue):
+    with patch("pytesseract.image_to_data", return_value=MOCK_OCR_DATA_SUCCESS) as mock_ocr:
+        first = analysis_engine_instance.ocr_extract_text(dummy_bgr_image_100x100_blue)
+        second = analysis_engine_instance.ocr_extract_text(dummy_bgr_image_100x100_blue.copy(), "OtherRegion")
+    mock_ocr.assert_called_once()
+    assert second == first
+    stats = analysis_engine_instance.get_ocr_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_ocr_extract_text_cache_keyed_on_pixels_and_config(dummy_bgr_image_100x100_blue):
+    engine = AnalysisEngine(ocr_config="--psm 6")
+    other_config_engine = AnalysisEngine(ocr_config="--psm 7")
+    changed_image = dummy_bgr_image_100x100_blue.copy()
+    changed_image[0, 0] = [0, 0, 0]
+    with patch("pytesseract.image_to_data", return_value=MOCK_OCR_DATA_SUCCESS) as mock_ocr:
+        engine.ocr_extract_text(dummy_bgr_image_100x100_blue)
+        engine.ocr_extract_text(changed_image)
+        other_config_engine.ocr_cache = engine.ocr_cache
+        other_config_engine.ocr_extract_text(dummy_bgr_image_100x100_blue)
+    assert mock_ocr.call_count == 3
+
+
+def test_ocr_extract_text_errors_not_cached(analysis_engine_instance, dummy_bgr_image_100x100_blue):
+    with patch("pytesseract.image_to_data", side_effect=_raise_tesseract_error_side_effect):
+        assert analysis_engine_instance.ocr_extract_text(dummy_bgr_image_100x100_blue) is None
+    assert len(analysis_engine_instance.ocr_cache) == 0
+
+
+def test_ocr_extract_text_batch_parallel_matches_sequential(dummy_bgr_image_100x100_blue, dummy_bgr_image_50x50_gradient):
+    engine = AnalysisEngine(ocr_workers=3, ocr_cache_entries=0)
+    images = {"a": dummy_bgr_image_100x100_blue, "b": dummy_bgr_image_50x50_gradient, "c": dummy_bgr_image_100x100_blue}
+    with patch("pytesseract.image_to_data", return_value=MOCK_OCR_DATA_SUCCESS) as mock_ocr:
+        results = engine.ocr_extract_text_batch(images)
+    engine.close()
+    assert mock_ocr.call_count == 3
+    assert list(results) == ["a", "b", "c"]
+    assert all(r["text"] == "Hello World" for r in results.values())
+
+
+def test_unavailable_ocr_backend_falls_back_to_pytesseract():
+    with patch("mark_i.engines.analysis_engine.create_ocr_backend", side_effect=RuntimeError("tesserocr is not installed")):
+        engine = AnalysisEngine(ocr_backend="tesserocr")
+    assert engine.ocr_backend.name == "pytesseract"
+
+
+def test_ocr_cache_disabled():
+    engine = AnalysisEngine(ocr_cache_entries=0)
+    assert engine.ocr_cache is None and engine.get_ocr_cache_stats() is None
+    assert engine.save_ocr_cache() is False
+
+
 # --- Tests for analyze_dominant_colors ---
 def test_analyze_dominant_colors_success(analysis_engine_instance, dummy_bgr_image_100x100_blue):
     mock_centers = np.array([[250, 10, 10], [50, 50, 50]], dtype=np.float32)
@@ -226,6 +368,55 @@ def test_analyze_dominant_colors_image_too_small(analysis_engine_instance):
             mock_np_unique.assert_called_once_with(mock_kmeans_labels_flat, return_counts=True)
 
 
+@pytest.fixture
+def red_blue_split_image() -> np.ndarray:
+    """A 200x100 BGR image: left 70% red, right 30% blue."""
+    img = np.zeros((100, 200, 3), dtype=np.uint8)
+    img[:, :140] = [0, 0, 255]
+    img[:, 140:] = [255, 0, 0]
+    return img
+
+
+def test_analyze_dominant_colors_fast_mode(red_blue_split_image):
+    engine = AnalysisEngine(dominant_colors_mode="fast", dominant_colors_max_samples=500)
+    with patch("cv2.kmeans") as mock_kmeans:
+        result = engine.analyze_dominant_colors(red_blue_split_image, num_colors=2, region_name_context="bar")
+    mock_kmeans.assert_not_called()
+    assert [d["bgr_color"] for d in result] == [[0, 0, 255], [255, 0, 0]]
+    assert result[0]["percentage"] == pytest.approx(70.0, abs=2.0)
+    assert sum(d["percentage"] for d in result) == pytest.approx(100.0)
+
+
+def test_analyze_dominant_colors_fast_mode_close_to_kmeans(dummy_bgr_image_50x50_gradient):
+    noisy = dummy_bgr_image_50x50_gradient.copy()
+    noisy[:25, :25] = [30, 200, 40]
+    fast = AnalysisEngine(dominant_colors_mode="fast").analyze_dominant_colors(noisy, num_colors=1)
+    exact = AnalysisEngine().analyze_dominant_colors(noisy, num_colors=1)
+    assert fast[0]["percentage"] == pytest.approx(100.0)
+    assert all(abs(a - b) <= 4 for a, b in zip(fast[0]["bgr_color"], exact[0]["bgr_color"]))
+
+
+def test_analyze_dominant_colors_fast_mode_warm_starts_per_region(red_blue_split_image):
+    engine = AnalysisEngine(dominant_colors_mode="fast")
+    engine.analyze_dominant_colors(red_blue_split_image, num_colors=2, region_name_context="bar")
+    assert ("bar", 2) in engine._dominant_color_centers
+    with patch.object(AnalysisEngine, "_seed_color_centers", side_effect=AssertionError("should warm start")):
+        again = engine.analyze_dominant_colors(red_blue_split_image, num_colors=2, region_name_context="bar")
+    assert again[0]["bgr_color"] == [0, 0, 255]
+
+
+def test_analyze_dominant_colors_fast_mode_fewer_colors_than_k():
+    solid = np.full((10, 10, 3), 77, dtype=np.uint8)
+    result = AnalysisEngine(dominant_colors_mode="fast").analyze_dominant_colors(solid, num_colors=3)
+    assert result == [{"bgr_color": [77, 77, 77], "percentage": 100.0}]
+
+
+def test_invalid_dominant_colors_mode_falls_back():
+    engine = AnalysisEngine(dominant_colors_mode="turbo", dominant_colors_max_samples=0)
+    assert engine.dominant_colors_mode == "kmeans"
+    assert engine.dominant_colors_max_samples > 0
+
+
 def test_analysis_engine_init_with_ocr_command(monkeypatch):
     mock_set_cmd = MagicMock()
     monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", "/custom/path/tesseract", raising=False)
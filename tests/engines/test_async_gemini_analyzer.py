@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, create_autospec
+
+import numpy as np
+import pytest
+
+from mark_i.engines.async_gemini_analyzer import AsyncGeminiAnalyzer
+from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_rate_limiter import ModelRateLimiter, TokenBucket, create_gemini_rate_limiter
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _analyzer_stub(side_effect=None) -> GeminiAnalyzer:
+    analyzer = create_autospec(GeminiAnalyzer, instance=True)
+    analyzer.default_model_name = "m"
+    analyzer.generation_config = None
+    analyzer.safety_settings = None
+    analyzer.upload_options = None
+    analyzer.query_vision_model.side_effect = side_effect or (lambda **kwargs: {"status": "success", "text_content": kwargs["prompt"]})
+    return analyzer
+
+
+def test_token_bucket_allows_burst_then_paces():
+    fake = FakeTime()
+    bucket = TokenBucket(rate_per_second=2.0, capacity=2, clock=fake.clock, sleep=fake.sleep)
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert fake.sleeps == [pytest.approx(0.5)]
+
+
+def test_model_rate_limiter_per_model_and_default():
+    fake = FakeTime()
+    limiter = ModelRateLimiter({"slow": 6}, clock=fake.clock, sleep=fake.sleep)  # 1 token burst, 1 per 10s
+    assert limiter.acquire("slow") == 0.0
+    assert limiter.acquire("slow") == pytest.approx(10.0)
+    assert limiter.acquire("unlimited") == 0.0
+    assert create_gemini_rate_limiter({}) is None
+    assert create_gemini_rate_limiter({"gemini_rate_limit_rpm": "fast"}) is None
+    assert create_gemini_rate_limiter({"gemini_rate_limit_rpm": {"*": 0}}) is None
+    assert isinstance(create_gemini_rate_limiter({"gemini_rate_limit_rpm": {"m": 30, "*": 60}}), ModelRateLimiter)
+
+
+def test_identical_in_flight_requests_share_one_round_trip():
+    release = threading.Event()
+
+    def slow_query(**kwargs):
+        release.wait(timeout=5)
+        return {"status": "success", "text_content": "shared"}
+
+    analyzer = _analyzer_stub(slow_query)
+    async_analyzer = AsyncGeminiAnalyzer(analyzer, max_in_flight=4)
+    image = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    async def scenario():
+        tasks = [asyncio.create_task(async_analyzer.query_vision_model("Is it on?", image_data=image.copy())) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(scenario())
+    assert analyzer.query_vision_model.call_count == 1
+    assert [r["text_content"] for r in results] == ["shared"] * 3
+    assert sum(1 for r in results if r.get("coalesced")) == 2
+    assert async_analyzer.get_stats() == {"queries": 1, "coalesced": 2}
+    async_analyzer.close()
+
+
+def test_distinct_requests_run_concurrently_and_keep_order():
+    barrier = threading.Barrier(3, timeout=5)  # Deadlocks (BrokenBarrierError) if the queries ran serially.
+
+    def query(**kwargs):
+        barrier.wait()
+        return {"status": "success", "text_content": kwargs["prompt"]}
+
+    analyzer = _analyzer_stub(query)
+    async_analyzer = AsyncGeminiAnalyzer(analyzer, max_in_flight=3)
+    results = async_analyzer.run_queries([{"prompt": p, "image_data": None} for p in ("a", "b", "c")])
+    assert [r["text_content"] for r in results] == ["a", "b", "c"]
+    async_analyzer.close()
+
+
+def test_in_flight_limit_is_respected():
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def query(**kwargs):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        threading.Event().wait(0.02)
+        with lock:
+            running["now"] -= 1
+        return {"status": "success"}
+
+    async_analyzer = AsyncGeminiAnalyzer(_analyzer_stub(query), max_in_flight=2)
+    async_analyzer.run_queries([{"prompt": str(i)} for i in range(6)])
+    assert running["max"] <= 2
+    async_analyzer.close()
+
+
+def test_exceptions_propagate_to_all_waiters():
+    release = threading.Event()
+
+    def failing_query(**kwargs):
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    async_analyzer = AsyncGeminiAnalyzer(_analyzer_stub(failing_query))
+
+    async def scenario():
+        tasks = [asyncio.create_task(async_analyzer.query_vision_model("p")) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    async_analyzer.close()
+
+
+def test_invalid_max_in_flight():
+    with pytest.raises(ValueError):
+        AsyncGeminiAnalyzer(MagicMock(), max_in_flight=0)
+
+
+def test_queries_work_again_after_close():
+    async_analyzer = AsyncGeminiAnalyzer(_analyzer_stub())
+    assert async_analyzer.run_queries([{"prompt": "first"}])[0]["text_content"] == "first"
+    async_analyzer.close()
+    assert async_analyzer.run_queries([{"prompt": "again"}])[0]["text_content"] == "again"
+    async_analyzer.close()
@@ -0,0 +1,161 @@
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from mark_i.engines import capture_backends
+from mark_i.engines.capture_backends import (
+    CaptureBackend,
+    CaptureBackendStats,
+    benchmark_capture_backends,
+    create_capture_backend,
+    create_first_available_capture_backend,
+    get_registered_capture_backends,
+    legacy_benchmark_results,
+    register_capture_backend,
+    select_fastest_capture_backend,
+)
+from mark_i.tools.__main__ import format_capture_benchmark_table, main, parse_region_sizes
+
+
+def _make_fake_backend(name: str, latency_s: float = 0.0, fail: bool = False, available: bool = True):
+    class _FakeBackend(CaptureBackend):
+        closed = []
+
+        def __init__(self):
+            if not available:
+                raise RuntimeError(f"{name} unavailable")
+            self.name = name
+
+        def grab(self, bbox, out=None):
+            if fail:
+                raise RuntimeError("grab failed")
+            return np.zeros((bbox[3] - bbox[1], bbox[2] - bbox[0], 3), dtype=np.uint8)
+
+        def close(self):
+            type(self).closed.append(self.name)
+
+    _FakeBackend.name = name
+    _FakeBackend.latency_s = latency_s
+    return _FakeBackend
+
+
+@pytest.fixture
+def fake_registry():
+    """Replaces the backend registry with an empty one for the duration of a test."""
+    with patch.dict(capture_backends._CAPTURE_BACKEND_REGISTRY, clear=True):
+        yield capture_backends._CAPTURE_BACKEND_REGISTRY
+
+
+class TestCaptureBackendStats:
+    def test_percentiles_and_throughput(self):
+        stats = CaptureBackendStats("fake")
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        for ms in range(1, 101):
+            stats.record(ms / 1000.0, image)
+        summary = stats.summary()
+        assert summary["grabs"] == 100 and summary["failures"] == 0
+        assert summary["min_ms"] == pytest.approx(1.0) and summary["max_ms"] == pytest.approx(100.0)
+        assert summary["p50_ms"] == pytest.approx(50.5)
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+        assert summary["mb_per_s"] > 0 and summary["fps"] > 0
+
+    def test_failures_counted_without_samples(self):
+        stats = CaptureBackendStats("fake")
+        stats.record(0.01, None)
+        summary = stats.summary()
+        assert summary["grabs"] == 1 and summary["failures"] == 1
+        assert summary["p50_ms"] is None and summary["fps"] == 0
+
+    def test_legacy_results_keep_old_keys(self):
+        stats = CaptureBackendStats("pil")
+        stats.record(0.002, np.zeros((2, 2, 3), dtype=np.uint8))
+        stats.record(0.002, None)
+        results = legacy_benchmark_results(stats.summary(), iterations=2)
+        for key in ("success_rate", "avg_time_ms", "min_time_ms", "max_time_ms", "fps", "method", "total_iterations", "successful_captures"):
+            assert key in results
+        assert results["success_rate"] == pytest.approx(0.5)
+        assert results["method"] == "pil" and results["successful_captures"] == 1
+
+
+class TestCaptureBackendRegistry:
+    def test_builtin_backends_registered(self):
+        names = get_registered_capture_backends()
+        assert names[0] == "xshm"
+        assert {"mss", "pil", "pyautogui", "import", "grim", "scrot", "gnome-screenshot"} <= set(names)
+
+    def test_register_and_create(self, fake_registry):
+        register_capture_backend(_make_fake_backend("fake"))
+        assert get_registered_capture_backends() == ["fake"]
+        assert create_capture_backend("fake").grab((0, 0, 4, 3)).shape == (3, 4, 3)
+
+    def test_unknown_backend_raises_value_error(self, fake_registry):
+        with pytest.raises(ValueError):
+            create_capture_backend("nope")
+
+    def test_backend_without_name_rejected(self, fake_registry):
+        with pytest.raises(ValueError):
+            register_capture_backend(_make_fake_backend(""))
+
+    def test_first_available_skips_unavailable_and_unknown(self, fake_registry):
+        register_capture_backend(_make_fake_backend("missing", available=False))
+        register_capture_backend(_make_fake_backend("second"))
+        register_capture_backend(_make_fake_backend("third"))
+        assert create_first_available_capture_backend(["nope", "missing", "second", "third"]).name == "second"
+        assert create_first_available_capture_backend(["nope", "missing"]) is None
+
+    def test_subprocess_backend_must_define_command(self):
+        class _NoCommand(capture_backends._SubprocessToolBackend):
+            name = "no-command"
+
+        with pytest.raises(TypeError):
+            _NoCommand()
+
+
+class TestSelectFastestCaptureBackend:
+    def test_picks_lowest_median_and_closes_others(self, fake_registry):
+        slow, fast = _make_fake_backend("slow"), _make_fake_backend("fast")
+        register_capture_backend(slow)
+        register_capture_backend(fast)
+        register_capture_backend(_make_fake_backend("missing", available=False))
+        clock = iter([0.0, 0.010] * 3 + [0.0, 0.002] * 3)
+        with patch("mark_i.engines.capture_backends.time.perf_counter", side_effect=lambda: next(clock)):
+            best, probe = select_fastest_capture_backend(probe_grabs=3)
+        assert best.name == "fast"
+        assert [r["backend"] for r in probe] == ["slow", "fast"]
+        assert slow.closed == ["slow"] and fast.closed == []
+
+    def test_failing_backend_never_selected(self, fake_registry):
+        register_capture_backend(_make_fake_backend("broken", fail=True))
+        best, probe = select_fastest_capture_backend()
+        assert best is None
+        assert probe[0]["failures"] == probe[0]["grabs"]
+
+
+class TestCaptureBenchmarkCommand:
+    def test_benchmark_every_backend_and_size(self, fake_registry):
+        register_capture_backend(_make_fake_backend("a"))
+        register_capture_backend(_make_fake_backend("b"))
+        results = benchmark_capture_backends(None, [(0, 0, 8, 4), (0, 0, 16, 8)], iterations=3, warmup=0)
+        assert [(r["backend"], r["region"]) for r in results] == [("a", "8x4"), ("a", "16x8"), ("b", "8x4"), ("b", "16x8")]
+        assert all(r["grabs"] == 3 and r["failures"] == 0 for r in results)
+
+    def test_parse_region_sizes(self):
+        assert parse_region_sizes("320x240, 64x48") == [(0, 0, 320, 240), (0, 0, 64, 48)]
+        with patch("mark_i.tools.__main__._primary_screen_size", return_value=(800, 600)):
+            assert parse_region_sizes("full") == [(0, 0, 800, 600)]
+
+    def test_table_reports_fastest_per_region(self):
+        rows = [
+            {"backend": "a", "region": "8x4", "grabs": 3, "failures": 0, "p50_ms": 2.0, "p95_ms": 3.0, "p99_ms": 3.0, "fps": 500.0, "mb_per_s": 1.0},
+            {"backend": "b", "region": "8x4", "grabs": 3, "failures": 0, "p50_ms": 1.0, "p95_ms": 1.5, "p99_ms": 1.5, "fps": 900.0, "mb_per_s": 2.0},
+        ]
+        table = format_capture_benchmark_table(rows)
+        assert "p99 ms" in table and "MB/s" in table
+        assert "Fastest for 8x4: b" in table
+
+    def test_main_rejects_unknown_backend(self, fake_registry, capsys):
+        register_capture_backend(_make_fake_backend("a"))
+        assert main(["capture-benchmark", "--backends", "zzz", "--sizes", "8x8"]) == 2
+        assert main(["capture-benchmark", "--backends", "a", "--sizes", "8x8", "--iterations", "2", "--json"]) == 0
+        assert '"backend": "a"' in capsys.readouterr().out
@@ -0,0 +1,215 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+from PIL import Image
+
+from mark_i.engines.capture_backends import CaptureBackend
+from mark_i.engines.capture_engine import CaptureEngine
+
+
+@pytest.fixture
+def capture_engine_instance() -> CaptureEngine:
+    """A CaptureEngine pinned to the Pillow ImageGrab path (no Linux tool probing)."""
+    with patch("mark_i.engines.capture_engine.platform.system", return_value="Windows"), patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+        return CaptureEngine()
+
+
+def _fake_screen_grab(bbox=None, all_screens=False):
+    """Returns an RGB PIL image whose pixel (x, y) encodes its absolute screen coordinates."""
+    left, top, right, bottom = bbox
+    ys, xs = np.mgrid[top:bottom, left:right]
+    rgb = np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+    rgb[..., 0] = xs % 256  # R carries x
+    rgb[..., 1] = ys % 256  # G carries y
+    return Image.fromarray(rgb, mode="RGB")
+
+
+class TestCaptureRegions:
+    def test_single_grab_for_all_regions(self, capture_engine_instance):
+        regions = [
+            {"name": "a", "x": 10, "y": 5, "width": 20, "height": 10},
+            {"name": "b", "x": 50, "y": 40, "width": 30, "height": 20},
+        ]
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab) as mock_grab:
+            images = capture_engine_instance.capture_regions(regions)
+
+        mock_grab.assert_called_once()
+        assert mock_grab.call_args.kwargs["bbox"] == (10, 5, 80, 60)
+        assert images["a"].shape == (10, 20, 3)
+        assert images["b"].shape == (20, 30, 3)
+        # BGR: channel 2 is R (x), channel 1 is G (y)
+        assert images["a"][0, 0, 2] == 10 and images["a"][0, 0, 1] == 5
+        assert images["b"][0, 0, 2] == 50 and images["b"][0, 0, 1] == 40
+
+    def test_regions_are_views_into_one_buffer(self, capture_engine_instance):
+        regions = [
+            {"name": "a", "x": 0, "y": 0, "width": 10, "height": 10},
+            {"name": "b", "x": 5, "y": 5, "width": 10, "height": 10},
+        ]
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab):
+            images = capture_engine_instance.capture_regions(regions)
+
+        assert images["a"].base is not None
+        assert np.shares_memory(images["a"], images["b"])
+
+    def test_matches_per_region_capture(self, capture_engine_instance):
+        region = {"name": "r", "x": 7, "y": 3, "width": 15, "height": 9}
+        other = {"name": "o", "x": 100, "y": 60, "width": 5, "height": 5}
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab):
+            single = capture_engine_instance.capture_region(region)
+            batched = capture_engine_instance.capture_regions([region, other])["r"]
+        assert np.array_equal(single, batched)
+
+    def test_full_screen_mode_grabs_primary_screen(self, capture_engine_instance):
+        regions = [{"name": "a", "x": 10, "y": 10, "width": 5, "height": 5}]
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab) as mock_grab:
+            images = capture_engine_instance.capture_regions(regions, full_screen=True)
+        assert mock_grab.call_args.kwargs["bbox"] == (0, 0, 200, 100)
+        assert images["a"][0, 0, 2] == 10
+
+    def test_invalid_region_is_none_and_excluded_from_union(self, capture_engine_instance):
+        regions = [
+            {"name": "good", "x": 0, "y": 0, "width": 4, "height": 4},
+            {"name": "bad", "x": 0, "y": 0, "width": -1, "height": 4},
+            {"x": 0, "y": 0, "width": 4, "height": 4},  # unnamed, skipped
+        ]
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab) as mock_grab:
+            images = capture_engine_instance.capture_regions(regions)
+        assert mock_grab.call_args.kwargs["bbox"] == (0, 0, 4, 4)
+        assert images["good"] is not None
+        assert images["bad"] is None
+        assert len(images) == 2
+
+    def test_grab_failure_returns_none_for_all(self, capture_engine_instance):
+        regions = [{"name": "a", "x": 0, "y": 0, "width": 4, "height": 4}]
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", return_value=None):
+            images = capture_engine_instance.capture_regions(regions)
+        assert images == {"a": None}
+
+    def test_no_valid_regions_skips_grab(self, capture_engine_instance):
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab") as mock_grab:
+            images = capture_engine_instance.capture_regions([{"name": "a", "x": "0", "y": 0, "width": 4, "height": 4}])
+        mock_grab.assert_not_called()
+        assert images == {"a": None}
+
+
+class TestCaptureBackendSelection:
+    def test_unavailable_backend_falls_back_to_default(self):
+        with patch("mark_i.engines.capture_engine.create_capture_backend", side_effect=RuntimeError("no display")), patch(
+            "mark_i.engines.capture_engine.platform.system", return_value="Windows"
+        ), patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+            engine = CaptureEngine(backend="xshm")
+        assert engine.backend == "default"
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab) as mock_grab:
+            assert engine.capture_region({"name": "r", "x": 0, "y": 0, "width": 3, "height": 2}).shape == (2, 3, 3)
+        mock_grab.assert_called_once()
+
+    def test_registered_backend_used_for_grabs(self):
+        with patch("mark_i.engines.capture_engine.create_capture_backend") as MockBackend, patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+            MockBackend.return_value.name = "xshm"
+            MockBackend.return_value.grab.side_effect = lambda bbox: np.zeros((bbox[3] - bbox[1], bbox[2] - bbox[0], 3), dtype=np.uint8)
+            engine = CaptureEngine(backend="xshm")
+            with patch("mark_i.engines.capture_engine.ImageGrab.grab") as mock_grab:
+                images = engine.capture_regions([{"name": "a", "x": 1, "y": 2, "width": 4, "height": 5}])
+        assert engine.backend == "xshm"
+        MockBackend.return_value.grab.assert_called_once_with((1, 2, 5, 7))
+        mock_grab.assert_not_called()
+        assert images["a"].shape == (5, 4, 3)
+
+    def test_backend_grab_error_returns_none_and_counts_failure(self):
+        with patch("mark_i.engines.capture_engine.create_capture_backend") as MockBackend, patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+            MockBackend.return_value.grab.side_effect = RuntimeError("X protocol error (code 8).")
+            engine = CaptureEngine(backend="xshm")
+            assert engine.capture_region({"name": "r", "x": 0, "y": 0, "width": 3, "height": 2}) is None
+        assert engine.get_capture_stats()["failures"] == 1
+
+    def test_unknown_backend_name_uses_default(self, capture_engine_instance):
+        with patch("mark_i.engines.capture_engine.platform.system", return_value="Windows"), patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+            engine = CaptureEngine(backend="no-such-backend")
+        assert engine.backend == "default"
+
+    def test_auto_uses_fastest_backend(self):
+        fake_backend = MagicMock()
+        fake_backend.name = "mss"
+        probe = [{"backend": "mss", "p50_ms": 4.0}]
+        with patch("mark_i.engines.capture_engine.select_fastest_capture_backend", return_value=(fake_backend, probe)), patch(
+            "mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)
+        ):
+            engine = CaptureEngine(backend="auto")
+        assert engine.backend == "mss"
+        assert engine.backend_probe_results == probe
+
+    def test_capture_stats_record_default_path(self, capture_engine_instance):
+        with patch("mark_i.engines.capture_engine.ImageGrab.grab", side_effect=_fake_screen_grab):
+            for _ in range(3):
+                capture_engine_instance.capture_region({"name": "r", "x": 0, "y": 0, "width": 8, "height": 8})
+        stats = capture_engine_instance.get_capture_stats()
+        assert stats["backend"] == "default"
+        assert stats["grabs"] == 3 and stats["failures"] == 0
+        assert stats["p50_ms"] is not None and stats["p99_ms"] >= stats["p50_ms"]
+
+
+class _OutBackend(CaptureBackend):
+    """Backend that records the `out` buffer it was given and fills frames with a grab counter."""
+
+    name = "out-backend"
+
+    def __init__(self, supports_out: bool = True):
+        self.supports_out = supports_out
+        self.outs = []
+
+    def grab(self, bbox, out=None):
+        self.outs.append(out)
+        frame = out if out is not None else np.empty((bbox[3] - bbox[1], bbox[2] - bbox[0], 3), dtype=np.uint8)
+        frame[:] = len(self.outs)
+        return frame
+
+
+def _engine_with(backend) -> CaptureEngine:
+    with patch("mark_i.engines.capture_engine.create_capture_backend", return_value=backend), patch("mark_i.engines.capture_engine.pyautogui.size", return_value=(200, 100)):
+        return CaptureEngine(backend=backend.name)
+
+
+class TestFrameBufferReuse:
+    REGIONS = [{"name": "a", "x": 0, "y": 0, "width": 4, "height": 4}, {"name": "b", "x": 4, "y": 0, "width": 4, "height": 4}]
+
+    def test_capture_regions_grabs_into_previous_frame(self):
+        backend = _OutBackend()
+        engine = _engine_with(backend)
+        first = engine.capture_regions(self.REGIONS)
+        second = engine.capture_regions(self.REGIONS)
+
+        assert backend.outs[0] is None
+        assert backend.outs[1] is not None and np.shares_memory(backend.outs[1], first["a"])
+        assert np.shares_memory(first["a"], second["a"])
+        assert second["b"][0, 0, 0] == 2
+
+    def test_capture_region_returns_fresh_frames_by_default(self):
+        backend = _OutBackend()
+        engine = _engine_with(backend)
+        region = self.REGIONS[0]
+        kept = engine.capture_region(region)
+        engine.capture_region(region)
+        assert backend.outs == [None, None]
+        assert kept[0, 0, 0] == 1
+
+        reused = engine.capture_region(region, reuse_buffer=True)
+        engine.capture_region(region, reuse_buffer=True)
+        assert backend.outs[3] is reused
+
+    def test_backend_without_out_support_never_gets_a_buffer(self):
+        backend = _OutBackend(supports_out=False)
+        engine = _engine_with(backend)
+        engine.capture_regions(self.REGIONS)
+        engine.capture_regions(self.REGIONS)
+        assert backend.outs == [None, None]
+
+    def test_failed_grab_drops_the_buffer(self):
+        backend = _OutBackend()
+        engine = _engine_with(backend)
+        engine.capture_regions(self.REGIONS)
+        with patch.object(backend, "grab", side_effect=RuntimeError("screen resized")):
+            assert engine.capture_regions(self.REGIONS)["a"] is None
+        engine.capture_regions(self.REGIONS)
+        assert backend.outs[-1] is None
@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+
+from mark_i.engines.change_detector import RegionChangeDetector
+
+
+@pytest.fixture
+def gray_image() -> np.ndarray:
+    img = np.zeros((40, 60, 3), dtype=np.uint8)
+    img[:, :] = [100, 100, 100]
+    return img
+
+
+def test_first_frame_is_changed(gray_image):
+    assert RegionChangeDetector().has_changed("r", gray_image) is True
+
+
+def test_identical_frame_is_unchanged(gray_image):
+    detector = RegionChangeDetector()
+    detector.has_changed("r", gray_image)
+    assert detector.has_changed("r", gray_image.copy()) is False
+
+
+def test_non_contiguous_view_is_hashed_by_content(gray_image):
+    detector = RegionChangeDetector()
+    frame = np.zeros((80, 80, 3), dtype=np.uint8)
+    frame[10:50, 5:65] = gray_image
+    detector.has_changed("r", gray_image)
+    assert detector.has_changed("r", frame[10:50, 5:65]) is False
+
+
+def test_single_pixel_change_detected_with_zero_threshold(gray_image):
+    detector = RegionChangeDetector()
+    detector.has_changed("r", gray_image)
+    changed = gray_image.copy()
+    changed[3, 3] = [101, 100, 100]
+    assert detector.has_changed("r", changed) is True
+
+
+def test_shape_change_detected(gray_image):
+    detector = RegionChangeDetector(threshold=50.0)
+    detector.has_changed("r", gray_image)
+    assert detector.has_changed("r", gray_image[:20]) is True
+
+
+def test_small_delta_below_threshold_is_unchanged(gray_image):
+    detector = RegionChangeDetector(threshold=2.0)
+    detector.has_changed("r", gray_image)
+    noisy = gray_image.copy()
+    noisy[0, 0] = [255, 255, 255]
+    assert detector.has_changed("r", noisy) is False
+    brighter = gray_image + 20
+    assert detector.has_changed("r", brighter) is True
+
+
+def test_reference_kept_until_change_so_drift_accumulates(gray_image):
+    detector = RegionChangeDetector(threshold=2.0)
+    detector.has_changed("r", gray_image)
+    assert detector.has_changed("r", gray_image + 1) is False
+    assert detector.has_changed("r", gray_image + 2) is False
+    assert detector.has_changed("r", gray_image + 3) is True
+
+
+def test_regions_tracked_independently_and_forget(gray_image):
+    detector = RegionChangeDetector()
+    detector.has_changed("a", gray_image)
+    assert detector.has_changed("b", gray_image) is True
+    detector.forget("a")
+    assert detector.has_changed("a", gray_image) is True
+    detector.reset()
+    assert detector.has_changed("b", gray_image) is True
+
+
+def test_negative_threshold_rejected():
+    with pytest.raises(ValueError):
+        RegionChangeDetector(threshold=-1)
@@ -140,6 +140,38 @@ class TestTemplateMatchEvaluator:
         assert result.met is False
         assert result.template_match_info == {"found": False}
 
+    def test_last_match_is_used_as_search_hint_until_missed(self, mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter):
+        match_details = {"location_x": 10, "location_y": 20, "confidence": 0.9, "width": 5, "height": 5, "scale": 1.0}
+        mock_template_loader.return_value = np.zeros((5, 5, 3), dtype=np.uint8)
+        evaluator = TemplateMatchEvaluator(mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter)
+        spec = {"template_filename": "test.png", "min_confidence": 0.8}
+        mock_analysis_engine.match_template.side_effect = [match_details, None, None]
+        for _ in range(3):
+            evaluator.evaluate(spec, "test_rgn", dummy_region_data_packet_with_image, "test_rule")
+        hints = [c.kwargs["search_hint"] for c in mock_analysis_engine.match_template.call_args_list]
+        assert hints[0] is None
+        assert hints[1]["location_x"] == 10 and hints[1]["matched_region_name"] == "test_rgn"
+        assert hints[2] is None
+
+    def test_evaluate_uses_prematched_results_with_own_threshold(self, mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter):
+        candidate = {"location_x": 3, "location_y": 4, "confidence": 0.85, "width": 5, "height": 5, "scale": 1.0}
+        evaluator = TemplateMatchEvaluator(mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter)
+        packet = {"image": dummy_image_bgr, "template_match_results": {"test.png": candidate}}
+        loose = evaluator.evaluate({"template_filename": "test.png", "min_confidence": 0.8, "capture_as": "m"}, "test_rgn", packet, "loose")
+        strict = evaluator.evaluate({"template_filename": "test.png", "min_confidence": 0.9}, "test_rgn", packet, "strict")
+        assert loose.met is True and loose.captured_value["value"] == candidate
+        assert strict.met is False and strict.template_match_info == {"found": False}
+        mock_analysis_engine.match_template.assert_not_called()
+        mock_template_loader.assert_not_called()
+
+    def test_prematch_region_skips_unloadable_templates(self, mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter):
+        mock_template_loader.side_effect = lambda name, ctx: None if name == "gone.png" else np.zeros((5, 5, 3), dtype=np.uint8)
+        mock_analysis_engine.match_templates.return_value = {"ok.png": None}
+        evaluator = TemplateMatchEvaluator(mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter)
+        results = evaluator.prematch_region("test_rgn", dummy_image_bgr, {"ok.png": 0.8, "gone.png": 0.8})
+        assert results == {"ok.png": None}
+        assert list(mock_analysis_engine.match_templates.call_args.args[1]) == ["ok.png"]
+
     def test_evaluate_template_loader_fails(self, mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter):
         mock_template_loader.return_value = None # Simulate template not found/loaded
         evaluator = TemplateMatchEvaluator(mock_analysis_engine, mock_template_loader, mock_gemini_analyzer, mock_config_settings_getter)
@@ -0,0 +1,123 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from mark_i.engines.fake_gemini import (
+    PIPELINE_BENCHMARK_RESPONSES,
+    FakeGeminiBackend,
+    GeminiSessionRecorder,
+    LatencyModel,
+    ScriptedResponse,
+    benchmark_gemini_session,
+    benchmark_nlu_task,
+    benchmark_rules_engine,
+    load_gemini_session,
+)
+from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.tools.__main__ import main as tools_main
+
+
+def test_latency_model_parse_and_sampling():
+    assert LatencyModel.parse("fixed:50") == LatencyModel("fixed", 50.0)
+    uniform = LatencyModel.parse("uniform:100,400")
+    rng = random.Random(1)
+    assert all(100 <= uniform.sample_ms(rng) <= 400 for _ in range(100))
+    lognormal = LatencyModel.parse("lognormal:800,0.5")
+    samples = sorted(lognormal.sample_ms(rng) for _ in range(2000))
+    assert 700 < samples[1000] < 900  # Median close to 800 ms.
+    with pytest.raises(ValueError):
+        LatencyModel.parse("gamma:1,2")
+    with pytest.raises(ValueError):
+        LatencyModel.parse("fixed:abc")
+
+
+def test_analyzer_with_fake_backend_returns_scripted_json_without_api_key():
+    backend = FakeGeminiBackend(responses=[ScriptedResponse.from_dict({"prompt_contains": "button", "response": {"found": True, "box": [1, 2, 3, 4]}})], default_text="no idea")
+    analyzer = GeminiAnalyzer(api_key="", default_model_name="fake", model_factory=backend)
+    assert analyzer.client_initialized
+
+    result = analyzer.query_vision_model("Find the button", image_data=np.zeros((10, 10, 3), dtype=np.uint8))
+    assert result["status"] == "success" and result["json_content"] == {"found": True, "box": [1, 2, 3, 4]}
+    assert analyzer.query_vision_model("Something else")["text_content"] == "no idea"
+    assert backend.get_stats()["calls"] == 2
+
+
+def test_rate_limit_errors_trigger_model_fallback_and_errors_surface():
+    sleeps = []
+    backend = FakeGeminiBackend(responses=[ScriptedResponse(text="ok", model="backup")], latency=LatencyModel("fixed", 25), rate_limit_rate=1.0, sleep=sleeps.append)
+    analyzer = GeminiAnalyzer(api_key="", model_factory=backend)
+    result = analyzer.query_vision_model("p", model_preference=["primary", "backup"])
+    assert result["status"] == "error_quota"
+    assert backend.get_stats()["calls_per_model"] == {"primary": 1, "backup": 1}
+    assert sleeps == [0.025, 0.025]
+
+    failing = GeminiAnalyzer(api_key="", model_factory=FakeGeminiBackend(error_rate=1.0))
+    assert failing.query_vision_model("p")["status"] == "error_api"
+
+
+def test_recorder_round_trip_replays_offline(tmp_path):
+    recorded_backend = FakeGeminiBackend(responses=[ScriptedResponse(text='{"answer": 42}')])
+    recorder = GeminiSessionRecorder(inner_factory=recorded_backend)
+    analyzer = GeminiAnalyzer(api_key="", default_model_name="live-model", model_factory=recorder)
+    analyzer.query_vision_model("What is the answer?", image_data=np.zeros((20, 30, 3), dtype=np.uint8))
+    session_path = str(tmp_path / "session.json")
+    recorder.save(session_path)
+
+    session = load_gemini_session(session_path)
+    assert session["requests"][0]["image_size"] == [30, 20]
+    replay_backend = FakeGeminiBackend.from_session(session)
+    replay_analyzer = GeminiAnalyzer(api_key="", default_model_name="live-model", model_factory=replay_backend)
+    report = benchmark_gemini_session(replay_analyzer, session, repeat=3)
+    assert report["requests"] == 3 and report["statuses"] == {"success": 3}
+    assert replay_analyzer.query_vision_model("What is the answer?")["json_content"] == {"answer": 42}
+
+
+def test_load_session_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"version": 99, "requests": []}))
+    with pytest.raises(ValueError):
+        load_gemini_session(str(path))
+
+
+def test_concurrent_replay_reports_percentiles():
+    session = {"version": 1, "requests": [{"prompt": f"q{i}", "image_size": None} for i in range(8)], "responses": []}
+    analyzer = GeminiAnalyzer(api_key="", model_factory=FakeGeminiBackend(latency=LatencyModel("fixed", 10)))
+    report = benchmark_gemini_session(analyzer, session, concurrency=4)
+    assert report["requests"] == 8 and report["statuses"] == {"success": 8}
+    assert report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"] <= report["max_ms"]
+    assert report["wall_s"] < 8 * 0.010  # Faster than a serial replay.
+
+
+def test_gemini_benchmark_command(capsys):
+    assert tools_main(["gemini-benchmark", "--latency", "fixed:0", "--repeat", "1", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["requests"] == 20 and report["statuses"] == {"success": 20}
+    assert tools_main(["gemini-benchmark", "--latency", "weird"]) == 2
+
+
+def _pipeline_analyzer(backend: FakeGeminiBackend) -> GeminiAnalyzer:
+    return GeminiAnalyzer(api_key="", default_model_name="fake", model_factory=backend)
+
+
+def test_rules_engine_benchmark_evaluates_gemini_query_rules():
+    backend = FakeGeminiBackend(responses=PIPELINE_BENCHMARK_RESPONSES)
+    report = benchmark_rules_engine(_pipeline_analyzer(backend), cycles=3, regions=2, concurrency=2, image_size=(32, 24))
+    assert report["cycles"] == 3 and report["rules_fired"] == 6
+    assert backend.get_stats()["calls"] == 6
+    assert report["p50_ms"] <= report["max_ms"]
+
+
+def test_nlu_task_benchmark_runs_the_full_plan():
+    backend = FakeGeminiBackend(responses=PIPELINE_BENCHMARK_RESPONSES)
+    report = benchmark_nlu_task(_pipeline_analyzer(backend), runs=2, image_size=(64, 48))
+    assert report["tasks"] == 2 and report["statuses"] == {"success": 2}
+    assert backend.get_stats()["calls"] == 6  # NLU parse, visual check and target refinement per task.
+
+
+def test_gemini_benchmark_command_pipeline_scenarios(capsys):
+    assert tools_main(["gemini-benchmark", "--scenario", "rules", "--latency", "fixed:0", "--repeat", "2", "--regions", "2", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["rules_fired"] == 4
+    assert tools_main(["gemini-benchmark", "--scenario", "nlu", "--latency", "fixed:0", "--repeat", "1", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["statuses"] == {"success": 1}
@@ -0,0 +1,163 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_response_cache import GeminiResponseCache, create_gemini_response_cache, gemini_request_key, hamming_distance, perceptual_hash
+from mark_i.engines.gemini_upload import prepare_upload_image
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _gradient_image(width: int = 64, height: int = 48) -> np.ndarray:
+    row = np.linspace(0, 255, width, dtype=np.uint8)
+    return np.dstack([np.tile(row, (height, 1))] * 3).copy()
+
+
+def _response(text: str) -> dict:
+    return {"status": "success", "text_content": text, "json_content": None, "error_message": None, "model_used": "m", "raw_gemini_response": text}
+
+
+def test_perceptual_hash_tolerates_noise_but_not_content_changes():
+    img = _gradient_image()
+    noisy = img.copy()
+    noisy[10, 10] ^= 1
+    assert hamming_distance(perceptual_hash(img), perceptual_hash(noisy)) <= 2
+    assert hamming_distance(perceptual_hash(img), perceptual_hash(img[:, ::-1].copy())) > 100
+
+
+def test_request_key_covers_model_prompt_config_and_shape():
+    base = gemini_request_key(["m1"], "p", "cfg", None, (4, 4, 3))
+    assert base == gemini_request_key(["m1"], "p", "cfg", None, (4, 4, 3))
+    assert base != gemini_request_key(["m2"], "p", "cfg", None, (4, 4, 3))
+    assert base != gemini_request_key(["m1"], "q", "cfg", None, (4, 4, 3))
+    assert base != gemini_request_key(["m1"], "p", "cfg2", None, (4, 4, 3))
+    assert base != gemini_request_key(["m1"], "p", "cfg", None, (8, 4, 3))
+
+
+def test_hamming_tolerance_and_near_hit_counters():
+    cache = GeminiResponseCache(max_distance=3)
+    cache.put("k", 0b1111, _response("a"))
+    assert cache.get("k", 0b1000)["text_content"] == "a"  # 3 bits away
+    assert cache.get("k", 0b0000) is None  # 4 bits away
+    assert cache.get("other", 0b1111) is None
+    stats = cache.get_stats()
+    assert stats == {**stats, "hits": 1, "near_hits": 1, "misses": 2}
+
+
+def test_ttl_expires_entries():
+    clock = FakeClock()
+    cache = GeminiResponseCache(ttl_seconds=10, clock=clock)
+    cache.put("k", 1, _response("a"))
+    clock.now += 9
+    assert cache.get("k", 1) is not None
+    clock.now += 2
+    assert cache.get("k", 1) is None
+    assert len(cache) == 0 and cache.get_stats()["expirations"] == 1
+
+
+def test_bounds_by_entries_and_bytes():
+    cache = GeminiResponseCache(max_entries=2)
+    for i in range(3):
+        cache.put("k", i, _response(str(i)))
+    assert cache.get("k", 0) is None and cache.get_stats()["evictions"] == 1
+    small = GeminiResponseCache(max_bytes=300)
+    small.put("k", 1, _response("x" * 400))
+    assert len(small) == 0
+
+
+def test_returned_responses_are_copies():
+    cache = GeminiResponseCache()
+    cache.put("k", None, _response("a"))
+    cache.get("k", None)["text_content"] = "mutated"
+    assert cache.get("k", None)["text_content"] == "a"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "gemini_cache.json")
+    clock = FakeClock()
+    cache = GeminiResponseCache(persist_path=path, clock=clock)
+    cache.put("k", 2**200 + 5, _response("a"))
+    cache.put("t", None, _response("text only"))
+    assert cache.save()
+    reloaded = GeminiResponseCache(persist_path=path, clock=clock)
+    assert reloaded.get("k", 2**200 + 5)["text_content"] == "a"
+    assert reloaded.get("t", None)["text_content"] == "text only"
+    clock.now += 3600
+    assert len(GeminiResponseCache(persist_path=path, clock=clock)) == 0  # expired entries are not loaded
+
+
+def test_create_from_settings():
+    assert create_gemini_response_cache({}) is None
+    assert create_gemini_response_cache({"gemini_response_cache_entries": -1}) is None
+    cache = create_gemini_response_cache({"gemini_response_cache_entries": 5, "gemini_response_cache_max_distance": 4})
+    assert cache.max_entries == 5 and cache.max_distance == 4
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        GeminiResponseCache(ttl_seconds=0)
+    with pytest.raises(ValueError):
+        GeminiResponseCache(max_distance=1000)
+
+
+class TestGeminiAnalyzerResponseCache:
+    @pytest.fixture
+    def genai_stub(self):
+        with patch("mark_i.engines.gemini_analyzer.genai") as genai_mock:
+            model = genai_mock.GenerativeModel.return_value
+            part = MagicMock(text='{"answer": "yes"}')
+            candidate = MagicMock(finish_reason=MagicMock(), content=MagicMock(parts=[part]))
+            candidate.finish_reason.name = "STOP"
+            model.generate_content.return_value = MagicMock(prompt_feedback=None, candidates=[candidate])
+            yield genai_mock
+
+    def test_repeated_query_on_same_image_hits_cache(self, genai_stub):
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m", response_cache=GeminiResponseCache())
+        img = _gradient_image()
+        first = analyzer.query_vision_model("Is it on?", image_data=img)
+        second = analyzer.query_vision_model("Is it on?", image_data=img.copy())
+        assert first["status"] == second["status"] == "success"
+        assert second["cache_hit"] is True and "cache_hit" not in first
+        assert second["json_content"] == {"answer": "yes"}
+        assert genai_stub.GenerativeModel.return_value.generate_content.call_count == 1
+        assert analyzer.get_response_cache_stats()["hits"] == 1
+
+    def test_cache_hit_skips_upload_preparation(self, genai_stub):
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m", response_cache=GeminiResponseCache())
+        img = _gradient_image()
+        with patch("mark_i.engines.gemini_analyzer.prepare_upload_image", wraps=prepare_upload_image) as prepare_spy:
+            analyzer.query_vision_model("Is it on?", image_data=img)
+            assert analyzer.query_vision_model("Is it on?", image_data=img)["cache_hit"] is True
+        assert prepare_spy.call_count == 1
+
+    def test_different_prompt_image_or_opt_out_calls_api(self, genai_stub):
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m", response_cache=GeminiResponseCache())
+        img = _gradient_image()
+        analyzer.query_vision_model("Is it on?", image_data=img)
+        analyzer.query_vision_model("Is it off?", image_data=img)
+        analyzer.query_vision_model("Is it on?", image_data=img[:, ::-1].copy())
+        analyzer.query_vision_model("Is it on?", image_data=img, use_cache=False)
+        assert genai_stub.GenerativeModel.return_value.generate_content.call_count == 4
+
+    def test_failed_responses_are_not_cached(self, genai_stub):
+        genai_stub.GenerativeModel.return_value.generate_content.side_effect = RuntimeError("boom")
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m", response_cache=GeminiResponseCache())
+        assert analyzer.query_vision_model("p")["status"] == "error_api"
+        assert analyzer.query_vision_model("p")["status"] == "error_api"
+        assert genai_stub.GenerativeModel.return_value.generate_content.call_count == 2
+        assert len(analyzer.response_cache) == 0
+
+    def test_no_cache_by_default(self, genai_stub):
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m")
+        analyzer.query_vision_model("p")
+        analyzer.query_vision_model("p")
+        assert genai_stub.GenerativeModel.return_value.generate_content.call_count == 2
+        assert analyzer.get_response_cache_stats() is None
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from mark_i.engines.gemini_analyzer import GeminiAnalyzer
+from mark_i.engines.gemini_upload import PreparedUploadImage, UploadImageOptions, prepare_upload_image, remap_boxes_to_source
+
+
+def _screen(width: int = 800, height: int = 600) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def test_no_options_keeps_full_resolution_pil_image():
+    prepared = prepare_upload_image(_screen(), None)
+    assert isinstance(prepared.content, Image.Image)
+    assert (prepared.width, prepared.height) == (800, 600)
+    assert prepared.is_identity and prepared.upload_bytes is None
+
+
+def test_downscale_to_pixel_budget_and_encode_jpeg():
+    prepared = prepare_upload_image(_screen(), UploadImageOptions(max_pixels=200 * 150, quality=70))
+    assert prepared.width * prepared.height <= 200 * 150
+    assert prepared.width == 200 and prepared.scale == pytest.approx(0.25)
+    assert prepared.content["mime_type"] == "image/jpeg"
+    decoded = cv2.imdecode(np.frombuffer(prepared.content["data"], np.uint8), cv2.IMREAD_UNCHANGED)
+    assert decoded.shape == (prepared.height, prepared.width, 3)
+    report = prepared.report()
+    assert report["upload_bytes"] == len(prepared.content["data"])
+    assert report["bytes_saved"] == 800 * 600 * 3 - report["upload_bytes"]
+
+
+def test_grayscale_webp_and_crop():
+    prepared = prepare_upload_image(_screen(), UploadImageOptions(image_format="webp", grayscale=True, crop_box=(100, 50, 300, 200)))
+    assert prepared.content["mime_type"] == "image/webp"
+    decoded = cv2.imdecode(np.frombuffer(prepared.content["data"], np.uint8), cv2.IMREAD_UNCHANGED)
+    assert decoded.shape[:2] == (200, 300)
+    assert (prepared.offset_x, prepared.offset_y) == (100, 50)
+
+
+def test_crop_outside_image_falls_back_to_full_frame():
+    prepared = prepare_upload_image(_screen(), UploadImageOptions(crop_box=(5000, 5000, 10, 10), image_format="png"))
+    assert (prepared.width, prepared.height, prepared.offset_x) == (800, 600, 0)
+
+
+def test_invalid_options_rejected():
+    with pytest.raises(ValueError):
+        UploadImageOptions(image_format="bmp")
+    with pytest.raises(ValueError):
+        UploadImageOptions(quality=0)
+    with pytest.raises(ValueError):
+        UploadImageOptions(max_pixels=-1)
+
+
+def test_remap_boxes_to_source_space():
+    prepared = PreparedUploadImage(content={}, width=200, height=150, offset_x=100, offset_y=50, scale=0.5)
+    response = {
+        "found": True,
+        "box": [10, 20, 30, 40],
+        "elements": [{"box": [0, 0, 2, 2], "label": "x"}, {"box": "n/a"}],
+        "bounding_box": {"x": 4, "y": 6, "width": 8, "height": 10, "note": "kept"},
+    }
+    remapped = remap_boxes_to_source(response, prepared)
+    assert remapped["box"] == [120, 90, 60, 80]
+    assert remapped["elements"] == [{"box": [100, 50, 4, 4], "label": "x"}, {"box": "n/a"}]
+    assert remapped["bounding_box"] == {"x": 108, "y": 62, "width": 16, "height": 20, "note": "kept"}
+    assert response["box"] == [10, 20, 30, 40]
+
+
+def test_analyzer_uploads_encoded_image_and_returns_screen_space_boxes():
+    with patch("mark_i.engines.gemini_analyzer.genai") as genai_mock:
+        part = MagicMock(text='{"found": true, "box": [50, 25, 10, 10]}')
+        candidate = MagicMock(finish_reason=MagicMock(), content=MagicMock(parts=[part]))
+        candidate.finish_reason.name = "STOP"
+        genai_mock.GenerativeModel.return_value.generate_content.return_value = MagicMock(prompt_feedback=None, candidates=[candidate])
+        analyzer = GeminiAnalyzer(api_key="k", default_model_name="m", upload_options=UploadImageOptions(max_pixels=400 * 300))
+
+        result = analyzer.query_vision_model("Find the button", image_data=_screen())
+
+        sent_contents = genai_mock.GenerativeModel.return_value.generate_content.call_args.args[0]
+        assert sent_contents[0] == "Find the button"
+        assert sent_contents[1]["mime_type"] == "image/jpeg"
+        assert result["json_content"]["box"] == [100, 50, 20, 20]
+        assert result["upload_image"]["width"] == 400
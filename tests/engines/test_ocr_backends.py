@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from mark_i.engines import ocr_backends
+from mark_i.engines.ocr_backends import PytesseractOcrBackend, TesserocrOcrBackend, create_ocr_backend, parse_tesseract_cli_config, parse_tesseract_tsv
+
+TSV_OUTPUT = (
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+    "1\t1\t0\t0\t0\t0\t0\t0\t100\t20\t-1\t\n"
+    "5\t1\t1\t1\t1\t1\t10\t10\t50\t10\t95.5\tHello\n"
+    "5\t1\t1\t1\t1\t2\t70\t10\t50\t10\t88\tWorld\n"
+)
+
+
+class _FakeApi:
+    instances = 0
+
+    def __init__(self, lang="eng", **kwargs):
+        type(self).instances += 1
+        self.kwargs = kwargs
+        self.variables = {}
+        self.ended = False
+
+    def SetVariable(self, key, value):
+        self.variables[key] = value
+        return True
+
+    def SetImage(self, image):
+        self.image = image
+
+    def Recognize(self):
+        time.sleep(0.01)
+
+    def GetTSVText(self, page):
+        return TSV_OUTPUT
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        self.ended = True
+
+
+@pytest.fixture
+def fake_tesserocr():
+    _FakeApi.instances = 0
+    module = MagicMock()
+    module.PyTessBaseAPI = _FakeApi
+    with patch.object(ocr_backends, "tesserocr", module), patch.object(ocr_backends, "TESSEROCR_AVAILABLE", True):
+        yield module
+
+
+def test_parse_tsv_matches_pytesseract_dict_layout():
+    data = parse_tesseract_tsv(TSV_OUTPUT)
+    assert data["level"] == [1, 5, 5]
+    assert data["text"] == ["", "Hello", "World"]
+    assert data["conf"] == [-1.0, 95.5, 88.0]
+    assert data["left"][1] == 10 and isinstance(data["width"][2], int)
+
+
+def test_parse_tsv_skips_malformed_lines():
+    data = parse_tesseract_tsv("5\t1\t1\t1\t1\tX\t0\t0\t1\t1\t50\tbad\n" + TSV_OUTPUT)
+    assert data["text"] == ["", "Hello", "World"]
+    assert all(len(column) == 3 for column in data.values())
+
+
+def test_parse_cli_config():
+    psm, oem, variables = parse_tesseract_cli_config("--psm 6 --oem 1 -c tessedit_char_whitelist=0123456789 --dpi 300")
+    assert (psm, oem) == (6, 1)
+    assert variables == {"tessedit_char_whitelist": "0123456789"}
+    assert parse_tesseract_cli_config("") == (None, None, {})
+
+
+def test_pytesseract_backend_delegates():
+    with patch("pytesseract.image_to_data", return_value={"text": []}) as mock_ocr:
+        assert PytesseractOcrBackend().image_to_data(np.zeros((2, 2, 3), np.uint8), "eng", "--psm 7") == {"text": []}
+    assert mock_ocr.call_args.kwargs["config"] == "--psm 7"
+
+
+def test_tesserocr_unavailable_raises_runtime_error():
+    with patch.object(ocr_backends, "TESSEROCR_AVAILABLE", False):
+        with pytest.raises(RuntimeError):
+            create_ocr_backend("tesserocr")
+    with pytest.raises(ValueError):
+        create_ocr_backend("easyocr")
+
+
+def test_tesserocr_pool_reuses_handles_and_caps_workers(fake_tesserocr):
+    backend = TesserocrOcrBackend(max_workers=2, config="--psm 6 -c load_system_dawg=0")
+    assert _FakeApi.instances == 1
+    image = np.zeros((10, 10, 3), dtype=np.uint8)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(backend.image_to_data(image, "eng", "--psm 6 -c load_system_dawg=0"))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 6 and all(r["text"][1:] == ["Hello", "World"] for r in results)
+    assert _FakeApi.instances <= 2
+    backend.close()
+    assert backend._created == 0
+
+
+def test_tesserocr_pool_rejects_mismatched_settings(fake_tesserocr):
+    backend = TesserocrOcrBackend(max_workers=1)
+    with pytest.raises(RuntimeError):
+        backend.image_to_data(np.zeros((2, 2, 3), np.uint8), "eng", "--psm 6")
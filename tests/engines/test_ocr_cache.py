@@ -0,0 +1,85 @@
+import json
+
+import pytest
+import numpy as np
+
+from mark_i.engines.ocr_cache import OcrResultCache, ocr_cache_key
+
+
+def _result(text: str) -> dict:
+    return {"text": text, "average_confidence": 90.0, "raw_data": {"level": [5], "text": [text], "conf": ["90"]}}
+
+
+def test_key_depends_on_pixels_shape_and_settings():
+    img = np.zeros((4, 6, 3), dtype=np.uint8)
+    assert ocr_cache_key(img, "eng|") == ocr_cache_key(img.copy(), "eng|")
+    assert ocr_cache_key(img, "eng|") != ocr_cache_key(img, "eng|--psm 6")
+    assert ocr_cache_key(img, "eng|") != ocr_cache_key(img.reshape(6, 4, 3), "eng|")
+    changed = img.copy()
+    changed[1, 1, 1] = 1
+    assert ocr_cache_key(img, "eng|") != ocr_cache_key(changed, "eng|")
+
+
+def test_key_of_view_matches_contiguous_copy():
+    frame = np.arange(10 * 10 * 3, dtype=np.uint8).reshape(10, 10, 3)
+    view = frame[2:6, 3:8]
+    assert ocr_cache_key(view, "s") == ocr_cache_key(view.copy(), "s")
+
+
+def test_lru_eviction_by_entries_and_counters():
+    cache = OcrResultCache(max_entries=2)
+    cache.put("a", _result("a"))
+    cache.put("b", _result("b"))
+    assert cache.get("a")["text"] == "a"  # "b" is now least recently used
+    cache.put("c", _result("c"))
+    assert cache.get("b") is None
+    assert cache.get("c")["text"] == "c"
+    stats = cache.get_stats()
+    assert stats == {**stats, "entries": 2, "hits": 2, "misses": 1, "evictions": 1}
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_byte_budget_evicts_and_rejects_oversized():
+    one_size = len(json.dumps(_result("x")))
+    cache = OcrResultCache(max_entries=100, max_bytes=one_size * 2)
+    for key in "xyz":
+        cache.put(key, _result(key))
+    assert len(cache) == 2 and cache.get("x") is None
+    cache.put("huge", _result("h" * one_size * 3))
+    assert cache.get("huge") is None
+
+
+def test_returned_results_are_independent_copies():
+    cache = OcrResultCache()
+    original = _result("abc")
+    cache.put("k", original)
+    original["text"] = "mutated"
+    fetched = cache.get("k")
+    fetched["raw_data"]["text"].append("junk")
+    assert cache.get("k") == _result("abc")
+
+
+def test_persistence_roundtrip(tmp_path):
+    path = str(tmp_path / "cache" / "ocr_cache.json")
+    cache = OcrResultCache(persist_path=path)
+    cache.put("k1", _result("one"))
+    cache.put("k2", _result("two"))
+    assert cache.save() is True
+
+    warm = OcrResultCache(persist_path=path)
+    assert len(warm) == 2
+    assert warm.get("k2")["text"] == "two"
+
+
+def test_corrupt_or_incompatible_file_starts_empty(tmp_path):
+    path = tmp_path / "ocr_cache.json"
+    path.write_text("{not json")
+    assert len(OcrResultCache(persist_path=str(path))) == 0
+    path.write_text(json.dumps({"version": 999, "entries": [["k", _result("x")]]}))
+    assert len(OcrResultCache(persist_path=str(path))) == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"max_bytes": -1}, {"max_entries": "10"}])
+def test_invalid_bounds_rejected(kwargs):
+    with pytest.raises(ValueError):
+        OcrResultCache(**kwargs)
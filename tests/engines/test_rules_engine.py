@@ -9,6 +9,7 @@ from mark_i.engines.gemini_analyzer import GeminiAnalyzer
 from mark_i.engines.gemini_decision_module import GeminiDecisionModule
 from mark_i.engines.rules_engine import RulesEngine
 from mark_i.engines.condition_evaluators import ConditionEvaluationResult, ConditionEvaluator
+from mark_i.engines.rule_plans import CompoundConditionPlan, ConditionPlan
 
 
 # --- Mock Fixtures ---
@@ -227,3 +228,150 @@ class TestRulesEngineEvaluateRules:
         rules_engine_instance_base.rules = [{"name": "MalformedRule"}]  # Missing condition/action
         rules_engine_instance_base.evaluate_rules({})
         mock_action_executor_re.execute_action.assert_not_called()
+
+
+class TestRulesEngineTemplateBatching:
+    @pytest.fixture
+    def batching_engine(self, mock_config_manager_re, mock_analysis_engine_re, mock_action_executor_re):
+        rules = [
+            {"name": "SaveIcon", "region": "toolbar", "condition": {"type": "template_match_found", "template_filename": "save.png", "min_confidence": 0.8}, "action": {"type": "log_message", "message": "save"}},
+            {"name": "SaveStrict", "region": "toolbar", "condition": {"type": "template_match_found", "template_filename": "save.png", "min_confidence": 0.95}, "action": {"type": "log_message", "message": "strict"}},
+            {
+                "name": "OpenAndSave",
+                "region": "toolbar",
+                "condition": {"logical_operator": "AND", "sub_conditions": [{"type": "template_match_found", "template_filename": "open.png"}, {"type": "template_match_found", "template_filename": "save.png"}]},
+                "action": {"type": "log_message", "message": "both"},
+            },
+            {"name": "Dynamic", "region": "toolbar", "condition": {"type": "template_match_found", "template_filename": "{icon}.png"}, "action": {"type": "log_message", "message": "dyn"}},
+        ]
+        mock_config_manager_re.get_profile_data.return_value = {"settings": {}, "rules": rules}
+        with patch("mark_i.engines.rules_engine.GeminiAnalyzer"):
+            engine = RulesEngine(config_manager=mock_config_manager_re, analysis_engine=mock_analysis_engine_re, action_executor=mock_action_executor_re)
+        template = np.zeros((4, 4, 3), dtype=np.uint8)
+        engine._loaded_templates[("/fake/profile/dir", "save.png")] = template
+        engine._loaded_templates[("/fake/profile/dir", "open.png")] = template
+        return engine
+
+    def test_static_template_conditions_grouped_by_region(self, batching_engine: RulesEngine):
+        assert dict(batching_engine._template_conditions_per_region) == {"toolbar": {"save.png": 0.95, "open.png": 0.8}}
+
+    def test_one_batched_match_per_region_and_per_condition_thresholds(self, batching_engine: RulesEngine, mock_analysis_engine_re, mock_action_executor_re, dummy_image_bgr):
+        mock_analysis_engine_re.match_templates.return_value = {
+            "save.png": {"location_x": 1, "location_y": 2, "confidence": 0.9, "width": 4, "height": 4, "scale": 1.0},
+            "open.png": {"location_x": 5, "location_y": 2, "confidence": 0.85, "width": 4, "height": 4, "scale": 1.0},
+        }
+        batching_engine.evaluate_rules({"toolbar": {"image": dummy_image_bgr}})
+
+        mock_analysis_engine_re.match_templates.assert_called_once()
+        assert set(mock_analysis_engine_re.match_templates.call_args.args[1]) == {"save.png", "open.png"}
+        mock_analysis_engine_re.match_template.assert_not_called()  # '{icon}.png' cannot resolve, nothing else falls back
+        executed_messages = [c.args[0]["message"] for c in mock_action_executor_re.execute_action.call_args_list]
+        assert executed_messages == ["save", "both"]
+        first_action_context = mock_action_executor_re.execute_action.call_args_list[0].args[0]["context"]
+        assert first_action_context["last_match_info"]["location_x"] == 1
+
+    def test_missing_image_skips_batch(self, batching_engine: RulesEngine, mock_analysis_engine_re):
+        batching_engine.evaluate_rules({"toolbar": {"image": None}})
+        mock_analysis_engine_re.match_templates.assert_not_called()
+
+
+class TestRulesEngineRulePlans:
+    def test_rules_compiled_with_resolved_evaluator_and_region(self, rules_engine_instance_base: RulesEngine, mock_condition_evaluator_always_true):
+        rules_engine_instance_base._condition_evaluators["type_true"] = mock_condition_evaluator_always_true
+        rules_engine_instance_base.rules = [{"name": "Static", "region": "r1", "condition": {"type": "type_true"}, "action": {"type": "click"}}, {"name": "Malformed"}]
+        plans = rules_engine_instance_base._rule_plans
+        assert [plan.name for plan in plans] == ["Static"]  # Malformed rule dropped at compile time
+        assert isinstance(plans[0].condition, ConditionPlan)
+        assert plans[0].condition.evaluator is mock_condition_evaluator_always_true
+        assert plans[0].condition.region == "r1"
+        assert plans[0].condition.template.is_static and plans[0].action.is_static
+
+    def test_plans_recompiled_when_rules_replaced(self, rules_engine_instance_base: RulesEngine):
+        rules_engine_instance_base.rules = [{"name": "A", "region": "r1", "condition": {"type": "ocr_contains_text", "text": "x"}, "action": {"type": "click"}}]
+        assert [plan.name for plan in rules_engine_instance_base._rule_plans] == ["A"]
+        assert rules_engine_instance_base.get_analysis_requirements_for_region("r1") == {"ocr"}
+        rules_engine_instance_base.rules = []
+        assert rules_engine_instance_base._rule_plans == []
+        assert rules_engine_instance_base.get_analysis_requirements_for_region("r1") == set()
+
+    def test_in_place_edits_need_explicit_recompile(self, rules_engine_instance_base: RulesEngine):
+        rules_engine_instance_base.rules = [{"name": "A", "condition": {"type": "always_true"}, "action": {"type": "click"}}]
+        rules_engine_instance_base.rules[0]["name"] = "Renamed"
+        assert [plan.name for plan in rules_engine_instance_base._rule_plans] == ["A"]
+        rules_engine_instance_base.recompile_rules()
+        assert [plan.name for plan in rules_engine_instance_base._rule_plans] == ["Renamed"]
+
+    def test_static_spec_passed_without_copy_and_dynamic_keys_substituted(self, rules_engine_instance_base: RulesEngine, mock_condition_evaluator_always_true, mock_action_executor_re):
+        rules_engine_instance_base._condition_evaluators["type_true"] = mock_condition_evaluator_always_true
+        mock_condition_evaluator_always_true.evaluate.return_value = ConditionEvaluationResult(met=True, captured_value="Bob")
+        condition_spec = {"type": "type_true", "capture_as": "who"}
+        rules_engine_instance_base.rules = [{"name": "Greet", "region": "r1", "condition": condition_spec, "action": {"type": "type_text", "text": "Hi {who}", "interval": 0.1}}]
+        rules_engine_instance_base.evaluate_rules({"r1": {"image": MagicMock()}})
+        assert mock_condition_evaluator_always_true.evaluate.call_args.args[0] is condition_spec
+        executed_spec = mock_action_executor_re.execute_action.call_args.args[0]
+        assert executed_spec["text"] == "Hi Bob"
+        assert executed_spec["interval"] == 0.1
+        assert rules_engine_instance_base.rules[0]["action"]["text"] == "Hi {who}"
+
+    def test_dynamic_region_resolved_per_cycle(self, rules_engine_instance_base: RulesEngine, mock_condition_evaluator_always_true):
+        rules_engine_instance_base._condition_evaluators["type_true"] = mock_condition_evaluator_always_true
+        mock_condition_evaluator_always_true.evaluate.return_value = ConditionEvaluationResult(met=True, captured_value="r2")
+        condition = {"logical_operator": "AND", "sub_conditions": [{"type": "type_true", "region": "r1", "capture_as": "target"}, {"type": "type_true", "region": "{target}"}]}
+        plan = rules_engine_instance_base._compile_condition("Dyn", condition, None)
+        assert isinstance(plan, CompoundConditionPlan) and plan.sub_conditions[1].region is None
+        assert rules_engine_instance_base._check_condition("Dyn", condition, None, {"r1": {}, "r2": {}}, {}) is True
+        assert mock_condition_evaluator_always_true.evaluate.call_args.args[1] == "r2"
+
+    def test_or_compound_skips_non_dict_sub_condition(self, rules_engine_instance_base: RulesEngine, mock_condition_evaluator_always_true):
+        rules_engine_instance_base._condition_evaluators["type_true"] = mock_condition_evaluator_always_true
+        condition = {"logical_operator": "or", "sub_conditions": ["not-a-dict", {"type": "type_true"}]}
+        assert rules_engine_instance_base._check_condition("OrRule", condition, "r1", {"r1": {}}, {}) is True
+        condition["logical_operator"] = "AND"
+        assert rules_engine_instance_base._check_condition("AndRule", condition, "r1", {"r1": {}}, {}) is False
+
+
+class TestRulesEngineGeminiFanOut:
+    @pytest.fixture
+    def fan_out_engine(self, mock_config_manager_re, mock_analysis_engine_re, mock_action_executor_re):
+        rules = [
+            {"name": "Q1", "region": "r1", "condition": {"type": "gemini_vision_query", "prompt": "Is A visible?", "expected_response_contains": "yes"}, "action": {"type": "log_message", "message": "a"}},
+            {"name": "Q2", "region": "r2", "condition": {"type": "gemini_vision_query", "prompt": "Is B visible?", "expected_response_contains": "yes"}, "action": {"type": "log_message", "message": "b"}},
+            {
+                "name": "Lazy",
+                "region": "r1",
+                "condition": {"logical_operator": "AND", "sub_conditions": [{"type": "always_true"}, {"type": "gemini_vision_query", "prompt": "Is C visible?"}]},
+                "action": {"type": "log_message", "message": "c"},
+            },
+            {"name": "Dynamic", "region": "r1", "condition": {"type": "gemini_vision_query", "prompt": "Is {thing} visible?"}, "action": {"type": "log_message", "message": "d"}},
+        ]
+        mock_config_manager_re.get_profile_data.return_value = {"settings": {}, "rules": rules}
+        with patch("mark_i.engines.rules_engine.GeminiAnalyzer"):
+            engine = RulesEngine(config_manager=mock_config_manager_re, analysis_engine=mock_analysis_engine_re, action_executor=mock_action_executor_re)
+        engine._async_gemini_analyzer = MagicMock()
+        engine._async_gemini_analyzer.run_queries.side_effect = lambda requests: [{"status": "success", "text_content": "yes", "json_content": None} for _ in requests]
+        return engine
+
+    def test_only_always_evaluated_static_queries_are_prefetched(self, fan_out_engine: RulesEngine):
+        assert dict(fan_out_engine._gemini_queries_per_region) == {"r1": {("Is A visible?", None)}, "r2": {("Is B visible?", None)}}
+
+    def test_independent_queries_fanned_out_once_and_consumed(self, fan_out_engine: RulesEngine, mock_action_executor_re, dummy_image_bgr):
+        fan_out_engine.gemini_analyzer_for_query = fan_out_engine._condition_evaluators["gemini_vision_query"].gemini_analyzer_for_query
+        fan_out_engine.gemini_analyzer_for_query.query_vision_model.return_value = {"status": "success", "text_content": "no", "json_content": None}
+        all_region_data = {"r1": {"image": dummy_image_bgr}, "r2": {"image": dummy_image_bgr}}
+
+        fan_out_engine.evaluate_rules(all_region_data)
+
+        fan_out_engine._async_gemini_analyzer.run_queries.assert_called_once()
+        prompts = sorted(request["prompt"] for request in fan_out_engine._async_gemini_analyzer.run_queries.call_args.args[0])
+        assert prompts == ["Is A visible?", "Is B visible?"]
+        executed_messages = [c.args[0]["message"] for c in mock_action_executor_re.execute_action.call_args_list]
+        assert executed_messages[:2] == ["a", "b"]
+        # The lazy sub-condition and the dynamic prompt were still queried one by one.
+        individually_queried = sorted(c.kwargs["prompt"] for c in fan_out_engine.gemini_analyzer_for_query.query_vision_model.call_args_list)
+        assert individually_queried == ["Is C visible?", "Is {thing} visible?"]
+
+    def test_single_query_is_not_fanned_out_and_stale_results_dropped(self, fan_out_engine: RulesEngine, dummy_image_bgr):
+        all_region_data = {"r1": {"image": dummy_image_bgr, "gemini_query_results": {("Is A visible?", None): {"status": "success"}}}, "r2": {"image": None}}
+        fan_out_engine._prefetch_gemini_queries(all_region_data)
+        fan_out_engine._async_gemini_analyzer.run_queries.assert_not_called()
+        assert "gemini_query_results" not in all_region_data["r1"]
@@ -0,0 +1,70 @@
+import os
+import platform
+
+import pytest
+import numpy as np
+
+from mark_i.engines.xshm_capture import XShmCaptureBackend
+
+
+def _xshm_backend_or_none():
+    try:
+        return XShmCaptureBackend()
+    except RuntimeError:
+        return None
+
+
+# These tests need a real X server with MIT-SHM, e.g. run the suite under `xvfb-run -s "-screen 0 1280x720x24"`.
+requires_x_server = pytest.mark.skipif(platform.system() != "Linux" or not os.environ.get("DISPLAY"), reason="XShm capture needs a Linux X server (DISPLAY).")
+
+
+def test_init_without_display_raises_runtime_error(monkeypatch):
+    monkeypatch.delenv("DISPLAY", raising=False)
+    with pytest.raises(RuntimeError):
+        XShmCaptureBackend()
+
+
+def test_init_with_unreachable_display_raises_runtime_error():
+    with pytest.raises(RuntimeError):
+        XShmCaptureBackend(display_name=":987654")
+
+
+@pytest.fixture
+def xshm_backend():
+    backend = _xshm_backend_or_none()
+    if backend is None:
+        pytest.skip("X server does not offer MIT-SHM.")
+    yield backend
+    backend.close()
+
+
+@requires_x_server
+class TestXShmCaptureBackendLive:
+    def test_full_screen_grab_shape(self, xshm_backend):
+        frame = xshm_backend.grab((0, 0, xshm_backend.screen_width, xshm_backend.screen_height))
+        assert frame.shape == (xshm_backend.screen_height, xshm_backend.screen_width, 3)
+        assert frame.dtype == np.uint8
+
+    def test_region_grab_matches_full_screen_crop(self, xshm_backend):
+        full = xshm_backend.grab((0, 0, xshm_backend.screen_width, xshm_backend.screen_height))
+        region = xshm_backend.grab((10, 20, 74, 68))
+        assert region.shape == (48, 64, 3)
+        assert np.array_equal(region, full[20:68, 10:74])
+
+    def test_grab_into_preallocated_buffer(self, xshm_backend):
+        out = np.empty((32, 32, 3), dtype=np.uint8)
+        assert xshm_backend.grab((0, 0, 32, 32), out=out) is out
+        with pytest.raises(ValueError):
+            xshm_backend.grab((0, 0, 16, 16), out=out)
+
+    def test_bbox_is_clipped_to_root_window(self, xshm_backend):
+        w, h = xshm_backend.screen_width, xshm_backend.screen_height
+        assert xshm_backend.grab((w - 10, h - 10, w + 50, h + 50)).shape == (10, 10, 3)
+        with pytest.raises(ValueError):
+            xshm_backend.grab((w + 1, 0, w + 10, 10))
+
+    def test_close_is_idempotent(self, xshm_backend):
+        xshm_backend.close()
+        xshm_backend.close()
+        with pytest.raises(RuntimeError):
+            xshm_backend.grab_bgra((0, 0, 4, 4))
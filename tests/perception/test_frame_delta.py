@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from mark_i.perception.frame_delta import FrameDelta, FrameDeltaEncoder
+from mark_i.perception.frame_ring_buffer import FrameRingBuffer
+
+
+def _screen(height=100, width=150):
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def test_first_frame_and_size_change_are_keyframes():
+    encoder = FrameDeltaEncoder(tile_size=32)
+    first = encoder.encode(_screen())
+    assert first.keyframe and first.tile_mask.shape == (4, 5) and first.changed_fraction == 1.0
+    assert encoder.encode(_screen()).unchanged
+    assert encoder.encode(_screen(50, 50)).keyframe
+
+
+def test_dirty_tiles_boxes_and_fraction():
+    encoder = FrameDeltaEncoder(tile_size=32, pixel_threshold=8)
+    encoder.encode(_screen())
+    frame = _screen()
+    frame[5, 40] = 200  # Tile (0, 1)
+    frame[40, 70] = 200  # Tile (1, 2), diagonal neighbour: same box
+    frame[99, 149] = 200  # Partial edge tile (3, 4)
+    frame[70, 5] = 5  # Below the noise threshold
+    delta = encoder.encode(frame)
+    assert delta.dirty_tiles == [(0, 1), (1, 2), (3, 4)]
+    assert sorted(delta.boxes) == [(32, 0, 64, 64), (128, 96, 22, 4)]
+    assert delta.bounding_box == (32, 0, 118, 100)
+    assert delta.changed_fraction == pytest.approx((32 * 32 * 2 + 22 * 4) / (100 * 150))
+
+
+def test_merge_unions_masks():
+    encoder = FrameDeltaEncoder(tile_size=50)
+    encoder.encode(_screen())
+    a = _screen()
+    a[0, 0] = 255
+    b = a.copy()
+    b[99, 149] = 255
+    merged = FrameDelta.merge([encoder.encode(a), encoder.encode(b)])
+    assert merged.dirty_tiles == [(0, 0), (1, 2)] and not merged.keyframe
+    with pytest.raises(ValueError):
+        FrameDelta.merge([])
+
+
+def test_invalid_encoder_arguments():
+    with pytest.raises(ValueError):
+        FrameDeltaEncoder(tile_size=0)
+    with pytest.raises(ValueError):
+        FrameDeltaEncoder(pixel_threshold=300)
+
+
+def test_ring_buffer_deltas_cover_skipped_and_overwritten_frames():
+    encoder = FrameDeltaEncoder(tile_size=50)
+    buffer = FrameRingBuffer(capacity=3)
+    subscriber = buffer.subscribe("agency")
+
+    def publish(frame):
+        buffer.publish(frame, delta=encoder.encode(frame))
+
+    base = _screen()
+    publish(base)
+    assert subscriber.latest().delta.keyframe  # First frame a subscriber sees.
+    publish(base.copy())
+    assert subscriber.latest().delta.unchanged
+
+    changed = base.copy()
+    changed[0, 0] = 255
+    publish(changed)
+    publish(changed.copy())
+    # The newest frame alone is unchanged, but the skipped one changed tile (0, 0).
+    assert subscriber.latest().delta.dirty_tiles == [(0, 0)]
+
+    for _ in range(4):
+        publish(changed.copy())
+    frames = subscriber.read_all()
+    assert frames[0].delta.keyframe and all(f.delta.unchanged for f in frames[1:])
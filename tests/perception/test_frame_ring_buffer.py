@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pytest
+
+from mark_i.perception.frame_ring_buffer import FrameRingBuffer
+
+
+def _frame(value: int, shape=(4, 6, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_slots_are_reused_and_memory_is_capped():
+    buffer = FrameRingBuffer(capacity=3, frame_shape=(4, 6, 3))
+    slot_ids = {id(slot) for slot in buffer._slots}
+    for value in range(50):
+        buffer.publish(_frame(value))
+    assert {id(slot) for slot in buffer._slots} == slot_ids
+    assert buffer.published == 50 and buffer.latest().image[0, 0, 0] == 49
+
+
+def test_latest_wins_and_counts_skipped_frames_as_dropped():
+    buffer = FrameRingBuffer(capacity=2)
+    subscriber = buffer.subscribe("agency")
+    assert subscriber.latest() is None
+    for value in range(5):
+        buffer.publish(_frame(value), timestamp=float(value))
+    frame = subscriber.latest()
+    assert (frame.sequence, frame.timestamp, int(frame.image[0, 0, 0])) == (4, 4.0, 4)
+    assert subscriber.dropped == 4 and subscriber.delivered == 1 and subscriber.latest() is None
+
+
+def test_subscribers_have_independent_cursors():
+    buffer = FrameRingBuffer(capacity=4)
+    fast, slow = buffer.subscribe("fast"), buffer.subscribe("slow")
+    for value in range(3):
+        buffer.publish(_frame(value))
+        assert int(fast.latest().image[0, 0, 0]) == value
+    assert [f.sequence for f in slow.read_all()] == [0, 1, 2]
+    for value in range(3, 9):
+        buffer.publish(_frame(value))
+    assert [f.sequence for f in slow.read_all()] == [5, 6, 7, 8]
+    stats = buffer.get_stats()
+    assert stats["subscribers"]["slow"] == {"delivered": 7, "dropped": 2, "pending": 0}
+    assert stats["subscribers"]["fast"]["pending"] == 4
+
+
+def test_read_frames_are_copies():
+    buffer = FrameRingBuffer(capacity=1)
+    subscriber = buffer.subscribe("reader")
+    buffer.publish(_frame(1))
+    frame = subscriber.latest()
+    buffer.publish(_frame(2))
+    assert int(frame.image[0, 0, 0]) == 1
+
+
+def test_shape_change_reallocates_slot():
+    buffer = FrameRingBuffer(capacity=1, frame_shape=(4, 6, 3))
+    buffer.publish(_frame(7, shape=(2, 2, 3)))
+    assert buffer.latest().image.shape == (2, 2, 3)
+
+
+def test_subscribe_validation_and_from_start():
+    buffer = FrameRingBuffer(capacity=2)
+    for value in range(3):
+        buffer.publish(_frame(value))
+    late = buffer.subscribe("late", from_start=True)
+    assert late.pending == 2 and [f.sequence for f in late.read_all()] == [1, 2]
+    with pytest.raises(ValueError):
+        buffer.subscribe("late")
+    late.close()
+    assert "late" not in buffer.get_stats()["subscribers"]
+    assert buffer.subscribe("late").name == "late"  # A closed subscriber's name can be reused
+    with pytest.raises(ValueError):
+        FrameRingBuffer(capacity=0)
+
+
+def test_wait_for_frame_wakes_on_publish_and_close():
+    buffer = FrameRingBuffer(capacity=2)
+    subscriber = buffer.subscribe("waiter")
+    assert subscriber.wait_for_frame(timeout=0.01) is False
+    timer = threading.Timer(0.02, buffer.publish, args=(_frame(1),))
+    timer.start()
+    assert subscriber.wait_for_frame(timeout=2.0) is True
+    timer.join()
+    subscriber.latest()
+    threading.Timer(0.02, buffer.close).start()
+    assert subscriber.wait_for_frame(timeout=2.0) is False
@@ -0,0 +1,239 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from mark_i.profiles.execution.execution_engine import ExecutionEngine, ExecutionPriority
+from mark_i.profiles.execution.profile_executor import ExecutionResult
+from mark_i.profiles.models.profile import AutomationProfile
+
+
+FINISHED_STATUSES = {'completed', 'failed', 'cancelled', 'timeout'}
+
+
+class FakeExecutors:
+    """Executor factory for one test; records every attempt of every executor it creates."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.released = False  # Attempts block until released or cancelled
+        self.results = {}  # Profile name -> results of successive attempts
+        self.calls = []  # (profile name, monotonic start time)
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = []  # Profile names whose running attempt was cancelled
+
+    def __call__(self):
+        return FakeExecutor(self)
+
+    def release(self):
+        with self.condition:
+            self.released = True
+            self.condition.notify_all()
+
+    def wait_for_calls(self, count, timeout=5):
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.calls) >= count, timeout=timeout)
+
+    def call_names(self):
+        with self.condition:
+            return [name for name, _ in self.calls]
+
+
+class FakeExecutor:
+    def __init__(self, executors):
+        self.executors = executors
+        self.cancelled = False
+
+    def execute_profile(self, profile, user_variables=None, mode=None):
+        executors = self.executors
+        with executors.condition:
+            self.cancelled = False
+            executors.calls.append((profile.name, time.monotonic()))
+            executors.running += 1
+            executors.max_running = max(executors.max_running, executors.running)
+            executors.condition.notify_all()
+
+            executors.condition.wait_for(lambda: executors.released or self.cancelled, timeout=5)
+            executors.running -= 1
+            if self.cancelled:
+                executors.cancelled.append(profile.name)
+                return ExecutionResult.CANCELLED
+            results = executors.results.get(profile.name)
+            return results.pop(0) if results else ExecutionResult.SUCCESS
+
+    def cancel_execution(self):
+        with self.executors.condition:
+            self.cancelled = True
+            self.executors.condition.notify_all()
+
+
+def _profile(name):
+    return AutomationProfile.create_new(name=name, description="Scheduler test profile", category="testing")
+
+
+def _wait_finished(engine, execution_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = engine.get_execution_status(execution_id)
+        if status and status['status'] in FINISHED_STATUSES:
+            return status
+        time.sleep(0.005)
+    pytest.fail(f"Execution did not finish: {engine.get_execution_status(execution_id)}")
+
+
+@pytest.fixture
+def executors():
+    return FakeExecutors()
+
+
+@pytest.fixture
+def engine(executors):
+    engine = ExecutionEngine(executor_factory=executors)
+    engine.max_concurrent_executions = 1
+    yield engine
+    executors.release()
+    engine.shutdown()
+
+
+def test_queued_executions_start_by_priority_then_queue_order(engine, executors):
+    first = engine.execute_profile(_profile("first"))
+    assert executors.wait_for_calls(1)
+
+    execution_ids = [
+        engine.execute_profile(_profile(name), priority=priority)
+        for name, priority in [
+            ("low", ExecutionPriority.LOW),
+            ("normal", ExecutionPriority.NORMAL),
+            ("critical", ExecutionPriority.CRITICAL),
+            ("high", ExecutionPriority.HIGH),
+            ("normal_later", ExecutionPriority.NORMAL),
+        ]
+    ]
+    expected_order = ["critical", "high", "normal", "normal_later", "low"]
+    assert [p['profile_name'] for p in engine.get_queue_status()['queued_profiles']] == expected_order
+    assert engine.get_execution_status(execution_ids[0])['position_in_queue'] == 5
+
+    executors.release()
+    for execution_id in [first] + execution_ids:
+        assert _wait_finished(engine, execution_id)['result'] == ExecutionResult.SUCCESS
+
+    assert executors.call_names() == ["first"] + expected_order
+
+
+def test_running_executions_are_bounded_by_max_concurrent(engine, executors):
+    engine.max_concurrent_executions = 2
+    execution_ids = [engine.execute_profile(_profile(f"profile_{i}")) for i in range(5)]
+
+    assert executors.wait_for_calls(2)
+    time.sleep(0.05)
+    queue_status = engine.get_queue_status()
+    assert executors.running == 2
+    assert queue_status['active_executions'] == 2
+    assert queue_status['queue_length'] == 3
+
+    executors.release()
+    for execution_id in execution_ids:
+        assert _wait_finished(engine, execution_id)['status'] == 'completed'
+    assert len(executors.calls) == 5
+    assert executors.max_running == 2
+
+
+def test_failed_attempts_are_retried_after_backoff_without_holding_a_worker(engine, executors):
+    engine.retry_attempts = 2
+    engine.retry_backoff_seconds = 0.05  # Retries wait 0.1s, then 0.2s
+    executors.results["flaky"] = [ExecutionResult.FAILURE, ExecutionResult.PARTIAL]
+    executors.release()
+
+    flaky = engine.execute_profile(_profile("flaky"), priority=ExecutionPriority.HIGH)
+    other = engine.execute_profile(_profile("other"))
+
+    status = _wait_finished(engine, flaky)
+    assert status['status'] == 'completed'
+    assert status['result'] == ExecutionResult.SUCCESS
+    assert status['retry_count'] == 2
+    assert _wait_finished(engine, other)['status'] == 'completed'
+
+    # The only worker ran "other" while "flaky" waited for its first retry
+    assert executors.call_names() == ["flaky", "other", "flaky", "flaky"]
+    flaky_starts = [started for name, started in executors.calls if name == "flaky"]
+    assert flaky_starts[1] - flaky_starts[0] >= 0.1
+    assert flaky_starts[2] - flaky_starts[1] >= 0.2
+
+
+def test_retries_stop_after_retry_attempts(engine, executors):
+    engine.retry_attempts = 1
+    engine.retry_backoff_seconds = 0.01
+    executors.results["broken"] = [ExecutionResult.FAILURE, ExecutionResult.FAILURE]
+    executors.release()
+
+    status = _wait_finished(engine, engine.execute_profile(_profile("broken")))
+
+    assert status['result'] == ExecutionResult.FAILURE
+    assert status['retry_count'] == 1
+    assert executors.call_names() == ["broken", "broken"]
+
+
+def test_running_execution_past_its_timeout_ends_as_timeout(engine, executors):
+    completed = []
+    engine.on_execution_completed = lambda execution_id, result, info: completed.append((execution_id, result))
+
+    execution_id = engine.execute_profile(_profile("slow"), timeout=0.1)
+    status = _wait_finished(engine, execution_id)
+
+    assert status['status'] == 'timeout'
+    assert status['result'] == ExecutionResult.TIMEOUT
+    assert executors.cancelled == ["slow"]
+    assert executors.call_names() == ["slow"]  # Timeouts are not retried
+    assert completed == [(execution_id, ExecutionResult.TIMEOUT)]
+
+
+def test_deadline_expires_while_still_queued(engine, executors):
+    completed = []
+    engine.on_execution_completed = lambda execution_id, result, info: completed.append((execution_id, result))
+
+    first = engine.execute_profile(_profile("first"))
+    assert executors.wait_for_calls(1)
+    late = engine.execute_profile(_profile("late"), deadline=datetime.now() + timedelta(seconds=0.1))
+
+    status = _wait_finished(engine, late)
+    assert status['status'] == 'timeout'
+    assert status['result'] == ExecutionResult.TIMEOUT
+    assert completed == [(late, ExecutionResult.TIMEOUT)]
+
+    executors.release()
+    assert _wait_finished(engine, first)['status'] == 'completed'
+    assert executors.call_names() == ["first"]
+
+
+def test_cancel_queued_and_active_executions(engine, executors):
+    active = engine.execute_profile(_profile("active"))
+    assert executors.wait_for_calls(1)
+    queued = engine.execute_profile(_profile("queued"))
+
+    assert engine.cancel_execution(queued) is True
+    assert engine.get_execution_status(queued)['status'] == 'cancelled'
+    assert engine.cancel_execution(active) is True
+    assert engine.cancel_execution("unknown") is False
+
+    status = _wait_finished(engine, active)
+    assert status['status'] == 'cancelled'
+    assert status['result'] == ExecutionResult.CANCELLED
+    assert executors.cancelled == ["active"]
+    assert executors.call_names() == ["active"]
+
+
+def test_shutdown_cancels_queued_and_running_executions(engine, executors):
+    running = engine.execute_profile(_profile("running"))
+    assert executors.wait_for_calls(1)
+    queued = engine.execute_profile(_profile("queued"))
+
+    engine.shutdown()
+
+    assert engine.get_execution_status(queued)['status'] == 'cancelled'
+    assert engine.get_execution_status(running)['result'] == ExecutionResult.CANCELLED
+    assert executors.cancelled == ["running"]
+    assert executors.call_names() == ["running"]
+    with pytest.raises(RuntimeError):
+        engine.execute_profile(_profile("after_shutdown"))
@@ -0,0 +1,177 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from mark_i.profiles.models.profile import AutomationProfile
+from mark_i.profiles.profile_index import INDEX_FILE_NAME, INDEX_VERSION, ProfileIndex
+from mark_i.profiles.profile_manager import PROFILE_CATEGORIES, ProfileManager
+from mark_i.profiles.validation.profile_validator import ValidationResult
+
+
+def _accept_all(profile):
+    return ValidationResult(is_valid=True, issues=[], validation_time=datetime.now(), profile_name=profile.name)
+
+
+def _manager(storage_path):
+    manager = ProfileManager(str(storage_path))
+    manager.validator.validate_profile = _accept_all
+    return manager
+
+
+def _saved_profile(manager, name="Inbox Cleaner", category="email", **fields):
+    profile = AutomationProfile.create_new(name=name, description="Sorts the inbox", category=category)
+    for key, value in fields.items():
+        setattr(profile, key, value)
+    assert manager.save_profile(profile)
+    return profile
+
+
+def _rewrite(file_path, **changes):
+    """Edit a profile file behind the manager's back, bumping its mtime"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data.update(changes)
+    stat = os.stat(file_path)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_save_records_the_profile_in_the_index_file(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+
+    entry = manager.index.get(profile.id)
+    assert entry.path == "email/inbox-cleaner.json"
+    assert entry.name == "Inbox Cleaner"
+
+    with open(tmp_path / INDEX_FILE_NAME, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["version"] == INDEX_VERSION
+    assert [e["id"] for e in data["entries"]] == [profile.id]
+
+
+def test_startup_picks_up_files_edited_outside_the_manager(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+    file_path = manager.index.resolve_path(manager.index.get(profile.id))
+
+    _rewrite(file_path, description="Edited by hand")
+
+    reopened = _manager(tmp_path)
+    assert reopened.index.get(profile.id).description == "Edited by hand"
+    assert reopened.index.get(profile.id).size == os.stat(file_path).st_size
+
+
+def test_unchanged_files_are_not_reread_on_refresh(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    _saved_profile(manager)
+
+    reads = []
+    original = ProfileIndex._read_entry
+    monkeypatch.setattr(ProfileIndex, "_read_entry", lambda self, *args: reads.append(args) or original(self, *args))
+
+    _manager(tmp_path)
+    assert reads == []
+
+
+def test_refresh_drops_the_cached_profile_of_an_edited_file(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+    assert manager.load_profile(profile.id) is profile
+
+    _rewrite(manager.index.resolve_path(manager.index.get(profile.id)), description="Edited by hand")
+    manager.list_profile_summaries()
+
+    reloaded = manager.load_profile(profile.id)
+    assert reloaded is not profile
+    assert reloaded.description == "Edited by hand"
+
+
+def test_renamed_save_removes_the_old_file(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+    old_file = tmp_path / "email" / "inbox-cleaner.json"
+    assert old_file.exists()
+
+    profile.name = "Inbox Sorter"
+    assert manager.save_profile(profile)
+
+    assert not old_file.exists()
+    assert (tmp_path / "email" / "inbox-sorter.json").exists()
+    assert manager.index.get(profile.id).path == "email/inbox-sorter.json"
+    assert len(manager.index) == 1
+
+
+def test_delete_removes_file_index_entry_and_cache(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+    file_path = manager.index.resolve_path(manager.index.get(profile.id))
+
+    assert manager.delete_profile(profile.id)
+
+    assert not file_path.exists()
+    assert manager.index.get(profile.id) is None
+    assert manager.load_profile(profile.id) is None
+    assert _manager(tmp_path).index.get(profile.id) is None
+    assert not manager.delete_profile(profile.id)
+
+
+@pytest.mark.parametrize("index_contents", [
+    json.dumps({"version": INDEX_VERSION - 1, "entries": []}),
+    "{not json",
+    json.dumps({"version": INDEX_VERSION, "entries": [{"id": "missing-fields"}]}),
+])
+def test_outdated_or_unreadable_index_is_rebuilt(tmp_path, index_contents):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+    (tmp_path / INDEX_FILE_NAME).write_text(index_contents, encoding="utf-8")
+
+    reopened = _manager(tmp_path)
+
+    assert reopened.index.get(profile.id).path == "email/inbox-cleaner.json"
+    with open(tmp_path / INDEX_FILE_NAME, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["version"] == INDEX_VERSION
+    assert [e["id"] for e in data["entries"]] == [profile.id]
+
+
+def test_find_profile_file_resolves_through_the_index(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager, name="Download Sorter", category="files")
+
+    # A hit must not rescan the storage directories
+    monkeypatch.setattr(manager.index, "refresh", lambda: pytest.fail("refresh() called for an indexed profile"))
+    assert manager._find_profile_file(profile.id) == str(tmp_path / "files" / "download-sorter.json")
+
+
+def test_find_profile_file_refreshes_on_a_miss(tmp_path):
+    manager = _manager(tmp_path)
+    other = _manager(tmp_path)
+    profile = _saved_profile(other, name="Download Sorter", category="files")
+
+    assert manager.index.get(profile.id) is None
+    assert manager._find_profile_file(profile.id) == str(tmp_path / "files" / "download-sorter.json")
+    assert manager._find_profile_file("no-such-profile") is None
+
+
+def test_find_profile_file_follows_a_file_moved_on_disk(tmp_path):
+    manager = _manager(tmp_path)
+    profile = _saved_profile(manager)
+
+    os.replace(tmp_path / "email" / "inbox-cleaner.json", tmp_path / "custom" / "inbox-cleaner.json")
+
+    assert manager._find_profile_file(profile.id) == str(tmp_path / "custom" / "inbox-cleaner.json")
+
+
+def test_search_and_category_listing_use_the_index(tmp_path):
+    manager = _manager(tmp_path)
+    inbox = _saved_profile(manager, tags=["mail"])
+    _saved_profile(manager, name="Download Sorter", category="files")
+
+    assert [entry.id for entry in manager.index.search("cleaner")] == [inbox.id]
+    assert [entry.id for entry in manager.index.search("sorter", category="email")] == []
+    assert {entry.category for entry in manager.index.entries()} <= set(PROFILE_CATEGORIES)
+    assert [entry.id for entry in manager.index.entries("email")] == [inbox.id]
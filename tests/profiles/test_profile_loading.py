@@ -0,0 +1,50 @@
+import pytest
+
+from mark_i.profiles.models.profile import AutomationProfile
+from mark_i.profiles.models.region import Region
+from mark_i.profiles.models.rule import Action, Condition, Rule
+
+
+def _profile_dict(**overrides):
+    profile = AutomationProfile.create_new(name="Loading Profile", description="Load-time checks", category="testing")
+    profile.add_region(Region(name="area", x=0, y=0, width=10, height=10, description="Area"))
+    profile.add_rule(Rule(
+        name="click_when_visible",
+        description="Click the area when it shows the button",
+        conditions=[Condition("visual_match", "area", parameters={"template": "button.png"})],
+        actions=[Action("click", "area")],
+    ))
+    data = profile.to_dict()
+    data.update(overrides)
+    return data
+
+
+def test_valid_profile_loads_lazily():
+    profile = AutomationProfile.from_dict(_profile_dict())
+
+    assert not profile.is_materialized
+    assert profile.rules[0].conditions[0].type == "visual_match"
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda data: data["rules"][0]["conditions"][0].update(type="no_such_condition"),
+    lambda data: data["rules"][0]["actions"][0].update(type="no_such_action"),
+    lambda data: data["rules"][0].update(logical_operator="XOR"),
+    lambda data: data["rules"][0].update(priority=-1),
+    lambda data: data["regions"][0].update(width=0),
+    lambda data: data["regions"][0].update(x=-5),
+])
+def test_invalid_entries_are_rejected_at_load_time(mutate):
+    data = _profile_dict()
+    mutate(data)
+
+    with pytest.raises(ValueError):
+        AutomationProfile.from_dict(data)
+
+
+def test_missing_required_keys_are_rejected_at_load_time():
+    data = _profile_dict()
+    del data["rules"][0]["conditions"][0]["region"]
+
+    with pytest.raises(KeyError):
+        AutomationProfile.from_dict(data)
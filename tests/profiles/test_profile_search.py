@@ -0,0 +1,172 @@
+from datetime import datetime
+
+import pytest
+
+from mark_i.profiles.profile_index import ProfileIndex, ProfileIndexEntry
+from mark_i.profiles.profile_search import FIELD_WEIGHTS, PREFIX_MATCH_FACTOR, ProfileSearchIndex, tokenize
+
+
+def _index(**profiles):
+    index = ProfileSearchIndex()
+    for profile_id, fields in profiles.items():
+        index.add(profile_id, fields)
+    return index
+
+
+def _ids(results):
+    return [profile_id for profile_id, _ in results]
+
+
+def _assert_consistent(index):
+    assert index._sorted_tokens == sorted(index._postings)
+    for profile_id, tokens in index._doc_tokens.items():
+        for token in tokens:
+            assert profile_id in index._postings[token]
+    for token, postings in index._postings.items():
+        assert postings
+        for profile_id in postings:
+            assert token in index._doc_tokens[profile_id]
+
+
+def test_tokenize_lowercases_and_splits_on_non_word_characters():
+    assert tokenize("Gmail-Inbox  cleaner_v2!") == ["gmail", "inbox", "cleaner_v2"]
+    assert tokenize("") == []
+
+
+def test_every_query_word_must_match():
+    index = _index(
+        inbox={"name": ["Inbox Cleaner"]},
+        downloads={"name": ["Downloads Cleaner"]},
+    )
+
+    assert _ids(index.search("cleaner")) == ["downloads", "inbox"]
+    assert _ids(index.search("inbox cleaner")) == ["inbox"]
+    assert index.search("inbox downloads") == []
+    assert index.search("cleaner missing") == []
+    assert index.search("  !! ") == []
+
+
+def test_query_words_match_across_fields():
+    index = _index(inbox={"name": ["Inbox Cleaner"], "tags": ["gmail"]})
+
+    assert index.search("gmail inbox") == [("inbox", FIELD_WEIGHTS["tags"] + FIELD_WEIGHTS["name"])]
+
+
+def test_exact_matches_rank_above_prefix_matches():
+    index = _index(
+        prefix={"name": ["Mailbox"], "description": ["mailer"]},
+        exact={"name": ["Mail"]},
+    )
+
+    results = index.search("mail")
+    assert _ids(results) == ["exact", "prefix"]
+    assert dict(results) == {
+        "exact": FIELD_WEIGHTS["name"],
+        "prefix": FIELD_WEIGHTS["name"] * PREFIX_MATCH_FACTOR,
+    }
+
+
+def test_partially_typed_word_matches_as_prefix():
+    index = _index(inbox={"name": ["Inbox Cleaner"]})
+
+    assert index.search("inbox cle") == [("inbox", FIELD_WEIGHTS["name"] + FIELD_WEIGHTS["name"] * PREFIX_MATCH_FACTOR)]
+    assert index.search("leaner") == []
+
+
+@pytest.mark.parametrize("stronger, weaker", [
+    ("name", "tags"),
+    ("tags", "target_application"),
+    ("target_application", "rule_names"),
+    ("region_names", "description"),
+])
+def test_field_weights_order_results(stronger, weaker):
+    index = _index(a={weaker: ["report"]}, b={stronger: ["report"]})
+
+    assert index.search("report") == [("b", FIELD_WEIGHTS[stronger]), ("a", FIELD_WEIGHTS[weaker])]
+
+
+def test_token_in_several_fields_keeps_its_best_weight():
+    index = _index(p={"description": ["report"], "name": ["Report"], "rule_names": ["report"]})
+
+    assert index.search("report") == [("p", FIELD_WEIGHTS["name"])]
+
+
+def test_ties_are_broken_by_profile_id():
+    index = _index(b={"name": ["Report"]}, a={"name": ["Report"]}, c={"name": ["Report"]})
+
+    assert _ids(index.search("report")) == ["a", "b", "c"]
+
+
+def test_limit_returns_the_best_results_in_order():
+    index = _index(
+        low={"description": ["report"]},
+        high={"name": ["report"]},
+        mid={"tags": ["report"]},
+    )
+
+    assert _ids(index.search("report", limit=2)) == ["high", "mid"]
+    assert _ids(index.search("report", limit=10)) == ["high", "mid", "low"]
+    assert index.search("report", limit=0) == []
+
+
+def test_add_replaces_the_previous_version_of_a_profile():
+    index = _index(p={"name": ["Inbox Cleaner"]}, other={"name": ["Inbox"]})
+
+    index.add("p", {"name": ["Download Sorter"]})
+
+    assert _ids(index.search("inbox")) == ["other"]
+    assert _ids(index.search("sorter")) == ["p"]
+    assert "cleaner" not in index._sorted_tokens
+    assert "inbox" in index._sorted_tokens
+    assert len(index) == 2
+    _assert_consistent(index)
+
+
+def test_incremental_add_and_remove_keep_sorted_tokens_consistent():
+    index = ProfileSearchIndex()
+    words = ["mail", "mailbox", "mailer", "zip", "archive", "report", "reports", "inbox"]
+
+    for i, word in enumerate(words):
+        index.add(f"p{i}", {"name": [word], "tags": [words[(i + 3) % len(words)]]})
+        _assert_consistent(index)
+
+    for i in range(0, len(words), 2):
+        index.remove(f"p{i}")
+        _assert_consistent(index)
+
+    # Only profiles that are still indexed are found, through the remaining tokens
+    assert _ids(index.search("mail")) == ["p5", "p1", "p7"]
+    assert _ids(index.search("report")) == ["p5", "p3"]
+    index.remove("p1")
+    index.remove("no-such-profile")
+    _assert_consistent(index)
+    assert len(index) == 3
+
+    index.clear()
+    assert index._sorted_tokens == []
+    assert index.search("mail") == []
+    assert len(index) == 0
+
+
+def _entry(profile_id, category, name):
+    return ProfileIndexEntry(
+        id=profile_id,
+        path=f"{category}/{profile_id}.json",
+        category=category,
+        name=name,
+        created_at=datetime(2024, 1, 1),
+        modified_at=datetime(2024, 1, 1),
+    )
+
+
+def test_profile_index_search_filters_by_category_before_limiting(tmp_path):
+    index = ProfileIndex(tmp_path, ["email", "files"])
+    index._put(_entry("email-report", "email", "Report"))
+    index._put(_entry("files-report", "files", "Report"))
+    index._put(_entry("files-reports", "files", "Reports"))
+
+    assert [e.id for e in index.search("report")] == ["email-report", "files-report", "files-reports"]
+    assert [e.id for e in index.search("report", category="files")] == ["files-report", "files-reports"]
+    assert [e.id for e in index.search("report", category="files", limit=1)] == ["files-report"]
+    assert [e.id for e in index.search("report", category="email", limit=1)] == ["email-report"]
+    assert index.search("report", category="custom") == []
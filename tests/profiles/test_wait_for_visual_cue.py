@@ -0,0 +1,196 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from mark_i.profiles.models.profile import AutomationProfile
+from mark_i.profiles.models.region import Region
+from mark_i.profiles.models.rule import Action
+from mark_i.profiles.profile_executor import ExecutionContext, ProfileExecutor
+from mark_i.profiles.validation.rule_validator import RuleValidator
+
+
+class FakeEye:
+    def __init__(self):
+        self.captures = 0
+
+    def capture_region(self, x, y, width, height):
+        self.captures += 1
+        return np.full((height, width, 3), self.captures, dtype=np.uint8)
+
+
+class FakeBrain:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def analyze_image(self, image_data, prompt):
+        self.prompts.append(prompt)
+        return self.answers.pop(0) if self.answers else "no"
+
+
+def _context():
+    profile = AutomationProfile.create_new(name="Cue Profile", description="Visual cue tests", category="testing")
+    profile.add_region(Region(name="results_area", x=0, y=0, width=8, height=6, description="Search results area"))
+    return ExecutionContext(profile=profile, variables={})
+
+
+def _legacy_cue_action(**extra):
+    return Action("wait_for_visual_cue", "results_area", parameters={"cue_description": "Search results loaded", **extra})
+
+
+def test_legacy_cue_description_waits_for_brain_confirmation():
+    brain = FakeBrain(["No", "Yes, the results are shown"])
+    executor = ProfileExecutor(capture_engine=FakeEye(), agent_core=brain)
+    assert executor._execute_action(_legacy_cue_action(poll_interval=0.0), _context()) is True
+    assert len(brain.prompts) == 2
+    assert "Search results loaded" in brain.prompts[0]
+
+
+def test_legacy_cue_description_times_out_when_never_seen():
+    executor = ProfileExecutor(capture_engine=FakeEye(), agent_core=FakeBrain([]))
+    assert executor._execute_action(_legacy_cue_action(timeout_seconds=0.05, poll_interval=0.01), _context()) is False
+
+
+class RecordingResult:
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+
+    def add_error(self, message):
+        self.errors.append(message)
+
+    def add_warning(self, message):
+        self.warnings.append(message)
+
+
+def test_legacy_cue_description_passes_validation():
+    result = RecordingResult()
+    RuleValidator()._validate_action_parameters(_legacy_cue_action(), result, 1)
+    assert result.errors == []
+
+
+def test_cue_without_condition_or_description_fails_validation():
+    result = RecordingResult()
+    RuleValidator()._validate_action_parameters(Action("wait_for_visual_cue", "results_area", parameters={}), result, 1)
+    assert len(result.errors) == 1
+
+
+class StaticEye:
+    def __init__(self, frames=None):
+        self.frames = list(frames or [])
+        self.captures = 0
+
+    def capture_region(self, x, y, width, height):
+        self.captures += 1
+        if self.frames:
+            return self.frames.pop(0)
+        return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+class FakeClock:
+    """Replaces the executor's time module and cancel event: each poll sleep advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timeouts = []
+
+    def monotonic(self):
+        return self.now
+
+    def wait(self, timeout=None):
+        self.timeouts.append(timeout)
+        self.now += timeout
+        return False
+
+
+def _cue_action(condition, **extra):
+    return Action("wait_for_visual_cue", "results_area", parameters={"condition": condition, **extra})
+
+
+def test_static_region_skips_checks_and_backs_off_to_max_interval(monkeypatch):
+    brain = FakeBrain([])
+    executor = ProfileExecutor(capture_engine=StaticEye(), agent_core=brain)
+    clock = FakeClock()
+    monkeypatch.setattr("mark_i.profiles.profile_executor.time", clock)
+    executor._cancel_event = clock
+    action = _legacy_cue_action(timeout_seconds=0.5, poll_interval=0.01, max_poll_interval=0.04)
+
+    assert executor._execute_action(action, _context()) is False
+    assert len(brain.prompts) == 1  # Only the first frame was checked
+    # Checked frame at the base interval, then backoff while static, capped at max_poll_interval
+    assert clock.timeouts[:6] == pytest.approx([0.01, 0.015, 0.0225, 0.03375, 0.04, 0.04])
+    assert max(clock.timeouts) == pytest.approx(0.04)
+
+
+def test_cancel_wakes_the_wait_early():
+    executor = ProfileExecutor(capture_engine=StaticEye(), agent_core=FakeBrain([]))
+    action = _legacy_cue_action(timeout_seconds=30, poll_interval=10, max_poll_interval=10)
+    outcome = []
+    waiter = threading.Thread(target=lambda: outcome.append(executor._execute_action(action, _context())))
+    start = time.monotonic()
+    waiter.start()
+    time.sleep(0.05)
+    executor.cancel_execution()
+    waiter.join(timeout=2)
+
+    assert not waiter.is_alive()
+    assert outcome == [False]
+    assert time.monotonic() - start < 2
+
+
+def test_template_cue_waits_until_the_template_appears(tmp_path):
+    template = np.zeros((4, 4, 3), dtype=np.uint8)
+    template[:2, :2] = 255
+    template[2:, 2:] = (0, 0, 255)
+    template_path = tmp_path / "button.png"
+    cv2.imwrite(str(template_path), template)
+    blank = np.full((6, 8, 3), 40, dtype=np.uint8)
+    shown = blank.copy()
+    shown[1:5, 2:6] = template
+    eye = StaticEye([blank, blank, shown])
+    executor = ProfileExecutor(capture_engine=eye)
+    condition = {"type": "template_match", "parameters": {"template_path": str(template_path), "threshold": 0.9}}
+
+    assert executor._execute_action(_cue_action(condition, poll_interval=0.0, timeout_seconds=1), _context()) is True
+    assert eye.captures == 3
+
+
+def test_template_cue_times_out_when_template_never_appears(tmp_path):
+    template = np.zeros((4, 4, 3), dtype=np.uint8)
+    template[:2, :2] = 255
+    template_path = tmp_path / "button.png"
+    cv2.imwrite(str(template_path), template)
+    executor = ProfileExecutor(capture_engine=StaticEye())
+    condition = {"type": "template_match", "parameters": {"template_path": str(template_path)}}
+
+    assert executor._execute_action(_cue_action(condition, poll_interval=0.01, timeout_seconds=0.05), _context()) is False
+
+
+def test_color_cue_matches_dominant_rgb_color():
+    gray = np.full((6, 8, 3), 90, dtype=np.uint8)
+    red = np.zeros((6, 8, 3), dtype=np.uint8)
+    red[..., 2] = 250
+    executor = ProfileExecutor(capture_engine=StaticEye([gray, red]))
+    condition = {"type": "color_match", "parameters": {"expected_color": [255, 0, 0], "tolerance": 10}}
+
+    assert executor._execute_action(_cue_action(condition, poll_interval=0.0, timeout_seconds=1), _context()) is True
+
+
+def test_window_cue_is_rechecked_while_region_is_static(monkeypatch):
+    eye = StaticEye()
+    executor = ProfileExecutor(capture_engine=eye)
+    titles = iter([[], ["Terminal"], ["Terminal", "Settings - System"]])
+    monkeypatch.setattr(executor, "_list_window_titles", lambda: next(titles))
+    condition = {"type": "window_exists", "parameters": {"window_title": "settings"}}
+
+    assert executor._execute_action(_cue_action(condition, poll_interval=0.0, timeout_seconds=1), _context()) is True
+    assert eye.captures == 0
+
+
+def test_cue_condition_parameters_are_validated():
+    result = RecordingResult()
+    RuleValidator()._validate_action_parameters(_cue_action({"type": "template_match", "parameters": {}}), result, 1)
+    assert any("template_path" in error for error in result.errors)
@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from mark_i.main_controller import MainController
+
+
+def _make_controller(settings, regions):
+    config_manager = MagicMock()
+    config_manager.get_profile_data.return_value = {"settings": settings, "regions": regions}
+    config_manager.get_profile_path.return_value = "test_profile.json"
+    with patch("mark_i.main_controller.ConfigManager", return_value=config_manager), patch("mark_i.main_controller.CaptureEngine"), patch(
+        "mark_i.main_controller.AnalysisEngine"
+    ), patch("mark_i.main_controller.RulesEngine"), patch("mark_i.main_controller.ActionExecutor"), patch.dict("os.environ", {}, clear=True):
+        controller = MainController("test_profile")
+    controller.rules_engine.get_analysis_requirements_for_region.return_value = {"ocr"}
+    controller.analysis_engine.ocr_extract_text_batch.side_effect = lambda images: {name: {"text": f"text-{int(img.sum())}"} for name, img in images.items()}
+    return controller
+
+
+REGIONS = [{"name": "a", "x": 0, "y": 0, "width": 4, "height": 4}, {"name": "b", "x": 10, "y": 0, "width": 4, "height": 4}]
+
+
+def _frame(a_value: int, b_value: int):
+    return {"a": np.full((4, 4, 3), a_value, dtype=np.uint8), "b": np.full((4, 4, 3), b_value, dtype=np.uint8)}
+
+
+class TestChangeDetectionInCycle:
+    def test_unchanged_region_reuses_previous_analyses(self):
+        controller = _make_controller({}, REGIONS)
+        controller.capture_engine.capture_regions.side_effect = [_frame(1, 2), _frame(1, 3)]
+        controller._perform_monitoring_cycle()
+        controller._perform_monitoring_cycle()
+
+        assert [list(c.args[0]) for c in controller.analysis_engine.ocr_extract_text_batch.call_args_list] == [["a", "b"], ["b"]]
+        second_cycle_data = controller.rules_engine.evaluate_rules.call_args_list[1].args[0]
+        assert second_cycle_data["a"]["ocr_analysis_result"] == {"text": f"text-{1 * 48}"}
+        assert second_cycle_data["b"]["ocr_analysis_result"] == {"text": f"text-{3 * 48}"}
+
+    def test_rules_still_evaluated_on_static_screen_by_default(self):
+        controller = _make_controller({}, REGIONS)
+        controller.capture_engine.capture_regions.side_effect = [_frame(1, 2), _frame(1, 2)]
+        controller._perform_monitoring_cycle()
+        controller._perform_monitoring_cycle()
+        assert controller.rules_engine.evaluate_rules.call_count == 2
+        assert controller.analysis_engine.ocr_extract_text_batch.call_count == 1
+
+    def test_skip_rules_when_unchanged(self):
+        controller = _make_controller({"skip_rules_when_unchanged": True}, REGIONS)
+        controller.capture_engine.capture_regions.side_effect = [_frame(1, 2), _frame(1, 2), _frame(5, 2)]
+        for _ in range(3):
+            controller._perform_monitoring_cycle()
+        assert controller.rules_engine.evaluate_rules.call_count == 2
+
+    def test_capture_failure_forces_reanalysis(self):
+        controller = _make_controller({}, REGIONS)
+        first = _frame(1, 2)
+        controller.capture_engine.capture_regions.side_effect = [first, {"a": None, "b": first["b"]}, first]
+        for _ in range(3):
+            controller._perform_monitoring_cycle()
+        assert [list(c.args[0]) for c in controller.analysis_engine.ocr_extract_text_batch.call_args_list] == [["a", "b"], ["a"]]
+
+    def test_disabled_change_detection_always_analyses(self):
+        controller = _make_controller({"change_detection_enabled": False}, REGIONS)
+        assert controller.change_detector is None
+        controller.capture_engine.capture_regions.side_effect = [_frame(1, 2), _frame(1, 2)]
+        controller._perform_monitoring_cycle()
+        controller._perform_monitoring_cycle()
+        assert [list(c.args[0]) for c in controller.analysis_engine.ocr_extract_text_batch.call_args_list] == [["a", "b"], ["a", "b"]]
+
+    def test_invalid_threshold_defaults_to_exact(self):
+        controller = _make_controller({"change_detection_threshold": "high"}, REGIONS)
+        assert controller.change_detector.threshold == 0.0
+
+
+class TestPipelinedCycle:
+    def _run_cycles(self, settings, frames):
+        controller = _make_controller(settings, REGIONS)
+        controller.rules_engine.get_analysis_requirements_for_region.return_value = {"ocr", "average_color", "dominant_color"}
+        controller.analysis_engine.analyze_average_color.side_effect = lambda img, name: [int(img[0, 0, 0])] * 3
+        controller.analysis_engine.analyze_dominant_colors.side_effect = lambda img, k, name: [{"bgr_color": [int(img[0, 0, 0])] * 3, "percentage": 100.0}]
+        controller.capture_engine.capture_regions.side_effect = frames
+        for _ in frames:
+            controller._perform_monitoring_cycle()
+        controller._shutdown_pipeline()
+        return controller, [c.args[0] for c in controller.rules_engine.evaluate_rules.call_args_list]
+
+    def test_pipelined_results_match_sequential(self):
+        frames = [_frame(1, 2), _frame(1, 3)]
+        _, sequential = self._run_cycles({}, list(frames))
+        controller, pipelined = self._run_cycles({"pipeline_workers": 3}, list(frames))
+        assert controller.pipeline_workers == 3
+        for seq_data, pipe_data in zip(sequential, pipelined):
+            for name in ("a", "b"):
+                assert {k: v for k, v in seq_data[name].items() if k != "image"} == {k: v for k, v in pipe_data[name].items() if k != "image"}
+        assert pipelined[1]["b"]["average_color"] == [3, 3, 3] and pipelined[1]["b"]["ocr_analysis_result"] == {"text": f"text-{3 * 48}"}
+
+    def test_failed_analysis_does_not_abort_cycle(self):
+        controller = _make_controller({"pipeline_workers": 2}, REGIONS)
+        controller.rules_engine.get_analysis_requirements_for_region.return_value = {"average_color", "ocr"}
+        controller.analysis_engine.analyze_average_color.side_effect = RuntimeError("boom")
+        controller.capture_engine.capture_regions.side_effect = [_frame(1, 2)]
+        controller._perform_monitoring_cycle()
+        controller._shutdown_pipeline()
+        region_data = controller.rules_engine.evaluate_rules.call_args.args[0]
+        assert region_data["a"]["average_color"] is None and region_data["a"]["ocr_analysis_result"] == {"text": f"text-{1 * 48}"}
+
+    def test_cycle_stats_record_stage_timings(self):
+        controller, _ = self._run_cycles({"monitoring_interval_seconds": 1e-9}, [_frame(1, 2), _frame(4, 5)])
+        stats = controller.get_cycle_stats()
+        assert stats["cycles"] == 2 and stats["overruns"] == 2
+        assert set(stats["last"]) == {"capture", "analysis", "rules", "total"}
+        assert stats["mean"]["total"] >= stats["mean"]["analysis"] >= 0
+
+    @pytest.mark.parametrize("value", [-1, "4", True])
+    def test_invalid_pipeline_workers_defaults_to_sequential(self, value):
+        controller = _make_controller({"pipeline_workers": value}, REGIONS)
+        assert controller.pipeline_workers == 0 and controller._get_pipeline_executor() is None